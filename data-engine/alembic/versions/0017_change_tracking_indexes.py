@@ -0,0 +1,27 @@
+"""updated_at indexes for incremental screen change tracking
+
+Revision ID: 0017_change_tracking_indexes
+Revises: 0016_principle_jobs_snapshots
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "0017_change_tracking_indexes"
+down_revision = "0016_principle_jobs_snapshots"
+branch_labels = None
+depends_on = None
+
+
+TRACKED_TABLES = ("financial_facts", "calculated_metrics", "market_prices")
+
+
+def upgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.create_index(f"ix_{table}_updated_at", table, ["updated_at"])
+
+
+def downgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
@@ -0,0 +1,33 @@
+"""content-addressed chunk embedding store
+
+Revision ID: 0018_chunk_embeddings
+Revises: 0017_change_tracking_indexes
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0018_chunk_embeddings"
+down_revision = "0017_change_tracking_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chunk_embeddings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("model", sa.String(160), nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("dimensions", sa.Integer(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("model", "content_sha256", name="uq_chunk_embedding_model_sha256"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chunk_embeddings")
@@ -0,0 +1,64 @@
+"""stored tsvector columns with GIN indexes for full-text search
+
+Revision ID: 0019_search_vectors
+Revises: 0018_chunk_embeddings
+Create Date: 2026-10-17 00:00:00
+
+The columns are maintained by a trigger rather than declared GENERATED so
+adding them does not rewrite the table under an exclusive lock. Existing
+rows stay NULL until SearchVectorService.backfill runs; search keeps using
+the to_tsvector expression for a table until its backfill is complete, so
+the expression indexes from 0012 are kept to serve that window.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0019_search_vectors"
+down_revision = "0018_chunk_embeddings"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTORS = (
+    ("document_chunks", "text"),
+    ("knowledge_chunks", "content"),
+    ("claims", "statement"),
+    ("thesis_sections", "body"),
+    ("investment_principles", "principle"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in SEARCH_VECTORS:
+        op.execute(sa.text(f'ALTER TABLE "{table}" ADD COLUMN search_vector tsvector'))
+        op.execute(
+            sa.text(
+                f'CREATE TRIGGER "trg_{table}_search_vector" '
+                f'BEFORE INSERT OR UPDATE OF "{column}" ON "{table}" '
+                "FOR EACH ROW EXECUTE FUNCTION "
+                f"tsvector_update_trigger(search_vector, 'pg_catalog.simple', \"{column}\")"
+            )
+        )
+        op.execute(
+            sa.text(f'CREATE INDEX "ix_{table}_search_vector" ON "{table}" USING GIN (search_vector)')
+        )
+        op.execute(
+            sa.text(
+                f'CREATE INDEX "ix_{table}_search_vector_pending" ON "{table}" (id) '
+                "WHERE search_vector IS NULL"
+            )
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, _ in SEARCH_VECTORS:
+        op.execute(sa.text(f'DROP TRIGGER IF EXISTS "trg_{table}_search_vector" ON "{table}"'))
+        op.execute(sa.text(f'DROP INDEX IF EXISTS "ix_{table}_search_vector_pending"'))
+        op.execute(sa.text(f'DROP INDEX IF EXISTS "ix_{table}_search_vector"'))
+        op.execute(sa.text(f'ALTER TABLE "{table}" DROP COLUMN search_vector'))
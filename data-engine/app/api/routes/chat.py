@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Depends
+import json
+from typing import Any, AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -7,7 +11,40 @@ from app.services.chat_service import ChatService
 
 router = APIRouter()
 
+STREAM_MEDIA_TYPES = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+
 
 @router.post("", response_model=ChatResponse)
 async def chat(payload: ChatRequest, db: Session = Depends(get_db)) -> ChatResponse:
     return await ChatService().answer(db, payload.question, payload.scope, payload.ticker)
+
+
+@router.post("/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    format: Literal["sse", "ndjson"] = Query("sse"),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Stream ``baseline``, ``token`` and ``final`` events as SSE or NDJSON.
+
+    Token events carry unverified model output; clients should replace it
+    with the ``final`` response, which falls back to the deterministic
+    answer when synthesis fails verification.
+    """
+    events = ChatService().answer_stream(db, payload.question, payload.scope, payload.ticker)
+    return StreamingResponse(
+        _encode(events, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _encode(
+    events: AsyncIterator[dict[str, Any]], format: Literal["sse", "ndjson"]
+) -> AsyncIterator[str]:
+    async for event in events:
+        data = json.dumps(event["data"], default=str, ensure_ascii=False)
+        if format == "sse":
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+        else:
+            yield f'{{"event": "{event["event"]}", "data": {data}}}\n'
@@ -47,6 +47,11 @@ class UrlIngestRequest(BaseModel):
     source_type: str = Field(default="url", min_length=2, max_length=80)
 
 
+@router.get("/documents/index/status")
+def document_index_status() -> dict:
+    return RAGIndex().status()
+
+
 @router.post("/documents/index/rebuild")
 def rebuild_document_index(db: Session = Depends(get_db)) -> dict:
     try:
@@ -0,0 +1,209 @@
+"""Bounded executors for blocking analytics work called from async routes.
+
+CPU-bound work (quantstats metrics, Monte Carlo) runs in a process pool so it
+never holds the server's GIL; blocking I/O such as price downloads runs in a
+thread pool. A pool admits at most one call per worker and each tenant at
+most ``compute_tenant_concurrency`` calls per pool, so one tenant's batch of
+simulations queues behind itself instead of in front of everyone else.
+
+One :class:`ComputeExecutor` lives per event loop and the FastAPI lifespan
+installs it. Code running outside an installed executor (scripts, tests that
+skip the lifespan) falls back to ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+import weakref
+from collections import Counter, deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Literal, TypeVar
+
+import numpy as np
+
+from app.core.config import get_settings
+
+
+T = TypeVar("T")
+Kind = Literal["cpu", "io"]
+KINDS: tuple[Kind, ...] = ("cpu", "io")
+# Recent calls kept per pool for the latency percentiles in ``metrics()``.
+LATENCY_SAMPLES = 512
+
+_executors: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ComputeExecutor] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class ComputeExecutor:
+    """Process and thread pools with per-tenant admission for one loop."""
+
+    def __init__(
+        self,
+        *,
+        process_workers: int = 2,
+        thread_workers: int = 8,
+        tenant_concurrency: int = 2,
+    ) -> None:
+        cpu: Executor
+        if process_workers:
+            # The server runs threads (DuckDB, the HTTP pools); forking it is unsafe.
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            cpu = ProcessPoolExecutor(process_workers, mp_context=multiprocessing.get_context(method))
+        else:
+            cpu = ThreadPoolExecutor(thread_workers, thread_name_prefix="compute-cpu")
+        self._pools: dict[Kind, Executor] = {
+            "cpu": cpu,
+            "io": ThreadPoolExecutor(thread_workers, thread_name_prefix="compute-io"),
+        }
+        self._workers: dict[Kind, int] = {"cpu": process_workers or thread_workers, "io": thread_workers}
+        self._tenant_concurrency = tenant_concurrency
+        self._slots: dict[Kind, asyncio.Semaphore] = {}
+        self._tenant_slots: dict[tuple[Kind, str], asyncio.Semaphore] = {}
+        self._queued: Counter[Kind] = Counter()
+        self._running: Counter[Kind] = Counter()
+        self._completed: Counter[Kind] = Counter()
+        self._cancelled: Counter[Kind] = Counter()
+        self._waits: dict[Kind, deque[float]] = {kind: deque(maxlen=LATENCY_SAMPLES) for kind in KINDS}
+        self._runs: dict[Kind, deque[float]] = {kind: deque(maxlen=LATENCY_SAMPLES) for kind in KINDS}
+        self.closed = False
+
+    async def run(self, kind: Kind, tenant: str, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` on the ``kind`` pool once a pool and tenant slot are free.
+
+        ``cpu`` callables and their arguments must be picklable. Cancelling
+        the caller drops queued work; work already running finishes in the
+        background and keeps its slots until it does.
+        """
+        if self.closed:
+            raise RuntimeError("Compute executor is closed")
+        pool_slot = self._slots.setdefault(kind, asyncio.Semaphore(self._workers[kind]))
+        tenant_slot = self._tenant_slots.setdefault(
+            (kind, tenant), asyncio.Semaphore(self._tenant_concurrency)
+        )
+        queued_at = time.perf_counter()
+        self._queued[kind] += 1
+        try:
+            await tenant_slot.acquire()
+            try:
+                await pool_slot.acquire()
+            except BaseException:
+                tenant_slot.release()
+                raise
+        except asyncio.CancelledError:
+            self._cancelled[kind] += 1
+            raise
+        finally:
+            self._queued[kind] -= 1
+
+        started_at = time.perf_counter()
+        self._waits[kind].append(started_at - queued_at)
+        self._running[kind] += 1
+        loop = asyncio.get_running_loop()
+
+        def finished(_: Future[Any]) -> None:
+            self._running[kind] -= 1
+            self._completed[kind] += 1
+            self._runs[kind].append(time.perf_counter() - started_at)
+            pool_slot.release()
+            tenant_slot.release()
+
+        try:
+            future = self._pools[kind].submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            finished(Future())
+            raise
+        # Slots are returned when the work actually ends, not when the caller
+        # stops waiting, so abandoned simulations still count against limits.
+        future.add_done_callback(lambda done: _call_soon(loop, finished, done))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._cancelled[kind] += 1
+            raise
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            kind: {
+                "workers": self._workers[kind],
+                "queued": self._queued[kind],
+                "running": self._running[kind],
+                "completed": self._completed[kind],
+                "cancelled": self._cancelled[kind],
+                "wait_ms": _percentiles(self._waits[kind]),
+                "run_ms": _percentiles(self._runs[kind]),
+            }
+            for kind in KINDS
+        }
+
+    def shutdown(self) -> None:
+        self.closed = True
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., None], *args: Any) -> None:
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(callback, *args)
+
+
+def _percentiles(samples: deque[float]) -> dict[str, float | None]:
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=float), [50, 95, 99]) * 1000
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+
+def install_compute_executor(
+    loop: asyncio.AbstractEventLoop, executor: ComputeExecutor | None = None
+) -> ComputeExecutor:
+    """Bind an executor to ``loop``; callers own shutting it down."""
+    if executor is None:
+        settings = get_settings()
+        executor = ComputeExecutor(
+            process_workers=settings.compute_process_workers,
+            thread_workers=settings.compute_thread_workers,
+            tenant_concurrency=settings.compute_tenant_concurrency,
+        )
+    _executors[loop] = executor
+    return executor
+
+
+def current_compute_executor() -> ComputeExecutor | None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    executor = _executors.get(loop)
+    return executor if executor is not None and not executor.closed else None
+
+
+@asynccontextmanager
+async def open_compute_executor(
+    executor: ComputeExecutor | None = None,
+) -> AsyncIterator[ComputeExecutor]:
+    """Install an executor for the running loop and shut it down on exit."""
+    loop = asyncio.get_running_loop()
+    previous = _executors.get(loop)
+    executor = install_compute_executor(loop, executor)
+    try:
+        yield executor
+    finally:
+        executor.shutdown()
+        if previous is not None:
+            _executors[loop] = previous
+        else:
+            _executors.pop(loop, None)
+
+
+async def run_blocking(kind: Kind, tenant: str, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run ``fn`` on the installed executor, or a plain thread without one."""
+    executor = current_compute_executor()
+    if executor is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return await executor.run(kind, tenant, fn, *args, **kwargs)
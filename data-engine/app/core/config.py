@@ -27,11 +27,20 @@ class Settings(BaseSettings):
     rate_limit_expensive_requests_per_minute: int = Field(default=20, ge=1, le=1000)
     financial_document_retention_days: int = Field(default=2555, ge=1)
     market_price_max_age_days: int = Field(default=3, ge=0, le=30)
+    # Blocking analytics called from async routes. Zero process workers runs
+    # CPU-bound work in threads instead.
+    compute_process_workers: int = Field(default=2, ge=0, le=64)
+    compute_thread_workers: int = Field(default=8, ge=1, le=256)
+    compute_tenant_concurrency: int = Field(default=2, ge=1, le=64)
 
     database_url: str = "sqlite:///./portfolio_research_os.db"
     redis_url: str = "redis://localhost:6379/0"
     qdrant_url: str = "http://localhost:6333"
     duckdb_path: Path = Path("./storage/analytics.duckdb")
+    analytics_warehouse_dir: Path = Path("./storage/warehouse")
+    # Provider payloads shared by every tenant; workers must share this directory.
+    public_data_cache_dir: Path = Path("./storage/public_data")
+    sec_cache_dir: Path = Path("./storage/sec")
 
     minio_endpoint: str = "localhost:9002"
     minio_access_key: str = "portfolio"
@@ -0,0 +1,45 @@
+"""Atomic file replacement for the on-disk stores and caches.
+
+Writers build a complete file under a temporary name in the target's
+directory and ``os.replace`` it into place, so readers only ever see the
+old file or the new one. Temporary names are unique per call and match
+``.<name>.*.tmp``; a writer that dies between the two steps leaves one
+behind for the owning store to clean up.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def replacing(path: Path) -> Iterator[Path]:
+    """Yield an empty temporary file next to ``path``; move it over ``path`` on success.
+
+    The parent directory is created when missing. On error the temporary
+    file is removed and ``path`` is left untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(descriptor)
+    temporary = Path(name)
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    with replacing(path) as temporary:
+        temporary.write_bytes(data)
+
+
+def sql_literal(path: Path | str) -> str:
+    """``path`` quoted for a DuckDB string literal; ``COPY ... TO`` takes no parameters."""
+    return str(path).replace("'", "''")
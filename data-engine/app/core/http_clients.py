@@ -0,0 +1,210 @@
+"""Pooled outbound HTTP clients shared by connectors and LLM providers.
+
+One :class:`HTTPClientRegistry` lives per event loop: the FastAPI lifespan
+installs it for the server loop and Dramatiq worker threads install one for
+their long-lived loop. Each known provider host (SEC, FMP, LLM APIs, ...)
+gets its own ``httpx.AsyncClient`` so connection limits apply per host and
+TLS sessions are kept alive across calls, while per-provider semaphores cap
+fan-out such as a universe-wide price refresh. Feed, IR and document URLs
+come from tenants, so every other host shares one bounded ``external``
+client instead of adding a pool per host.
+
+Pooled clients are shared across tenants and never store cookies.
+
+Code running outside an installed registry (scripts, one-off tests) falls
+back to a short-lived client per call, which was the previous behaviour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+from collections import Counter
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+DEFAULT_TIMEOUT = httpx.Timeout(30.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+HOST_LIMITS = {
+    # SEC fair-access policy allows 10 requests/second per client; SECClient
+    # throttles, so a handful of warm connections is enough.
+    "data.sec.gov": httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=30),
+    "www.sec.gov": httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=30),
+    "financialmodelingprep.com": httpx.Limits(
+        max_connections=16, max_keepalive_connections=16, keepalive_expiry=30
+    ),
+    "finnhub.io": httpx.Limits(max_connections=8, max_keepalive_connections=8, keepalive_expiry=30),
+}
+# Hosts with a dedicated pooled client; anything else uses the external client.
+PROVIDER_HOSTS = frozenset(
+    {
+        *HOST_LIMITS,
+        "www.ecb.europa.eu",
+        "api.stlouisfed.org",
+        "api.gdeltproject.org",
+        "openrouter.ai",
+        "api.openai.com",
+        "api.anthropic.com",
+        "generativelanguage.googleapis.com",
+    }
+)
+EXTERNAL_CLIENT = "external"
+EXTERNAL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30)
+# Maximum in-flight requests per provider, independent of the host pools.
+PROVIDER_CONCURRENCY = {
+    "sec": 4,
+    "fmp": 8,
+    "finnhub": 8,
+    "ecb": 2,
+    "fred": 4,
+    "gdelt": 4,
+    "feeds": 16,
+    "openrouter": 8,
+    "openai": 8,
+    "anthropic": 8,
+    "gemini": 8,
+}
+DEFAULT_CONCURRENCY = 16
+
+_registries: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HTTPClientRegistry] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class HTTPClientRegistry:
+    """Per-host pooled clients and per-provider concurrency limits for one loop."""
+
+    def __init__(
+        self,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+        host_limits: dict[str, httpx.Limits] | None = None,
+        concurrency: dict[str, int] | None = None,
+        http2: bool = HTTP2_AVAILABLE,
+    ) -> None:
+        self._transport = transport
+        self._host_limits = {**HOST_LIMITS, **(host_limits or {})}
+        self._provider_hosts = PROVIDER_HOSTS | set(self._host_limits)
+        self._concurrency = {**PROVIDER_CONCURRENCY, **(concurrency or {})}
+        self._http2 = http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._requests: Counter[str] = Counter()
+        self._in_flight: Counter[str] = Counter()
+        self._peak_in_flight: Counter[str] = Counter()
+        self.closed = False
+
+    def client(self, url: str | httpx.URL) -> httpx.AsyncClient:
+        if self.closed:
+            raise RuntimeError("HTTP client registry is closed")
+        parsed = httpx.URL(url)
+        if parsed.host in self._provider_hosts:
+            key = f"{parsed.scheme}://{parsed.host}" + (f":{parsed.port}" if parsed.port else "")
+            limits = self._host_limits.get(parsed.host, DEFAULT_LIMITS)
+        else:
+            key, limits = EXTERNAL_CLIENT, EXTERNAL_LIMITS
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=DEFAULT_TIMEOUT,
+                limits=limits,
+                http2=self._http2,
+                transport=self._transport,
+                cookies=_no_cookies(),
+            )
+            self._clients[key] = client
+        return client
+
+    @asynccontextmanager
+    async def limit(self, provider: str) -> AsyncIterator[None]:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._concurrency.get(provider, DEFAULT_CONCURRENCY))
+            self._semaphores[provider] = semaphore
+        async with semaphore:
+            self._requests[provider] += 1
+            self._in_flight[provider] += 1
+            self._peak_in_flight[provider] = max(
+                self._peak_in_flight[provider], self._in_flight[provider]
+            )
+            try:
+                yield
+            finally:
+                self._in_flight[provider] -= 1
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "http2": self._http2,
+            "hosts": sorted(self._clients),
+            "requests": dict(self._requests),
+            "peak_in_flight": dict(self._peak_in_flight),
+        }
+
+    async def aclose(self) -> None:
+        self.closed = True
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+
+def _no_cookies() -> CookieJar:
+    # A jar whose policy accepts no domain: Set-Cookie from one tenant's
+    # request is never replayed on another tenant's request to that host.
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def install_http_clients(
+    loop: asyncio.AbstractEventLoop, registry: HTTPClientRegistry | None = None
+) -> HTTPClientRegistry:
+    """Bind a registry to ``loop``; callers own closing it."""
+    registry = registry or HTTPClientRegistry()
+    _registries[loop] = registry
+    return registry
+
+
+def current_http_clients() -> HTTPClientRegistry | None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    registry = _registries.get(loop)
+    return registry if registry is not None and not registry.closed else None
+
+
+@asynccontextmanager
+async def open_http_clients(
+    registry: HTTPClientRegistry | None = None,
+) -> AsyncIterator[HTTPClientRegistry]:
+    """Install a registry for the running loop and close it on exit."""
+    loop = asyncio.get_running_loop()
+    previous = _registries.get(loop)
+    registry = install_http_clients(loop, registry)
+    try:
+        yield registry
+    finally:
+        await registry.aclose()
+        if previous is not None:
+            _registries[loop] = previous
+        else:
+            _registries.pop(loop, None)
+
+
+@asynccontextmanager
+async def http_client(url: str, *, provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the pooled client for ``url`` while holding ``provider``'s slot.
+
+    Pass timeouts, headers and redirect policy per request: pooled clients
+    are shared by every caller of the host.
+    """
+    registry = current_http_clients()
+    if registry is None:
+        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
+            yield client
+        return
+    async with registry.limit(provider):
+        yield registry.client(url)
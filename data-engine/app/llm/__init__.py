@@ -13,6 +13,7 @@ from app.llm.contracts import (
     Message,
     MessageRole,
     ResponseFormat,
+    StreamEvent,
     Usage,
 )
 from app.llm.errors import (
@@ -49,6 +50,7 @@ __all__ = [
     "ProviderRequestError",
     "ProviderResponseError",
     "ResponseFormat",
+    "StreamEvent",
     "StructuredOutputError",
     "TaskModelRouter",
     "Usage",
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Mapping
+from typing import Any, AsyncIterator, Mapping
 from urllib.parse import quote
 
 import httpx
 
 from app.llm.base import LLMProvider
-from app.llm.contracts import LLMRequest, LLMResponse, Message, MessageRole, Usage
+from app.llm.contracts import (
+    LLMRequest,
+    LLMResponse,
+    Message,
+    MessageRole,
+    StreamEvent,
+    Usage,
+)
 from app.llm.errors import ProviderDisabledError, ProviderRequestError, ProviderResponseError
 from app.llm.routing import TaskModelRouter
 
@@ -78,6 +85,97 @@ class OpenAICompatibleProvider(LLMProvider):
 
     async def complete(self, request: LLMRequest) -> LLMResponse:
         model = self.model_router.resolve(request)
+        response = await self._post_json(
+            f"{self._base_url}/chat/completions",
+            headers=self._headers(),
+            payload=self._payload(request, model),
+        )
+        body = self._response_json(response)
+        try:
+            choice = body["choices"][0]
+            content = _join_text_blocks(choice["message"]["content"])
+        except (KeyError, IndexError, TypeError):
+            raise ProviderResponseError(f"{self.name} returned no assistant message") from None
+        if not content:
+            raise ProviderResponseError(f"{self.name} returned an empty assistant message")
+
+        return LLMResponse(
+            message=Message(MessageRole.ASSISTANT, content),
+            usage=self._usage(body.get("usage")),
+            model=body.get("model") if isinstance(body.get("model"), str) else model,
+            provider=self.name,
+            finish_reason=choice.get("finish_reason") if isinstance(choice, dict) else None,
+            request_id=body.get("id") if isinstance(body.get("id"), str) else None,
+        )
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[StreamEvent]:
+        model = self.model_router.resolve(request)
+        payload = {
+            **self._payload(request, model),
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        parts: list[str] = []
+        usage_body: Any = None
+        response_model = model
+        finish_reason: str | None = None
+        request_id: str | None = None
+        async for line in self._post_stream(
+            f"{self._base_url}/chat/completions",
+            headers=self._headers(),
+            payload=payload,
+        ):
+            # Server-sent events: skip blank separators and ": keep-alive" comments.
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                raise ProviderResponseError(f"{self.name} returned a malformed stream event") from None
+            if not isinstance(chunk, dict):
+                continue
+            if chunk.get("error") is not None:
+                raise ProviderResponseError(f"{self.name} reported an error mid-stream")
+            if isinstance(chunk.get("id"), str):
+                request_id = chunk["id"]
+            if isinstance(chunk.get("model"), str):
+                response_model = chunk["model"]
+            if chunk.get("usage") is not None:
+                usage_body = chunk["usage"]
+            choices = chunk.get("choices")
+            if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+                continue
+            choice = choices[0]
+            delta = choice.get("delta")
+            text = _join_text_blocks(delta.get("content")) if isinstance(delta, dict) else ""
+            if text:
+                parts.append(text)
+                yield StreamEvent(delta=text)
+            if isinstance(choice.get("finish_reason"), str):
+                finish_reason = choice["finish_reason"]
+
+        content = "".join(parts)
+        if not content:
+            raise ProviderResponseError(f"{self.name} returned an empty assistant message")
+        yield StreamEvent(
+            response=LLMResponse(
+                message=Message(MessageRole.ASSISTANT, content),
+                usage=self._usage(usage_body),
+                model=response_model,
+                provider=self.name,
+                finish_reason=finish_reason,
+                request_id=request_id,
+            )
+        )
+
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self._api_key}", **self._extra_headers}
+
+    @staticmethod
+    def _payload(request: LLMRequest, model: str) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": model,
             "messages": [
@@ -102,44 +200,21 @@ class OpenAICompatibleProvider(LLMProvider):
                 }
             else:
                 payload["response_format"] = {"type": "json_object"}
+        return payload
 
-        response = await self._post_json(
-            f"{self._base_url}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {self._api_key}",
-                **self._extra_headers,
-            },
-            payload=payload,
-        )
-        body = self._response_json(response)
-        try:
-            choice = body["choices"][0]
-            content = _join_text_blocks(choice["message"]["content"])
-        except (KeyError, IndexError, TypeError):
-            raise ProviderResponseError(f"{self.name} returned no assistant message") from None
-        if not content:
-            raise ProviderResponseError(f"{self.name} returned an empty assistant message")
-
-        usage_body = body.get("usage", {})
+    @staticmethod
+    def _usage(usage_body: Any) -> Usage:
         usage_body = usage_body if isinstance(usage_body, dict) else {}
         input_tokens = _integer(usage_body.get("prompt_tokens"))
         output_tokens = _integer(usage_body.get("completion_tokens"))
         prompt_details = usage_body.get("prompt_tokens_details") or {}
         prompt_details = prompt_details if isinstance(prompt_details, dict) else {}
-        usage = Usage(
+        return Usage(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             total_tokens=_integer(usage_body.get("total_tokens")) or input_tokens + output_tokens,
             cache_read_tokens=_integer(prompt_details.get("cached_tokens")),
         )
-        return LLMResponse(
-            message=Message(MessageRole.ASSISTANT, content),
-            usage=usage,
-            model=body.get("model") if isinstance(body.get("model"), str) else model,
-            provider=self.name,
-            finish_reason=choice.get("finish_reason") if isinstance(choice, dict) else None,
-            request_id=body.get("id") if isinstance(body.get("id"), str) else None,
-        )
 
     def __repr__(self) -> str:
         return (
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import asyncio
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import replace
-from typing import Any, Mapping
+from typing import Any, AsyncIterator, Mapping
 
 import httpx
 
-from app.llm.contracts import LLMRequest, LLMResponse, ResponseFormat
+from app.core.http_clients import http_client
+from app.llm.contracts import LLMRequest, LLMResponse, ResponseFormat, StreamEvent
 from app.llm.errors import LLMError, ProviderHTTPError, ProviderResponseError
 from app.llm.json import parse_json_response
 from app.llm.routing import TaskModelRouter
@@ -37,6 +39,16 @@ class LLMProvider(ABC):
     async def complete(self, request: LLMRequest) -> LLMResponse:
         raise NotImplementedError
 
+    async def stream(self, request: LLMRequest) -> AsyncIterator[StreamEvent]:
+        """Yield text deltas as the provider produces them, then the full response.
+
+        Providers without a streaming transport deliver the whole completion
+        as a single delta.
+        """
+        response = await self.complete(request)
+        yield StreamEvent(delta=response.text)
+        yield StreamEvent(response=response)
+
     async def generate_json(
         self,
         request: LLMRequest,
@@ -78,6 +90,67 @@ class LLMProvider(ABC):
 
         raise LLMError(f"{self.name} request failed")
 
+    async def _post_stream(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        payload: Mapping[str, Any],
+    ) -> AsyncIterator[str]:
+        # Retries follow _post_json, but only until the first line arrives:
+        # replaying a partially consumed stream would duplicate tokens.
+        for attempt in range(self._max_retries + 1):
+            started = False
+            try:
+                async with self._open_stream(url, headers=headers, payload=payload) as response:
+                    if response.status_code < 400:
+                        async for line in response.aiter_lines():
+                            started = True
+                            yield line
+                        return
+                    status_code = response.status_code
+            except httpx.HTTPError:
+                if started or attempt >= self._max_retries:
+                    raise LLMError(f"{self.name} stream failed") from None
+                await asyncio.sleep(0.25 * (2**attempt))
+                continue
+
+            if status_code not in {408, 409, 429} and status_code < 500:
+                raise ProviderHTTPError(self.name, status_code)
+            if attempt >= self._max_retries:
+                raise ProviderHTTPError(self.name, status_code)
+            await asyncio.sleep(0.25 * (2**attempt))
+
+        raise LLMError(f"{self.name} stream failed")
+
+    @asynccontextmanager
+    async def _open_stream(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        payload: Mapping[str, Any],
+    ) -> AsyncIterator[httpx.Response]:
+        if self._client is not None:
+            async with self._client.stream(
+                "POST",
+                url,
+                headers=dict(headers),
+                json=dict(payload),
+                timeout=self._timeout,
+            ) as response:
+                yield response
+            return
+        async with http_client(url, provider=self.name) as client:
+            async with client.stream(
+                "POST",
+                url,
+                headers=dict(headers),
+                json=dict(payload),
+                timeout=self._timeout,
+            ) as response:
+                yield response
+
     async def _send(
         self,
         url: str,
@@ -92,8 +165,13 @@ class LLMProvider(ABC):
                 json=dict(payload),
                 timeout=self._timeout,
             )
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            return await client.post(url, headers=dict(headers), json=dict(payload))
+        async with http_client(url, provider=self.name) as client:
+            return await client.post(
+                url,
+                headers=dict(headers),
+                json=dict(payload),
+                timeout=self._timeout,
+            )
 
     def _response_json(self, response: httpx.Response) -> Mapping[str, Any]:
         try:
@@ -116,5 +116,17 @@ class LLMResponse:
         return self.message.content
 
 
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    """One increment of a streamed completion.
+
+    Text arrives as ``delta`` events; the last event carries the assembled
+    ``response`` with usage and request metadata.
+    """
+
+    delta: str = ""
+    response: LLMResponse | None = None
+
+
 LLMMessage = Message
 LLMUsage = Usage
@@ -7,6 +7,7 @@ from app.models.entities import (
     Catalyst,
     CalculatedMetric,
     ChatSession,
+    ChunkEmbedding,
     Claim,
     ClaimEvidence,
     Company,
@@ -84,6 +85,7 @@ __all__ = [
     "CashDailySnapshot",
     "Catalyst",
     "CalculatedMetric",
+    "ChunkEmbedding",
     "ChatSession",
     "Claim",
     "ClaimEvidence",
@@ -7,7 +7,9 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
@@ -314,8 +316,29 @@ class DocumentChunk(TenantOwnedMixin, Base, TimestampMixin):
     document: Mapped[Document] = relationship(back_populates="chunks")
 
 
+class ChunkEmbedding(Base, TimestampMixin):
+    """Embedding of one exact chunk text, shared across documents and tenants.
+
+    Rows are keyed by model and the SHA-256 of the embedded text, so the
+    vector reveals nothing to a tenant that does not already hold the text.
+    Vectors are little-endian float32 bytes rather than JSON.
+    """
+
+    __tablename__ = "chunk_embeddings"
+    __table_args__ = (
+        UniqueConstraint("model", "content_sha256", name="uq_chunk_embedding_model_sha256"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    model: Mapped[str] = mapped_column(String(160))
+    content_sha256: Mapped[str] = mapped_column(String(64))
+    dimensions: Mapped[int] = mapped_column(Integer)
+    vector: Mapped[bytes] = mapped_column(LargeBinary)
+
+
 class FinancialFact(TenantOwnedMixin, Base, TimestampMixin):
     __tablename__ = "financial_facts"
+    __table_args__ = (Index("ix_financial_facts_updated_at", "updated_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), index=True)
@@ -407,6 +430,7 @@ class CalculatedMetric(TenantOwnedMixin, Base, TimestampMixin):
             "definition_version",
             name="uq_calculated_metric_definition_period",
         ),
+        Index("ix_calculated_metrics_updated_at", "updated_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -442,7 +466,10 @@ class FinancialStatement(TenantOwnedMixin, Base, TimestampMixin):
 
 class MarketPrice(Base, TimestampMixin):
     __tablename__ = "market_prices"
-    __table_args__ = (UniqueConstraint("company_id", "date", name="uq_market_price_company_date"),)
+    __table_args__ = (
+        UniqueConstraint("company_id", "date", name="uq_market_price_company_date"),
+        Index("ix_market_prices_updated_at", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), index=True)
@@ -0,0 +1,423 @@
+"""Columnar Parquet snapshots of facts, metrics and prices for DuckDB queries.
+
+PostgreSQL stays the system of record. An export job copies
+``financial_facts``, ``calculated_metrics`` and ``market_prices`` into
+Parquet parts under ``ANALYTICS_WAREHOUSE_DIR``, and services run their
+cross-sectional and time-series aggregates on those parts through an
+in-memory DuckDB connection.
+
+Exports are incremental on the indexed ``updated_at`` watermark, the same
+signal ``CompanyChangeService`` uses. Every changed company is re-exported
+whole into a new part stamped with an increasing sequence, and readers keep
+only each company's rows from its newest part, which also drops deleted
+rows. A refresh that only deletes facts stamps a surviving fact through
+``CompanyChangeService.record_deletions`` so the company is re-exported.
+Deleting a tenant's last fact for a company leaves nothing to re-export,
+so tenant-owned watermarks also carry the row count: the drop makes the
+export stale, and an incremental export whose parts hold more rows than
+the table falls back to a full one.
+
+Tenant-owned tables are written to one directory per tenant and a reader
+only opens its own tenant's directory. Prices are global.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pandas as pd
+from sqlalchemy import Connection, String, func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.files import replacing, sql_literal
+from app.models import CalculatedMetric, FinancialFact, MarketPrice
+from app.services.company_change_service import CHANGE_WATERMARK_OVERLAP
+
+
+EXPORT_COMPANY_BATCH = 500
+# Above this many parts a directory is rewritten as one deduplicated part.
+COMPACT_AFTER_PARTS = 8
+PART_RE = re.compile(r"^part-(\d{10})-(\d{5})\.parquet$")
+
+
+@dataclass(frozen=True)
+class WarehouseTable:
+    model: Any
+    columns: tuple[tuple[str, str], ...]
+
+    @property
+    def name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def tenant_owned(self) -> bool:
+        return any(column == "tenant_id" for column, _ in self.columns)
+
+
+TABLES = (
+    WarehouseTable(
+        FinancialFact,
+        (
+            ("id", "BIGINT"),
+            ("tenant_id", "BIGINT"),
+            ("company_id", "BIGINT"),
+            ("metric", "VARCHAR"),
+            ("value", "DECIMAL(24,6)"),
+            ("unit", "VARCHAR"),
+            ("period", "VARCHAR"),
+            ("fiscal_year", "INTEGER"),
+            ("fiscal_quarter", "VARCHAR"),
+            ("source_id", "BIGINT"),
+            ("source_type", "VARCHAR"),
+            ("is_reported", "BOOLEAN"),
+            ("is_adjusted", "BOOLEAN"),
+            ("confidence", "DECIMAL(5,4)"),
+            ("created_at", "TIMESTAMP"),
+            ("updated_at", "TIMESTAMP"),
+        ),
+    ),
+    WarehouseTable(
+        CalculatedMetric,
+        (
+            ("id", "BIGINT"),
+            ("tenant_id", "BIGINT"),
+            ("company_id", "BIGINT"),
+            ("metric", "VARCHAR"),
+            ("value", "DECIMAL(24,8)"),
+            ("unit", "VARCHAR"),
+            ("period", "VARCHAR"),
+            ("fiscal_year", "INTEGER"),
+            ("fiscal_quarter", "VARCHAR"),
+            ("status", "VARCHAR"),
+            ("definition_version", "VARCHAR"),
+            ("confidence", "DECIMAL(5,4)"),
+            ("created_at", "TIMESTAMP"),
+            ("updated_at", "TIMESTAMP"),
+        ),
+    ),
+    WarehouseTable(
+        MarketPrice,
+        (
+            ("id", "BIGINT"),
+            ("company_id", "BIGINT"),
+            ("date", "DATE"),
+            ("open", "DECIMAL(20,6)"),
+            ("high", "DECIMAL(20,6)"),
+            ("low", "DECIMAL(20,6)"),
+            ("close", "DECIMAL(20,6)"),
+            ("adj_close", "DECIMAL(20,6)"),
+            ("volume", "BIGINT"),
+            ("source", "VARCHAR"),
+            ("created_at", "TIMESTAMP"),
+            ("updated_at", "TIMESTAMP"),
+        ),
+    ),
+)
+
+
+def table_watermark(connection: Connection, model: Any) -> tuple[int | None, str | None, int | None]:
+    """Newest ``id`` and ``updated_at`` across all tenants, plus a row count.
+
+    The maxima are two index lookups. Only tenant-owned tables, where
+    ingestion deletes rows, pay for the count; it is ``None`` for the rest.
+    """
+    # Separate scalar subqueries keep both MAX() lookups on their indexes;
+    # a combined aggregate scans the table.
+    columns = [
+        select(func.max(model.id)).scalar_subquery(),
+        select(func.max(model.updated_at)).scalar_subquery(),
+    ]
+    if hasattr(model, "tenant_id"):
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+    max_id, max_updated_at, *rows = connection.execute(select(*columns)).one()
+    if isinstance(max_updated_at, datetime):
+        max_updated_at = max_updated_at.isoformat()
+    return max_id, max_updated_at, rows[0] if rows else None
+
+
+@lru_cache
+def default_warehouse() -> AnalyticsWarehouse:
+    return AnalyticsWarehouse(get_settings().analytics_warehouse_dir)
+
+
+class AnalyticsWarehouse:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    # -- reads -------------------------------------------------------------
+
+    def matches(self, table: str, watermark: tuple[int | None, str | None, int | None]) -> bool:
+        """Whether the last export of ``table`` saw exactly this watermark."""
+        state = self._manifest()["tables"].get(table)
+        return state is not None and (
+            state["max_id"],
+            state["max_updated_at"],
+            state.get("rows"),
+        ) == tuple(watermark)
+
+    def is_current(self, db: Session, *models: Any) -> bool:
+        """Whether every table behind ``models`` is unchanged since its export."""
+        manifest = self._manifest()["tables"]
+        if not all(model.__tablename__ in manifest for model in models):
+            return False
+        connection = db.connection()
+        return all(
+            self.matches(model.__tablename__, table_watermark(connection, model))
+            for model in models
+        )
+
+    @contextmanager
+    def connect(self, tenant_id: int | None) -> Iterator[duckdb.DuckDBPyConnection]:
+        """DuckDB connection with one view per exported table.
+
+        Tenant-owned views read only ``tenant_id``'s directory; ``None``
+        reads every tenant, like an unscoped session.
+        """
+        connection = duckdb.connect()
+        try:
+            for table in TABLES:
+                connection.execute(f"CREATE VIEW {table.name} AS {self._view(table, tenant_id)}")
+            yield connection
+        finally:
+            connection.close()
+
+    def _view(self, table: WarehouseTable, tenant_id: int | None) -> str:
+        parts = self._parts(table, tenant_id)
+        if not parts:
+            typed = ", ".join(f"CAST(NULL AS {kind}) AS {column}" for column, kind in table.columns)
+            return f"SELECT {typed} LIMIT 0"
+        return self._select(table, parts)
+
+    @staticmethod
+    def _select(table: WarehouseTable, parts: list[Path]) -> str:
+        """Current rows of ``parts``: each company's rows from its newest part.
+
+        A directory holds one base sequence (full export or compaction) plus
+        incremental parts. Base rows are dropped by an anti-join against the
+        companies re-exported later, so a freshly compacted directory is a
+        plain scan.
+        """
+        names = ", ".join(f"t.{column}" for column, _ in table.columns)
+        base: dict[Path, int] = {}
+        for path in parts:
+            base[path.parent] = min(base.get(path.parent, _sequence(path)), _sequence(path))
+        newer = [path for path in parts if _sequence(path) > base[path.parent]]
+        scan = f"SELECT {names} FROM read_parquet({_file_list(parts)}) AS t"
+        if not newer:
+            return scan
+        if table.tenant_owned:
+            keys = "coalesce(tenant_id, -1) AS tenant_key, company_id"
+            match = "coalesce(t.tenant_id, -1) = n.tenant_key AND t.company_id = n.company_id"
+        else:
+            keys = "company_id"
+            match = "t.company_id = n.company_id"
+        return (
+            f"{scan} ANTI JOIN ("
+            f"SELECT {keys}, max(_export_seq) AS latest FROM read_parquet({_file_list(newer)}) "
+            f"GROUP BY ALL) AS n ON {match} AND t._export_seq < n.latest"
+        )
+
+    # -- export ------------------------------------------------------------
+
+    def export(self, db: Session, *, full: bool = False) -> dict[str, Any]:
+        """Copy rows changed since the last export, or everything with ``full``.
+
+        Reads bypass the tenant filter on purpose: the export covers every
+        tenant and writes each one to its own directory.
+        """
+        manifest = self._manifest()
+        connection = db.connection()
+        summary: dict[str, Any] = {}
+        for table in TABLES:
+            state = manifest["tables"].get(table.name)
+            # Taken before reading rows, so the snapshot holds at least this state.
+            watermark = table_watermark(connection, table.model)
+            if not full and state is not None and self.matches(table.name, watermark):
+                summary[table.name] = {"mode": "unchanged", "companies": 0, "rows": 0}
+                continue
+            since = None
+            if not full and state is not None and state["max_updated_at"] is not None:
+                since = datetime.fromisoformat(state["max_updated_at"]) - CHANGE_WATERMARK_OVERLAP
+            manifest["sequence"] += 1
+            sequence = manifest["sequence"]
+            companies, rows = self._export_table(connection, table, sequence, since)
+            if since is not None and table.tenant_owned and self._row_count(table) > (watermark[2] or 0):
+                # Rows deleted with nothing left to re-export still sit in older parts.
+                manifest["sequence"] += 1
+                sequence = manifest["sequence"]
+                since = None
+                companies, rows = self._export_table(connection, table, sequence, since)
+            if since is None:
+                self._drop_parts(table, before=sequence)
+            compacted = self._compact(table, manifest)
+            manifest["tables"][table.name] = {
+                "max_id": watermark[0],
+                "max_updated_at": watermark[1],
+                "rows": watermark[2],
+                "exported_at": datetime.now(UTC).isoformat(),
+            }
+            self._write_manifest(manifest)
+            summary[table.name] = {
+                "mode": "full" if since is None else "incremental",
+                "companies": companies,
+                "rows": rows,
+                "compacted_directories": compacted,
+            }
+        return {"status": "ok", "tables": summary}
+
+    def _export_table(
+        self, connection: Connection, table: WarehouseTable, sequence: int, since: datetime | None
+    ) -> tuple[int, int]:
+        model = table.model
+        keys = [model.tenant_id, model.company_id] if table.tenant_owned else [model.company_id]
+        changed = select(*keys).distinct()
+        if since is not None:
+            changed = changed.where(model.updated_at > since)
+        pairs = {tuple(row) for row in connection.execute(changed)}
+        company_ids = sorted({pair[-1] for pair in pairs})
+        names = [column for column, _ in table.columns]
+        kinds = [kind for _, kind in table.columns]
+        tenant_owned = table.tenant_owned
+        selected = [
+            # Dates and timestamps go out as text; DuckDB parses them itself.
+            type_coerce(getattr(model, name), String) if kind in {"DATE", "TIMESTAMP"} else getattr(model, name)
+            for name, kind in table.columns
+        ]
+        exported = 0
+        for chunk, offset in enumerate(range(0, len(company_ids), EXPORT_COMPANY_BATCH)):
+            batch = company_ids[offset : offset + EXPORT_COMPANY_BATCH]
+            rows = connection.execute(select(*selected).where(model.company_id.in_(batch))).all()
+            if tenant_owned:
+                rows = [row for row in rows if (row[1], row[2]) in pairs]
+            if not rows:
+                continue
+            by_tenant: dict[int | None, list[Any]] = {}
+            for row in rows:
+                by_tenant.setdefault(row[1] if tenant_owned else None, []).append(row)
+            for tenant_id, tenant_rows in by_tenant.items():
+                frame = pd.DataFrame(
+                    {
+                        name: _parquet_column(values, kind)
+                        for name, kind, values in zip(names, kinds, zip(*tenant_rows))
+                    }
+                )
+                directory = self._directory(table, tenant_id)
+                self._write_part(table, frame, directory / _part_name(sequence, chunk), sequence)
+            exported += len(rows)
+        return len(pairs), exported
+
+    def _write_part(
+        self, table: WarehouseTable, frame: pd.DataFrame, path: Path, sequence: int
+    ) -> None:
+        casts = ", ".join(f"CAST({column} AS {kind}) AS {column}" for column, kind in table.columns)
+        with replacing(path) as temporary, duckdb.connect() as connection:
+            connection.register("part", frame)
+            connection.execute(
+                f"COPY (SELECT {casts}, {int(sequence)} AS _export_seq FROM part "
+                f"ORDER BY company_id) TO '{sql_literal(temporary)}' (FORMAT parquet)"
+            )
+
+    def _compact(self, table: WarehouseTable, manifest: dict[str, Any]) -> int:
+        directories = (
+            sorted(path for path in (self.root / table.name).glob("tenant=*") if path.is_dir())
+            if table.tenant_owned
+            else [self.root / table.name]
+        )
+        compacted = 0
+        for directory in directories:
+            parts = sorted(directory.glob("part-*.parquet"))
+            if len(parts) <= COMPACT_AFTER_PARTS:
+                continue
+            manifest["sequence"] += 1
+            sequence = manifest["sequence"]
+            # Compacted rows take a new, higher sequence so a reader that still
+            # sees the old parts prefers them without returning duplicates.
+            with replacing(directory / _part_name(sequence, 0)) as temporary, duckdb.connect() as connection:
+                connection.execute(
+                    f"COPY (SELECT *, {int(sequence)} AS _export_seq "
+                    f"FROM ({self._select(table, parts)}) ORDER BY company_id) "
+                    f"TO '{sql_literal(temporary)}' (FORMAT parquet)"
+                )
+            for path in parts:
+                path.unlink(missing_ok=True)
+            compacted += 1
+        return compacted
+
+    def _row_count(self, table: WarehouseTable) -> int:
+        """Rows the exported parts currently present, across every tenant."""
+        parts = self._parts(table, None)
+        if not parts:
+            return 0
+        with duckdb.connect() as connection:
+            (count,) = connection.execute(f"SELECT count(*) FROM ({self._select(table, parts)})").fetchone() or (0,)
+        return count
+
+    def _drop_parts(self, table: WarehouseTable, *, before: int) -> None:
+        for path in (self.root / table.name).rglob("part-*.parquet"):
+            if _sequence(path) < before:
+                path.unlink(missing_ok=True)
+
+    # -- files -------------------------------------------------------------
+
+    def _directory(self, table: WarehouseTable, tenant_id: int | None) -> Path:
+        if not table.tenant_owned:
+            return self.root / table.name
+        return self.root / table.name / f"tenant={tenant_id if tenant_id is not None else 'none'}"
+
+    def _parts(self, table: WarehouseTable, tenant_id: int | None) -> list[Path]:
+        if table.tenant_owned and tenant_id is None:
+            return sorted((self.root / table.name).glob("tenant=*/part-*.parquet"))
+        return sorted(self._directory(table, tenant_id).glob("part-*.parquet"))
+
+    def _manifest(self) -> dict[str, Any]:
+        try:
+            manifest = json.loads((self.root / "manifest.json").read_text())
+        except (OSError, ValueError):
+            return {"sequence": 0, "tables": {}}
+        manifest.setdefault("sequence", 0)
+        manifest.setdefault("tables", {})
+        return manifest
+
+    def _write_manifest(self, manifest: dict[str, Any]) -> None:
+        with replacing(self.root / "manifest.json") as temporary:
+            temporary.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def _parquet_column(values: tuple[Any, ...], kind: str) -> list[Any]:
+    """Exact text for decimals, dates and timestamps; DuckDB casts it per column."""
+    if kind == "TIMESTAMP":
+        return [_timestamp_text(value) for value in values]
+    if kind == "DATE" or kind.startswith("DECIMAL"):
+        return [None if value is None else str(value) for value in values]
+    return list(values)
+
+
+def _timestamp_text(value: Any) -> str | None:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value.isoformat()
+    return value
+
+
+def _sequence(path: Path) -> int:
+    match = PART_RE.match(path.name)
+    return int(match.group(1)) if match else 0
+
+
+def _file_list(paths: list[Path]) -> str:
+    return "[" + ", ".join(f"'{sql_literal(path)}'" for path in paths) + "]"
+
+
+def _part_name(sequence: int, chunk: int) -> str:
+    return f"part-{sequence:010d}-{chunk:05d}.parquet"
@@ -1,5 +1,6 @@
 import os
 from decimal import Decimal
+from typing import Any, AsyncIterator
 
 from sqlalchemy import desc, select
 from sqlalchemy.orm import Session, selectinload
@@ -190,6 +191,28 @@ class ChatService:
             db=db,
         )
 
+    async def answer_stream(
+        self, db: Session, question: str, scope: str, ticker: str | None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the deterministic baseline, synthesized tokens and the final answer.
+
+        Events are ``baseline`` (sources and deterministic sections, sent as
+        soon as retrieval finishes), ``token`` (raw model output) and
+        ``final`` (the verified ``ChatResponse``).
+        """
+        baseline = self._deterministic_answer(db, question, scope, ticker)
+        yield {"event": "baseline", "data": baseline.model_dump(mode="json")}
+        async for event in ChatSynthesisService(self.provider).stream(
+            question=question,
+            ticker=ticker,
+            baseline=baseline,
+            db=db,
+        ):
+            if isinstance(event, ChatResponse):
+                yield {"event": "final", "data": event.model_dump(mode="json")}
+            else:
+                yield {"event": "token", "data": {"delta": event}}
+
     def _deterministic_answer(
         self, db: Session, question: str, scope: str, ticker: str | None
     ) -> ChatResponse:
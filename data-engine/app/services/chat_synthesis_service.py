@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, AsyncIterator
 
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.llm import LLMRequest, Message, ResponseFormat, parse_json_response
+from app.llm import LLMError, LLMRequest, Message, ResponseFormat, parse_json_response
 from app.llm.base import LLMProvider
 from app.schemas import ChatResponse, SynthesisSection
 from app.services.langfuse_client import LangfuseTracer
@@ -73,6 +73,38 @@ class ChatSynthesisService:
         baseline: ChatResponse,
         db: Session | None = None,
     ) -> ChatResponse:
+        result = baseline
+        async for event in self._synthesis(question, ticker, baseline, db, streaming=False):
+            if isinstance(event, ChatResponse):
+                result = event
+        return result
+
+    async def stream(
+        self,
+        *,
+        question: str,
+        ticker: str | None,
+        baseline: ChatResponse,
+        db: Session | None = None,
+    ) -> AsyncIterator[str | ChatResponse]:
+        """Yield raw model tokens as they arrive, then the verified response.
+
+        The tokens are the unverified JSON the model is writing; only the
+        final ``ChatResponse`` is authoritative, and it is the deterministic
+        baseline whenever verification fails.
+        """
+        async for event in self._synthesis(question, ticker, baseline, db, streaming=True):
+            yield event
+
+    async def _synthesis(
+        self,
+        question: str,
+        ticker: str | None,
+        baseline: ChatResponse,
+        db: Session | None,
+        *,
+        streaming: bool,
+    ) -> AsyncIterator[str | ChatResponse]:
         retrieval_ids = [
             f"{source.get('type')}:{source.get('id')}"
             for source in baseline.sources
@@ -86,6 +118,7 @@ class ChatSynthesisService:
             "fallback": False,
             "escalation": False,
             "escalation_reason": "premium escalation requires a passing evaluation gate",
+            "streaming": streaming,
         }
         with self.tracer.workflow("ChatSourceAwareSynthesis", trace_seed) as trace:
             try:
@@ -129,7 +162,17 @@ class ChatSynthesisService:
                     ),
                     metadata={"prompt_version": PROMPT_VERSION},
                 )
-                response = await self.provider.complete(request)
+                if streaming:
+                    response = None
+                    async for chunk in self.provider.stream(request):
+                        if chunk.response is not None:
+                            response = chunk.response
+                        elif chunk.delta:
+                            yield chunk.delta
+                    if response is None:
+                        raise LLMError("Stream ended without a final response")
+                else:
+                    response = await self.provider.complete(request)
                 cost = budget.estimate_cost_eur(
                     response.model,
                     response.usage.input_tokens,
@@ -181,7 +224,7 @@ class ChatSynthesisService:
                     "insufficient_data": insufficient,
                     "citation_verification": True,
                 }
-                return baseline
+                yield baseline
             except Exception as exc:
                 # The deterministic response is the safe product contract and fallback.
                 baseline.model = "deterministic"
@@ -205,7 +248,7 @@ class ChatSynthesisService:
                 }
                 trace.update(**baseline.llm_trace)
                 trace.output = {"fallback": True, "reason": type(exc).__name__}
-                return baseline
+                yield baseline
 
     @staticmethod
     def _verified_sections(
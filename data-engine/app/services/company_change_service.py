@@ -0,0 +1,78 @@
+"""Watermark change tracking for company-scoped market and fundamental data."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import CalculatedMetric, Company, FinancialFact, MarketPrice
+
+
+# Rows are stamped at flush time but become visible at commit, so a watermark
+# taken at the start of a run can miss rows from transactions still open at
+# that moment. Re-reading a short overlap only re-evaluates a few companies.
+CHANGE_WATERMARK_OVERLAP = timedelta(minutes=5)
+
+TRACKED_MODELS = (FinancialFact, CalculatedMetric, MarketPrice)
+
+
+class CompanyChangeService:
+    """Report which companies had facts, metrics, prices or profile rows touched.
+
+    Every tracked table carries an indexed ``updated_at`` column, so one
+    range scan per table answers "what changed since this watermark" without
+    a separate outbox. Tenant-owned tables are scoped by the session filter;
+    prices and company profiles are global.
+
+    A delete leaves no row to carry a newer ``updated_at``, so code that
+    deletes facts calls :meth:`record_deletions` for the affected companies.
+    """
+
+    def changed_company_ids(self, db: Session, since: datetime) -> set[int]:
+        cutoff = since - CHANGE_WATERMARK_OVERLAP
+        changed: set[int] = set()
+        for model in TRACKED_MODELS:
+            changed.update(
+                db.scalars(
+                    select(model.company_id).where(model.updated_at > cutoff).distinct()
+                ).all()
+            )
+        changed.update(db.scalars(select(Company.id).where(Company.updated_at > cutoff)).all())
+        return changed
+
+    def record_deletions(self, db: Session, company_ids: Iterable[int]) -> None:
+        """Make deleted facts visible to ``updated_at`` watermarks.
+
+        One surviving fact per company in the session's tenant is stamped,
+        which also makes the analytics warehouse re-export the company.
+        Companies with no fact left get their profile row stamped instead.
+        """
+        ids = set(company_ids)
+        if not ids:
+            return
+        tenant_id = db.info.get("tenant_id")
+        tenant_filter = (
+            FinancialFact.tenant_id == tenant_id
+            if tenant_id is not None
+            else FinancialFact.tenant_id.is_(None)
+        )
+        survivors = dict(
+            db.execute(
+                select(FinancialFact.company_id, func.min(FinancialFact.id))
+                .where(FinancialFact.company_id.in_(ids), tenant_filter)
+                .group_by(FinancialFact.company_id)
+            ).tuples().all()
+        )
+        now = datetime.now(UTC)
+        if survivors:
+            db.execute(
+                update(FinancialFact)
+                .where(FinancialFact.id.in_(survivors.values()))
+                .values(updated_at=now)
+            )
+        orphaned = ids - survivors.keys()
+        if orphaned:
+            db.execute(update(Company).where(Company.id.in_(orphaned)).values(updated_at=now))
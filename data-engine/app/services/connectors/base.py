@@ -32,6 +32,21 @@ class ConnectorItem:
             "metadata": self.metadata,
         }
 
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> ConnectorItem:
+        published_at = payload.get("published_at")
+        return cls(
+            source=payload["source"],
+            title=payload["title"],
+            url=payload.get("url"),
+            summary=payload.get("summary") or "",
+            published_at=datetime.fromisoformat(published_at) if published_at else None,
+            ticker=payload.get("ticker"),
+            item_type=payload.get("item_type") or "news",
+            external_id=payload.get("external_id"),
+            metadata=payload.get("metadata") or {},
+        )
+
 
 @dataclass(slots=True)
 class ConnectorResult:
@@ -65,6 +80,17 @@ class ConnectorResult:
             "metadata": self.metadata,
         }
 
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> ConnectorResult:
+        """Rebuild a result from ``as_dict`` output, e.g. a cached payload."""
+        return cls(
+            source=payload["source"],
+            items=[ConnectorItem.from_dict(item) for item in payload.get("items", [])],
+            fetched_at=datetime.fromisoformat(payload["fetched_at"]),
+            errors=list(payload.get("errors", [])),
+            metadata=payload.get("metadata") or {},
+        )
+
     @classmethod
     def failed(
         cls,
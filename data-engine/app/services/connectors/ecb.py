@@ -5,7 +5,7 @@ from datetime import date
 from decimal import Decimal
 from xml.etree import ElementTree
 
-import httpx
+from app.core.http_clients import http_client
 
 
 @dataclass(frozen=True)
@@ -18,13 +18,27 @@ class ECBRates:
 class ECBClient:
     url = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
 
+    async def daily_document(self) -> str:
+        """The ECB daily reference-rate XML, as published."""
+        async with http_client(self.url, provider="ecb") as client:
+            response = await client.get(self.url, timeout=30)
+            response.raise_for_status()
+        return response.text
+
     async def conversion_rates(
         self, *, base_currency: str, quote_currencies: set[str]
     ) -> ECBRates:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(self.url)
-            response.raise_for_status()
-        root = ElementTree.fromstring(response.content)
+        return self.parse_conversion_rates(
+            await self.daily_document(),
+            base_currency=base_currency,
+            quote_currencies=quote_currencies,
+        )
+
+    @staticmethod
+    def parse_conversion_rates(
+        document: str, *, base_currency: str, quote_currencies: set[str]
+    ) -> ECBRates:
+        root = ElementTree.fromstring(document)
         rate_date: date | None = None
         per_eur: dict[str, Decimal] = {"EUR": Decimal("1")}
         for element in root.iter():
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
-
 from app.core.config import get_settings
+from app.core.http_clients import http_client
 
 
 class FinnhubClient:
@@ -19,10 +18,12 @@ class FinnhubClient:
     async def quote(self, ticker: str) -> dict[str, Any]:
         if not self.configured():
             raise RuntimeError("FINNHUB_API_KEY is not configured")
-        async with httpx.AsyncClient(timeout=30) as client:
+        url = f"{self.base_url}/quote"
+        async with http_client(url, provider="finnhub") as client:
             response = await client.get(
-                f"{self.base_url}/quote",
+                url,
                 params={"symbol": ticker.upper(), "token": self.settings.finnhub_api_key},
+                timeout=30,
             )
             response.raise_for_status()
             payload = response.json()
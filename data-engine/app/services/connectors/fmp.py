@@ -1,6 +1,5 @@
-import httpx
-
 from app.core.config import get_settings
+from app.core.http_clients import http_client
 
 
 class FMPClient:
@@ -16,8 +15,9 @@ class FMPClient:
         if not self.configured():
             raise RuntimeError("FMP_API_KEY is not configured")
         merged = {**(params or {}), "apikey": self.settings.fmp_api_key}
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(f"{self.base_url}{path}", params=merged)
+        url = f"{self.base_url}{path}"
+        async with http_client(url, provider="fmp") as client:
+            response = await client.get(url, params=merged, timeout=30)
             response.raise_for_status()
             return response.json()
 
@@ -1,6 +1,5 @@
-import httpx
-
 from app.core.config import get_settings
+from app.core.http_clients import http_client
 
 
 class FREDClient:
@@ -22,8 +21,9 @@ class FREDClient:
             "limit": limit,
             "sort_order": "desc",
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(f"{self.base_url}/series/observations", params=params)
+        url = f"{self.base_url}/series/observations"
+        async with http_client(url, provider="fred") as client:
+            response = await client.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
 
@@ -2,8 +2,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-import httpx
-
+from app.core.http_clients import http_client
 from app.services.connectors.base import ConnectorItem, ConnectorResult
 
 
@@ -18,8 +17,8 @@ class GDELTClient:
             "maxrecords": max_records,
             "sort": "hybridrel",
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(self.base_url, params=params)
+        async with http_client(self.base_url, provider="gdelt") as client:
+            response = await client.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
 
@@ -10,6 +10,7 @@ from xml.etree import ElementTree
 
 import httpx
 
+from app.core.http_clients import http_client
 from app.services.connectors.base import ConnectorItem, ConnectorResult
 
 
@@ -66,12 +67,10 @@ class RSSConnector:
         if self.client is not None:
             response = await self.client.get(url, headers=self.headers)
         else:
-            async with httpx.AsyncClient(
-                timeout=self.timeout,
-                follow_redirects=True,
-                headers=self.headers,
-            ) as client:
-                response = await client.get(url)
+            async with http_client(url, provider="feeds") as client:
+                response = await client.get(
+                    url, headers=self.headers, timeout=self.timeout, follow_redirects=True
+                )
         response.raise_for_status()
         return response
 
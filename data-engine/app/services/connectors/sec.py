@@ -1,17 +1,117 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
+import hashlib
+import json
 import time
-from datetime import UTC, datetime
-from pathlib import PurePosixPath
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
 from app.core.config import get_settings
+from app.core.files import replacing, write_atomic
+from app.core.http_clients import http_client
 from app.services.connectors.base import ConnectorItem, ConnectorResult
 
 
+# How long a cached SEC payload is served without asking SEC at all. After
+# that it is revalidated with a conditional GET, which is usually a 304.
+CACHE_TTL = {
+    "ticker_map": timedelta(hours=24),
+    "submissions": timedelta(minutes=15),
+    "companyfacts": timedelta(hours=12),
+}
+STREAM_CHUNK_BYTES = 1 << 16
+
+# Ticker -> zero-padded CIK, built once per process and cache directory and
+# rebuilt only when the cached company_tickers.json changes on disk.
+_ticker_indexes: dict[Path, tuple[float, int, dict[str, str]]] = {}
+
+
+@lru_cache
+def default_sec_cache() -> SECResponseCache:
+    return SECResponseCache(get_settings().sec_cache_dir)
+
+
+class SECResponseCache:
+    """SEC JSON bodies on disk, gzip-compressed, with their HTTP validators.
+
+    ``<sha256(url)>.json.gz`` holds the body and ``<sha256(url)>.meta.json``
+    the URL, ``ETag``, ``Last-Modified`` and when it was last confirmed.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def body_path(self, url: str) -> Path:
+        return self.root / f"{_url_digest(url)}.json.gz"
+
+    def _meta_path(self, url: str) -> Path:
+        return self.root / f"{_url_digest(url)}.meta.json"
+
+    def metadata(self, url: str) -> dict[str, Any] | None:
+        try:
+            meta = json.loads(self._meta_path(url).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        return meta if self.body_path(url).exists() else None
+
+    def is_fresh(self, meta: dict[str, Any], ttl: timedelta) -> bool:
+        return datetime.now(UTC) - datetime.fromisoformat(meta["checked_at"]) < ttl
+
+    def confirm(self, url: str, meta: dict[str, Any]) -> None:
+        """Record a 304: the body on disk is still current."""
+        write_atomic(self._meta_path(url), json.dumps({**meta, "checked_at": _now()}).encode())
+
+    async def store(self, url: str, response: httpx.Response) -> None:
+        """Stream ``response`` to disk without holding the body in memory.
+
+        A gzip-encoded response is written as received; anything else is
+        compressed on the way in.
+        """
+        with replacing(self.body_path(url)) as temporary, temporary.open("wb") as raw:
+            if response.headers.get("content-encoding", "").lower() == "gzip":
+                async for chunk in response.aiter_raw(STREAM_CHUNK_BYTES):
+                    raw.write(chunk)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=5) as compressed:
+                    async for chunk in response.aiter_bytes(STREAM_CHUNK_BYTES):
+                        compressed.write(chunk)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "checked_at": _now(),
+        }
+        write_atomic(self._meta_path(url), json.dumps(meta).encode())
+
+    def load(self, url: str) -> Any:
+        """Parse a cached body.
+
+        Only the download is streamed. ``json.load`` reads the whole
+        decompressed text before parsing, so a companyfacts payload is held
+        in memory once as text and once as objects.
+        """
+        with gzip.open(self.body_path(url), "rt", encoding="utf-8") as handle:
+            return json.load(handle)
+
+
+def _url_digest(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
 class SECClient:
     submissions_url = "https://data.sec.gov/submissions"
     companyfacts_url = "https://data.sec.gov/api/xbrl/companyfacts"
@@ -24,13 +124,18 @@ class SECClient:
         *,
         user_agent: str | None = None,
         requests_per_second: float = 8,
+        cache: SECResponseCache | None = None,
     ) -> None:
         self.settings = get_settings()
         self.client = client
         self.user_agent = user_agent or self.settings.sec_user_agent
+        self.cache = cache
+        # Responses by outcome for cached reads: "hit", "not_modified", "downloaded".
+        self.cache_stats: Counter[str] = Counter()
         self._minimum_interval = 1 / max(0.1, min(requests_per_second, 10))
         self._last_request_at = 0.0
         self._rate_lock = asyncio.Lock()
+        self._index_lock = asyncio.Lock()
 
     @property
     def headers(self) -> dict[str, str]:
@@ -53,36 +158,94 @@ class SECClient:
         if self.client is not None:
             response = await self.client.get(url, headers=self.headers)
         else:
-            async with httpx.AsyncClient(
-                timeout=30,
-                headers=self.headers,
-                follow_redirects=True,
-            ) as client:
-                response = await client.get(url)
+            async with http_client(url, provider="sec") as client:
+                response = await client.get(
+                    url, headers=self.headers, timeout=30, follow_redirects=True
+                )
         response.raise_for_status()
         return response
 
+    @asynccontextmanager
+    async def _stream(self, url: str, headers: dict[str, str]) -> AsyncIterator[httpx.Response]:
+        await self._throttle()
+        if self.client is not None:
+            async with self.client.stream("GET", url, headers=headers) as response:
+                yield response
+            return
+        async with http_client(url, provider="sec") as client:
+            async with client.stream(
+                "GET", url, headers=headers, timeout=30, follow_redirects=True
+            ) as response:
+                yield response
+
     async def _get_json(self, url: str) -> dict:
         return (await self._get(url)).json()
 
+    async def _revalidate(self, cache: SECResponseCache, url: str, ttl: timedelta) -> None:
+        """Make the cached body for ``url`` current, downloading only if it changed."""
+        meta = cache.metadata(url)
+        if meta is not None and cache.is_fresh(meta, ttl):
+            self.cache_stats["hit"] += 1
+            return
+        # Only gzip, so a compressed body can go to disk byte for byte.
+        headers = {**self.headers, "Accept-Encoding": "gzip"}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        async with self._stream(url, headers) as response:
+            if response.status_code == 304 and meta is not None:
+                cache.confirm(url, meta)
+                self.cache_stats["not_modified"] += 1
+                return
+            response.raise_for_status()
+            await cache.store(url, response)
+            self.cache_stats["downloaded"] += 1
+
+    async def _get_cached_json(self, url: str, kind: str) -> Any:
+        if self.cache is None:
+            return await self._get_json(url)
+        await self._revalidate(self.cache, url, CACHE_TTL[kind])
+        return self.cache.load(url)
+
     async def ticker_map(self) -> dict:
-        return await self._get_json(self.ticker_map_url)
+        return await self._get_cached_json(self.ticker_map_url, "ticker_map")
+
+    async def ticker_index(self) -> dict[str, str]:
+        """Upper-case ticker -> zero-padded CIK.
+
+        With a cache the index is kept in process memory and only rebuilt
+        when SEC publishes a new ticker file.
+        """
+        if self.cache is None:
+            return _build_ticker_index(await self.ticker_map())
+        root = self.cache.root
+        loaded = _ticker_indexes.get(root)
+        if loaded is not None and time.monotonic() < loaded[0]:
+            return loaded[2]
+        async with self._index_lock:
+            await self._revalidate(self.cache, self.ticker_map_url, CACHE_TTL["ticker_map"])
+            version = self.cache.body_path(self.ticker_map_url).stat().st_mtime_ns
+            loaded = _ticker_indexes.get(root)
+            if loaded is not None and loaded[1] == version:
+                index = loaded[2]
+            else:
+                index = _build_ticker_index(self.cache.load(self.ticker_map_url))
+            expires = time.monotonic() + CACHE_TTL["ticker_map"].total_seconds()
+            _ticker_indexes[root] = (expires, version, index)
+            return index
 
     async def cik_for_ticker(self, ticker: str) -> str | None:
-        ticker = ticker.upper()
-        mapping = await self.ticker_map()
-        for item in mapping.values():
-            if item.get("ticker", "").upper() == ticker:
-                return str(item["cik_str"]).zfill(10)
-        return None
+        return (await self.ticker_index()).get(ticker.upper())
 
     async def submissions(self, cik: str) -> dict:
         padded = str(cik).zfill(10)
-        return await self._get_json(f"{self.submissions_url}/CIK{padded}.json")
+        return await self._get_cached_json(f"{self.submissions_url}/CIK{padded}.json", "submissions")
 
     async def company_facts(self, cik: str) -> dict:
         padded = str(cik).zfill(10)
-        return await self._get_json(f"{self.companyfacts_url}/CIK{padded}.json")
+        return await self._get_cached_json(f"{self.companyfacts_url}/CIK{padded}.json", "companyfacts")
 
     @classmethod
     def filing_index_url(cls, cik: str, accession_number: str) -> str:
@@ -192,3 +355,12 @@ class SECClient:
         except ValueError:
             return None
 
+
+def _build_ticker_index(mapping: dict) -> dict[str, str]:
+    index: dict[str, str] = {}
+    for item in mapping.values():
+        ticker = str(item.get("ticker") or "").upper()
+        # First match wins, as with the previous linear scan.
+        if ticker and ticker not in index:
+            index[ticker] = str(item["cik_str"]).zfill(10)
+    return index
@@ -0,0 +1,204 @@
+"""Process-wide sentence embedding model with batched, cached query encoding."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import Any
+
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+class QueryBatcher:
+    """Merge concurrent single-query encodes into one model call.
+
+    The first caller to arrive becomes the leader: it waits ``max_wait_seconds``
+    for other callers to queue up, encodes everything pending in batches of at
+    most ``max_batch_size`` and resolves each caller's future. Callers that
+    arrive while a leader is active simply wait for their result. No background
+    thread is needed, so the batcher survives Dramatiq's worker forks.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], list[list[float]]],
+        *,
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.002,
+    ) -> None:
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, Future[list[float]]]] = []
+        self._leader_active = False
+
+    def submit(self, text: str) -> list[float]:
+        future: Future[list[float]] = Future()
+        with self._lock:
+            self._pending.append((text, future))
+            lead = not self._leader_active
+            self._leader_active = True
+        if lead:
+            self._drain()
+        return future.result()
+
+    def _drain(self) -> None:
+        if self.max_wait_seconds > 0:
+            time.sleep(self.max_wait_seconds)
+        while True:
+            with self._lock:
+                batch = self._pending[: self.max_batch_size]
+                del self._pending[: self.max_batch_size]
+                if not batch:
+                    self._leader_active = False
+                    return
+            try:
+                vectors = self._encode([text for text, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), vector in zip(batch, vectors, strict=True):
+                future.set_result(vector)
+
+
+class EmbeddingService:
+    """Lazily loaded embedding model shared by every caller in the process.
+
+    Document chunks are encoded directly in batches. Search queries go through
+    an LRU cache keyed by whitespace-normalised text and, on a miss, through a
+    :class:`QueryBatcher` so concurrent searches share one ``encode`` call.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        *,
+        query_cache_size: int = 1024,
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.002,
+        model_factory: Callable[[str], Any] | None = None,
+    ) -> None:
+        self.model_name = model_name
+        self.query_cache_size = query_cache_size
+        self._model_factory = model_factory
+        self._model: Any | None = None
+        self._model_lock = threading.Lock()
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._batcher = QueryBatcher(
+            self._encode_queries,
+            max_batch_size=max_batch_size,
+            max_wait_seconds=max_wait_seconds,
+        )
+        self._counters = {
+            "model_loads": 0,
+            "model_load_seconds": 0.0,
+            "encode_calls": 0,
+            "encoded_texts": 0,
+            "encode_seconds": 0.0,
+            "max_batch_size": 0,
+            "query_batches": 0,
+            "batched_queries": 0,
+            "query_cache_hits": 0,
+            "query_cache_misses": 0,
+        }
+
+    def model(self) -> Any:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    self._model = self._load_model()
+                    self._record(model_loads=1, model_load_seconds=time.perf_counter() - started)
+        return self._model
+
+    def encode_documents(self, texts: Sequence[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        return self._encode(list(texts))
+
+    def encode_query(self, text: str) -> list[float]:
+        key = self.normalize_query(text)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            self._record(query_cache_hits=1)
+            return cached
+        self._record(query_cache_misses=1)
+        vector = self._batcher.submit(key)
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.query_cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def metrics(self) -> dict[str, Any]:
+        with self._metrics_lock:
+            counters = dict(self._counters)
+        with self._cache_lock:
+            cache_entries = len(self._cache)
+        calls = counters["encode_calls"]
+        batches = counters["query_batches"]
+        return {
+            "model": self.model_name,
+            "model_loaded": self._model is not None,
+            **counters,
+            "mean_batch_size": counters["encoded_texts"] / calls if calls else 0.0,
+            "mean_query_batch_size": counters["batched_queries"] / batches if batches else 0.0,
+            "mean_encode_ms": 1000 * counters["encode_seconds"] / calls if calls else 0.0,
+            "query_cache_entries": cache_entries,
+        }
+
+    @staticmethod
+    def normalize_query(text: str) -> str:
+        return " ".join(text.split())
+
+    def _load_model(self) -> Any:
+        if self._model_factory is not None:
+            return self._model_factory(self.model_name)
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(self.model_name)
+
+    def _encode_queries(self, texts: list[str]) -> list[list[float]]:
+        self._record(query_batches=1, batched_queries=len(texts))
+        return self._encode(texts)
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        model = self.model()
+        started = time.perf_counter()
+        vectors = model.encode(texts, normalize_embeddings=True).tolist()
+        elapsed = time.perf_counter() - started
+        self._record(encode_calls=1, encoded_texts=len(texts), encode_seconds=elapsed)
+        with self._metrics_lock:
+            self._counters["max_batch_size"] = max(self._counters["max_batch_size"], len(texts))
+        return vectors
+
+    def _record(self, **increments: float) -> None:
+        with self._metrics_lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+
+_service: EmbeddingService | None = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Return the process-wide embedding service used by the API and workers."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
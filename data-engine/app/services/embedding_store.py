@@ -0,0 +1,98 @@
+"""Content-addressed cache of chunk embeddings stored as float32 bytes."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import ChunkEmbedding
+from app.services.embedding_service import EmbeddingService, get_embedding_service
+
+
+LOOKUP_BATCH_SIZE = 500
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+class ChunkEmbeddingStore:
+    """Return chunk vectors, running the model only for text it has not seen.
+
+    Vectors are keyed by ``(model, sha256(text))``, so re-indexing a document,
+    rebuilding a tenant after a Qdrant wipe or uploading the same filing in
+    another tenant reads stored bytes instead of encoding again. ``reused``
+    and ``computed`` count texts served from the store and from the model.
+    """
+
+    def __init__(self, embeddings: EmbeddingService | None = None) -> None:
+        self.embeddings = embeddings or get_embedding_service()
+        self.reused = 0
+        self.computed = 0
+
+    def encode(self, db: Session, texts: Sequence[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        model = self.embeddings.model_name
+        hashes = [self.content_hash(text) for text in texts]
+        known = self._lookup(db, model, sorted(set(hashes)))
+
+        missing: dict[str, str] = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in known:
+                missing.setdefault(digest, text)
+        if missing:
+            vectors = self.embeddings.encode_documents(list(missing.values()))
+            fresh = dict(zip(missing, vectors))
+            self._save(db, model, fresh)
+            known.update(fresh)
+        self.computed += len(missing)
+        self.reused += len(texts) - len(missing)
+        return [known[digest] for digest in hashes]
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        # Same digest as the chunk_sha256 recorded in document chunk metadata.
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def pack(vector: Sequence[float]) -> bytes:
+        return np.asarray(vector, dtype=VECTOR_DTYPE).tobytes()
+
+    @staticmethod
+    def unpack(data: bytes) -> list[float]:
+        return np.frombuffer(data, dtype=VECTOR_DTYPE).tolist()
+
+    def _lookup(self, db: Session, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        for offset in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            rows = db.execute(
+                select(ChunkEmbedding.content_sha256, ChunkEmbedding.vector).where(
+                    ChunkEmbedding.model == model,
+                    ChunkEmbedding.content_sha256.in_(hashes[offset : offset + LOOKUP_BATCH_SIZE]),
+                )
+            )
+            for digest, data in rows:
+                found[digest] = self.unpack(data)
+        return found
+
+    def _save(self, db: Session, model: str, vectors: dict[str, list[float]]) -> None:
+        rows = [
+            ChunkEmbedding(
+                model=model,
+                content_sha256=digest,
+                dimensions=len(vector),
+                vector=self.pack(vector),
+            )
+            for digest, vector in vectors.items()
+        ]
+        # A concurrent indexer may store the same text first. The savepoint
+        # keeps that race from failing the caller's transaction; the vectors
+        # are already in hand either way.
+        try:
+            with db.begin_nested():
+                db.add_all(rows)
+        except IntegrityError:
+            pass
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from pathlib import PurePosixPath
 from urllib.parse import urlparse
 
 import httpx
 
+from app.core.http_clients import http_client
 from app.services.connectors import (
     ConnectorResult,
     GDELTConnector,
@@ -15,6 +17,7 @@ from app.services.connectors import (
     RSSConnector,
     SECClient,
 )
+from app.services.public_data_cache import PublicDataCache
 
 
 @dataclass(frozen=True, slots=True)
@@ -73,8 +76,29 @@ def _unique_feeds(feeds: list[RSSFeed]) -> list[RSSFeed]:
 class FeedIngestionService:
     """Poll connectors and adapt their common result into existing ingestion services."""
 
-    def __init__(self, *, sec_client: SECClient | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        sec_client: SECClient | None = None,
+        public_data: PublicDataCache | None = None,
+    ) -> None:
         self._sec_client = sec_client
+        self.public_data = public_data
+
+    async def _cached(
+        self, namespace: str, key: str, poll: Callable[[], Awaitable[ConnectorResult]]
+    ) -> ConnectorResult:
+        """Serve a poll from the shared public-data cache when one is configured."""
+        if self.public_data is None:
+            return await poll()
+
+        async def fetch() -> dict:
+            return (await poll()).as_dict()
+
+        payload = await self.public_data.fetch(
+            namespace, key, fetch, cacheable=lambda payload: payload["status"] != "error"
+        )
+        return ConnectorResult.from_dict(payload)
 
     async def poll_rss(
         self,
@@ -84,10 +108,10 @@ class FeedIngestionService:
         max_items: int = 100,
         connector: RSSConnector | None = None,
     ) -> ConnectorResult:
-        return await (connector or RSSConnector()).poll(
-            url,
-            ticker=ticker,
-            max_items=max_items,
+        return await self._cached(
+            "rss",
+            f"{url}|{ticker}|{max_items}",
+            lambda: (connector or RSSConnector()).poll(url, ticker=ticker, max_items=max_items),
         )
 
     async def poll_gdelt(
@@ -98,10 +122,12 @@ class FeedIngestionService:
         max_records: int = 50,
         connector: GDELTConnector | None = None,
     ) -> ConnectorResult:
-        return await (connector or GDELTConnector()).poll(
-            query,
-            ticker=ticker,
-            max_records=max_records,
+        return await self._cached(
+            "gdelt",
+            f"{query}|{ticker}|{max_records}",
+            lambda: (connector or GDELTConnector()).poll(
+                query, ticker=ticker, max_records=max_records
+            ),
         )
 
     async def poll_sec(
@@ -117,11 +143,11 @@ class FeedIngestionService:
         if sec is None:
             sec = SECClient()
             self._sec_client = sec
-        return await sec.recent_filings(
-            cik,
-            forms=forms or {"10-K", "10-Q", "8-K", "20-F", "6-K"},
-            limit=limit,
-            ticker=ticker,
+        forms = forms or {"10-K", "10-Q", "8-K", "20-F", "6-K"}
+        return await self._cached(
+            "sec",
+            f"{str(cik).zfill(10)}|{','.join(sorted(forms))}|{limit}|{ticker}",
+            lambda: sec.recent_filings(cik, forms=forms, limit=limit, ticker=ticker),
         )
 
     async def poll_ir(
@@ -132,10 +158,10 @@ class FeedIngestionService:
         max_items: int = 100,
         connector: IRConnector | None = None,
     ) -> ConnectorResult:
-        return await (connector or IRConnector()).poll(
-            ir_url,
-            ticker=ticker,
-            max_items=max_items,
+        return await self._cached(
+            "ir",
+            f"{ir_url}|{ticker}|{max_items}",
+            lambda: (connector or IRConnector()).poll(ir_url, ticker=ticker, max_items=max_items),
         )
 
     def ingest_news_result(
@@ -201,12 +227,13 @@ class FeedIngestionService:
         if (parsed_url.hostname or "").lower() in {"sec.gov", "www.sec.gov"}:
             content, content_type = await SECClient().filing_document(url)
         else:
-            async with httpx.AsyncClient(
-                timeout=30,
-                follow_redirects=True,
-                headers={"User-Agent": "CavaAI Document Poller/1.0"},
-            ) as client:
-                response = await client.get(url)
+            async with http_client(url, provider="feeds") as client:
+                response = await client.get(
+                    url,
+                    headers={"User-Agent": "CavaAI Document Poller/1.0"},
+                    timeout=30,
+                    follow_redirects=True,
+                )
                 response.raise_for_status()
                 content = response.content
                 content_type = response.headers.get("content-type")
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import re
+import time
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal, InvalidOperation
+from pathlib import Path
 from typing import Any
 
-from sqlalchemy import delete, select
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.orm import Session, aliased
 
+from app.core.config import get_settings
 from app.models import Company, Document, FinancialFact, FinancialStatement, MarketPrice
+from app.services.company_change_service import CompanyChangeService
 from app.services.connectors.fmp import FMPClient
-from app.services.connectors.sec import SECClient
+from app.services.connectors.sec import SECClient, default_sec_cache
 
 
 MetricSpec = tuple[str, str, str]
@@ -79,6 +89,51 @@ SEC_METRIC_MAP: list[tuple[str, list[str], str]] = [
     ("dividends_paid",    ["PaymentsOfDividends", "PaymentsOfDividendsCommonStock"],                                "USD"),
 ]
 
+# Companies per transaction when loading EDGAR's bulk companyfacts.zip.
+COMPANYFACTS_BATCH_SIZE = 500
+_ARCHIVE_MEMBER = re.compile(r"CIK(\d{10})\.json")
+
+# Columns compared when diffing a refresh against the stored rows; the key
+# columns (company, source, metric/statement type, period) are matched first.
+FACT_FIELDS = (
+    "value",
+    "unit",
+    "fiscal_year",
+    "fiscal_quarter",
+    "source_id",
+    "is_reported",
+    "is_adjusted",
+    "confidence",
+)
+STATEMENT_FIELDS = ("fiscal_year", "fiscal_quarter", "facts")
+# FinancialFact.value is Numeric(24, 6); comparing at stored precision keeps
+# unchanged provider values from being rewritten on every refresh.
+_VALUE_QUANTUM = Decimal("0.000001")
+
+
+@dataclass
+class FactChangeSet:
+    """Facts a refresh inserted, updated or deleted, for incremental recomputation."""
+
+    inserted: list[int] = field(default_factory=list)
+    updated: list[int] = field(default_factory=list)
+    deleted: list[int] = field(default_factory=list)
+    unchanged: int = 0
+    metrics: set[str] = field(default_factory=set)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "unchanged": self.unchanged,
+            "metrics": sorted(self.metrics),
+        }
+
 
 def _decimal(value: Any) -> Decimal | None:
     if value is None or value == "":
@@ -118,6 +173,114 @@ def _rows(payload: list | dict) -> list[dict[str, Any]]:
     return []
 
 
+def _fact_row(
+    document: Document,
+    metric: str,
+    value: Decimal,
+    unit: str,
+    *,
+    period: str,
+    confidence: Decimal,
+    fiscal_year: int | None = None,
+    fiscal_quarter: str | None = None,
+    is_reported: bool = True,
+    is_adjusted: bool = False,
+) -> dict[str, Any]:
+    return {
+        "metric": metric,
+        "value": value.quantize(_VALUE_QUANTUM),
+        "unit": unit,
+        "period": period,
+        "fiscal_year": fiscal_year,
+        "fiscal_quarter": fiscal_quarter,
+        "source_id": document.id,
+        "is_reported": is_reported,
+        "is_adjusted": is_adjusted,
+        "confidence": confidence,
+    }
+
+
+def _derived_row(
+    document: Document,
+    metric: str,
+    value: Decimal,
+    unit: str,
+    basis: FinancialFact,
+) -> dict[str, Any]:
+    return _fact_row(
+        document,
+        metric,
+        value,
+        unit,
+        period=basis.period,
+        fiscal_year=basis.fiscal_year,
+        fiscal_quarter=basis.fiscal_quarter,
+        confidence=Decimal("0.85"),
+        is_reported=False,
+        is_adjusted=True,
+    )
+
+
+def _not_fmp_derived():
+    return or_(FinancialFact.source_type != "FMP", FinancialFact.is_reported.is_(True))
+
+
+def _tenant_filter(db: Session, model: type[FinancialFact] | type[FinancialStatement]):
+    tenant_id = db.info.get("tenant_id")
+    return model.tenant_id == tenant_id if tenant_id is not None else model.tenant_id.is_(None)
+
+
+def _bulk_tenant_id(db: Session) -> int | None:
+    # Bulk rows skip the ORM flush, so the ``before_flush`` tenant check is repeated here.
+    tenant_id = db.info.get("tenant_id")
+    if tenant_id is None and get_settings().research_auth_required:
+        raise RuntimeError("Tenant context is required for tenant-owned writes")
+    return tenant_id
+
+
+def _sec_fact_rows(companyfacts: dict[str, Any]) -> list[dict[str, Any]]:
+    """Annual 10-K/20-F values for each SEC_METRIC_MAP metric, latest ten years first.
+
+    The first concept with annual entries wins; capex is stored negative like FMP.
+    """
+    us_gaap = companyfacts.get("facts", {}).get("us-gaap", {})
+    rows: list[dict[str, Any]] = []
+    for metric, concepts, unit in SEC_METRIC_MAP:
+        xbrl_unit_key = "USD/shares" if unit == "USD/share" else unit
+        for concept in concepts:
+            concept_data = us_gaap.get(concept, {})
+            entries = concept_data.get("units", {}).get(xbrl_unit_key, [])
+            annual = [
+                e for e in entries
+                if e.get("fp") == "FY" and e.get("form") in {"10-K", "20-F"}
+            ]
+            if not annual:
+                continue
+            annual_sorted = sorted(annual, key=lambda e: e.get("fy", 0), reverse=True)[:10]
+            for entry in annual_sorted:
+                val = _decimal(entry.get("val"))
+                if val is None:
+                    continue
+                if metric == "capital_expenditure":
+                    val = -val
+                rows.append(
+                    {
+                        "metric": metric,
+                        "value": val,
+                        "unit": unit,
+                        "period": f"{entry['end']}:FY",
+                        "fiscal_year": entry.get("fy"),
+                    }
+                )
+            break
+    return rows
+
+
+def _archive_cik(name: str) -> int | None:
+    match = _ARCHIVE_MEMBER.fullmatch(Path(name).name)
+    return int(match.group(1)) if match else None
+
+
 class FinancialIngestionService:
     """Normalize provider data into auditable financial facts."""
 
@@ -131,17 +294,19 @@ class FinancialIngestionService:
         fmp = client or FMPClient()
         ticker = company.ticker.upper()
 
-        income = _rows(await fmp.income_statement(ticker, limit=limit))
-        balance = _rows(await fmp.balance_sheet(ticker, limit=limit))
-        cash_flow = _rows(await fmp.cash_flow(ticker, limit=limit))
-        ratios = _rows(await fmp.ratios(ticker, limit=limit))
-        profile = _rows(await fmp.company_profile(ticker))
+        payloads = await asyncio.gather(
+            fmp.income_statement(ticker, limit=limit),
+            fmp.balance_sheet(ticker, limit=limit),
+            fmp.cash_flow(ticker, limit=limit),
+            fmp.ratios(ticker, limit=limit),
+            fmp.company_profile(ticker),
+        )
+        income, balance, cash_flow, ratios, profile = (_rows(payload) for payload in payloads)
 
         document = self._source_document(db, company)
-        self._replace_fmp_data(db, company, document)
 
-        statements = 0
-        facts = 0
+        statements: list[dict[str, Any]] = []
+        reported: list[dict[str, Any]] = []
         for statement_type, rows, specs in [
             ("income", income, INCOME_METRICS),
             ("balance_sheet", balance, BALANCE_METRICS),
@@ -149,24 +314,19 @@ class FinancialIngestionService:
             ("ratios", ratios, RATIO_METRICS),
         ]:
             for row in rows:
-                statements += self._add_statement(
-                    db=db,
-                    company=company,
-                    document=document,
-                    statement_type=statement_type,
-                    row=row,
-                )
-                facts += self._add_facts(
-                    db=db,
-                    company=company,
-                    document=document,
-                    row=row,
-                    specs=specs,
-                )
-
-        db.flush()
-        facts += self._add_derived_facts(db, company, document)
-        facts += self._add_profile_facts(db, company, document, profile)
+                statements.append(self._statement_row(document, statement_type, row))
+                reported.extend(self._fact_rows(document, row, specs))
+
+        changes = FactChangeSet()
+        self._sync_statements(db, company, document, statements)
+        self._sync_facts(db, company, reported, changes, source_type="FMP", is_reported=True)
+        # Derived facts read the reported facts just written, so they sync second.
+        derived = self._derived_fact_rows(db, company, document)
+        self._sync_facts(db, company, derived, changes, source_type="FMP", is_reported=False)
+        profile_facts = self._profile_fact_rows(document, profile)
+        self._sync_facts(db, company, profile_facts, changes, source_type="FMP_profile", prune=False)
+        if changes.deleted and not (changes.inserted or changes.updated):
+            CompanyChangeService().record_deletions(db, [company.id])
         self._add_profile_price(db, company, profile)
 
         document.metadata_ = {
@@ -185,14 +345,15 @@ class FinancialIngestionService:
             "ticker": ticker,
             "provider": "FMP",
             "source_document_id": document.id,
-            "facts_imported": facts,
-            "statements_imported": statements,
+            "facts_imported": len(reported) + len(derived) + len(profile_facts),
+            "statements_imported": len(statements),
+            "changes": changes.as_dict(),
             "latest_periods": self.latest_periods(db, company),
             "valuation_input_ready": self.valuation_input_ready(db, company),
         }
 
     async def refresh_from_sec(self, db: Session, company: Company) -> dict[str, Any]:
-        sec = SECClient()
+        sec = SECClient(cache=default_sec_cache())
         ticker = company.ticker.upper()
 
         try:
@@ -208,78 +369,12 @@ class FinancialIngestionService:
         except Exception as e:
             raise RuntimeError(f"SEC fetch failed: {e}") from e
 
-        us_gaap = facts_data.get("facts", {}).get("us-gaap", {})
-
-        document = self._source_document_sec(db, company, ticker)
-        self._replace_sec_data(db, company)
-
-        facts_imported = 0
-
-        for metric, concepts, unit in SEC_METRIC_MAP:
-            xbrl_unit_key = "USD/shares" if unit == "USD/share" else unit
-            for concept in concepts:
-                concept_data = us_gaap.get(concept, {})
-                entries = concept_data.get("units", {}).get(xbrl_unit_key, [])
-                annual = [
-                    e for e in entries
-                    if e.get("fp") == "FY" and e.get("form") in {"10-K", "20-F"}
-                ]
-                if not annual:
-                    continue
-                annual_sorted = sorted(annual, key=lambda e: e.get("fy", 0), reverse=True)[:10]
-                for entry in annual_sorted:
-                    val = _decimal(entry.get("val"))
-                    if val is None:
-                        continue
-                    if metric == "capital_expenditure":
-                        val = -val
-                    db.add(
-                        FinancialFact(
-                            company_id=company.id,
-                            metric=metric,
-                            value=val,
-                            unit=unit,
-                            period=f"{entry['end']}:FY",
-                            fiscal_year=entry.get("fy"),
-                            fiscal_quarter=None,
-                            source_id=document.id,
-                            source_type="SEC",
-                            is_reported=True,
-                            confidence=Decimal("0.95"),
-                        )
-                    )
-                    facts_imported += 1
-                break
-
-        db.flush()
-
-        conflicts: list[str] = []
-        sec_facts = list(
-            db.scalars(
-                select(FinancialFact).where(
-                    FinancialFact.company_id == company.id,
-                    FinancialFact.source_type == "SEC",
-                )
-            )
-        )
-        for sec_fact in sec_facts:
-            fmp_fact = db.scalar(
-                select(FinancialFact).where(
-                    FinancialFact.company_id == company.id,
-                    FinancialFact.source_type == "FMP",
-                    FinancialFact.metric == sec_fact.metric,
-                    FinancialFact.period == sec_fact.period,
-                )
-            )
-            if fmp_fact is not None:
-                sec_val = float(sec_fact.value)
-                fmp_val = float(fmp_fact.value)
-                diff = abs(sec_val - fmp_val) / max(abs(fmp_val), 1)
-                if diff > 0.05:
-                    pct = round(diff * 100, 1)
-                    conflicts.append(
-                        f"{sec_fact.metric}:{sec_fact.period} FMP={int(fmp_val)} SEC={int(sec_val)} diff={pct}%"
-                    )
+        document = self._sec_documents(db, [company])[company.id]
+        deleted = self._replace_sec_data(db, company)
+        facts_imported = self._insert_sec_facts(db, [(company, document, _sec_fact_rows(facts_data))])
+        if not facts_imported:
+            CompanyChangeService().record_deletions(db, deleted)
+        conflicts = self._sec_conflicts(db, [company.id]).get(company.id, [])
 
         document.metadata_ = {
             **(document.metadata_ or {}),
@@ -300,6 +395,57 @@ class FinancialIngestionService:
             "conflicts": conflicts,
         }
 
+    def ingest_companyfacts_archive(
+        self,
+        db: Session,
+        archive_path: str | Path,
+        *,
+        batch_size: int = COMPANYFACTS_BATCH_SIZE,
+    ) -> dict[str, Any]:
+        """Load SEC facts for every known company from EDGAR's nightly ``companyfacts.zip``.
+
+        The archive holds one ``CIK##########.json`` member per filer, in the
+        same shape as the companyfacts API. Members are read one at a time and
+        written in batches of ``batch_size`` companies: one delete, one bulk
+        insert and one conflict query per batch instead of per company.
+        """
+        started = time.perf_counter()
+        companies_by_cik: dict[int, list[Company]] = defaultdict(list)
+        for company in db.scalars(select(Company).where(Company.cik.is_not(None)).order_by(Company.id)):
+            cik = (company.cik or "").strip()
+            if cik.isdigit():
+                companies_by_cik[int(cik)].append(company)
+
+        members = 0
+        batch: list[tuple[Company, int, list[dict[str, Any]]]] = []
+        summary: dict[str, Any] = {"companies": 0, "facts_imported": 0, "conflicts": {}}
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.infolist():
+                cik = _archive_cik(member.filename)
+                if cik is None:
+                    continue
+                members += 1
+                companies = companies_by_cik.get(cik)
+                if not companies:
+                    continue
+                with archive.open(member) as handle:
+                    rows = _sec_fact_rows(json.load(handle))
+                batch.extend((company, cik, rows) for company in companies)
+                if len(batch) >= batch_size:
+                    self._write_sec_batch(db, batch, summary)
+                    batch = []
+        if batch:
+            self._write_sec_batch(db, batch, summary)
+
+        return {
+            "status": "ingested",
+            "provider": "SEC",
+            "archive": Path(archive_path).name,
+            "members": members,
+            **summary,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
     def latest_periods(self, db: Session, company: Company) -> dict[str, str | None]:
         periods: dict[str, str | None] = {}
         for metric in ["revenue", "free_cash_flow", "net_debt", "shares_diluted"]:
@@ -346,226 +492,385 @@ class FinancialIngestionService:
         db.flush()
         return document
 
-    def _replace_fmp_data(self, db: Session, company: Company, document: Document) -> None:
-        tenant_id = db.info.get("tenant_id")
-        fact_tenant = (
-            FinancialFact.tenant_id == tenant_id
-            if tenant_id is not None
-            else FinancialFact.tenant_id.is_(None)
-        )
-        statement_tenant = (
-            FinancialStatement.tenant_id == tenant_id
-            if tenant_id is not None
-            else FinancialStatement.tenant_id.is_(None)
-        )
-        db.execute(
-            delete(FinancialFact).where(
-                FinancialFact.company_id == company.id,
-                FinancialFact.source_type == "FMP",
-                fact_tenant,
+    def _sync_statements(
+        self,
+        db: Session,
+        company: Company,
+        document: Document,
+        statements: list[dict[str, Any]],
+    ) -> None:
+        wanted = {(row["statement_type"], row["period"]): row for row in statements}
+        existing = db.execute(
+            select(
+                FinancialStatement.id,
+                FinancialStatement.statement_type,
+                FinancialStatement.period,
+                FinancialStatement.fiscal_year,
+                FinancialStatement.fiscal_quarter,
+                FinancialStatement.facts,
             )
-        )
-        db.execute(
-            delete(FinancialStatement).where(
+            .where(
                 FinancialStatement.company_id == company.id,
                 FinancialStatement.source_id == document.id,
-                statement_tenant,
+                _tenant_filter(db, FinancialStatement),
             )
-        )
-        db.flush()
-
-    def _source_document_sec(self, db: Session, company: Company, ticker: str) -> Document:
-        title = f"SEC XBRL facts - {ticker}"
-        document = db.scalar(
-            select(Document).where(
-                Document.company_id == company.id,
-                Document.source_type == "SEC",
-                Document.title == title,
+            .order_by(FinancialStatement.id)
+        ).all()
+        now = datetime.now(UTC)
+        updates: list[dict[str, Any]] = []
+        stale: list[int] = []
+        for current in existing:
+            target = wanted.pop((current.statement_type, current.period), None)
+            if target is None:
+                stale.append(current.id)
+            elif any(getattr(current, column) != target[column] for column in STATEMENT_FIELDS):
+                updates.append({"id": current.id, **{column: target[column] for column in STATEMENT_FIELDS}})
+        if stale:
+            db.execute(delete(FinancialStatement).where(FinancialStatement.id.in_(stale)))
+        if updates:
+            db.execute(update(FinancialStatement), [{**row, "updated_at": now} for row in updates])
+        if wanted:
+            tenant_id = _bulk_tenant_id(db)
+            db.execute(
+                insert(FinancialStatement),
+                [
+                    {**row, "tenant_id": tenant_id, "company_id": company.id, "created_at": now, "updated_at": now}
+                    for row in wanted.values()
+                ],
             )
-        )
-        if document:
-            return document
-        document = Document(
-            company_id=company.id,
-            title=title,
-            source_type="SEC",
-            source_url=f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&ticker={ticker}&type=10-K",
-            metadata_={"provider": "SEC", "normalized": True},
-        )
-        db.add(document)
-        db.flush()
-        return document
 
-    def _replace_sec_data(self, db: Session, company: Company) -> None:
-        tenant_id = db.info.get("tenant_id")
-        tenant_filter = (
-            FinancialFact.tenant_id == tenant_id
-            if tenant_id is not None
-            else FinancialFact.tenant_id.is_(None)
-        )
-        db.execute(
-            delete(FinancialFact).where(
-                FinancialFact.company_id == company.id,
+    def _sync_facts(
+        self,
+        db: Session,
+        company: Company,
+        facts: list[dict[str, Any]],
+        changes: FactChangeSet,
+        *,
+        source_type: str,
+        is_reported: bool | None = None,
+        prune: bool = True,
+    ) -> None:
+        """Diff ``facts`` against the stored rows keyed on (metric, period) and write only changes.
+
+        Unchanged rows keep their id and timestamps. With ``prune`` stored
+        rows missing from ``facts`` are deleted; otherwise only the given
+        periods are compared and nothing is removed. A refresh that only
+        deletes must still call ``CompanyChangeService.record_deletions``.
+        """
+        wanted = {(row["metric"], row["period"]): row for row in facts}
+        criteria = [
+            FinancialFact.company_id == company.id,
+            FinancialFact.source_type == source_type,
+            _tenant_filter(db, FinancialFact),
+        ]
+        if is_reported is not None:
+            criteria.append(FinancialFact.is_reported.is_(is_reported))
+        if not prune:
+            if not wanted:
+                return
+            criteria.append(FinancialFact.period.in_({period for _metric, period in wanted}))
+        existing = db.execute(
+            select(
+                FinancialFact.id,
+                FinancialFact.metric,
+                FinancialFact.period,
+                *(getattr(FinancialFact, column) for column in FACT_FIELDS),
+            )
+            .where(*criteria)
+            .order_by(FinancialFact.id)
+        ).all()
+        now = datetime.now(UTC)
+        updates: list[dict[str, Any]] = []
+        stale: list[int] = []
+        for current in existing:
+            target = wanted.pop((current.metric, current.period), None)
+            if target is None:
+                # Also removes duplicates left by the old delete-and-reinsert path.
+                if prune:
+                    stale.append(current.id)
+                    changes.metrics.add(current.metric)
+            elif any(getattr(current, column) != target[column] for column in FACT_FIELDS):
+                updates.append({"id": current.id, **{column: target[column] for column in FACT_FIELDS}})
+                changes.metrics.add(current.metric)
+            else:
+                changes.unchanged += 1
+        if stale:
+            db.execute(delete(FinancialFact).where(FinancialFact.id.in_(stale)))
+            changes.deleted.extend(stale)
+        if updates:
+            db.execute(update(FinancialFact), [{**row, "updated_at": now} for row in updates])
+            changes.updated.extend(row["id"] for row in updates)
+        if wanted:
+            tenant_id = _bulk_tenant_id(db)
+            inserted = db.scalars(
+                insert(FinancialFact).returning(FinancialFact.id, sort_by_parameter_order=True),
+                [
+                    {
+                        **row,
+                        "tenant_id": tenant_id,
+                        "company_id": company.id,
+                        "source_type": source_type,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for row in wanted.values()
+                ],
+            ).all()
+            changes.inserted.extend(inserted)
+            changes.metrics.update(metric for metric, _period in wanted)
+
+    def _sec_documents(self, db: Session, companies: list[Company]) -> dict[int, Document]:
+        titles = {company.id: f"SEC XBRL facts - {company.ticker.upper()}" for company in companies}
+        documents = {
+            document.company_id: document
+            for document in db.scalars(
+                select(Document).where(
+                    Document.company_id.in_(titles),
+                    Document.source_type == "SEC",
+                    Document.title.in_(set(titles.values())),
+                )
+            )
+            if document.company_id is not None and document.title == titles[document.company_id]
+        }
+        missing = [company for company in companies if company.id not in documents]
+        for company in missing:
+            ticker = company.ticker.upper()
+            documents[company.id] = Document(
+                company_id=company.id,
+                title=titles[company.id],
+                source_type="SEC",
+                source_url=f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&ticker={ticker}&type=10-K",
+                metadata_={"provider": "SEC", "normalized": True},
+            )
+        if missing:
+            db.add_all(documents[company.id] for company in missing)
+            db.flush()
+        return documents
+
+    def _replace_sec_data(self, db: Session, *companies: Company) -> set[int]:
+        """Delete the companies' SEC facts; returns the ids of companies that had any."""
+        deleted = db.scalars(
+            delete(FinancialFact)
+            .where(
+                FinancialFact.company_id.in_([company.id for company in companies]),
                 FinancialFact.source_type == "SEC",
-                tenant_filter,
+                _tenant_filter(db, FinancialFact),
             )
-        )
+            .returning(FinancialFact.company_id)
+        ).all()
         db.flush()
+        return set(deleted)
 
-    def _add_statement(
+    def _insert_sec_facts(
         self,
         db: Session,
-        company: Company,
-        document: Document,
-        statement_type: str,
-        row: dict[str, Any],
+        batch: list[tuple[Company, Document, list[dict[str, Any]]]],
     ) -> int:
-        period, fiscal_year, fiscal_quarter = _period(row)
-        db.add(
-            FinancialStatement(
-                company_id=company.id,
-                statement_type=statement_type,
-                period=period,
-                fiscal_year=fiscal_year,
-                fiscal_quarter=fiscal_quarter,
-                source_id=document.id,
-                facts=row,
+        tenant_id = _bulk_tenant_id(db)
+        now = datetime.now(UTC)
+        rows = [
+            {
+                "tenant_id": tenant_id,
+                "company_id": company.id,
+                "metric": fact["metric"],
+                "value": fact["value"],
+                "unit": fact["unit"],
+                "period": fact["period"],
+                "fiscal_year": fact["fiscal_year"],
+                "fiscal_quarter": None,
+                "source_id": document.id,
+                "source_type": "SEC",
+                "is_reported": True,
+                "is_adjusted": False,
+                "confidence": Decimal("0.95"),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for company, document, facts in batch
+            for fact in facts
+        ]
+        if not rows:
+            return 0
+        bind = db.get_bind()
+        if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg":
+            # COPY is several times faster than a multi-row INSERT for the
+            # tens of thousands of rows one archive batch produces.
+            columns = list(rows[0])
+            connection: Any = db.connection().connection.dbapi_connection
+            with connection.cursor() as cursor:
+                with cursor.copy(
+                    f"COPY {FinancialFact.__tablename__} ({', '.join(columns)}) FROM STDIN"
+                ) as copy:
+                    for row in rows:
+                        copy.write_row([row[column] for column in columns])
+        else:
+            db.execute(insert(FinancialFact), rows)
+        return len(rows)
+
+    def _sec_conflicts(self, db: Session, company_ids: list[int]) -> dict[int, list[str]]:
+        """SEC facts more than 5% away from the FMP fact for the same metric and period."""
+        sec, fmp = aliased(FinancialFact), aliased(FinancialFact)
+        pairs = db.execute(
+            select(sec.id, sec.company_id, sec.metric, sec.period, sec.value, fmp.value)
+            .join(
+                fmp,
+                and_(
+                    fmp.company_id == sec.company_id,
+                    fmp.metric == sec.metric,
+                    fmp.period == sec.period,
+                    fmp.source_type == "FMP",
+                ),
             )
+            .where(sec.company_id.in_(company_ids), sec.source_type == "SEC")
+            .order_by(sec.id, fmp.id)
         )
-        return 1
+        conflicts: dict[int, list[str]] = defaultdict(list)
+        seen: set[int] = set()
+        for sec_id, company_id, metric, period, sec_value, fmp_value in pairs:
+            # One comparison per SEC fact, against the first FMP match.
+            if sec_id in seen:
+                continue
+            seen.add(sec_id)
+            sec_val = float(sec_value)
+            fmp_val = float(fmp_value)
+            diff = abs(sec_val - fmp_val) / max(abs(fmp_val), 1)
+            if diff > 0.05:
+                pct = round(diff * 100, 1)
+                conflicts[company_id].append(
+                    f"{metric}:{period} FMP={int(fmp_val)} SEC={int(sec_val)} diff={pct}%"
+                )
+        return conflicts
 
-    def _add_facts(
+    def _write_sec_batch(
         self,
         db: Session,
-        company: Company,
+        batch: list[tuple[Company, int, list[dict[str, Any]]]],
+        summary: dict[str, Any],
+    ) -> None:
+        companies = [company for company, _cik, _rows in batch]
+        documents = self._sec_documents(db, companies)
+        deleted = self._replace_sec_data(db, *companies)
+        summary["facts_imported"] += self._insert_sec_facts(
+            db, [(company, documents[company.id], rows) for company, _cik, rows in batch]
+        )
+        CompanyChangeService().record_deletions(
+            db, (company.id for company, _cik, rows in batch if not rows and company.id in deleted)
+        )
+        conflicts = self._sec_conflicts(db, [company.id for company in companies])
+        refreshed_at = datetime.now(UTC).isoformat()
+        for company, cik, _rows in batch:
+            document = documents[company.id]
+            document.metadata_ = {
+                **(document.metadata_ or {}),
+                "provider": "SEC",
+                "cik": str(cik).zfill(10),
+                "last_refreshed_at": refreshed_at,
+                "conflicts": conflicts.get(company.id, []),
+            }
+            if conflicts.get(company.id):
+                summary["conflicts"][company.ticker] = conflicts[company.id]
+        summary["companies"] += len(batch)
+        db.commit()
+
+    def _statement_row(self, document: Document, statement_type: str, row: dict[str, Any]) -> dict[str, Any]:
+        period, fiscal_year, fiscal_quarter = _period(row)
+        return {
+            "statement_type": statement_type,
+            "period": period,
+            "fiscal_year": fiscal_year,
+            "fiscal_quarter": fiscal_quarter,
+            "source_id": document.id,
+            "facts": row,
+        }
+
+    def _fact_rows(
+        self,
         document: Document,
         row: dict[str, Any],
         specs: list[MetricSpec],
-    ) -> int:
+    ) -> list[dict[str, Any]]:
         period, fiscal_year, fiscal_quarter = _period(row)
-        count = 0
+        facts: list[dict[str, Any]] = []
         for metric, fmp_key, unit in specs:
             value = _decimal(row.get(fmp_key))
             if value is None:
                 continue
-            db.add(
-                FinancialFact(
-                    company_id=company.id,
-                    metric=metric,
-                    value=value,
-                    unit=unit,
+            facts.append(
+                _fact_row(
+                    document,
+                    metric,
+                    value,
+                    unit,
                     period=period,
                     fiscal_year=fiscal_year,
                     fiscal_quarter=fiscal_quarter,
-                    source_id=document.id,
-                    source_type="FMP",
-                    is_reported=True,
                     confidence=Decimal("0.90"),
                 )
             )
-            count += 1
-        return count
+        return facts
 
-    def _add_derived_facts(self, db: Session, company: Company, document: Document) -> int:
+    def _derived_fact_rows(self, db: Session, company: Company, document: Document) -> list[dict[str, Any]]:
         revenue_facts = list(
             db.scalars(
                 select(FinancialFact)
-                .where(FinancialFact.company_id == company.id, FinancialFact.metric == "revenue")
+                .where(
+                    FinancialFact.company_id == company.id,
+                    FinancialFact.metric == "revenue",
+                    _not_fmp_derived(),
+                )
                 .order_by(FinancialFact.fiscal_year.desc().nullslast())
                 .limit(2)
             )
         )
-        count = 0
+        facts: list[dict[str, Any]] = []
         latest_revenue = revenue_facts[0] if revenue_facts else None
         prior_revenue = revenue_facts[1] if len(revenue_facts) > 1 else None
-        latest_fcf = self.latest_fact(db, company, "free_cash_flow")
-        operating_cash_flow = self.latest_fact(db, company, "operating_cash_flow")
-        capex = self.latest_fact(db, company, "capital_expenditure")
-        total_debt = self.latest_fact(db, company, "total_debt")
-        cash = self.latest_fact(db, company, "cash_and_equivalents")
+        latest_fcf = self._basis_fact(db, company, "free_cash_flow")
+        operating_cash_flow = self._basis_fact(db, company, "operating_cash_flow")
+        capex = self._basis_fact(db, company, "capital_expenditure")
+        total_debt = self._basis_fact(db, company, "total_debt")
+        cash = self._basis_fact(db, company, "cash_and_equivalents")
 
+        fcf_value = latest_fcf.value if latest_fcf else None
         if not latest_fcf and operating_cash_flow and capex:
-            count += self._add_derived_fact(
-                db,
-                company,
-                document,
-                "free_cash_flow",
-                operating_cash_flow.value + capex.value,
-                "USD",
-                operating_cash_flow.period,
-                operating_cash_flow.fiscal_year,
-                operating_cash_flow.fiscal_quarter,
-            )
-            db.flush()
-            latest_fcf = self.latest_fact(db, company, "free_cash_flow")
-
-        if latest_revenue and latest_fcf and latest_revenue.value:
-            count += self._add_derived_fact(
-                db,
-                company,
-                document,
-                "fcf_margin",
-                latest_fcf.value / latest_revenue.value,
-                "decimal",
-                latest_revenue.period,
-                latest_revenue.fiscal_year,
-                latest_revenue.fiscal_quarter,
+            fcf_value = operating_cash_flow.value + capex.value
+            facts.append(_derived_row(document, "free_cash_flow", fcf_value, "USD", operating_cash_flow))
+
+        if latest_revenue and fcf_value is not None and latest_revenue.value:
+            facts.append(
+                _derived_row(
+                    document, "fcf_margin", fcf_value / latest_revenue.value, "decimal", latest_revenue
+                )
             )
         if latest_revenue and prior_revenue and prior_revenue.value:
-            count += self._add_derived_fact(
-                db,
-                company,
-                document,
-                "revenue_growth",
-                latest_revenue.value / prior_revenue.value - Decimal("1"),
-                "decimal",
-                latest_revenue.period,
-                latest_revenue.fiscal_year,
-                latest_revenue.fiscal_quarter,
-            )
-        if total_debt and cash and not self.latest_fact(db, company, "net_debt"):
-            count += self._add_derived_fact(
-                db,
-                company,
-                document,
-                "net_debt",
-                total_debt.value - cash.value,
-                "USD",
-                total_debt.period,
-                total_debt.fiscal_year,
-                total_debt.fiscal_quarter,
+            facts.append(
+                _derived_row(
+                    document,
+                    "revenue_growth",
+                    latest_revenue.value / prior_revenue.value - Decimal("1"),
+                    "decimal",
+                    latest_revenue,
+                )
             )
-        return count
+        if total_debt and cash and not self._basis_fact(db, company, "net_debt"):
+            facts.append(_derived_row(document, "net_debt", total_debt.value - cash.value, "USD", total_debt))
+        return facts
 
-    def _add_derived_fact(
-        self,
-        db: Session,
-        company: Company,
-        document: Document,
-        metric: str,
-        value: Decimal,
-        unit: str,
-        period: str,
-        fiscal_year: int | None,
-        fiscal_quarter: str | None,
-    ) -> int:
-        db.add(
-            FinancialFact(
-                company_id=company.id,
-                metric=metric,
-                value=value,
-                unit=unit,
-                period=period,
-                fiscal_year=fiscal_year,
-                fiscal_quarter=fiscal_quarter,
-                source_id=document.id,
-                source_type="FMP",
-                is_reported=False,
-                is_adjusted=True,
-                confidence=Decimal("0.85"),
+    def _basis_fact(self, db: Session, company: Company, metric: str) -> FinancialFact | None:
+        # latest_fact without the FMP facts this refresh is about to re-derive.
+        return db.scalar(
+            select(FinancialFact)
+            .where(
+                FinancialFact.company_id == company.id,
+                FinancialFact.metric == metric,
+                _not_fmp_derived(),
+            )
+            .order_by(
+                FinancialFact.fiscal_year.desc().nullslast(),
+                FinancialFact.created_at.desc(),
             )
+            .limit(1)
         )
-        return 1
 
     def _add_profile_price(
         self,
@@ -600,18 +905,12 @@ class FinancialIngestionService:
             )
         )
 
-    def _add_profile_facts(
-        self,
-        db: Session,
-        company: Company,
-        document: Document,
-        profile: list[dict[str, Any]],
-    ) -> int:
+    def _profile_fact_rows(self, document: Document, profile: list[dict[str, Any]]) -> list[dict[str, Any]]:
         if not profile:
-            return 0
+            return []
         row = profile[0]
         period = datetime.now(UTC).date().isoformat()
-        count = 0
+        facts: list[dict[str, Any]] = []
         for metric, field, unit in [
             ("beta", "beta", "decimal"),
             ("market_cap", "mktCap", "USD"),
@@ -619,19 +918,5 @@ class FinancialIngestionService:
             value = _decimal(row.get(field))
             if value is None:
                 continue
-            db.add(
-                FinancialFact(
-                    company_id=company.id,
-                    metric=metric,
-                    value=value,
-                    unit=unit,
-                    period=period,
-                    source_id=document.id,
-                    source_type="FMP_profile",
-                    is_reported=True,
-                    is_adjusted=False,
-                    confidence=Decimal("0.75"),
-                )
-            )
-            count += 1
-        return count
+            facts.append(_fact_row(document, metric, value, unit, period=period, confidence=Decimal("0.75")))
+        return facts
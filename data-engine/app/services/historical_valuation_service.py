@@ -4,12 +4,19 @@ from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
-from typing import Any
+from typing import Any, NamedTuple
 
+import duckdb
 from sqlalchemy import desc, select
 from sqlalchemy.orm import Session
 
 from app.models import Company, FinancialFact, MarketPrice
+from app.services.analytics_warehouse import AnalyticsWarehouse, default_warehouse
+
+
+class AnnualPoint(NamedTuple):
+    id: int
+    value: Decimal
 
 
 class HistoricalValuationService:
@@ -22,49 +29,20 @@ class HistoricalValuationService:
         "cash_and_equivalents",
     }
 
+    def __init__(self, warehouse: AnalyticsWarehouse | None = None) -> None:
+        self.warehouse = warehouse or default_warehouse()
+
     def build(
         self, db: Session, company: Company, *, years: int = 10
     ) -> dict[str, Any]:
         minimum_year = date.today().year - max(1, min(years, 20)) + 1
-        prices = list(
-            db.scalars(
-                select(MarketPrice)
-                .where(
-                    MarketPrice.company_id == company.id,
-                    MarketPrice.date >= date(minimum_year, 1, 1),
-                )
-                .order_by(MarketPrice.date)
-            ).all()
-        )
-        facts = list(
-            db.scalars(
-                select(FinancialFact)
-                .where(
-                    FinancialFact.company_id == company.id,
-                    FinancialFact.metric.in_(self.METRICS),
-                    FinancialFact.fiscal_year >= minimum_year,
-                )
-                .order_by(
-                    FinancialFact.fiscal_year,
-                    FinancialFact.metric,
-                    desc(FinancialFact.id),
-                )
-            ).all()
-        )
-        annual_prices: dict[int, MarketPrice] = {}
-        for row in prices:
-            annual_prices[row.date.year] = row
-        annual_facts: dict[int, dict[str, FinancialFact]] = {}
-        for row in facts:
-            if row.fiscal_year is None or (row.fiscal_quarter or "").upper().startswith("Q"):
-                continue
-            annual_facts.setdefault(row.fiscal_year, {}).setdefault(row.metric, row)
+        annual_prices, annual_facts = self._annual_rows(db, company, minimum_year)
 
         series = []
         for year in sorted(annual_prices.keys() | annual_facts.keys()):
             price_row = annual_prices.get(year)
             year_facts = annual_facts.get(year, {})
-            price = price_row.close if price_row else None
+            price = price_row.value if price_row else None
             shares = self._value(year_facts, "shares_diluted")
             eps = self._value(year_facts, "eps")
             fcf = self._value(year_facts, "free_cash_flow")
@@ -133,8 +111,92 @@ class HistoricalValuationService:
             },
         }
 
+    def _annual_rows(
+        self, db: Session, company: Company, minimum_year: int
+    ) -> tuple[dict[int, AnnualPoint], dict[int, dict[str, AnnualPoint]]]:
+        """Last close per calendar year and the newest annual fact per year and metric."""
+        if self.warehouse.is_current(db, MarketPrice, FinancialFact):
+            try:
+                return self._annual_rows_warehouse(db, company, minimum_year)
+            except duckdb.IOException:
+                # A concurrent export replaced a part; the database is current.
+                pass
+        prices = db.execute(
+            select(MarketPrice.id, MarketPrice.date, MarketPrice.close)
+            .where(
+                MarketPrice.company_id == company.id,
+                MarketPrice.date >= date(minimum_year, 1, 1),
+            )
+            .order_by(MarketPrice.date)
+        ).all()
+        facts = db.execute(
+            select(
+                FinancialFact.id,
+                FinancialFact.metric,
+                FinancialFact.value,
+                FinancialFact.fiscal_year,
+                FinancialFact.fiscal_quarter,
+            )
+            .where(
+                FinancialFact.company_id == company.id,
+                FinancialFact.metric.in_(self.METRICS),
+                FinancialFact.fiscal_year >= minimum_year,
+            )
+            .order_by(
+                FinancialFact.fiscal_year,
+                FinancialFact.metric,
+                desc(FinancialFact.id),
+            )
+        ).all()
+        annual_prices: dict[int, AnnualPoint] = {}
+        for row in prices:
+            annual_prices[row.date.year] = AnnualPoint(row.id, row.close)
+        annual_facts: dict[int, dict[str, AnnualPoint]] = {}
+        for row in facts:
+            if row.fiscal_year is None or (row.fiscal_quarter or "").upper().startswith("Q"):
+                continue
+            annual_facts.setdefault(row.fiscal_year, {}).setdefault(
+                row.metric, AnnualPoint(row.id, row.value)
+            )
+        return annual_prices, annual_facts
+
+    def _annual_rows_warehouse(
+        self, db: Session, company: Company, minimum_year: int
+    ) -> tuple[dict[int, AnnualPoint], dict[int, dict[str, AnnualPoint]]]:
+        with self.warehouse.connect(db.info.get("tenant_id")) as connection:
+            prices = connection.execute(
+                """
+                SELECT year(date), arg_max(id, date), arg_max(close, date)
+                FROM market_prices
+                WHERE company_id = ? AND date >= ?
+                GROUP BY 1
+                ORDER BY 1
+                """,
+                [company.id, date(minimum_year, 1, 1)],
+            ).fetchall()
+            facts = connection.execute(
+                """
+                SELECT fiscal_year, metric, max(id), arg_max(value, id)
+                FROM financial_facts
+                WHERE company_id = ?
+                  AND list_contains(?, metric)
+                  AND fiscal_year >= ?
+                  AND NOT starts_with(upper(coalesce(fiscal_quarter, '')), 'Q')
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+                """,
+                [company.id, sorted(self.METRICS), minimum_year],
+            ).fetchall()
+        annual_facts: dict[int, dict[str, AnnualPoint]] = {}
+        for year, metric, row_id, value in facts:
+            annual_facts.setdefault(year, {})[metric] = AnnualPoint(row_id, value)
+        return (
+            {year: AnnualPoint(row_id, close) for year, row_id, close in prices},
+            annual_facts,
+        )
+
     @staticmethod
-    def _value(rows: dict[str, FinancialFact], metric: str) -> Decimal | None:
+    def _value(rows: dict[str, AnnualPoint], metric: str) -> Decimal | None:
         row = rows.get(metric)
         return row.value if row else None
 
@@ -19,6 +19,7 @@ from app.services.connectors.finnhub import FinnhubClient
 from app.services.connectors.fmp import FMPClient
 from app.services.portfolio_fx_service import PortfolioFXService
 from app.services.portfolio_ledger_service import PortfolioLedgerService
+from app.services.public_data_cache import PublicDataCache
 from app.services.risk_service import RiskService
 from app.services.screener_service import ScreenerService
 
@@ -42,11 +43,16 @@ class FXProvider(Protocol):
 
 
 class PublicPriceProvider:
-    """FMP first, Finnhub fallback, with per-ticker failure isolation."""
+    """FMP first, Finnhub fallback, with per-ticker failure isolation.
 
-    def __init__(self) -> None:
+    With a ``public_data`` cache, quotes are shared across tenants: each
+    ticker is requested from the providers once per cache interval.
+    """
+
+    def __init__(self, public_data: PublicDataCache | None = None) -> None:
         self.fmp = FMPClient()
         self.finnhub = FinnhubClient()
+        self.public_data = public_data
 
     async def fetch(
         self, companies: list[Company], *, as_of: date
@@ -64,33 +70,62 @@ class PublicPriceProvider:
     async def _one(
         self, company: Company, as_of: date
     ) -> tuple[Company, PriceObservation | None, dict | None]:
+        if self.public_data is None:
+            quote = await self._quote(company.ticker, as_of)
+        else:
+            quote = await self.public_data.fetch(
+                "prices",
+                f"{company.ticker}|{as_of.isoformat()}",
+                lambda: self._quote(company.ticker, as_of),
+                cacheable=lambda payload: "reason" not in payload,
+            )
+        if "reason" in quote:
+            return company, None, {"ticker": company.ticker, "reason": quote["reason"]}
+        observation = PriceObservation(
+            company.ticker,
+            Decimal(quote["price"]),
+            date.fromisoformat(quote["date"]),
+            quote["source"],
+        )
+        return company, observation, None
+
+    async def _quote(self, ticker: str, as_of: date) -> dict[str, str]:
         errors = []
         if self.fmp.configured():
             try:
-                payload = await self.fmp.company_profile(company.ticker)
+                payload = await self.fmp.company_profile(ticker)
                 item = payload[0] if isinstance(payload, list) and payload else None
                 value = Decimal(str(item.get("price"))) if isinstance(item, dict) else None
                 if value and value > 0:
-                    return company, PriceObservation(company.ticker, value, as_of, "FMP"), None
+                    return {"price": str(value), "date": as_of.isoformat(), "source": "FMP"}
             except Exception as exc:
                 errors.append(f"FMP:{type(exc).__name__}")
         if self.finnhub.configured():
             try:
-                payload = await self.finnhub.quote(company.ticker)
+                payload = await self.finnhub.quote(ticker)
                 value = Decimal(str(payload.get("c") or 0))
                 timestamp = int(payload.get("t") or 0)
                 observed_date = datetime.fromtimestamp(timestamp, tz=UTC).date() if timestamp > 0 else as_of
                 if value > 0:
-                    return company, PriceObservation(company.ticker, value, observed_date, "Finnhub"), None
+                    return {"price": str(value), "date": observed_date.isoformat(), "source": "Finnhub"}
             except Exception as exc:
                 errors.append(f"Finnhub:{type(exc).__name__}")
-        reason = ",".join(errors) if errors else "no_price_provider_configured"
-        return company, None, {"ticker": company.ticker, "reason": reason}
+        return {"reason": ",".join(errors) if errors else "no_price_provider_configured"}
 
 
 class ECBFXProvider:
+    def __init__(self, public_data: PublicDataCache | None = None) -> None:
+        self.public_data = public_data
+
     async def fetch(self, *, base_currency: str, quote_currencies: set[str]) -> ECBRates:
-        return await ECBClient().conversion_rates(
+        client = ECBClient()
+        if self.public_data is None:
+            document = await client.daily_document()
+        else:
+            # One document serves every base/quote pair, so cache it whole.
+            document = await self.public_data.fetch("fx", "ecb:eurofxref-daily", client.daily_document)
+        return client.parse_conversion_rates(
+            document,
             base_currency=base_currency,
             quote_currencies=quote_currencies,
         )
@@ -262,7 +297,7 @@ class MarketRefreshService:
         for screen in db.scalars(
             select(SavedScreen).where(SavedScreen.active.is_(True)).order_by(SavedScreen.id)
         ).all():
-            result = ScreenerService().run_saved(db, screen)
+            result = ScreenerService().run_saved(db, screen, incremental=True)
             screen_results.append(
                 {
                     "saved_screen_id": screen.id,
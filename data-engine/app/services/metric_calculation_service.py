@@ -1,5 +1,7 @@
 import re
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
 
 from sqlalchemy import desc, select
@@ -18,6 +20,17 @@ CFROI_REQUIRED_INPUTS = (
     "terminal_non_depreciating_assets",
 )
 
+TAX_RATE_ALIASES = ("effective_tax_rate", "tax_rate")
+TAX_EXPENSE_ALIASES = ("income_tax_expense", "tax_expense")
+PRETAX_INCOME_ALIASES = ("income_before_tax", "pretax_income", "income_before_taxes")
+EQUITY_VALUE_ALIASES = ("market_cap", "market_capitalization", "total_equity")
+WACC_SUPPLEMENTAL_INPUTS = ("cost_of_debt", "interest_expense", "country_risk_premium")
+
+# Mirrors the LIMIT applied by ``_facts_for_metric``; the batched index keeps
+# exactly the same candidate window so both paths select identical facts.
+FACT_CANDIDATE_LIMIT = 20
+UNIVERSE_BATCH_SIZE = 500
+
 METRIC_DEFINITIONS: dict[str, MetricFormula] = {
     "fcf_margin": ("FCF_MARGIN_V1", "free_cash_flow / revenue", ("free_cash_flow", "revenue"), "decimal"),
     "net_margin": ("NET_MARGIN_V1", "net_income / revenue", ("net_income", "revenue"), "decimal"),
@@ -81,17 +94,143 @@ class MetricResult:
     id: int | None = None
 
 
+BATCH_INPUT_METRICS = frozenset(
+    {
+        *(input_metric for _, _, inputs, _ in METRIC_DEFINITIONS.values() for input_metric in inputs),
+        *TAX_RATE_ALIASES,
+        *TAX_EXPENSE_ALIASES,
+        *PRETAX_INCOME_ALIASES,
+        *EQUITY_VALUE_ALIASES,
+        *WACC_SUPPLEMENTAL_INPUTS,
+    }
+)
+
+
 def _quantize(value: Decimal) -> Decimal:
     return value.quantize(Decimal("0.00000001"), rounding=ROUND_HALF_UP)
 
 
+def _fact_order() -> tuple:
+    return (
+        FinancialFact.fiscal_year.desc().nullslast(),
+        desc(FinancialFact.created_at),
+        desc(FinancialFact.id),
+    )
+
+
+@dataclass
+class _MetricFacts:
+    candidates: list[FinancialFact] = field(default_factory=list)
+    by_period: dict[str, FinancialFact] = field(default_factory=dict)
+    by_fiscal_period: dict[tuple[int, str | None], FinancialFact] = field(default_factory=dict)
+
+
+class FactIndex:
+    """In-memory fact candidates keyed by company and metric.
+
+    Each entry holds the same ordered candidate window ``_facts_for_metric``
+    would query, plus first-match lookups by period and by
+    ``(fiscal_year, fiscal_quarter)`` so anchor matching needs no round trip.
+    """
+
+    def __init__(self, facts: Iterable[FinancialFact]) -> None:
+        self._entries: dict[tuple[int, str], _MetricFacts] = {}
+        for fact in facts:
+            entry = self._entries.setdefault((fact.company_id, fact.metric), _MetricFacts())
+            if len(entry.candidates) >= FACT_CANDIDATE_LIMIT:
+                continue
+            entry.candidates.append(fact)
+            entry.by_period.setdefault(fact.period, fact)
+            if fact.fiscal_year is not None:
+                entry.by_fiscal_period.setdefault((fact.fiscal_year, fact.fiscal_quarter), fact)
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        company_ids: Iterable[int],
+        metrics: Iterable[str] = BATCH_INPUT_METRICS,
+    ) -> "FactIndex":
+        ids = sorted(set(company_ids))
+        metric_names = sorted(set(metrics))
+        facts: list[FinancialFact] = []
+        for offset in range(0, len(ids), UNIVERSE_BATCH_SIZE):
+            facts.extend(
+                db.scalars(
+                    select(FinancialFact)
+                    .where(
+                        FinancialFact.company_id.in_(ids[offset : offset + UNIVERSE_BATCH_SIZE]),
+                        FinancialFact.metric.in_(metric_names),
+                    )
+                    .order_by(FinancialFact.company_id, FinancialFact.metric, *_fact_order())
+                ).all()
+            )
+        return cls(facts)
+
+    def candidates(self, company_id: int, metric: str) -> list[FinancialFact]:
+        entry = self._entries.get((company_id, metric))
+        return list(entry.candidates) if entry else []
+
+    def match(self, company_id: int, metric: str, anchor: FinancialFact) -> FinancialFact | None:
+        entry = self._entries.get((company_id, metric))
+        if entry is None:
+            return None
+        match = entry.by_period.get(anchor.period)
+        if match is None and anchor.fiscal_year is not None:
+            match = entry.by_fiscal_period.get((anchor.fiscal_year, anchor.fiscal_quarter))
+        return match
+
+
 class MetricCalculationService:
+    def __init__(self) -> None:
+        self._fact_index: FactIndex | None = None
+
     def calculate_all(self, db: Session, company: Company, persist: bool = True) -> list[MetricResult]:
-        results = [self.calculate(db, company, metric, persist=persist) for metric in METRIC_DEFINITIONS]
+        return self.calculate_universe(db, [company], persist=persist)[company.id]
+
+    def calculate_universe(
+        self,
+        db: Session,
+        companies: Iterable[Company],
+        persist: bool = True,
+    ) -> dict[int, list[MetricResult]]:
+        """Evaluate every metric for many companies against one preloaded fact index.
+
+        Facts are loaded in ``UNIVERSE_BATCH_SIZE`` company batches and results
+        are written with one existing-row lookup and a single flush, instead of
+        one query per anchor and input metric plus one upsert per result.
+        """
+        unique_companies = list({company.id: company for company in companies}.values())
+        index = FactIndex.load(db, [company.id for company in unique_companies])
+        with self._using_index(index):
+            results = {
+                company.id: [
+                    self.calculate(db, company, metric, persist=False)
+                    for metric in METRIC_DEFINITIONS
+                ]
+                for company in unique_companies
+            }
         if persist:
+            self._upsert_many(
+                db,
+                [
+                    (company, result)
+                    for company in unique_companies
+                    for result in results[company.id]
+                ],
+            )
             db.commit()
         return results
 
+    @contextmanager
+    def _using_index(self, index: FactIndex) -> Iterator[None]:
+        previous = self._fact_index
+        self._fact_index = index
+        try:
+            yield
+        finally:
+            self._fact_index = previous
+
     def calculate(self, db: Session, company: Company, metric: str, persist: bool = True) -> MetricResult:
         if metric not in METRIC_DEFINITIONS:
             raise ValueError(f"Unsupported calculated metric: {metric}")
@@ -245,16 +384,20 @@ class MetricCalculationService:
         return facts
 
     def _facts_for_metric(self, db: Session, company: Company, metric: str) -> list[FinancialFact]:
+        if self._fact_index is not None:
+            return self._fact_index.candidates(company.id, metric)
         return list(
             db.scalars(
                 select(FinancialFact)
                 .where(FinancialFact.company_id == company.id, FinancialFact.metric == metric)
-                .order_by(FinancialFact.fiscal_year.desc().nullslast(), desc(FinancialFact.created_at))
-                .limit(20)
+                .order_by(*_fact_order())
+                .limit(FACT_CANDIDATE_LIMIT)
             ).all()
         )
 
     def _match_fact(self, db: Session, company: Company, metric: str, anchor: FinancialFact) -> FinancialFact | None:
+        if self._fact_index is not None:
+            return self._fact_index.match(company.id, metric, anchor)
         candidates = self._facts_for_metric(db, company, metric)
         for candidate in candidates:
             if candidate.period == anchor.period:
@@ -390,7 +533,7 @@ class MetricCalculationService:
         direct = self._match_alias(
             db,
             company,
-            ("effective_tax_rate", "tax_rate"),
+            TAX_RATE_ALIASES,
             anchor,
             reported_only=True,
             allow_latest=allow_latest,
@@ -412,7 +555,7 @@ class MetricCalculationService:
         tax_expense = self._match_alias(
             db,
             company,
-            ("income_tax_expense", "tax_expense"),
+            TAX_EXPENSE_ALIASES,
             anchor,
             reported_only=True,
             allow_latest=allow_latest,
@@ -421,7 +564,7 @@ class MetricCalculationService:
         pretax_income = self._match_alias(
             db,
             company,
-            ("income_before_tax", "pretax_income", "income_before_taxes"),
+            PRETAX_INCOME_ALIASES,
             pretax_anchor,
             reported_only=True,
         )
@@ -607,7 +750,7 @@ class MetricCalculationService:
             equity = self._match_alias(
                 db,
                 company,
-                ("market_cap", "market_capitalization", "total_equity"),
+                EQUITY_VALUE_ALIASES,
                 anchor,
                 allow_latest=True,
             )
@@ -907,15 +1050,60 @@ class MetricCalculationService:
             )
         )
         if metric is None:
-            metric = CalculatedMetric(
-                company_id=company.id,
-                metric=result.metric,
-                period=result.period,
-                definition_version=result.definition_version,
-                formula=result.formula,
-            )
+            metric = self._new_calculated_metric(company, result)
             db.add(metric)
+        self._apply_result(metric, result)
+        db.flush()
+        return metric
 
+    def _upsert_many(
+        self,
+        db: Session,
+        results: list[tuple[Company, MetricResult]],
+    ) -> None:
+        if not results:
+            return
+        existing: dict[tuple[int, str, str, str], CalculatedMetric] = {}
+        company_ids = sorted({company.id for company, _ in results})
+        for offset in range(0, len(company_ids), UNIVERSE_BATCH_SIZE):
+            rows = db.scalars(
+                select(CalculatedMetric)
+                .where(
+                    CalculatedMetric.company_id.in_(company_ids[offset : offset + UNIVERSE_BATCH_SIZE]),
+                    CalculatedMetric.metric.in_(list(METRIC_DEFINITIONS)),
+                )
+                .order_by(CalculatedMetric.id)
+            ).all()
+            for row in rows:
+                existing.setdefault(
+                    (row.company_id, row.metric, row.period, row.definition_version),
+                    row,
+                )
+
+        stored_rows: list[tuple[CalculatedMetric, MetricResult]] = []
+        for company, result in results:
+            key = (company.id, result.metric, result.period, result.definition_version)
+            metric = existing.get(key)
+            if metric is None:
+                metric = self._new_calculated_metric(company, result)
+                db.add(metric)
+                existing[key] = metric
+            self._apply_result(metric, result)
+            stored_rows.append((metric, result))
+        db.flush()
+        for metric, result in stored_rows:
+            result.id = metric.id
+
+    def _new_calculated_metric(self, company: Company, result: MetricResult) -> CalculatedMetric:
+        return CalculatedMetric(
+            company_id=company.id,
+            metric=result.metric,
+            period=result.period,
+            definition_version=result.definition_version,
+            formula=result.formula,
+        )
+
+    def _apply_result(self, metric: CalculatedMetric, result: MetricResult) -> None:
         metric.value = result.value
         metric.unit = result.unit
         metric.fiscal_year = result.fiscal_year
@@ -927,5 +1115,3 @@ class MetricCalculationService:
         metric.source_fact_ids = result.source_fact_ids
         metric.calculation_trace = result.calculation_trace
         metric.confidence = result.confidence
-        db.flush()
-        return metric
@@ -1,9 +1,11 @@
 from decimal import Decimal
 
-from sqlalchemy import desc, select
+import duckdb
+from sqlalchemy import desc, func, select
 from sqlalchemy.orm import Session
 
 from app.models import Company, FinancialFact, PeerRelationship
+from app.services.analytics_warehouse import AnalyticsWarehouse, default_warehouse
 from app.services.metric_calculation_service import METRIC_DEFINITIONS, MetricCalculationService, MetricResult
 
 
@@ -25,8 +27,9 @@ def _decimal_string(value: Decimal | None) -> str | None:
 
 
 class PeerComparisonService:
-    def __init__(self) -> None:
+    def __init__(self, warehouse: AnalyticsWarehouse | None = None) -> None:
         self.metric_service = MetricCalculationService()
+        self.warehouse = warehouse or default_warehouse()
 
     def compare(
         self,
@@ -39,7 +42,11 @@ class PeerComparisonService:
         metric_names = [metric for metric in (metrics or DEFAULT_PEER_METRICS) if metric in METRIC_DEFINITIONS]
         peers, basis, selection_trace = self._find_peers(db, company, limit)
         participants = [company, *peers]
-        rows = [self._company_row(db, participant, metric_names, participant.id == company.id, refresh) for participant in participants]
+        results = self.metric_service.calculate_universe(db, participants, persist=refresh)
+        rows = [
+            self._company_row(participant, results[participant.id], metric_names, participant.id == company.id)
+            for participant in participants
+        ]
 
         return {
             "ticker": company.ticker,
@@ -87,13 +94,14 @@ class PeerComparisonService:
                 select(Company).where(Company.id != company.id)
             ).all()
         )
-        target_market_cap = self._latest_market_cap(db, company.id)
+        market_caps = self._latest_market_caps(db)
+        target_market_cap = market_caps.get(company.id)
         scored: list[tuple[float, Company, list[str], dict]] = []
         for candidate in candidates:
             if candidate.id in selected_ids:
                 continue
             score, rationale, dimensions = self._peer_score(
-                db, company, candidate, target_market_cap
+                company, candidate, target_market_cap, market_caps.get(candidate.id)
             )
             if score <= 0:
                 continue
@@ -142,10 +150,10 @@ class PeerComparisonService:
 
     def _peer_score(
         self,
-        db: Session,
         target: Company,
         candidate: Company,
         target_market_cap: Decimal | None,
+        candidate_market_cap: Decimal | None,
     ) -> tuple[float, list[str], dict]:
         score = 0.0
         rationale: list[str] = []
@@ -187,7 +195,6 @@ class PeerComparisonService:
             score += 0.03
             dimensions["exchange"] = 1.0
 
-        candidate_market_cap = self._latest_market_cap(db, candidate.id)
         if (
             target_market_cap is not None
             and target_market_cap > 0
@@ -203,34 +210,62 @@ class PeerComparisonService:
             rationale.append(f"market-cap ratio {float(ratio):.2f}x")
         return score, rationale, dimensions
 
-    def _latest_market_cap(
-        self, db: Session, company_id: int
-    ) -> Decimal | None:
-        fact = db.scalar(
-            select(FinancialFact)
-            .where(
-                FinancialFact.company_id == company_id,
-                FinancialFact.metric == "market_cap",
-            )
-            .order_by(
-                FinancialFact.fiscal_year.desc().nullslast(),
-                desc(FinancialFact.created_at),
+    def _latest_market_caps(self, db: Session) -> dict[int, Decimal]:
+        """Newest ``market_cap`` fact per company, for the whole universe at once."""
+        if self.warehouse.is_current(db, FinancialFact):
+            try:
+                with self.warehouse.connect(db.info.get("tenant_id")) as connection:
+                    return dict(
+                        connection.execute(
+                            """
+                            SELECT company_id, value
+                            FROM financial_facts
+                            WHERE metric = 'market_cap'
+                            QUALIFY row_number() OVER (
+                                PARTITION BY company_id
+                                ORDER BY fiscal_year DESC NULLS LAST, created_at DESC, id DESC
+                            ) = 1
+                            """
+                        ).fetchall()
+                    )
+            except duckdb.IOException:
+                # A concurrent export replaced a part; the database is current.
+                pass
+        ranked = (
+            select(
+                FinancialFact.company_id,
+                FinancialFact.value,
+                func.row_number()
+                .over(
+                    partition_by=FinancialFact.company_id,
+                    order_by=(
+                        FinancialFact.fiscal_year.desc().nullslast(),
+                        desc(FinancialFact.created_at),
+                        desc(FinancialFact.id),
+                    ),
+                )
+                .label("position"),
             )
-            .limit(1)
+            .where(FinancialFact.metric == "market_cap")
+            .subquery()
         )
-        return fact.value if fact else None
+        return {
+            company_id: value
+            for company_id, value in db.execute(
+                select(ranked.c.company_id, ranked.c.value).where(ranked.c.position == 1)
+            )
+        }
 
     def _company_row(
         self,
-        db: Session,
         company: Company,
+        metric_results: list[MetricResult],
         metric_names: list[str],
         is_target: bool,
-        refresh: bool,
     ) -> dict:
         results = {
             result.metric: result
-            for result in self.metric_service.calculate_all(db, company, persist=refresh)
+            for result in metric_results
             if result.metric in metric_names
         }
         return {
@@ -1,14 +1,125 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections.abc import Iterable
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import desc, select
+import numpy as np
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
 
 from app.models import FXRate, Portfolio
 
 
+FX_CURVE_KEY = "portfolio_fx_curve"
+# ECB reference rates are all quoted against EUR, so it is the one currency
+# every stored pair is likely to share.
+CROSS_CURRENCY = "EUR"
+
+
+class FXCurve:
+    """Every FX quote of one tenant as date-sorted series per currency pair.
+
+    As-of lookups keep the precedence of the former point queries: the latest
+    direct quote on or before the date, otherwise the inverse of the latest
+    reverse quote. Pairs with neither fall back to a cross rate through EUR.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, str, date, Decimal]]) -> None:
+        points: dict[tuple[str, str], list[tuple[date, Decimal]]] = {}
+        for base, quote, rate_date, rate in rows:
+            points.setdefault((base.upper(), quote.upper()), []).append((rate_date, rate))
+        self._pairs: dict[tuple[str, str], tuple[list[date], list[Decimal]]] = {}
+        for pair, series in points.items():
+            # Stable: rows arrive by (rate_date, created_at), so the newest
+            # duplicate of a date stays last and wins the lookup.
+            series.sort(key=lambda point: point[0])
+            self._pairs[pair] = ([day for day, _ in series], [rate for _, rate in series])
+        self._arrays: dict[tuple[str, str], tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(days) for days, _ in self._pairs.values())
+
+    def rate(self, *, quote_currency: str, base_currency: str, as_of: date) -> Decimal | None:
+        quote = quote_currency.upper()
+        base = base_currency.upper()
+        if quote == base:
+            return Decimal("1")
+        rate = self._stored(quote, base, as_of)
+        if rate is not None or CROSS_CURRENCY in {quote, base}:
+            return rate
+        to_cross = self._stored(quote, CROSS_CURRENCY, as_of)
+        from_cross = self._stored(CROSS_CURRENCY, base, as_of)
+        if to_cross is None or from_cross is None:
+            return None
+        return to_cross * from_cross
+
+    def rates(self, *, quote_currency: str, base_currency: str, days: np.ndarray) -> np.ndarray:
+        """Vectorized :meth:`rate` for ``datetime64[D]`` days; NaN where missing."""
+        quote = quote_currency.upper()
+        base = base_currency.upper()
+        days = np.asarray(days, dtype="datetime64[D]")
+        if quote == base:
+            return np.ones(len(days))
+        result = self._stored_rates(quote, base, days)
+        missing = np.isnan(result)
+        if missing.any() and CROSS_CURRENCY not in {quote, base}:
+            result[missing] = self._stored_rates(
+                quote, CROSS_CURRENCY, days[missing]
+            ) * self._stored_rates(CROSS_CURRENCY, base, days[missing])
+        return result
+
+    def _stored(self, quote: str, base: str, as_of: date) -> Decimal | None:
+        direct = self._pairs.get((base, quote))
+        if direct is not None:
+            index = bisect_right(direct[0], as_of) - 1
+            if index >= 0:
+                return direct[1][index]
+        inverse = self._pairs.get((quote, base))
+        if inverse is not None:
+            index = bisect_right(inverse[0], as_of) - 1
+            if index >= 0 and inverse[1][index]:
+                return Decimal("1") / inverse[1][index]
+        return None
+
+    def _stored_rates(self, quote: str, base: str, days: np.ndarray) -> np.ndarray:
+        result = np.full(len(days), np.nan)
+        # Inverse quotes only fill dates the direct series does not cover yet.
+        for pair, invert in (((base, quote), False), ((quote, base), True)):
+            series = self._series(pair)
+            if series is None:
+                continue
+            series_days, values = series
+            index = np.searchsorted(series_days, days, side="right") - 1
+            fill = np.isnan(result) & (index >= 0)
+            selected = values[index[fill]]
+            if invert:
+                with np.errstate(divide="ignore"):
+                    selected = np.where(selected != 0, 1 / selected, np.nan)
+            result[fill] = selected
+        return result
+
+    def _series(self, pair: tuple[str, str]) -> tuple[np.ndarray, np.ndarray] | None:
+        if pair not in self._pairs:
+            return None
+        arrays = self._arrays.get(pair)
+        if arrays is None:
+            days, rates = self._pairs[pair]
+            arrays = (
+                np.array(days, dtype="datetime64[D]"),
+                np.array([float(rate) for rate in rates]),
+            )
+            self._arrays[pair] = arrays
+        return arrays
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_fx_curve(session: Session, _previous_transaction) -> None:
+    # A rolled-back upsert may already be part of a reloaded curve.
+    session.info.pop(FX_CURVE_KEY, None)
+
+
 class PortfolioFXService:
     """Tenant-scoped portfolio configuration and point-in-time FX lookup."""
 
@@ -41,6 +152,29 @@ class PortfolioFXService:
         db.flush()
         return portfolio
 
+    def curve(self, db: Session) -> FXCurve:
+        """All FX quotes of the session's tenant, loaded once per session.
+
+        The curve is kept in ``db.info`` so every service handling a request
+        shares one query; :meth:`upsert_rate` and rollbacks drop it.
+        """
+        tenant_id = db.info.get("tenant_id")
+        cached = db.info.get(FX_CURVE_KEY)
+        if cached is not None and cached[0] == tenant_id:
+            return cached[1]
+        curve = FXCurve(
+            db.execute(
+                select(
+                    FXRate.base_currency,
+                    FXRate.quote_currency,
+                    FXRate.rate_date,
+                    FXRate.rate,
+                ).order_by(FXRate.rate_date, FXRate.created_at)
+            ).tuples().all()
+        )
+        db.info[FX_CURVE_KEY] = (tenant_id, curve)
+        return curve
+
     def rate(
         self,
         db: Session,
@@ -49,35 +183,9 @@ class PortfolioFXService:
         base_currency: str,
         as_of: date,
     ) -> Decimal | None:
-        quote = quote_currency.upper()
-        base = base_currency.upper()
-        if quote == base:
-            return Decimal("1")
-        direct = db.scalar(
-            select(FXRate)
-            .where(
-                FXRate.base_currency == base,
-                FXRate.quote_currency == quote,
-                FXRate.rate_date <= as_of,
-            )
-            .order_by(desc(FXRate.rate_date), desc(FXRate.created_at))
-            .limit(1)
+        return self.curve(db).rate(
+            quote_currency=quote_currency, base_currency=base_currency, as_of=as_of
         )
-        if direct:
-            return direct.rate
-        inverse = db.scalar(
-            select(FXRate)
-            .where(
-                FXRate.base_currency == quote,
-                FXRate.quote_currency == base,
-                FXRate.rate_date <= as_of,
-            )
-            .order_by(desc(FXRate.rate_date), desc(FXRate.created_at))
-            .limit(1)
-        )
-        if inverse and inverse.rate:
-            return Decimal("1") / inverse.rate
-        return None
 
     def upsert_rate(
         self,
@@ -114,4 +222,5 @@ class PortfolioFXService:
         row.rate = rate
         row.source = source.strip()[:80] or "manual"
         db.flush()
+        db.info.pop(FX_CURVE_KEY, None)
         return row
@@ -6,17 +6,31 @@ import math
 from collections import defaultdict
 from datetime import date, timedelta
 from decimal import Decimal
-from statistics import mean, pstdev
 from typing import Any
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import Float, String, cast, select, type_coerce
 from sqlalchemy.orm import Session
 
-from app.models import CashBalance, Company, FinancialFact, MarketPrice, Position, Transaction
+from app.models import CashBalance, Company, FinancialFact, Position, Transaction
+from app.services.cashflow_analytics import (
+    CashFlows,
+    money_weighted_return,
+    money_weighted_returns_by_key,
+)
 from app.services.portfolio_fx_service import PortfolioFXService
 from app.services.portfolio_snapshot_service import PortfolioSnapshotService
+from app.services.price_matrix import (
+    PriceMatrix,
+    beta,
+    compound,
+    drawdowns,
+    pairwise_correlations,
+    weighted_returns,
+)
 
 
+BENCHMARK_TICKER = "SPY"
 EXCHANGE_COUNTRY = {
     "NASDAQ": "United States",
     "NYSE": "United States",
@@ -51,24 +65,17 @@ class PortfolioIntelligenceService:
             )
             for position, company in rows
         }
-        price_series = {
-            company.id: list(
-                db.scalars(
-                    select(MarketPrice)
-                    .where(
-                        MarketPrice.company_id == company.id,
-                        MarketPrice.date >= cutoff,
-                    )
-                    .order_by(MarketPrice.date)
-                ).all()
-            )
-            for _, company in rows
-        }
-        returns = {
-            company_id: self._returns(series)
-            for company_id, series in price_series.items()
-        }
-        indicative_returns = self._portfolio_returns(returns, weights)
+        companies = list({company.id: company for _, company in rows}.values())
+        benchmark = db.scalar(select(Company).where(Company.ticker == BENCHMARK_TICKER))
+        # One query for every held series plus the benchmark, aligned on dates.
+        matrix = PriceMatrix.load(
+            db,
+            [company.id for company in companies] + ([benchmark.id] if benchmark else []),
+            start=cutoff,
+        )
+        returns = matrix.returns()
+        weight_vector = np.array([weights.get(company_id, 0.0) for company_id in matrix.company_ids])
+        indicative_values, present = weighted_returns(returns, weight_vector)
         snapshots = PortfolioSnapshotService().history(db, start=cutoff)
         snapshot_returns = {
             snapshot.snapshot_date: float(snapshot.daily_return)
@@ -76,21 +83,27 @@ class PortfolioIntelligenceService:
             if snapshot.daily_return is not None
         }
         snapshot_exact = self._snapshot_history_is_exact(snapshots)
-        portfolio_returns = snapshot_returns if snapshot_exact else indicative_returns
-        twr = self._compound(list(portfolio_returns.values()))
+        if snapshot_exact:
+            return_dates = np.array(list(snapshot_returns), dtype="datetime64[D]")
+            portfolio_returns = np.array(list(snapshot_returns.values()), dtype=np.float64)
+        else:
+            return_dates = matrix.dates[present]
+            portfolio_returns = indicative_values[present]
+        observations = len(portfolio_returns)
+        twr = compound(portfolio_returns)
         annualized_return = (
-            (1 + twr) ** (252 / len(portfolio_returns)) - 1
-            if portfolio_returns and twr > -1
+            (1 + twr) ** (252 / observations) - 1
+            if observations and twr > -1
             else None
         )
         volatility = (
-            pstdev(portfolio_returns.values()) * math.sqrt(252)
-            if len(portfolio_returns) >= 2
+            float(np.std(portfolio_returns)) * math.sqrt(252)
+            if observations >= 2
             else None
         )
-        downside = [value for value in portfolio_returns.values() if value < 0]
+        downside = portfolio_returns[portfolio_returns < 0]
         downside_volatility = (
-            pstdev(downside) * math.sqrt(252) if len(downside) >= 2 else None
+            float(np.std(downside)) * math.sqrt(252) if len(downside) >= 2 else None
         )
         sharpe = (
             annualized_return / volatility
@@ -102,22 +115,30 @@ class PortfolioIntelligenceService:
             if annualized_return is not None and downside_volatility not in {None, 0}
             else None
         )
-        drawdown = self._drawdown(portfolio_returns)
-        xirr, xirr_trace = self._xirr(db, rows)
-        correlations = self._correlations(returns, rows)
-        beta, beta_trace = self._beta(db, portfolio_returns, cutoff)
+        drawdown = drawdowns(portfolio_returns)
+        base_currency = PortfolioFXService().base_currency(db)
+        flows, ending_value = self._cashflows(db, rows, base_currency)
+        xirr, xirr_trace = self._xirr(flows, ending_value)
+        money_weighted = self._money_weighted(flows, rows, snapshots, snapshot_exact)
+        held_columns = [matrix.column(company.id) for company in companies]
+        correlations = self._correlations(returns, held_columns, companies)
+        beta, beta_trace = self._beta(matrix, returns, benchmark, return_dates, portfolio_returns)
         exposures = self._exposures(rows, total_value)
-        attribution = self._attribution(db, rows, weights, price_series)
-        complete_price_series = sum(len(series) >= 2 for series in price_series.values())
+        attribution = self._attribution(db, rows, weights, matrix)
+        observed = matrix.valid.sum(axis=0)
+        complete_price_series = sum(
+            int(observed[column] >= 2) for column in held_columns if column is not None
+        )
         return {
             "as_of": date.today(),
-            "base_currency": PortfolioFXService().base_currency(db),
+            "base_currency": base_currency,
             "horizon_years": years,
             "performance": {
-                "twr": twr if portfolio_returns else None,
+                "twr": twr if observations else None,
                 "xirr": xirr,
                 "annualized_return": annualized_return,
                 "trace": xirr_trace,
+                "money_weighted": money_weighted,
                 "twr_method": (
                     "daily_portfolio_snapshots"
                     if snapshot_exact
@@ -126,8 +147,11 @@ class PortfolioIntelligenceService:
                 "twr_is_exact": snapshot_exact,
             },
             "risk": {
-                "max_drawdown": drawdown["max_drawdown"],
-                "drawdown_series": drawdown["series"],
+                "max_drawdown": float(drawdown.min(initial=0.0)) if observations else None,
+                "drawdown_series": [
+                    {"date": day, "drawdown": value}
+                    for day, value in zip(return_dates.tolist(), drawdown.tolist())
+                ],
                 "volatility": volatility,
                 "sharpe": sharpe,
                 "sortino": sortino,
@@ -182,166 +206,164 @@ class PortfolioIntelligenceService:
                 return False
         return snapshots[0].pricing_coverage == Decimal("1")
 
-    @staticmethod
-    def _returns(series: list[MarketPrice]) -> dict[date, float]:
-        result = {}
-        for previous, current in zip(series, series[1:]):
-            if previous.adj_close and previous.adj_close > 0:
-                result[current.date] = float(current.adj_close / previous.adj_close - 1)
-        return result
-
-    @staticmethod
-    def _portfolio_returns(
-        returns: dict[int, dict[date, float]], weights: dict[int, float]
-    ) -> dict[date, float]:
-        by_date: dict[date, list[tuple[float, float]]] = defaultdict(list)
-        for company_id, series in returns.items():
-            for day, value in series.items():
-                by_date[day].append((weights.get(company_id, 0), value))
-        result = {}
-        for day, values in sorted(by_date.items()):
-            active_weight = sum(weight for weight, _ in values)
-            if active_weight > 0:
-                result[day] = sum(weight * value for weight, value in values) / active_weight
-        return result
-
-    @staticmethod
-    def _compound(returns: list[float]) -> float:
-        value = 1.0
-        for item in returns:
-            value *= 1 + item
-        return value - 1
-
-    def _drawdown(self, returns: dict[date, float]) -> dict[str, Any]:
-        cumulative = 1.0
-        peak = 1.0
-        minimum = 0.0
-        series = []
-        for day, value in returns.items():
-            cumulative *= 1 + value
-            peak = max(peak, cumulative)
-            drawdown = cumulative / peak - 1
-            minimum = min(minimum, drawdown)
-            series.append({"date": day, "drawdown": drawdown})
-        return {"max_drawdown": minimum if returns else None, "series": series}
-
-    def _xirr(
-        self, db: Session, positions: list[tuple[Position, Company]]
-    ) -> tuple[float | None, dict[str, Any]]:
-        fx = PortfolioFXService()
-        base = fx.base_currency(db)
-        cashflows: list[tuple[date, float]] = []
-        for transaction in db.scalars(select(Transaction).order_by(Transaction.trade_date)).all():
-            rate = fx.rate(
-                db,
-                quote_currency=transaction.currency,
-                base_currency=base,
-                as_of=transaction.trade_date,
+    def _cashflows(
+        self, db: Session, positions: list[tuple[Position, Company]], base: str
+    ) -> tuple[CashFlows, float]:
+        """Base-currency transaction flows keyed by company, plus the ending value."""
+        today = date.today()
+        # Floats and ISO date strings straight from the driver, transposed
+        # into columns: the flows only need arrays, and numpy parses dates.
+        transactions = db.execute(
+            select(
+                type_coerce(Transaction.trade_date, String).label("trade_date"),
+                Transaction.action,
+                cast(
+                    Transaction.quantity * Transaction.price + Transaction.fees, Float
+                ).label("gross"),
+                Transaction.currency,
+                Transaction.company_id,
             )
-            if rate is None:
-                continue
-            amount = float(
-                (transaction.quantity * transaction.price + transaction.fees) * rate
+        ).all()
+        cash_balances = db.scalars(select(CashBalance)).all()
+        count = len(transactions)
+        trade_dates, actions, gross, currency_codes, company_ids = (
+            zip(*transactions) if transactions else ((),) * 5
+        )
+        dates = np.array(trade_dates, dtype="datetime64[D]")
+        signs = np.where(np.array(actions, dtype=str) == "buy", -1.0, 1.0)
+        keys = np.nan_to_num(np.array(company_ids, dtype=np.float64), nan=-1).astype(np.int64)
+        currencies = np.char.upper(np.array(currency_codes, dtype=str))
+        # One FX query for the session instead of two per flow.
+        curve = PortfolioFXService().curve(db)
+        rates = np.full(count, np.nan)
+        for currency in set(currencies.tolist()):
+            selected = currencies == currency
+            rates[selected] = curve.rates(
+                quote_currency=currency, base_currency=base, days=dates[selected]
             )
-            sign = -1 if transaction.action == "buy" else 1
-            if transaction.action in {"dividend", "interest"}:
-                sign = 1
-            cashflows.append((transaction.trade_date, sign * amount))
+        amounts = signs * np.array(gross, dtype=np.float64) * rates
+        converted = ~np.isnan(amounts)
+        flows = CashFlows.from_arrays(dates[converted], amounts[converted], keys[converted])
         ending_value = sum(float(position.market_value_base or 0) for position, _ in positions)
-        for cash in db.scalars(select(CashBalance)).all():
-            rate = fx.rate(
-                db,
-                quote_currency=cash.currency,
-                base_currency=base,
-                as_of=date.today(),
-            )
+        for cash in cash_balances:
+            rate = curve.rate(quote_currency=cash.currency, base_currency=base, as_of=today)
             if rate is not None:
                 ending_value += float(cash.balance * rate)
+        return flows, ending_value
+
+    @staticmethod
+    def _xirr(flows: CashFlows, ending_value: float) -> tuple[float | None, dict[str, Any]]:
         if ending_value:
-            cashflows.append((date.today(), ending_value))
-        if len(cashflows) < 2 or not any(value < 0 for _, value in cashflows):
-            return None, {"status": "insufficient_cashflows", "cashflows": len(cashflows)}
-        origin = min(day for day, _ in cashflows)
+            flows = flows.append(date.today(), ending_value)
+        if len(flows) < 2 or not (flows.amounts < 0).any():
+            return None, {"status": "insufficient_cashflows", "cashflows": len(flows)}
+        rate = flows.xirr()
+        if rate is None:
+            return None, {"status": "no_xirr_root", "cashflows": len(flows)}
+        return rate, {
+            "status": "calculated",
+            "method": "newton_brent_xirr",
+            "cashflows": len(flows),
+        }
 
-        def npv(rate: float) -> float:
-            return sum(
-                value / ((1 + rate) ** ((day - origin).days / 365.0))
-                for day, value in cashflows
+    @staticmethod
+    def _money_weighted(
+        flows: CashFlows,
+        positions: list[tuple[Position, Company]],
+        snapshots: list[Any],
+        snapshot_exact: bool,
+    ) -> dict[str, Any]:
+        """Per-position XIRR and calendar-year portfolio MWR from exact snapshots."""
+        by_company = money_weighted_returns_by_key(
+            flows,
+            {
+                company.id: float(position.market_value_base or 0)
+                for position, company in positions
+            },
+            as_of=date.today(),
+        )
+        periods = []
+        if snapshot_exact:
+            flow_dates = np.array(
+                [snapshot.snapshot_date for snapshot in snapshots], dtype="datetime64[D]"
             )
-
-        low, high = -0.9999, 10.0
-        if npv(low) * npv(high) > 0:
-            return None, {"status": "no_xirr_root", "cashflows": len(cashflows)}
-        for _ in range(200):
-            middle = (low + high) / 2
-            if abs(npv(middle)) < 1e-8:
-                break
-            if npv(low) * npv(middle) <= 0:
-                high = middle
-            else:
-                low = middle
-        return middle, {
-            "status": "calculated",
-            "method": "bisection_xirr",
-            "cashflows": len(cashflows),
+            # Snapshot flows are inflows into the portfolio: the investor paid them.
+            flow_amounts = np.array(
+                [-float(snapshot.net_external_flow_base or 0) for snapshot in snapshots]
+            )
+            opening = snapshots[0]
+            for index, snapshot in enumerate(snapshots):
+                following = snapshots[index + 1] if index + 1 < len(snapshots) else None
+                if following is not None and following.snapshot_date.year == snapshot.snapshot_date.year:
+                    continue
+                periods.append(
+                    {
+                        "start": opening.snapshot_date,
+                        "end": snapshot.snapshot_date,
+                        "mwr": money_weighted_return(
+                            flow_dates,
+                            flow_amounts,
+                            start=opening.snapshot_date,
+                            end=snapshot.snapshot_date,
+                            start_value=float(opening.total_value_base),
+                            end_value=float(snapshot.total_value_base),
+                        )
+                        if snapshot is not opening
+                        else None,
+                    }
+                )
+                opening = snapshot
+        return {
+            "positions": {
+                company.ticker: by_company.get(company.id) for _, company in positions
+            },
+            "periods": periods,
         }
 
     @staticmethod
     def _correlations(
-        returns: dict[int, dict[date, float]], rows: list[tuple[Position, Company]]
+        returns: np.ndarray, columns: list[int | None], companies: list[Company]
     ) -> dict[str, dict[str, float | None]]:
-        result: dict[str, dict[str, float | None]] = {}
-        for _, left_company in rows:
-            result[left_company.ticker] = {}
-            for _, right_company in rows:
-                left = returns.get(left_company.id, {})
-                right = returns.get(right_company.id, {})
-                dates = sorted(left.keys() & right.keys())
-                if left_company.id == right_company.id and dates:
-                    correlation = 1.0
-                elif len(dates) < 3:
-                    correlation = None
-                else:
-                    xs, ys = [left[day] for day in dates], [right[day] for day in dates]
-                    x_mean, y_mean = mean(xs), mean(ys)
-                    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
-                    denominator = math.sqrt(
-                        sum((x - x_mean) ** 2 for x in xs)
-                        * sum((y - y_mean) ** 2 for y in ys)
-                    )
-                    correlation = numerator / denominator if denominator else None
-                result[left_company.ticker][right_company.ticker] = correlation
-        return result
+        # Assets without prices get an all-NaN column, which yields None.
+        aligned = np.full((returns.shape[0], len(columns)), np.nan)
+        for index, column in enumerate(columns):
+            if column is not None:
+                aligned[:, index] = returns[:, column]
+        matrix = pairwise_correlations(aligned).tolist()
+        tickers = [company.ticker for company in companies]
+        return {
+            ticker: {
+                other: None if math.isnan(value) else value
+                for other, value in zip(tickers, row)
+            }
+            for ticker, row in zip(tickers, matrix)
+        }
 
     @staticmethod
     def _beta(
-        db: Session, portfolio_returns: dict[date, float], cutoff: date
+        matrix: PriceMatrix,
+        returns: np.ndarray,
+        benchmark: Company | None,
+        return_dates: np.ndarray,
+        portfolio_returns: np.ndarray,
     ) -> tuple[float | None, dict[str, Any]]:
-        benchmark = db.scalar(select(Company).where(Company.ticker == "SPY"))
         if benchmark is None:
-            return None, {"status": "missing_benchmark", "benchmark": "SPY"}
-        prices = list(
-            db.scalars(
-                select(MarketPrice)
-                .where(MarketPrice.company_id == benchmark.id, MarketPrice.date >= cutoff)
-                .order_by(MarketPrice.date)
-            ).all()
-        )
-        benchmark_returns = PortfolioIntelligenceService._returns(prices)
-        dates = sorted(portfolio_returns.keys() & benchmark_returns.keys())
-        if len(dates) < 20:
-            return None, {"status": "insufficient_overlap", "observations": len(dates)}
-        portfolio = [portfolio_returns[day] for day in dates]
-        market = [benchmark_returns[day] for day in dates]
-        market_mean = mean(market)
-        variance = sum((value - market_mean) ** 2 for value in market)
-        covariance = sum(
-            (left - mean(portfolio)) * (right - market_mean)
-            for left, right in zip(portfolio, market)
+            return None, {"status": "missing_benchmark", "benchmark": BENCHMARK_TICKER}
+        column = matrix.column(benchmark.id)
+        benchmark_returns = returns[:, column] if column is not None else np.empty(0)
+        observed = ~np.isnan(benchmark_returns)
+        _, portfolio_index, market_index = np.intersect1d(
+            return_dates, matrix.dates[observed], assume_unique=True, return_indices=True
         )
+        if len(portfolio_index) < 20:
+            return None, {"status": "insufficient_overlap", "observations": len(portfolio_index)}
         return (
-            covariance / variance if variance else None,
-            {"status": "calculated", "benchmark": "SPY", "observations": len(dates)},
+            beta(portfolio_returns[portfolio_index], benchmark_returns[observed][market_index]),
+            {
+                "status": "calculated",
+                "benchmark": BENCHMARK_TICKER,
+                "observations": len(portfolio_index),
+            },
         )
 
     @staticmethod
@@ -368,43 +390,46 @@ class PortfolioIntelligenceService:
         db: Session,
         rows: list[tuple[Position, Company]],
         weights: dict[int, float],
-        price_series: dict[int, list[MarketPrice]],
+        matrix: PriceMatrix,
     ) -> dict[str, Any]:
+        company_ids = list({company.id for _, company in rows})
+        total_returns = matrix.total_returns()
+        facts_by_company: dict[int, dict[str, list[FinancialFact]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for fact in db.scalars(
+            select(FinancialFact)
+            .where(
+                FinancialFact.company_id.in_(company_ids),
+                FinancialFact.metric.in_(["eps", "shares_diluted"]),
+            )
+            .order_by(FinancialFact.fiscal_year)
+        ):
+            facts_by_company[fact.company_id][fact.metric].append(fact)
+        dividends_by_company: dict[int, float] = defaultdict(float)
+        for company_id, quantity, price in db.execute(
+            select(Transaction.company_id, Transaction.quantity, Transaction.price).where(
+                Transaction.company_id.in_(company_ids),
+                Transaction.action == "dividend",
+            )
+        ):
+            dividends_by_company[company_id] += float(quantity * price)
+
         positions = []
         totals = defaultdict(float)
         for position, company in rows:
-            prices = price_series.get(company.id, [])
+            column = matrix.column(company.id)
             total_return = (
-                float(prices[-1].adj_close / prices[0].adj_close - 1)
-                if len(prices) >= 2 and prices[0].adj_close
+                float(total_returns[column])
+                if column is not None and not math.isnan(total_returns[column])
                 else None
             )
-            facts = list(
-                db.scalars(
-                    select(FinancialFact)
-                    .where(
-                        FinancialFact.company_id == company.id,
-                        FinancialFact.metric.in_(["eps", "shares_diluted"]),
-                    )
-                    .order_by(FinancialFact.fiscal_year)
-                ).all()
-            )
-            by_metric = defaultdict(list)
-            for fact in facts:
-                by_metric[fact.metric].append(fact)
+            by_metric = facts_by_company[company.id]
             fundamental_growth = self._series_change(by_metric["eps"])
             share_change = self._series_change(by_metric["shares_diluted"])
             dilution = max(share_change or 0, 0)
             buybacks = max(-(share_change or 0), 0)
-            dividends = sum(
-                float(transaction.quantity * transaction.price)
-                for transaction in db.scalars(
-                    select(Transaction).where(
-                        Transaction.company_id == company.id,
-                        Transaction.action == "dividend",
-                    )
-                ).all()
-            )
+            dividends = dividends_by_company[company.id]
             dividend_return = (
                 dividends / float(position.cost_basis_native)
                 if position.cost_basis_native and position.cost_basis_native > 0
@@ -0,0 +1,279 @@
+"""Aligned (days x assets) price matrices and the vectorized kernels on them."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import duckdb
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, String, cast, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.models import MarketPrice
+from app.services.analytics_warehouse import AnalyticsWarehouse, default_warehouse, table_watermark
+
+
+CACHE_SIZE = 8
+
+_cache: OrderedDict[tuple[Any, ...], tuple[tuple[Any, ...], PriceMatrix]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PriceMatrix:
+    """Adjusted closes for a set of companies on the union of their dates.
+
+    ``prices`` is float64 with NaN where a company has no row for that date;
+    ``valid`` is the matching observation mask.
+    """
+
+    dates: np.ndarray
+    company_ids: tuple[int, ...]
+    prices: np.ndarray
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        company_ids: Collection[int],
+        *,
+        start: date | None = None,
+        warehouse: AnalyticsWarehouse | None = None,
+    ) -> PriceMatrix:
+        """Load every requested price series with a single query.
+
+        Matrices are cached per process and reused while no price has been
+        inserted or updated, which the newest ``id``/``updated_at`` detects
+        from two index lookups. A cold load reads the warehouse's Parquet
+        export instead of the database when that export saw the same
+        watermark.
+        """
+        ids = tuple(sorted(set(company_ids)))
+        if not ids:
+            return cls.empty()
+        connection = db.connection()
+        watermark = table_watermark(connection, MarketPrice)
+        key = (id(connection.engine), str(connection.engine.url), ids, start)
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None and cached[0] == watermark:
+                _cache.move_to_end(key)
+                return cached[1]
+        warehouse = warehouse or default_warehouse()
+        matrix = None
+        if warehouse.matches(MarketPrice.__tablename__, watermark):
+            try:
+                matrix = cls._load_warehouse(warehouse, ids, start)
+            except duckdb.IOException:
+                # A concurrent export replaced a part; the database is current.
+                matrix = None
+        if matrix is None:
+            # Core columns without Decimal/date result processing: the matrix
+            # only needs floats, and numpy parses ISO date strings itself.
+            query = select(
+                MarketPrice.company_id,
+                type_coerce(MarketPrice.date, String),
+                cast(MarketPrice.adj_close, Float),
+            ).where(MarketPrice.company_id.in_(ids))
+            if start is not None:
+                query = query.where(MarketPrice.date >= start)
+            # Plain tuples straight from the DBAPI cursor: wrapping every
+            # price in a Row costs more than the fetch itself.
+            with connection.execute(query) as result:
+                assert result.cursor is not None
+                rows = result.cursor.fetchall()
+            matrix = cls.from_rows(rows, ids)
+        with _cache_lock:
+            _cache[key] = (watermark, matrix)
+            _cache.move_to_end(key)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+        return matrix
+
+    @classmethod
+    def _load_warehouse(
+        cls, warehouse: AnalyticsWarehouse, ids: tuple[int, ...], start: date | None
+    ) -> PriceMatrix:
+        with warehouse.connect(None) as connection:
+            arrays = connection.execute(
+                "SELECT company_id, date, CAST(adj_close AS DOUBLE) AS price FROM market_prices "
+                "WHERE list_contains(?, company_id) AND date >= ?",
+                [list(ids), start or date.min],
+            ).fetchnumpy()
+        return cls.from_arrays(
+            np.asarray(arrays["company_id"], dtype=np.int64),
+            np.asarray(arrays["date"]).astype("datetime64[D]"),
+            np.ma.filled(np.ma.asarray(arrays["price"], dtype=np.float64), np.nan),
+            ids,
+        )
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Sequence[Any]], company_ids: Sequence[int]
+    ) -> PriceMatrix:
+        """Pivot ``(company_id, date, price)`` rows; dates may be ISO strings."""
+        if not len(rows):
+            ids = tuple(company_ids)
+            return cls(np.array([], dtype="datetime64[D]"), ids, np.empty((0, len(ids))))
+        frame = pd.DataFrame.from_records(rows, columns=["company_id", "date", "price"])
+        # Few distinct dates repeat across many rows: hash them once and let
+        # numpy convert only the distinct values.
+        codes, seen = pd.factorize(frame["date"])
+        distinct = np.array(
+            [str(day)[:10] if not isinstance(day, date) else day for day in seen],
+            dtype="datetime64[D]",
+        )
+        return cls._pivot(
+            frame["company_id"].to_numpy(dtype=np.int64),
+            distinct[codes],
+            frame["price"].to_numpy(dtype=np.float64, na_value=np.nan),
+            company_ids,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        row_ids: np.ndarray,
+        days: np.ndarray,
+        values: np.ndarray,
+        company_ids: Sequence[int],
+    ) -> PriceMatrix:
+        """Pivot column arrays of company ids, ``datetime64[D]`` days and prices."""
+        return cls._pivot(row_ids, days, values, company_ids)
+
+    @classmethod
+    def _pivot(
+        cls, row_ids: np.ndarray, days: np.ndarray, values: np.ndarray, company_ids: Sequence[int]
+    ) -> PriceMatrix:
+        ids = tuple(company_ids)
+        distinct, rank = np.unique(days, return_inverse=True)
+        id_array = np.asarray(ids, dtype=np.int64)
+        sorter = np.argsort(id_array)
+        asset_index = sorter[np.searchsorted(id_array, row_ids, sorter=sorter)]
+        prices = np.full((len(distinct), len(ids)), np.nan)
+        prices[rank.ravel(), asset_index] = values
+        return cls(distinct.astype("datetime64[D]"), ids, prices)
+
+    @classmethod
+    def empty(cls) -> PriceMatrix:
+        return cls(np.array([], dtype="datetime64[D]"), (), np.empty((0, 0)))
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.prices)
+
+    def column(self, company_id: int) -> int | None:
+        try:
+            return self.company_ids.index(company_id)
+        except ValueError:
+            return None
+
+    def day(self, index: int) -> date:
+        return self.dates[index].astype(date)
+
+    def returns(self) -> np.ndarray:
+        """Simple returns against each asset's previous observation.
+
+        A value appears on every date an asset has a price and an earlier
+        positive price; gaps in one asset do not break the others.
+        """
+        days, assets = self.prices.shape
+        if days == 0:
+            return np.empty((0, assets))
+        valid = self.valid
+        last_seen = np.where(valid, np.arange(days)[:, None], -1)
+        np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+        previous = np.vstack([np.full((1, assets), -1), last_seen[:-1]])
+        has_previous = previous >= 0
+        previous_price = np.where(
+            has_previous,
+            self.prices[np.maximum(previous, 0), np.arange(assets)],
+            np.nan,
+        )
+        usable = valid & has_previous & (previous_price > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(usable, self.prices / previous_price - 1, np.nan)
+
+    def total_returns(self) -> np.ndarray:
+        """Last over first observed price per asset, NaN below two observations."""
+        days, assets = self.prices.shape
+        if days == 0:
+            return np.full(assets, np.nan)
+        valid = self.valid
+        count = valid.sum(axis=0)
+        first = self.prices[valid.argmax(axis=0), np.arange(assets)]
+        last = self.prices[days - 1 - valid[::-1].argmax(axis=0), np.arange(assets)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where((count >= 2) & (first != 0), last / first - 1, np.nan)
+
+
+def weighted_returns(returns: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Weight-normalised cross-sectional return for each date.
+
+    Each date uses only the assets with a return that day, renormalising by
+    their weight. Returns ``(values, present)`` where ``present`` marks dates
+    with positive active weight.
+    """
+    valid = ~np.isnan(returns)
+    active = valid @ weights
+    contribution = np.where(valid, returns, 0.0) @ weights
+    present = active > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(present, contribution / active, np.nan)
+    return values, present
+
+
+def compound(returns: np.ndarray) -> float:
+    return float(np.prod(1 + returns) - 1) if returns.size else 0.0
+
+
+def drawdowns(returns: np.ndarray) -> np.ndarray:
+    """Drawdown from the running peak, with the starting value 1 as first peak."""
+    if not returns.size:
+        return returns
+    cumulative = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(np.maximum(cumulative, 1.0))
+    return cumulative / peak - 1
+
+
+def pairwise_correlations(returns: np.ndarray, *, min_observations: int = 3) -> np.ndarray:
+    """Pearson correlations over the dates both assets share.
+
+    Computed from pairwise-complete sums with matrix products, so every pair
+    is O(days) inside BLAS rather than a Python loop. Pairs with fewer than
+    ``min_observations`` shared dates or zero variance are NaN; the diagonal
+    is 1 for any asset with at least one return.
+    """
+    valid = (~np.isnan(returns)).astype(np.float64)
+    # Centering on each asset's own mean leaves correlations unchanged and
+    # keeps the one-pass sums below from cancelling catastrophically.
+    observed = valid.sum(axis=0)
+    centre = np.nansum(returns, axis=0) / np.maximum(observed, 1)
+    values = np.where(valid > 0, returns - centre, 0.0)
+    count = valid.T @ valid
+    sums = values.T @ valid
+    squares = (values * values).T @ valid
+    products = values.T @ values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = products - sums * sums.T / count
+        variance = squares - sums * sums / count
+        flat = variance <= 1e-12 * squares
+        denominator = np.sqrt(variance * variance.T)
+        correlation = covariance / denominator
+    correlation[(count < min_observations) | flat | flat.T | ~(denominator > 0)] = np.nan
+    np.fill_diagonal(correlation, np.where(np.diag(count) >= 1, 1.0, np.nan))
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def beta(portfolio: np.ndarray, market: np.ndarray) -> float | None:
+    market_deviation = market - market.mean()
+    variance = float(market_deviation @ market_deviation)
+    if not variance:
+        return None
+    return float((portfolio - portfolio.mean()) @ market_deviation) / variance
@@ -0,0 +1,229 @@
+"""Cross-tenant cache for public provider payloads.
+
+Companies, prices, filings, FX rates and feeds are public: every tenant's
+refresh asks the providers for the same resources. Payloads are stored once
+under ``public_data_cache_dir`` so a scheduled global refresh fetches each
+resource once per interval and tenant actors read it from disk.
+
+Layout::
+
+    objects/<digest[:2]>/<digest>.json   canonical JSON, named by its SHA-256
+    refs/<namespace>/<sha256(key)>.json  {"key", "digest", "fetched_at"}
+    locks/<namespace>/<sha256(key)>.lock
+
+Identical payloads (the same feed behind two URLs, an unchanged filing list)
+share one object. A fetch holds the key's lock file, so concurrent readers
+in other workers wait for the first fetch instead of repeating it.
+
+Every changed payload adds an object, so :meth:`PublicDataCache.prune` runs
+after each global refresh: it drops refs older than the longest max age
+(no read accepts them) and then every object no remaining ref points to.
+Writers hold ``locks/store.lock`` shared and prune holds it exclusively, so
+an object cannot be deleted between ``put`` finding it and pointing a ref
+at it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from app.core.config import get_settings
+from app.core.files import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None  # type: ignore[assignment]
+
+
+# How long a tenant read accepts a cached payload. These follow the scheduler
+# intervals, so the global refresh always replaces an entry before it expires.
+MAX_AGE = {
+    "sec": timedelta(hours=4),
+    "ir": timedelta(hours=1),
+    "rss": timedelta(minutes=15),
+    "gdelt": timedelta(minutes=30),
+    "prices": timedelta(hours=1),
+    "fx": timedelta(hours=1),
+}
+DEFAULT_MAX_AGE = timedelta(hours=1)
+RETENTION = max(*MAX_AGE.values(), DEFAULT_MAX_AGE)
+LOCK_POLL_SECONDS = 0.05
+
+
+@lru_cache
+def default_public_data_cache() -> PublicDataCache:
+    return PublicDataCache(get_settings().public_data_cache_dir)
+
+
+class PublicDataCache:
+    """Content-addressed store of JSON payloads keyed by provider resource.
+
+    ``refresh=True`` makes every fetch go to the provider and overwrite the
+    entry; the global refresh uses it, tenant actors use the default reader.
+    """
+
+    def __init__(self, root: str | Path, *, refresh: bool = False) -> None:
+        self.root = Path(root)
+        self.refresh = refresh
+        self.fetches: Counter[str] = Counter()
+        self.hits: Counter[str] = Counter()
+
+    def refreshing(self) -> PublicDataCache:
+        return PublicDataCache(self.root, refresh=True)
+
+    async def fetch(
+        self,
+        namespace: str,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        *,
+        max_age: timedelta | None = None,
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Return the cached payload for ``key`` or fetch and store it.
+
+        ``fetcher`` must return JSON-serialisable data; callers always get
+        the JSON form back, cached or not. Payloads rejected by
+        ``cacheable`` (provider errors) are returned but not stored.
+        """
+        if max_age is None:
+            max_age = MAX_AGE.get(namespace, DEFAULT_MAX_AGE)
+        requested_at = datetime.now(UTC)
+        if not self.refresh:
+            cached = self.get(namespace, key, max_age=max_age)
+            if cached is not None:
+                self.hits[namespace] += 1
+                return cached
+        async with self._lock(namespace, key):
+            # Whoever held the lock may have just fetched the same resource.
+            cached = self.get(
+                namespace,
+                key,
+                max_age=max_age,
+                fetched_after=requested_at if self.refresh else None,
+            )
+            if cached is not None:
+                self.hits[namespace] += 1
+                return cached
+            self.fetches[namespace] += 1
+            payload = _canonical(await fetcher())
+            if cacheable is None or cacheable(payload):
+                self.put(namespace, key, payload)
+            return payload
+
+    def get(
+        self,
+        namespace: str,
+        key: str,
+        *,
+        max_age: timedelta,
+        fetched_after: datetime | None = None,
+    ) -> Any | None:
+        try:
+            ref = json.loads(self._ref_path(namespace, key).read_text())
+            fetched_at = datetime.fromisoformat(ref["fetched_at"])
+            if datetime.now(UTC) - fetched_at > max_age:
+                return None
+            if fetched_after is not None and fetched_at < fetched_after:
+                return None
+            return json.loads(self._object_path(ref["digest"]).read_bytes())
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    def put(self, namespace: str, key: str, payload: Any) -> str:
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        target = self._object_path(digest)
+        with self._store_lock(shared=True):
+            if target.exists():
+                os.utime(target)
+            else:
+                write_atomic(target, data)
+            ref = {"key": key, "digest": digest, "fetched_at": datetime.now(UTC).isoformat()}
+            write_atomic(self._ref_path(namespace, key), json.dumps(ref).encode())
+        return digest
+
+    def prune(self, *, retention: timedelta = RETENTION) -> dict[str, int]:
+        """Delete expired refs, then objects and temp files nothing points to."""
+        cutoff = datetime.now(UTC) - retention
+        removed = {"refs": 0, "objects": 0}
+        with self._store_lock(shared=False):
+            live: set[str] = set()
+            for path in (self.root / "refs").glob("*/*.json"):
+                try:
+                    ref = json.loads(path.read_text())
+                    if datetime.fromisoformat(ref["fetched_at"]) >= cutoff:
+                        live.add(ref["digest"])
+                        continue
+                except (FileNotFoundError, KeyError, ValueError):
+                    pass
+                path.unlink(missing_ok=True)
+                removed["refs"] += 1
+            for path in (self.root / "objects").glob("*/*.json"):
+                if path.stem not in live:
+                    path.unlink(missing_ok=True)
+                    removed["objects"] += 1
+            # Leftovers of writers that died before their replace.
+            for path in self.root.glob("*/**/.*.tmp"):
+                if datetime.fromtimestamp(path.stat().st_mtime, UTC) < cutoff:
+                    path.unlink(missing_ok=True)
+        return removed
+
+    def _ref_path(self, namespace: str, key: str) -> Path:
+        return self.root / "refs" / namespace / f"{_key_digest(key)}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.json"
+
+    @contextmanager
+    def _store_lock(self, *, shared: bool) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        path = self.root / "locks" / "store.lock"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @asynccontextmanager
+    async def _lock(self, namespace: str, key: str) -> AsyncIterator[None]:
+        if fcntl is None:
+            yield
+            return
+        path = self.root / "locks" / namespace / f"{_key_digest(key)}.lock"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as handle:
+            # Poll a non-blocking flock so waiting never blocks the event loop.
+            while True:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(LOCK_POLL_SECONDS)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _key_digest(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _canonical(payload: Any) -> Any:
+    return json.loads(json.dumps(payload, sort_keys=True, default=str))
@@ -1,37 +1,73 @@
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
 from qdrant_client import QdrantClient
 
 from app.core.config import get_settings
+from app.services.embedding_service import get_embedding_service
+from app.services.embedding_store import ChunkEmbeddingStore
+
+
+# One client per Qdrant URL for the whole process. QdrantClient keeps its own
+# HTTP connection pool, so reusing it keeps connections warm across requests.
+_clients: dict[str, QdrantClient] = {}
+_ready_collections: weakref.WeakKeyDictionary[QdrantClient, set[str]] = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def shared_qdrant_client(url: str) -> QdrantClient:
+    client = _clients.get(url)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(url)
+            if client is None:
+                client = QdrantClient(location=url) if url == ":memory:" else QdrantClient(url=url)
+                _clients[url] = client
+    return client
 
 
 class RAGIndex:
     collection_name = "portfolio_research_documents"
     vector_size = 384
+    rebuild_batch_size = 64
+    rebuild_upsert_workers = 4
 
-    def __init__(self) -> None:
+    def __init__(self, client: QdrantClient | None = None) -> None:
         self.settings = get_settings()
+        self.embeddings = get_embedding_service()
+        self._client = client
 
     def client(self) -> QdrantClient:
-        return QdrantClient(url=self.settings.qdrant_url)
-
-    def _embedder(self):
-        from sentence_transformers import SentenceTransformer
-        return SentenceTransformer("all-MiniLM-L6-v2")
+        if self._client is None:
+            self._client = shared_qdrant_client(self.settings.qdrant_url)
+        return self._client
 
     def _ensure_collection(self, client: QdrantClient) -> None:
         from qdrant_client.models import Distance, VectorParams
-        collections = [c.name for c in client.get_collections().collections]
-        if self.collection_name not in collections:
+        if self.collection_name in _ready_collections.get(client, ()):
+            return
+        if not client.collection_exists(self.collection_name):
             client.create_collection(
                 self.collection_name,
                 vectors_config=VectorParams(size=self.vector_size, distance=Distance.COSINE),
             )
+        with _clients_lock:
+            _ready_collections.setdefault(client, set()).add(self.collection_name)
+
+    def _forget_collection(self) -> None:
+        # A failed call may mean the collection was dropped behind our back;
+        # the next call checks for it again instead of trusting the cache.
+        if self._client is not None:
+            _ready_collections.get(self._client, set()).discard(self.collection_name)
 
     def ingest_document(self, db, document) -> dict:
         from sqlalchemy.orm import Session
         from app.models import DocumentChunk
         from sqlalchemy import select
         from qdrant_client.models import PointStruct
-        import uuid
 
         tenant_id = db.info.get("tenant_id")
         if tenant_id is None or document.tenant_id != tenant_id:
@@ -46,9 +82,7 @@ class RAGIndex:
         if not chunks:
             return {"chunks_indexed": 0, "collection": self.collection_name}
 
-        texts = [c.text for c in chunks]
-        embedder = self._embedder()
-        vectors = embedder.encode(texts, normalize_embeddings=True).tolist()
+        vectors = ChunkEmbeddingStore(self.embeddings).encode(db, [c.text for c in chunks])
 
         ticker = None
         if document.company_id:
@@ -85,13 +119,12 @@ class RAGIndex:
             client.upsert(collection_name=self.collection_name, points=points)
             db.commit()
         except Exception as exc:
+            self._forget_collection()
             return {"chunks_indexed": 0, "error": str(exc), "collection": self.collection_name}
 
         return {"chunks_indexed": len(points), "collection": self.collection_name}
 
     def ingest_knowledge_document(self, db, document) -> dict:
-        import uuid
-
         from qdrant_client.models import PointStruct
         from sqlalchemy import select
 
@@ -109,9 +142,9 @@ class RAGIndex:
         )
         if not chunks:
             return {"chunks_indexed": 0, "collection": self.collection_name}
-        vectors = self._embedder().encode(
-            [chunk.content for chunk in chunks], normalize_embeddings=True
-        ).tolist()
+        vectors = ChunkEmbeddingStore(self.embeddings).encode(
+            db, [chunk.content for chunk in chunks]
+        )
         points = []
         for chunk, vector in zip(chunks, vectors):
             point_id = chunk.qdrant_point_id or str(uuid.uuid4())
@@ -140,6 +173,7 @@ class RAGIndex:
             client.upsert(collection_name=self.collection_name, points=points)
             db.commit()
         except Exception as exc:
+            self._forget_collection()
             return {
                 "chunks_indexed": 0,
                 "error": str(exc),
@@ -148,20 +182,31 @@ class RAGIndex:
         return {"chunks_indexed": len(points), "collection": self.collection_name}
 
     def rebuild_tenant(self, db) -> dict:
-        """Recreate one tenant's disposable Qdrant index from PostgreSQL chunks."""
+        """Recreate one tenant's disposable Qdrant index from PostgreSQL chunks.
+
+        Chunks of all documents are streamed through a server-side cursor in
+        ``rebuild_batch_size`` slices. Each slice is embedded in one call and
+        upserted on a small worker pool; once ``2 * rebuild_upsert_workers``
+        upserts are in flight the reader waits, so memory stays bounded no
+        matter how large the tenant is. Vectors come from the chunk embedding
+        store, so after a Qdrant wipe only text never embedded before hits the
+        model.
+        """
         from qdrant_client.models import (
             FieldCondition,
             Filter,
             FilterSelector,
             MatchValue,
+            PointStruct,
         )
-        from sqlalchemy import select
-        from app.models import Document, KnowledgeDocument
+        from sqlalchemy import func, select, update
+        from app.models import Company, Document, DocumentChunk, KnowledgeChunk, KnowledgeDocument
 
         tenant_id = db.info.get("tenant_id")
         if tenant_id is None:
             raise ValueError("Tenant context is required to rebuild the vector index")
 
+        started = time.perf_counter()
         client = self.client()
         self._ensure_collection(client)
         client.delete(
@@ -179,35 +224,157 @@ class RAGIndex:
             wait=True,
         )
 
-        documents = list(
-            db.scalars(
-                select(Document)
-                .where(Document.tenant_id == tenant_id)
-                .order_by(Document.id)
-            ).all()
+        document_chunks = (
+            select(
+                DocumentChunk.id,
+                DocumentChunk.text,
+                DocumentChunk.chunk_index,
+                DocumentChunk.qdrant_point_id,
+                Document.id.label("document_id"),
+                Document.source_type,
+                Document.title,
+                Company.ticker,
+            )
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .outerjoin(Company, Company.id == Document.company_id)
+            .where(Document.tenant_id == tenant_id)
+            .order_by(Document.id, DocumentChunk.chunk_index)
         )
+        knowledge_chunks = (
+            select(
+                KnowledgeChunk.id,
+                KnowledgeChunk.content,
+                KnowledgeChunk.chunk_index,
+                KnowledgeChunk.page_number,
+                KnowledgeChunk.qdrant_point_id,
+                KnowledgeDocument.id.label("knowledge_document_id"),
+                KnowledgeDocument.document_type,
+                KnowledgeDocument.title,
+                KnowledgeDocument.collection_id,
+            )
+            .join(KnowledgeDocument, KnowledgeDocument.id == KnowledgeChunk.knowledge_document_id)
+            .where(KnowledgeDocument.tenant_id == tenant_id)
+            .order_by(KnowledgeDocument.id, KnowledgeChunk.chunk_index)
+        )
+
+        store = ChunkEmbeddingStore(self.embeddings)
         indexed = 0
         errors: list[dict] = []
-        for document in documents:
-            result = self.ingest_document(db, document)
-            indexed += int(result.get("chunks_indexed", 0))
-            if result.get("error"):
-                errors.append({"document_id": document.id, "error": result["error"]})
-        knowledge_documents = list(
-            db.scalars(select(KnowledgeDocument).order_by(KnowledgeDocument.id)).all()
-        )
-        for document in knowledge_documents:
-            result = self.ingest_knowledge_document(db, document)
-            indexed += int(result.get("chunks_indexed", 0))
-            if result.get("error"):
-                errors.append(
-                    {"knowledge_document_id": document.id, "error": result["error"]}
-                )
+        assigned: dict[type, list[dict]] = {DocumentChunk: [], KnowledgeChunk: []}
+        in_flight: dict[Future, tuple[type, list[dict], dict]] = {}
+        max_in_flight = 2 * self.rebuild_upsert_workers
+
+        def settle(done) -> None:
+            nonlocal indexed
+            for future in done:
+                model, new_ids, batch = in_flight.pop(future)
+                try:
+                    future.result()
+                except Exception as exc:
+                    self._forget_collection()
+                    errors.append({**batch, "error": str(exc)})
+                    continue
+                indexed += batch["chunks"]
+                assigned[model].extend(new_ids)
+
+        def submit(model: type, points: list, new_ids: list[dict], batch: dict) -> None:
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                settle(done)
+            future = pool.submit(
+                client.upsert, collection_name=self.collection_name, points=points
+            )
+            in_flight[future] = (model, new_ids, batch)
+
+        with ThreadPoolExecutor(
+            max_workers=self.rebuild_upsert_workers, thread_name_prefix="qdrant-upsert"
+        ) as pool:
+            result = db.execute(document_chunks.execution_options(yield_per=self.rebuild_batch_size))
+            for rows in result.partitions():
+                vectors = store.encode(db, [row.text for row in rows])
+                points = []
+                new_ids = []
+                for row, vector in zip(rows, vectors):
+                    point_id = row.qdrant_point_id or str(uuid.uuid4())
+                    if not row.qdrant_point_id:
+                        new_ids.append({"id": row.id, "qdrant_point_id": point_id})
+                    points.append(PointStruct(
+                        id=point_id,
+                        vector=vector,
+                        payload={
+                            "text": row.text,
+                            "ticker": row.ticker,
+                            "document_id": row.document_id,
+                            "chunk_index": row.chunk_index,
+                            "entity_type": "document_chunk",
+                            "entity_id": row.id,
+                            "source_type": row.source_type,
+                            "title": row.title,
+                            "tenant_id": tenant_id,
+                        },
+                    ))
+                batch = {
+                    "document_ids": sorted({row.document_id for row in rows}),
+                    "chunks": len(points),
+                }
+                submit(DocumentChunk, points, new_ids, batch)
+            result = db.execute(knowledge_chunks.execution_options(yield_per=self.rebuild_batch_size))
+            for rows in result.partitions():
+                vectors = store.encode(db, [row.content for row in rows])
+                points = []
+                new_ids = []
+                for row, vector in zip(rows, vectors):
+                    point_id = row.qdrant_point_id or str(uuid.uuid4())
+                    if not row.qdrant_point_id:
+                        new_ids.append({"id": row.id, "qdrant_point_id": point_id})
+                    points.append(PointStruct(
+                        id=point_id,
+                        vector=vector,
+                        payload={
+                            "text": row.content,
+                            "title": row.title,
+                            "source_type": row.document_type,
+                            "knowledge_document_id": row.knowledge_document_id,
+                            "collection_id": row.collection_id,
+                            "chunk_index": row.chunk_index,
+                            "page_number": row.page_number,
+                            "entity_type": "knowledge_chunk",
+                            "entity_id": row.id,
+                            "tenant_id": tenant_id,
+                        },
+                    ))
+                batch = {
+                    "knowledge_document_ids": sorted({row.knowledge_document_id for row in rows}),
+                    "chunks": len(points),
+                }
+                submit(KnowledgeChunk, points, new_ids, batch)
+            settle(list(in_flight))
+
+        # Point ids are written back only once the cursors are drained and only
+        # for chunks whose upsert succeeded.
+        for model, rows in assigned.items():
+            if rows:
+                db.execute(update(model), rows)
+        db.commit()
+
+        documents = db.scalar(
+            select(func.count()).select_from(Document).where(Document.tenant_id == tenant_id)
+        ) or 0
+        knowledge_documents = db.scalar(
+            select(func.count())
+            .select_from(KnowledgeDocument)
+            .where(KnowledgeDocument.tenant_id == tenant_id)
+        ) or 0
+        elapsed = time.perf_counter() - started
         return {
             "tenant_id": tenant_id,
-            "documents": len(documents),
-            "knowledge_documents": len(knowledge_documents),
+            "documents": documents,
+            "knowledge_documents": knowledge_documents,
             "chunks_indexed": indexed,
+            "elapsed_seconds": round(elapsed, 3),
+            "chunks_per_second": round(indexed / elapsed, 1) if elapsed > 0 else 0.0,
+            "embeddings_reused": store.reused,
+            "embeddings_computed": store.computed,
             "errors": errors,
             "collection": self.collection_name,
         }
@@ -223,8 +390,7 @@ class RAGIndex:
         if tenant_id is None:
             return []
         try:
-            embedder = self._embedder()
-            vector = embedder.encode([query], normalize_embeddings=True)[0].tolist()
+            vector = self.embeddings.encode_query(query)
             client = self.client()
             self._ensure_collection(client)
             conditions = []
@@ -264,11 +430,17 @@ class RAGIndex:
                 for r in results
             ]
         except Exception:
+            self._forget_collection()
             return []
 
     def status(self) -> dict:
+        embeddings = self.embeddings.metrics()
         try:
             collections = self.client().get_collections()
-            return {"configured": True, "collections": [c.name for c in collections.collections]}
+            return {
+                "configured": True,
+                "collections": [c.name for c in collections.collections],
+                "embeddings": embeddings,
+            }
         except Exception as exc:
-            return {"configured": False, "error": str(exc)}
+            return {"configured": False, "error": str(exc), "embeddings": embeddings}
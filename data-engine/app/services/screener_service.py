@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import ast
+import hashlib
+import json
 import operator
 import re
+from collections.abc import Callable, Collection, Sequence
 from dataclasses import dataclass
 from datetime import UTC, date, datetime
 from decimal import Decimal, DivisionByZero, InvalidOperation
 from typing import Any
 
-from sqlalchemy import desc, select
+import numpy as np
+from sqlalchemy import desc, func, select
 from sqlalchemy.orm import Session
 
 from app.models import (
@@ -21,6 +25,7 @@ from app.models import (
     SavedScreen,
     SavedScreenMatch,
 )
+from app.services.company_change_service import CompanyChangeService
 from app.services.review_alert_service import ReviewAlertService
 
 
@@ -33,6 +38,9 @@ COMPARATORS = {
     "==": operator.eq,
     "!=": operator.ne,
 }
+# Above this share of changed companies an incremental run re-evaluates the
+# whole universe; the scoped queries stop paying off.
+INCREMENTAL_MAX_CHANGED_SHARE = 0.5
 
 
 class MissingVariables(ValueError):
@@ -124,6 +132,77 @@ class SafeFormula:
         raise ValueError("Invalid formula node")
 
 
+ColumnExpression = Callable[[dict[str, np.ndarray]], Any]
+
+
+class VectorFormula:
+    """A validated ``SafeFormula`` compiled once into NumPy column operations.
+
+    Columns are object arrays of ``Decimal`` so every element goes through the
+    same Decimal arithmetic, comparisons and error handling as
+    ``SafeFormula.evaluate``; only the per-node Python dispatch is removed.
+    """
+
+    BINARY = {
+        ast.Add: np.add,
+        ast.Sub: np.subtract,
+        ast.Mult: np.multiply,
+        ast.Div: np.true_divide,
+        ast.Pow: np.power,
+        ast.Mod: np.remainder,
+    }
+    UNARY = {ast.UAdd: np.positive, ast.USub: np.negative}
+    _ABS = np.frompyfunc(abs, 1, 1)
+    _IS_FINITE = np.frompyfunc(lambda value: value.is_finite(), 1, 1)
+
+    def __init__(self, formula: SafeFormula) -> None:
+        self.formula = formula
+        self.names = formula.names
+        self._expression = self._compile(formula.tree.body)
+
+    def evaluate(self, columns: dict[str, np.ndarray], size: int) -> np.ndarray:
+        try:
+            result = self._expression(columns)
+            if not isinstance(result, np.ndarray):
+                result = np.full(size, result, dtype=object)
+            if size and not self._IS_FINITE(result).all():
+                raise ValueError("Formula result is not finite")
+            return result
+        except (DivisionByZero, InvalidOperation, ZeroDivisionError) as exc:
+            raise ValueError("Formula cannot be evaluated for these values") from exc
+
+    def _compile(self, node: ast.AST) -> ColumnExpression:
+        if isinstance(node, ast.Constant):
+            constant = Decimal(str(node.value))
+            return lambda columns: constant
+        if isinstance(node, ast.Name):
+            key = node.id
+            return lambda columns: columns[key]
+        if isinstance(node, ast.BinOp):
+            left = self._compile(node.left)
+            right = self._compile(node.right)
+            function = self.BINARY[type(node.op)]
+            checks_exponent = isinstance(node.op, ast.Pow)
+
+            def binary(columns: dict[str, np.ndarray]) -> Any:
+                left_value = left(columns)
+                right_value = right(columns)
+                if checks_exponent and np.any(self._ABS(right_value) > 10):
+                    raise ValueError("Formula exponent exceeds safe limit")
+                return function(left_value, right_value)
+
+            return binary
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand)
+            unary = self.UNARY[type(node.op)]
+            return lambda columns: unary(operand(columns))
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            arguments = [self._compile(argument) for argument in node.args]
+            function = np.frompyfunc(SafeFormula.FUNCTIONS[node.func.id], len(arguments), 1)
+            return lambda columns: function(*(argument(columns) for argument in arguments))
+        raise ValueError("Invalid formula node")
+
+
 @dataclass
 class Observation:
     value: Decimal
@@ -134,6 +213,39 @@ class Observation:
     source_ids: list[int]
 
 
+@dataclass
+class ScreenTable:
+    """Wide universe table: one Decimal column and presence mask per metric."""
+
+    company_ids: list[int]
+    tickers: list[str]
+    company_names: list[str]
+    values: dict[str, np.ndarray]
+    present: dict[str, np.ndarray]
+    confidence: dict[str, np.ndarray]
+    as_of: dict[str, np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return len(self.company_ids)
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.values:
+            self.values[name] = np.empty(self.size, dtype=object)
+            self.present[name] = np.zeros(self.size, dtype=bool)
+            self.confidence[name] = np.empty(self.size, dtype=object)
+            self.as_of[name] = np.full(self.size, None, dtype=object)
+        return self.values[name]
+
+    def available(self, names: set[str]) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        for name in names:
+            if name not in self.present:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self.present[name]
+        return mask
+
+
 class CustomMetricService:
     def create(
         self,
@@ -219,14 +331,42 @@ class ScreenerService:
         db.refresh(screen)
         return screen
 
-    def run_saved(self, db: Session, screen: SavedScreen) -> dict[str, Any]:
+    def run_saved(
+        self,
+        db: Session,
+        screen: SavedScreen,
+        *,
+        incremental: bool = False,
+    ) -> dict[str, Any]:
+        """Run a saved screen and reconcile its persisted matches.
+
+        With ``incremental`` only companies whose facts, metrics, prices or
+        profile changed since the previous run are re-evaluated; matches of
+        untouched companies are left as they are. A full pass still runs on
+        the first execution, after the criteria or active custom metrics
+        change, and when most of the universe changed anyway.
+        """
+        now = datetime.now(UTC)
+        metadata = dict(screen.metadata_ or {})
+        fingerprint = self._screen_fingerprint(screen, CustomMetricService.active(db))
+        company_ids: set[int] | None = None
+        if (
+            incremental
+            and screen.last_run_at is not None
+            and metadata.get("run_fingerprint") == fingerprint
+        ):
+            changed = CompanyChangeService().changed_company_ids(db, screen.last_run_at)
+            universe = db.scalar(select(func.count()).select_from(Company)) or 0
+            if len(changed) < universe * INCREMENTAL_MAX_CHANGED_SHARE:
+                company_ids = changed
         response = self.run(
             db,
             criteria=screen.criteria,
             ranking_formula=screen.ranking_formula,
             ranking_direction=screen.ranking_direction,
+            company_ids=company_ids,
         )
-        now = datetime.now(UTC)
+        evaluated_ids = {row["company_id"] for row in response["results"]}
         matched_ids = {row["company_id"] for row in response["results"] if row["matched"]}
         existing = {
             row.company_id: row
@@ -268,14 +408,37 @@ class ScreenerService:
                         },
                     )
         for company_id, match in existing.items():
-            if match.active and company_id not in matched_ids:
+            if match.active and company_id in evaluated_ids and company_id not in matched_ids:
                 match.active = False
+        # The watermark is the run start so changes committed while the screen
+        # was evaluating are picked up by the next incremental run.
         screen.last_run_at = now
+        screen.metadata_ = {**metadata, "run_fingerprint": fingerprint}
         db.commit()
+        active_ids = matched_ids | {
+            company_id for company_id, match in existing.items() if match.active
+        }
         response["saved_screen_id"] = screen.id
         response["new_match_company_ids"] = new_company_ids
+        response["evaluation_mode"] = "full" if company_ids is None else "incremental"
+        response["evaluated_company_count"] = len(evaluated_ids)
+        response["match_count"] = len(active_ids)
         return response
 
+    @staticmethod
+    def _screen_fingerprint(screen: SavedScreen, definitions: list[CustomMetricDefinition]) -> str:
+        payload = {
+            "criteria": screen.criteria,
+            "ranking_formula": screen.ranking_formula,
+            "ranking_direction": screen.ranking_direction,
+            "custom_metrics": [
+                [definition.metric_key, definition.version, definition.formula]
+                for definition in sorted(definitions, key=lambda item: item.metric_key)
+            ],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
     def run(
         self,
         db: Session,
@@ -283,7 +446,112 @@ class ScreenerService:
         criteria: list[dict[str, Any]],
         ranking_formula: str | None = None,
         ranking_direction: str = "desc",
+        company_ids: Collection[int] | None = None,
+    ) -> dict[str, Any]:
+        """Evaluate a screen for the whole universe in one columnar pass.
+
+        Only metrics referenced by the criteria, the ranking formula and the
+        custom metrics they depend on are loaded, in two bulk queries. Each
+        formula is compiled once and evaluated over whole columns. Passing
+        ``company_ids`` restricts the pass to those companies.
+        """
+        normalized = [self._criterion(item) for item in criteria]
+        ranking = SafeFormula(ranking_formula) if ranking_formula else None
+        definitions = CustomMetricService.active(db)
+        compiled = [
+            (
+                criterion,
+                VectorFormula(SafeFormula(criterion["left"])),
+                VectorFormula(SafeFormula(criterion["right"])),
+            )
+            for criterion in normalized
+        ]
+        used_names: set[str] = set(ranking.names if ranking else ())
+        for _, left, right in compiled:
+            used_names.update(left.names | right.names)
+        table = self._load_table(
+            db, self._required_metrics(used_names, definitions), company_ids=company_ids
+        )
+        self._custom_metric_columns(table, definitions, used_names)
+
+        size = table.size
+        criterion_columns = []
+        for criterion, left, right in compiled:
+            left_ok = table.available(left.names)
+            both_ok = left_ok & table.available(right.names)
+            left_values = self._evaluate_rows(table, left, left_ok)
+            right_values = self._evaluate_rows(table, right, both_ok)
+            passed = np.zeros(size, dtype=bool)
+            if both_ok.any():
+                passed[both_ok] = COMPARATORS[criterion["operator"]](
+                    left_values[both_ok], right_values[both_ok]
+                ).astype(bool)
+            criterion_columns.append(
+                (criterion, left, right, left_ok, both_ok, left_values, right_values, passed)
+            )
+        rank_ok = table.available(ranking.names) if ranking else np.zeros(size, dtype=bool)
+        rank_values = (
+            self._evaluate_rows(table, VectorFormula(ranking), rank_ok)
+            if ranking
+            else np.empty(size, dtype=object)
+        )
+
+        by_key = {definition.metric_key: definition for definition in definitions}
+        dependencies = {key: SafeFormula(definition.formula).names for key, definition in by_key.items()}
+        present_names = [name for name in sorted(used_names) if name in table.present]
+        results = []
+        for row in range(size):
+            present = {name for name in present_names if table.present[name][row]}
+            criterion_results = []
+            missing: set[str] = set()
+            for criterion, left, right, left_ok, both_ok, left_values, right_values, passed in criterion_columns:
+                if both_ok[row]:
+                    criterion_results.append(
+                        {
+                            **criterion,
+                            "left_value": str(left_values[row]),
+                            "right_value": str(right_values[row]),
+                            "passed": bool(passed[row]),
+                        }
+                    )
+                    continue
+                absent = (right.names if left_ok[row] else left.names) - present
+                expanded = self._expand_dependencies(absent, dependencies, table, row)
+                missing.update(expanded)
+                criterion_results.append({**criterion, "passed": False, "missing_fields": sorted(expanded)})
+            rank_value = rank_values[row] if rank_ok[row] else None
+            if ranking and not rank_ok[row]:
+                missing.update(
+                    self._expand_dependencies(ranking.names - present, dependencies, table, row)
+                )
+            available = sorted(name for name in used_names - missing if name in present)
+            confidence_values = [table.confidence[name][row] for name in available]
+            dates = [table.as_of[name][row] for name in available if table.as_of[name][row]]
+            results.append(
+                self._result_row(
+                    table.company_ids[row],
+                    table.tickers[row],
+                    table.company_names[row],
+                    criterion_results,
+                    missing,
+                    rank_value,
+                    used_names,
+                    available,
+                    confidence_values,
+                    dates,
+                )
+            )
+        return self._response(normalized, ranking_formula, ranking_direction, results)
+
+    def run_rowwise(
+        self,
+        db: Session,
+        *,
+        criteria: list[dict[str, Any]],
+        ranking_formula: str | None = None,
+        ranking_direction: str = "desc",
     ) -> dict[str, Any]:
+        """Reference implementation: load and evaluate one company at a time."""
         normalized = [self._criterion(item) for item in criteria]
         ranking = SafeFormula(ranking_formula) if ranking_formula else None
         definitions = CustomMetricService.active(db)
@@ -325,28 +593,62 @@ class ScreenerService:
                     rank_value = ranking.evaluate(values)
                 except MissingVariables as exc:
                     missing.update(self._expand_missing(exc.names, definitions, values))
-            available = {name for name in used_names - missing if name in observations}
+            available = sorted(name for name in used_names - missing if name in observations)
             confidence_values = [observations[name].confidence for name in available]
             dates = [observations[name].as_of for name in available if observations[name].as_of]
             results.append(
-                {
-                    "company_id": company.id,
-                    "ticker": company.ticker,
-                    "name": company.name,
-                    "matched": not missing and all(item["passed"] for item in criterion_results),
-                    "rank_value": str(rank_value) if rank_value is not None else None,
-                    "coverage_percent": round(100 * len(available) / len(used_names), 1)
-                    if used_names
-                    else 100.0,
-                    "confidence": str(sum(confidence_values, Decimal("0")) / len(confidence_values))
-                    if confidence_values
-                    else "0",
-                    "latest_data_at": max(dates).isoformat() if dates else None,
-                    "missing_fields": sorted(missing),
-                    "criteria": criterion_results,
-                }
+                self._result_row(
+                    company.id,
+                    company.ticker,
+                    company.name,
+                    criterion_results,
+                    missing,
+                    rank_value,
+                    used_names,
+                    available,
+                    confidence_values,
+                    dates,
+                )
             )
+        return self._response(normalized, ranking_formula, ranking_direction, results)
+
+    @staticmethod
+    def _result_row(
+        company_id: int,
+        ticker: str,
+        name: str,
+        criterion_results: list[dict[str, Any]],
+        missing: set[str],
+        rank_value: Decimal | None,
+        used_names: set[str],
+        available: list[str],
+        confidence_values: list[Decimal],
+        dates: list[Any],
+    ) -> dict[str, Any]:
+        return {
+            "company_id": company_id,
+            "ticker": ticker,
+            "name": name,
+            "matched": not missing and all(item["passed"] for item in criterion_results),
+            "rank_value": str(rank_value) if rank_value is not None else None,
+            "coverage_percent": round(100 * len(available) / len(used_names), 1)
+            if used_names
+            else 100.0,
+            "confidence": str(sum(confidence_values, Decimal("0")) / len(confidence_values))
+            if confidence_values
+            else "0",
+            "latest_data_at": max(dates).isoformat() if dates else None,
+            "missing_fields": sorted(missing),
+            "criteria": criterion_results,
+        }
 
+    @staticmethod
+    def _response(
+        normalized: list[dict[str, str]],
+        ranking_formula: str | None,
+        ranking_direction: str,
+        results: list[dict[str, Any]],
+    ) -> dict[str, Any]:
         def result_order(row: dict[str, Any]) -> tuple[Any, ...]:
             missing_rank = row["rank_value"] is None
             rank_value = Decimal(row["rank_value"]) if row["rank_value"] is not None else Decimal("0")
@@ -363,6 +665,192 @@ class ScreenerService:
             "results": results,
         }
 
+    @staticmethod
+    def _evaluate_rows(table: ScreenTable, formula: VectorFormula, rows: np.ndarray) -> np.ndarray:
+        values = np.empty(table.size, dtype=object)
+        if rows.any():
+            columns = {name: table.values[name][rows] for name in formula.names}
+            values[rows] = formula.evaluate(columns, int(rows.sum()))
+        return values
+
+    @staticmethod
+    def _expand_dependencies(
+        names: set[str],
+        dependencies: dict[str, set[str]],
+        table: ScreenTable,
+        row: int,
+    ) -> set[str]:
+        expanded = set(names)
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            for dependency in dependencies.get(name, ()):
+                present = dependency in table.present and table.present[dependency][row]
+                if not present and dependency not in expanded:
+                    expanded.add(dependency)
+                    pending.append(dependency)
+        return expanded
+
+    @staticmethod
+    def _required_metrics(
+        used_names: set[str],
+        definitions: list[CustomMetricDefinition],
+    ) -> set[str]:
+        by_key = {definition.metric_key: definition for definition in definitions}
+        required: set[str] = set()
+        pending = list(used_names)
+        while pending:
+            name = pending.pop()
+            if name in required:
+                continue
+            required.add(name)
+            if name in by_key:
+                pending.extend(SafeFormula(by_key[name].formula).names)
+        for name in list(required):
+            if name.endswith("_cagr"):
+                required.add(name.removesuffix("_cagr"))
+        if "shares_cagr" in required:
+            required.update({"shares_diluted", "shares_diluted_cagr"})
+        if "fcf_per_share_cagr" in required:
+            required.update({"free_cash_flow", "shares_diluted"})
+        return required
+
+    def _load_table(
+        self,
+        db: Session,
+        metrics: set[str],
+        *,
+        company_ids: Collection[int] | None = None,
+    ) -> ScreenTable:
+        company_query = select(Company.id, Company.ticker, Company.name).order_by(Company.ticker)
+        if company_ids is not None:
+            company_query = company_query.where(Company.id.in_(sorted(company_ids)))
+        companies = db.execute(company_query).all() if company_ids is None or company_ids else []
+        scope = [company.id for company in companies] if company_ids is not None else None
+        metric_names = sorted(metrics)
+        calculated_by_company: dict[int, list[Any]] = {}
+        facts_by_company: dict[int, list[Any]] = {}
+        if metric_names and (scope is None or scope):
+            for row in db.execute(
+                select(
+                    CalculatedMetric.id,
+                    CalculatedMetric.company_id,
+                    CalculatedMetric.metric,
+                    CalculatedMetric.value,
+                    CalculatedMetric.confidence,
+                    CalculatedMetric.updated_at,
+                    CalculatedMetric.period,
+                )
+                .where(
+                    CalculatedMetric.metric.in_(metric_names),
+                    CalculatedMetric.value.is_not(None),
+                    CalculatedMetric.status == "ok",
+                    *([CalculatedMetric.company_id.in_(scope)] if scope is not None else []),
+                )
+                .order_by(
+                    CalculatedMetric.company_id,
+                    CalculatedMetric.metric,
+                    desc(CalculatedMetric.fiscal_year),
+                    desc(CalculatedMetric.id),
+                )
+            ):
+                calculated_by_company.setdefault(row.company_id, []).append(row)
+            for row in db.execute(
+                select(
+                    FinancialFact.id,
+                    FinancialFact.company_id,
+                    FinancialFact.metric,
+                    FinancialFact.value,
+                    FinancialFact.confidence,
+                    FinancialFact.updated_at,
+                    FinancialFact.period,
+                    FinancialFact.source_type,
+                    FinancialFact.fiscal_year,
+                    FinancialFact.fiscal_quarter,
+                )
+                .where(
+                    FinancialFact.metric.in_(metric_names),
+                    *([FinancialFact.company_id.in_(scope)] if scope is not None else []),
+                )
+                .order_by(
+                    FinancialFact.company_id,
+                    FinancialFact.metric,
+                    desc(FinancialFact.fiscal_year),
+                    desc(FinancialFact.id),
+                )
+            ):
+                facts_by_company.setdefault(row.company_id, []).append(row)
+
+        table = ScreenTable(
+            company_ids=[company.id for company in companies],
+            tickers=[company.ticker for company in companies],
+            company_names=[company.name for company in companies],
+            values={},
+            present={},
+            confidence={},
+            as_of={},
+        )
+        for row, company in enumerate(companies):
+            observations = self._build_observations(
+                calculated_by_company.get(company.id, []),
+                facts_by_company.get(company.id, []),
+                metrics,
+            )
+            for name, observation in observations.items():
+                table.column(name)[row] = observation.value
+                table.present[name][row] = True
+                table.confidence[name][row] = observation.confidence
+                table.as_of[name][row] = observation.as_of
+        return table
+
+    @staticmethod
+    def _custom_metric_columns(
+        table: ScreenTable,
+        definitions: list[CustomMetricDefinition],
+        used_names: set[str],
+    ) -> None:
+        """Column-wise equivalent of ``_custom_metrics`` for referenced definitions."""
+        required = ScreenerService._required_metrics(used_names, definitions)
+        pending = [
+            (definition, VectorFormula(SafeFormula(definition.formula)))
+            for definition in definitions
+            if definition.metric_key in required
+        ]
+        if not pending:
+            return
+        unresolved = np.ones((len(pending), table.size), dtype=bool)
+        for _ in range(len(pending) + 1):
+            # Like ``_custom_metrics``, a pass sees the values available when it
+            # started; metrics computed during the pass become visible next pass.
+            present = {name: mask.copy() for name, mask in table.present.items()}
+            values = {name: column.copy() for name, column in table.values.items()}
+            changed = False
+            for index, (definition, formula) in enumerate(pending):
+                rows = unresolved[index].copy()
+                for name in formula.names:
+                    rows &= present[name] if name in present else False
+                if not rows.any():
+                    continue
+                row_ids = np.flatnonzero(rows)
+                columns = {name: values[name][rows] for name in formula.names}
+                computed = formula.evaluate(columns, len(row_ids))
+                key = definition.metric_key
+                table.column(key)[rows] = computed
+                table.present[key][rows] = True
+                for row in row_ids:
+                    table.confidence[key][row] = min(
+                        (table.confidence[name][row] for name in formula.names),
+                        default=Decimal("0"),
+                    )
+                    table.as_of[key][row] = max(
+                        (table.as_of[name][row] for name in formula.names if table.as_of[name][row]),
+                        default=None,
+                    )
+                unresolved[index] &= ~rows
+                changed = True
+            if not changed:
+                break
+
     @staticmethod
     def _expand_missing(
         names: set[str],
@@ -396,7 +884,6 @@ class ScreenerService:
         return {"left": left, "operator": operator_key, "right": right}
 
     def _observations(self, db: Session, company: Company) -> dict[str, Observation]:
-        result: dict[str, Observation] = {}
         calculated = db.scalars(
             select(CalculatedMetric)
             .where(
@@ -406,6 +893,25 @@ class ScreenerService:
             )
             .order_by(CalculatedMetric.metric, desc(CalculatedMetric.fiscal_year), desc(CalculatedMetric.id))
         ).all()
+        facts = db.scalars(
+            select(FinancialFact)
+            .where(FinancialFact.company_id == company.id)
+            .order_by(FinancialFact.metric, desc(FinancialFact.fiscal_year), desc(FinancialFact.id))
+        ).all()
+        return self._build_observations(calculated, facts)
+
+    def _build_observations(
+        self,
+        calculated: Sequence[Any],
+        facts: Sequence[Any],
+        needed: set[str] | None = None,
+    ) -> dict[str, Observation]:
+        """Build one company's observations from ordered metric and fact rows.
+
+        Rows may be ORM entities or column tuples with the same attribute names.
+        When ``needed`` is given, derived CAGRs outside it are not computed.
+        """
+        result: dict[str, Observation] = {}
         for metric in calculated:
             if metric.metric not in result and metric.value is not None:
                 result[metric.metric] = Observation(
@@ -416,14 +922,7 @@ class ScreenerService:
                     "calculated_metric",
                     [metric.id],
                 )
-        facts = list(
-            db.scalars(
-                select(FinancialFact)
-                .where(FinancialFact.company_id == company.id)
-                .order_by(FinancialFact.metric, desc(FinancialFact.fiscal_year), desc(FinancialFact.id))
-            ).all()
-        )
-        by_metric: dict[str, list[FinancialFact]] = {}
+        by_metric: dict[str, list[Any]] = {}
         for fact in facts:
             by_metric.setdefault(fact.metric, []).append(fact)
             result.setdefault(
@@ -438,11 +937,15 @@ class ScreenerService:
                 ),
             )
         for key, series in by_metric.items():
+            if needed is not None and f"{key}_cagr" not in needed:
+                continue
             cagr = self._cagr(series)
             if cagr:
                 result[f"{key}_cagr"] = cagr
         if "shares_diluted_cagr" in result:
             result["shares_cagr"] = result["shares_diluted_cagr"]
+        if needed is not None and "fcf_per_share_cagr" not in needed:
+            return result
         fcf_per_share = self._ratio_cagr(
             by_metric.get("free_cash_flow", []),
             by_metric.get("shares_diluted", []),
@@ -452,7 +955,7 @@ class ScreenerService:
         return result
 
     @staticmethod
-    def _cagr(series: list[FinancialFact]) -> Observation | None:
+    def _cagr(series: Sequence[Any]) -> Observation | None:
         annual = {
             fact.fiscal_year: fact
             for fact in series
@@ -474,9 +977,7 @@ class ScreenerService:
             [first.id, last.id],
         )
 
-    def _ratio_cagr(
-        self, numerators: list[FinancialFact], denominators: list[FinancialFact]
-    ) -> Observation | None:
+    def _ratio_cagr(self, numerators: Sequence[Any], denominators: Sequence[Any]) -> Observation | None:
         numerator_by_year = {row.fiscal_year: row for row in numerators if row.fiscal_year}
         denominator_by_year = {row.fiscal_year: row for row in denominators if row.fiscal_year}
         years = sorted(numerator_by_year.keys() & denominator_by_year.keys())
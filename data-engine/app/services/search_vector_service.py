@@ -0,0 +1,111 @@
+"""Stored PostgreSQL tsvector columns for the largest full-text corpora."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.orm import Session
+
+
+# Table -> text column mirrored into ``search_vector`` by migration 0019. A
+# trigger keeps new and edited rows current; rows that existed before the
+# migration are filled by :meth:`SearchVectorService.backfill`.
+SEARCH_VECTOR_SOURCES = {
+    "document_chunks": "text",
+    "knowledge_chunks": "content",
+    "claims": "statement",
+    "thesis_sections": "body",
+    "investment_principles": "principle",
+}
+SEARCH_VECTOR_COLUMN = "search_vector"
+READY_CACHE_SECONDS = 300.0
+
+_ready: dict[str, tuple[float, frozenset[str]]] = {}
+_ready_lock = threading.Lock()
+
+
+class SearchVectorService:
+    """Report which stored tsvector columns are usable and backfill the rest.
+
+    A column is only used for search once no row is waiting for backfill;
+    until then queries keep the ``to_tsvector`` expression so no row is
+    silently missing from results.
+    """
+
+    def ready_tables(self, db: Session) -> frozenset[str]:
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return frozenset()
+        key = str(bind.engine.url)
+        cached = _ready.get(key)
+        if cached is not None and time.monotonic() - cached[0] < READY_CACHE_SECONDS:
+            return cached[1]
+        tables = self._existing_tables(db)
+        ready = frozenset(table for table in tables if not self._pending(db, table))
+        with _ready_lock:
+            _ready[key] = (time.monotonic(), ready)
+        return ready
+
+    def backfill(self, db: Session, *, batch_size: int = 5000) -> dict[str, Any]:
+        """Fill ``search_vector`` for pre-existing rows in committed batches."""
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            return {"status": "skipped", "reason": "PostgreSQL only", "tables": {}}
+        started = time.perf_counter()
+        updated: dict[str, int] = {}
+        for table in sorted(self._existing_tables(db)):
+            column = SEARCH_VECTOR_SOURCES[table]
+            updated[table] = 0
+            while True:
+                result = db.execute(
+                    text(
+                        f'UPDATE "{table}" SET "{SEARCH_VECTOR_COLUMN}" = '
+                        f"to_tsvector('simple', coalesce(\"{column}\", '')) "
+                        f'WHERE id IN (SELECT id FROM "{table}" '
+                        f'WHERE "{SEARCH_VECTOR_COLUMN}" IS NULL LIMIT :batch_size)'
+                    ),
+                    {"batch_size": batch_size},
+                )
+                rows = cast(CursorResult, result).rowcount
+                db.commit()
+                updated[table] += rows
+                if rows < batch_size:
+                    break
+        self.invalidate()
+        return {
+            "status": "ok",
+            "tables": updated,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    @staticmethod
+    def invalidate() -> None:
+        with _ready_lock:
+            _ready.clear()
+
+    @staticmethod
+    def _existing_tables(db: Session) -> set[str]:
+        rows = db.execute(
+            text(
+                "SELECT table_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND column_name = :column "
+                "AND table_name = ANY(:tables)"
+            ),
+            {"column": SEARCH_VECTOR_COLUMN, "tables": list(SEARCH_VECTOR_SOURCES)},
+        )
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _pending(db: Session, table: str) -> bool:
+        # Served by the partial ix_<table>_search_vector_pending index.
+        return bool(
+            db.scalar(
+                text(
+                    f'SELECT EXISTS (SELECT 1 FROM "{table}" '
+                    f'WHERE "{SEARCH_VECTOR_COLUMN}" IS NULL)'
+                )
+            )
+        )
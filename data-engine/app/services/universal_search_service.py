@@ -5,11 +5,13 @@ from __future__ import annotations
 import math
 import os
 import re
+from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Any, Iterable
+from datetime import date, datetime, time, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import func, literal, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Session
 
 from app.models import (
@@ -28,11 +30,19 @@ from app.models import (
     KnowledgeDocument,
     ThesisSection,
 )
+from app.services.search_vector_service import (
+    SEARCH_VECTOR_COLUMN,
+    SEARCH_VECTOR_SOURCES,
+    SearchVectorService,
+)
 from app.services.source_hierarchy_service import classify_source
 
 
 TOKEN_RE = re.compile(r"[\w.-]+", re.UNICODE)
 RRF_K = 60
+# PostgreSQL ranks inside each corpus, so only the best rows are hydrated.
+# The portable fallback cannot rank in SQL and keeps the historical caps.
+CORPUS_TOP_K_MIN = 30
 
 
 @dataclass
@@ -51,6 +61,36 @@ class SearchCandidate:
     status: str | None = None
     as_of: date | datetime | None = None
     metadata: dict[str, Any] | None = None
+    lexical_rank: float | None = None
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    source_types: set[str] | None = None
+    statuses: set[str] | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+
+
+@dataclass(frozen=True)
+class Corpus:
+    """SQL shape of one searchable entity type.
+
+    ``source_type`` and ``status`` are either a column or the constant every
+    row of the corpus reports. ``collection`` is ``None`` for company corpora,
+    which never match a collection-scoped search.
+    """
+
+    entity_type: str
+    model: Any
+    text: Any
+    as_of: Any
+    source_type: Any
+    status: Any
+    company: Callable[[int], Any] | None
+    collection: Any | None
+    joins: Callable[[Any], Any] = lambda statement: statement
+    fallback_limit: int = 300
 
 
 def _tokens(value: str) -> list[str]:
@@ -73,9 +113,128 @@ def _lexical_score(query: str, candidate: SearchCandidate) -> float:
     return coverage * 4 + math.log1p(frequency) + title_hits * 0.4 + phrase * 2
 
 
+CORPORA = (
+    Corpus(
+        entity_type="document_chunk",
+        model=DocumentChunk,
+        text=DocumentChunk.text,
+        as_of=func.coalesce(Document.published_at, Document.created_at),
+        source_type=Document.source_type,
+        status="active",
+        company=lambda company_id: Document.company_id == company_id,
+        collection=None,
+        joins=lambda statement: statement.join(Document, DocumentChunk.document_id == Document.id),
+    ),
+    Corpus(
+        entity_type="claim",
+        model=Claim,
+        text=Claim.statement,
+        as_of=Claim.updated_at,
+        source_type="research",
+        status=Claim.status,
+        company=lambda company_id: Claim.company_id == company_id,
+        collection=None,
+    ),
+    Corpus(
+        entity_type="thesis_section",
+        model=ThesisSection,
+        text=ThesisSection.body,
+        as_of=ThesisSection.updated_at,
+        source_type="research",
+        status=ThesisSection.status,
+        company=lambda company_id: ThesisSection.company_id == company_id,
+        collection=None,
+    ),
+    Corpus(
+        entity_type="decision_lesson",
+        model=DecisionLesson,
+        text=DecisionLesson.lesson,
+        as_of=DecisionLesson.updated_at,
+        source_type="user",
+        status=DecisionLesson.status,
+        company=lambda company_id: DecisionLesson.company_id == company_id,
+        collection=None,
+    ),
+    Corpus(
+        entity_type="financial_fact",
+        model=FinancialFact,
+        text=FinancialFact.metric,
+        as_of=FinancialFact.updated_at,
+        source_type=FinancialFact.source_type,
+        status="verified",
+        company=lambda company_id: FinancialFact.company_id == company_id,
+        collection=None,
+        joins=lambda statement: statement.join(Company, FinancialFact.company_id == Company.id),
+        fallback_limit=500,
+    ),
+    Corpus(
+        entity_type="calculated_metric",
+        model=CalculatedMetric,
+        text=CalculatedMetric.metric,
+        as_of=CalculatedMetric.updated_at,
+        source_type="calculation",
+        status=CalculatedMetric.status,
+        company=lambda company_id: CalculatedMetric.company_id == company_id,
+        collection=None,
+        joins=lambda statement: statement.join(Company, CalculatedMetric.company_id == Company.id),
+        fallback_limit=500,
+    ),
+    Corpus(
+        entity_type="decision",
+        model=DecisionJournalEntry,
+        text=DecisionJournalEntry.rationale,
+        as_of=DecisionJournalEntry.decision_date,
+        source_type="user",
+        status=DecisionJournalEntry.status,
+        company=lambda company_id: DecisionJournalEntry.company_id == company_id,
+        collection=None,
+    ),
+    Corpus(
+        entity_type="knowledge_chunk",
+        model=KnowledgeChunk,
+        text=KnowledgeChunk.content,
+        as_of=func.coalesce(KnowledgeDocument.publication_date, KnowledgeDocument.created_at),
+        source_type=KnowledgeDocument.document_type,
+        status=KnowledgeDocument.status,
+        company=None,
+        collection=KnowledgeDocument.collection_id,
+        joins=lambda statement: statement.join(
+            KnowledgeDocument, KnowledgeChunk.knowledge_document_id == KnowledgeDocument.id
+        ),
+    ),
+    Corpus(
+        entity_type="investment_principle",
+        model=InvestmentPrinciple,
+        text=InvestmentPrinciple.principle,
+        as_of=func.coalesce(InvestmentPrinciple.approved_at, InvestmentPrinciple.created_at),
+        source_type=KnowledgeDocument.document_type,
+        status=InvestmentPrinciple.status,
+        company=lambda company_id: InvestmentPrinciple.applies_to_company_ids.contains([company_id]),
+        collection=InvestmentPrinciple.collection_id,
+        joins=lambda statement: statement.join(
+            KnowledgeDocument, InvestmentPrinciple.knowledge_document_id == KnowledgeDocument.id
+        ),
+    ),
+    Corpus(
+        entity_type="investment_case",
+        model=InvestmentCaseStudy,
+        text=InvestmentCaseStudy.summary,
+        as_of=InvestmentCaseStudy.updated_at,
+        source_type="historical_case",
+        status=InvestmentCaseStudy.status,
+        company=lambda company_id: InvestmentCaseStudy.company_id == company_id,
+        collection=InvestmentCaseStudy.collection_id,
+    ),
+)
+CORPUS_BY_TYPE = {corpus.entity_type: corpus for corpus in CORPORA}
+
+
 class UniversalSearchService:
     """PostgreSQL FTS + optional Qdrant + RRF + deterministic reranking."""
 
+    def __init__(self, *, use_search_vectors: bool = True) -> None:
+        self.use_search_vectors = use_search_vectors
+
     def search(
         self,
         db: Session,
@@ -102,6 +261,13 @@ class UniversalSearchService:
             company = db.scalar(select(Company).where(Company.ticker == ticker.strip().upper()))
             if company is None:
                 return self._not_found(query, include_vector)
+        filters = SearchFilters(
+            source_types=source_types,
+            statuses=statuses,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        postgres = self._is_postgres(db)
 
         candidates = self._candidates(
             db,
@@ -109,20 +275,17 @@ class UniversalSearchService:
             company=company,
             entity_types=entity_types,
             collection_id=collection_id,
+            filters=filters,
+            top_k=max(limit * 3, CORPUS_TOP_K_MIN),
         )
-        candidates = [
-            item
-            for item in candidates
-            if self._matches_filters(
-                item,
-                source_types=source_types,
-                statuses=statuses,
-                date_from=date_from,
-                date_to=date_to,
-            )
-        ]
         lexical = sorted(
-            ((item, _lexical_score(query, item)) for item in candidates),
+            (
+                (
+                    item,
+                    item.lexical_rank if item.lexical_rank is not None else _lexical_score(query, item),
+                )
+                for item in candidates
+            ),
             key=lambda pair: pair[1],
             reverse=True,
         )
@@ -155,17 +318,10 @@ class UniversalSearchService:
             company=company,
             entity_types=entity_types,
             collection_id=collection_id,
+            filters=filters,
         ):
             if item.key in known_keys:
                 continue
-            if not self._matches_filters(
-                item,
-                source_types=source_types,
-                statuses=statuses,
-                date_from=date_from,
-                date_to=date_to,
-            ):
-                continue
             candidates.append(item)
             known_keys.add(item.key)
 
@@ -236,10 +392,9 @@ class UniversalSearchService:
             },
             "retrieval": {
                 "lexical_backend": (
-                    "postgresql_full_text"
-                    if db.bind and db.bind.dialect.name == "postgresql"
-                    else "portable_lexical_fallback"
+                    "postgresql_full_text" if postgres else "portable_lexical_fallback"
                 ),
+                "lexical_ranker": "ts_rank_cd" if postgres else "token_overlap_v1",
                 "vector_backend": "qdrant",
                 "vector_status": vector_status,
                 "fusion": "reciprocal_rank_fusion",
@@ -269,38 +424,70 @@ class UniversalSearchService:
         return ""
 
     @staticmethod
-    def _matches_filters(
-        item: SearchCandidate,
-        *,
-        source_types: set[str] | None,
-        statuses: set[str] | None,
-        date_from: date | None,
-        date_to: date | None,
-    ) -> bool:
-        if source_types and item.source_type not in source_types:
-            return False
-        if statuses and item.status not in statuses:
-            return False
-        item_date = item.as_of.date() if isinstance(item.as_of, datetime) else item.as_of
-        if date_from and (item_date is None or item_date < date_from):
-            return False
-        if date_to and (item_date is None or item_date > date_to):
-            return False
-        return True
-
-    @staticmethod
-    def _fts(statement, column, query: str, db: Session):
-        if db.bind and db.bind.dialect.name == "postgresql":
-            tsquery = func.websearch_to_tsquery("simple", query)
-            statement = statement.where(
-                func.to_tsvector("simple", func.coalesce(column, "")).op("@@")(tsquery)
-            )
-        return statement
+    def _is_postgres(db: Session) -> bool:
+        return bool(db.bind and db.bind.dialect.name == "postgresql")
+
+    def _fts(self, statement, column, query: str, db: Session):
+        """Restrict ``statement`` to full-text matches and return it with a rank.
+
+        On PostgreSQL the rank is ``ts_rank_cd`` over the column's tsvector,
+        read from the stored ``search_vector`` column once its table has been
+        backfilled and computed with ``to_tsvector`` otherwise. The portable
+        fallback leaves the statement untouched and ranks later in Python.
+        """
+        if not self._is_postgres(db):
+            return statement, literal(None)
+        tsquery = func.websearch_to_tsquery("simple", query)
+        source = column.expression
+        table = source.table.name
+        if (
+            self.use_search_vectors
+            and SEARCH_VECTOR_SOURCES.get(table) == source.name
+            and table in SearchVectorService().ready_tables(db)
+        ):
+            document = literal_column(f'"{table}".{SEARCH_VECTOR_COLUMN}', type_=TSVECTOR)
+        else:
+            document = func.to_tsvector("simple", func.coalesce(column, ""))
+        return statement.where(document.op("@@")(tsquery)), func.ts_rank_cd(document, tsquery)
 
     @staticmethod
     def _allowed(entity_type: str, entity_types: set[str] | None) -> bool:
         return not entity_types or entity_type in entity_types
 
+    @staticmethod
+    def _scope(
+        statement,
+        corpus: Corpus,
+        *,
+        company_id: int | None,
+        collection_id: int | None,
+        filters: SearchFilters,
+    ):
+        """Push tenant-independent filters into SQL; ``None`` when nothing can match."""
+        if collection_id is not None:
+            if corpus.collection is None:
+                return None
+            statement = statement.where(corpus.collection == collection_id)
+        if company_id is not None and corpus.company is not None:
+            statement = statement.where(corpus.company(company_id))
+        for values, column in (
+            (filters.source_types, corpus.source_type),
+            (filters.statuses, corpus.status),
+        ):
+            if not values:
+                continue
+            if isinstance(column, str):
+                if column not in values:
+                    return None
+            else:
+                statement = statement.where(column.in_(sorted(values)))
+        if filters.date_from:
+            statement = statement.where(corpus.as_of >= datetime.combine(filters.date_from, time.min))
+        if filters.date_to:
+            upper = datetime.combine(filters.date_to + timedelta(days=1), time.min)
+            statement = statement.where(corpus.as_of < upper)
+        return statement
+
     def _candidates(
         self,
         db: Session,
@@ -309,21 +496,52 @@ class UniversalSearchService:
         company: Company | None,
         entity_types: set[str] | None,
         collection_id: int | None,
+        filters: SearchFilters | None = None,
+        top_k: int = CORPUS_TOP_K_MIN,
     ) -> list[SearchCandidate]:
-        result: list[SearchCandidate] = []
+        """Select the best ids of every corpus in one query, then hydrate them.
+
+        Each corpus contributes a filtered, ranked and limited subquery to a
+        single ``UNION ALL``; full rows are loaded only for the ids it returns.
+        """
+        filters = filters or SearchFilters()
+        postgres = self._is_postgres(db)
         company_id = company.id if company else None
-        if collection_id is None:
-            result.extend(self._company_corpus(db, query, company_id, entity_types))
-        result.extend(
-            self._knowledge_corpus(
-                db,
-                query,
-                company_id,
-                entity_types,
+        branches = []
+        for corpus in CORPORA:
+            if not self._allowed(corpus.entity_type, entity_types):
+                continue
+            statement = self._scope(
+                corpus.joins(select(corpus.model.id).select_from(corpus.model)),
+                corpus,
+                company_id=company_id,
                 collection_id=collection_id,
+                filters=filters,
             )
-        )
-        return result
+            if statement is None:
+                continue
+            statement, rank = self._fts(statement, corpus.text, query, db)
+            statement = statement.with_only_columns(
+                literal(corpus.entity_type).label("entity_type"),
+                corpus.model.id.label("entity_id"),
+                rank.label("rank"),
+                maintain_column_froms=True,
+            )
+            if postgres:
+                statement = statement.order_by(rank.desc(), corpus.model.id).limit(top_k)
+            else:
+                statement = statement.order_by(corpus.model.id).limit(corpus.fallback_limit)
+            branches.append(select(statement.subquery()))
+        if not branches:
+            return []
+        ranks: dict[str, dict[int, float | None]] = {}
+        for entity_type, entity_id, rank in db.execute(union_all(*branches)).all():
+            ranks.setdefault(entity_type, {})[entity_id] = rank
+        candidates = self._hydrate(db, {key: set(value) for key, value in ranks.items()})
+        for item in candidates:
+            rank = ranks[item.entity_type][item.entity_id]
+            item.lexical_rank = float(rank) if rank is not None else None
+        return candidates
 
     def _hydrate_vector_candidates(
         self,
@@ -333,8 +551,10 @@ class UniversalSearchService:
         company: Company | None,
         entity_types: set[str] | None,
         collection_id: int | None,
+        filters: SearchFilters | None = None,
     ) -> list[SearchCandidate]:
         """Load canonical SQL records for Qdrant hits not returned by FTS."""
+        filters = filters or SearchFilters()
         ids_by_type: dict[str, set[int]] = {
             "document_chunk": set(),
             "knowledge_chunk": set(),
@@ -349,290 +569,191 @@ class UniversalSearchService:
             ):
                 ids_by_type[entity_type].add(entity_id)
 
-        hydrated: list[SearchCandidate] = []
-        document_ids = ids_by_type["document_chunk"]
-        if document_ids and collection_id is None:
-            statement = (
-                select(DocumentChunk, Document, Company)
-                .join(Document, DocumentChunk.document_id == Document.id)
-                .outerjoin(Company, Document.company_id == Company.id)
-                .where(DocumentChunk.id.in_(document_ids))
+        allowed: dict[str, set[int]] = {}
+        for entity_type, ids in ids_by_type.items():
+            if not ids:
+                continue
+            corpus = CORPUS_BY_TYPE[entity_type]
+            statement = self._scope(
+                corpus.joins(select(corpus.model.id).select_from(corpus.model)),
+                corpus,
+                company_id=company.id if company else None,
+                collection_id=collection_id,
+                filters=filters,
             )
-            if company is not None:
-                statement = statement.where(Document.company_id == company.id)
-            for chunk, document, row_company in db.execute(statement).all():
-                hydrated.append(
-                    SearchCandidate(
-                        key=f"document_chunk:{chunk.id}",
-                        entity_type="document_chunk",
-                        entity_id=chunk.id,
-                        title=document.title,
-                        text=chunk.text,
-                        company_id=document.company_id,
-                        ticker=row_company.ticker if row_company else None,
-                        source_type=document.source_type,
-                        source_url=document.source_url,
-                        status="active",
-                        as_of=document.published_at or document.created_at,
-                        metadata={
-                            "document_id": document.id,
-                            "chunk_index": chunk.chunk_index,
-                        },
-                    )
-                )
-
-        knowledge_ids = ids_by_type["knowledge_chunk"]
-        if knowledge_ids:
-            statement = (
-                select(KnowledgeChunk, KnowledgeDocument, KnowledgeCollection)
-                .join(
-                    KnowledgeDocument,
-                    KnowledgeChunk.knowledge_document_id == KnowledgeDocument.id,
-                )
-                .outerjoin(
-                    KnowledgeCollection,
-                    KnowledgeDocument.collection_id == KnowledgeCollection.id,
-                )
-                .where(KnowledgeChunk.id.in_(knowledge_ids))
+            if statement is None:
+                continue
+            allowed[entity_type] = set(
+                db.scalars(statement.where(corpus.model.id.in_(sorted(ids)))).all()
             )
-            if collection_id is not None:
-                statement = statement.where(KnowledgeDocument.collection_id == collection_id)
-            for chunk, document, collection in db.execute(statement).all():
-                hydrated.append(
-                    SearchCandidate(
-                        key=f"knowledge_chunk:{chunk.id}",
-                        entity_type="knowledge_chunk",
-                        entity_id=chunk.id,
-                        title=document.title,
-                        text=chunk.content,
-                        source_type=document.document_type,
-                        source_url=document.source_url,
-                        collection_id=document.collection_id,
-                        collection=collection.name if collection else None,
-                        status=document.status,
-                        as_of=document.publication_date or document.created_at,
-                        metadata={
-                            "knowledge_document_id": document.id,
-                            "page_number": chunk.page_number,
-                            "source_locator": chunk.source_locator,
-                        },
-                    )
-                )
-        return hydrated
-
-    def _company_corpus(
-        self,
-        db: Session,
-        query: str,
-        company_id: int | None,
-        entity_types: set[str] | None,
-    ) -> Iterable[SearchCandidate]:
+        return self._hydrate(db, allowed)
+
+    def _hydrate(self, db: Session, ids_by_type: dict[str, set[int]]) -> list[SearchCandidate]:
+        loaders = {
+            "document_chunk": self._document_chunks,
+            "claim": self._narrative_rows,
+            "thesis_section": self._narrative_rows,
+            "decision_lesson": self._narrative_rows,
+            "financial_fact": self._metric_rows,
+            "calculated_metric": self._metric_rows,
+            "decision": self._decisions,
+            "knowledge_chunk": self._knowledge_chunks,
+            "investment_principle": self._principles,
+            "investment_case": self._cases,
+        }
         result: list[SearchCandidate] = []
-        if self._allowed("document_chunk", entity_types):
-            statement = (
-                select(DocumentChunk, Document, Company)
-                .join(Document, DocumentChunk.document_id == Document.id)
-                .outerjoin(Company, Document.company_id == Company.id)
-            )
-            if company_id is not None:
-                statement = statement.where(Document.company_id == company_id)
-            statement = self._fts(statement, DocumentChunk.text, query, db).limit(300)
-            for chunk, document, company in db.execute(statement).all():
-                result.append(
-                    SearchCandidate(
-                        key=f"document_chunk:{chunk.id}",
-                        entity_type="document_chunk",
-                        entity_id=chunk.id,
-                        title=document.title,
-                        text=chunk.text,
-                        company_id=document.company_id,
-                        ticker=company.ticker if company else None,
-                        source_type=document.source_type,
-                        source_url=document.source_url,
-                        status="active",
-                        as_of=document.published_at or document.created_at,
-                        metadata={
-                            "document_id": document.id,
-                            "chunk_index": chunk.chunk_index,
-                        },
-                    )
-                )
-        result.extend(self._narrative_candidates(db, query, company_id, entity_types))
-        result.extend(self._metric_candidates(db, query, company_id, entity_types))
-        if self._allowed("decision", entity_types):
-            statement = select(DecisionJournalEntry)
-            if company_id is not None:
-                statement = statement.where(DecisionJournalEntry.company_id == company_id)
-            statement = self._fts(statement, DecisionJournalEntry.rationale, query, db).limit(300)
-            for row in db.scalars(statement).all():
-                result.append(
-                    SearchCandidate(
-                        key=f"decision:{row.id}",
-                        entity_type="decision",
-                        entity_id=row.id,
-                        title=f"Decision: {row.decision}",
-                        text=f"{row.rationale} {' '.join(row.what_must_be_true)}",
-                        company_id=row.company_id,
-                        source_type="user",
-                        status=row.status,
-                        as_of=row.decision_date,
-                    )
-                )
+        for corpus in CORPORA:
+            ids = ids_by_type.get(corpus.entity_type)
+            if ids:
+                result.extend(loaders[corpus.entity_type](db, corpus, sorted(ids)))
         return result
 
-    def _narrative_candidates(
-        self,
-        db: Session,
-        query: str,
-        company_id: int | None,
-        entity_types: set[str] | None,
-    ) -> list[SearchCandidate]:
-        result: list[SearchCandidate] = []
-        specs = (
-            ("claim", Claim, Claim.statement),
-            ("thesis_section", ThesisSection, ThesisSection.body),
-            ("decision_lesson", DecisionLesson, DecisionLesson.lesson),
+    def _document_chunks(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
+        statement = (
+            select(DocumentChunk, Document, Company)
+            .join(Document, DocumentChunk.document_id == Document.id)
+            .outerjoin(Company, Document.company_id == Company.id)
+            .where(DocumentChunk.id.in_(ids))
         )
-        for entity_type, model, text_column in specs:
-            if not self._allowed(entity_type, entity_types):
-                continue
-            statement = select(model)
-            if company_id is not None:
-                statement = statement.where(model.company_id == company_id)
-            statement = self._fts(statement, text_column, query, db).limit(300)
-            for row in db.scalars(statement).all():
-                if entity_type == "claim":
-                    title, text = row.statement[:160], row.statement
-                elif entity_type == "thesis_section":
-                    title, text = row.title, row.body
-                else:
-                    title = f"Decision lesson: {row.taxonomy}"
-                    text = " ".join(
-                        (
-                            row.expectation,
-                            row.outcome,
-                            row.deviation,
-                            row.cause,
-                            row.error,
-                            row.lesson,
-                            row.future_application,
-                        )
-                    )
-                result.append(
-                    SearchCandidate(
-                        key=f"{entity_type}:{row.id}",
-                        entity_type=entity_type,
-                        entity_id=row.id,
-                        title=title,
-                        text=text,
-                        company_id=row.company_id,
-                        source_type=("user" if entity_type == "decision_lesson" else "research"),
-                        status=row.status,
-                        as_of=row.updated_at,
-                    )
-                )
-        return result
+        return [
+            SearchCandidate(
+                key=f"document_chunk:{chunk.id}",
+                entity_type="document_chunk",
+                entity_id=chunk.id,
+                title=document.title,
+                text=chunk.text,
+                company_id=document.company_id,
+                ticker=company.ticker if company else None,
+                source_type=document.source_type,
+                source_url=document.source_url,
+                status="active",
+                as_of=document.published_at or document.created_at,
+                metadata={
+                    "document_id": document.id,
+                    "chunk_index": chunk.chunk_index,
+                },
+            )
+            for chunk, document, company in db.execute(statement).all()
+        ]
 
-    def _metric_candidates(
-        self,
-        db: Session,
-        query: str,
-        company_id: int | None,
-        entity_types: set[str] | None,
-    ) -> list[SearchCandidate]:
-        result: list[SearchCandidate] = []
-        for entity_type, model in (
-            ("financial_fact", FinancialFact),
-            ("calculated_metric", CalculatedMetric),
-        ):
-            if not self._allowed(entity_type, entity_types):
-                continue
-            statement = select(model, Company).join(Company, model.company_id == Company.id)
-            if company_id is not None:
-                statement = statement.where(model.company_id == company_id)
-            statement = self._fts(statement, model.metric, query, db).limit(500)
-            for row, row_company in db.execute(statement).all():
-                result.append(
-                    SearchCandidate(
-                        key=f"{entity_type}:{row.id}",
-                        entity_type=entity_type,
-                        entity_id=row.id,
-                        title=f"{row_company.ticker} {row.metric} {row.period}",
-                        text=f"{row.metric} {row.value} {row.unit} {row.period}",
-                        company_id=row.company_id,
-                        ticker=row_company.ticker,
-                        source_type=getattr(row, "source_type", "calculation"),
-                        status=getattr(row, "status", "verified"),
-                        as_of=row.updated_at,
-                        metadata={
-                            "period": row.period,
-                            "value": str(row.value),
-                            "unit": row.unit,
-                        },
-                    )
-                )
-        return result
+    def _decisions(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
+        statement = select(DecisionJournalEntry).where(DecisionJournalEntry.id.in_(ids))
+        return [
+            SearchCandidate(
+                key=f"decision:{row.id}",
+                entity_type="decision",
+                entity_id=row.id,
+                title=f"Decision: {row.decision}",
+                text=f"{row.rationale} {' '.join(row.what_must_be_true)}",
+                company_id=row.company_id,
+                source_type="user",
+                status=row.status,
+                as_of=row.decision_date,
+            )
+            for row in db.scalars(statement).all()
+        ]
 
-    def _knowledge_corpus(
-        self,
-        db: Session,
-        query: str,
-        company_id: int | None,
-        entity_types: set[str] | None,
-        *,
-        collection_id: int | None,
-    ) -> Iterable[SearchCandidate]:
+    def _narrative_rows(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
+        entity_type = corpus.entity_type
         result: list[SearchCandidate] = []
-        if self._allowed("knowledge_chunk", entity_types):
-            statement = (
-                select(KnowledgeChunk, KnowledgeDocument, KnowledgeCollection)
-                .join(
-                    KnowledgeDocument,
-                    KnowledgeChunk.knowledge_document_id == KnowledgeDocument.id,
+        for row in db.scalars(select(corpus.model).where(corpus.model.id.in_(ids))).all():
+            if entity_type == "claim":
+                title, text = row.statement[:160], row.statement
+            elif entity_type == "thesis_section":
+                title, text = row.title, row.body
+            else:
+                title = f"Decision lesson: {row.taxonomy}"
+                text = " ".join(
+                    (
+                        row.expectation,
+                        row.outcome,
+                        row.deviation,
+                        row.cause,
+                        row.error,
+                        row.lesson,
+                        row.future_application,
+                    )
                 )
-                .outerjoin(
-                    KnowledgeCollection,
-                    KnowledgeDocument.collection_id == KnowledgeCollection.id,
+            result.append(
+                SearchCandidate(
+                    key=f"{entity_type}:{row.id}",
+                    entity_type=entity_type,
+                    entity_id=row.id,
+                    title=title,
+                    text=text,
+                    company_id=row.company_id,
+                    source_type=corpus.source_type,
+                    status=row.status,
+                    as_of=row.updated_at,
                 )
             )
-            if collection_id is not None:
-                statement = statement.where(KnowledgeDocument.collection_id == collection_id)
-            statement = self._fts(statement, KnowledgeChunk.content, query, db).limit(300)
-            for chunk, document, collection in db.execute(statement).all():
-                result.append(
-                    SearchCandidate(
-                        key=f"knowledge_chunk:{chunk.id}",
-                        entity_type="knowledge_chunk",
-                        entity_id=chunk.id,
-                        title=document.title,
-                        text=chunk.content,
-                        source_type=document.document_type,
-                        source_url=document.source_url,
-                        collection_id=document.collection_id,
-                        collection=collection.name if collection else None,
-                        status=document.status,
-                        as_of=document.publication_date or document.created_at,
-                        metadata={
-                            "knowledge_document_id": document.id,
-                            "page_number": chunk.page_number,
-                            "source_locator": chunk.source_locator,
-                        },
-                    )
-                )
-        result.extend(self._principle_candidates(db, query, company_id, entity_types, collection_id))
-        result.extend(self._case_candidates(db, query, company_id, entity_types, collection_id))
         return result
 
-    def _principle_candidates(
-        self,
-        db: Session,
-        query: str,
-        company_id: int | None,
-        entity_types: set[str] | None,
-        collection_id: int | None,
-    ) -> list[SearchCandidate]:
-        if not self._allowed("investment_principle", entity_types):
-            return []
+    def _metric_rows(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
+        entity_type = corpus.entity_type
+        model = corpus.model
+        statement = (
+            select(model, Company)
+            .join(Company, model.company_id == Company.id)
+            .where(model.id.in_(ids))
+        )
+        return [
+            SearchCandidate(
+                key=f"{entity_type}:{row.id}",
+                entity_type=entity_type,
+                entity_id=row.id,
+                title=f"{row_company.ticker} {row.metric} {row.period}",
+                text=f"{row.metric} {row.value} {row.unit} {row.period}",
+                company_id=row.company_id,
+                ticker=row_company.ticker,
+                source_type=getattr(row, "source_type", "calculation"),
+                status=getattr(row, "status", "verified"),
+                as_of=row.updated_at,
+                metadata={
+                    "period": row.period,
+                    "value": str(row.value),
+                    "unit": row.unit,
+                },
+            )
+            for row, row_company in db.execute(statement).all()
+        ]
+
+    def _knowledge_chunks(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
+        statement = (
+            select(KnowledgeChunk, KnowledgeDocument, KnowledgeCollection)
+            .join(
+                KnowledgeDocument,
+                KnowledgeChunk.knowledge_document_id == KnowledgeDocument.id,
+            )
+            .outerjoin(
+                KnowledgeCollection,
+                KnowledgeDocument.collection_id == KnowledgeCollection.id,
+            )
+            .where(KnowledgeChunk.id.in_(ids))
+        )
+        return [
+            SearchCandidate(
+                key=f"knowledge_chunk:{chunk.id}",
+                entity_type="knowledge_chunk",
+                entity_id=chunk.id,
+                title=document.title,
+                text=chunk.content,
+                source_type=document.document_type,
+                source_url=document.source_url,
+                collection_id=document.collection_id,
+                collection=collection.name if collection else None,
+                status=document.status,
+                as_of=document.publication_date or document.created_at,
+                metadata={
+                    "knowledge_document_id": document.id,
+                    "page_number": chunk.page_number,
+                    "source_locator": chunk.source_locator,
+                },
+            )
+            for chunk, document, collection in db.execute(statement).all()
+        ]
+
+    def _principles(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
         statement = (
             select(InvestmentPrinciple, KnowledgeDocument, KnowledgeCollection)
             .join(
@@ -643,78 +764,60 @@ class UniversalSearchService:
                 KnowledgeCollection,
                 InvestmentPrinciple.collection_id == KnowledgeCollection.id,
             )
+            .where(InvestmentPrinciple.id.in_(ids))
         )
-        if collection_id is not None:
-            statement = statement.where(InvestmentPrinciple.collection_id == collection_id)
-        if company_id is not None:
-            statement = statement.where(InvestmentPrinciple.applies_to_company_ids.contains([company_id]))
-        statement = self._fts(statement, InvestmentPrinciple.principle, query, db).limit(300)
-        result = []
-        for row, document, collection in db.execute(statement).all():
-            result.append(
-                SearchCandidate(
-                    key=f"investment_principle:{row.id}",
-                    entity_type="investment_principle",
-                    entity_id=row.id,
-                    title=f"Principle: {row.category}",
-                    text=" ".join(
-                        (
-                            row.principle,
-                            row.exact_fragment,
-                            *row.application_conditions,
-                            *row.exceptions,
-                        )
-                    ),
-                    source_type=document.document_type,
-                    source_url=document.source_url,
-                    collection_id=row.collection_id,
-                    collection=collection.name if collection else None,
-                    status=row.status,
-                    as_of=row.approved_at or row.created_at,
-                    metadata={
-                        "author": row.author,
-                        "page_number": row.page_number,
-                        "knowledge_document_id": row.knowledge_document_id,
-                    },
-                )
+        return [
+            SearchCandidate(
+                key=f"investment_principle:{row.id}",
+                entity_type="investment_principle",
+                entity_id=row.id,
+                title=f"Principle: {row.category}",
+                text=" ".join(
+                    (
+                        row.principle,
+                        row.exact_fragment,
+                        *row.application_conditions,
+                        *row.exceptions,
+                    )
+                ),
+                source_type=document.document_type,
+                source_url=document.source_url,
+                collection_id=row.collection_id,
+                collection=collection.name if collection else None,
+                status=row.status,
+                as_of=row.approved_at or row.created_at,
+                metadata={
+                    "author": row.author,
+                    "page_number": row.page_number,
+                    "knowledge_document_id": row.knowledge_document_id,
+                },
             )
-        return result
+            for row, document, collection in db.execute(statement).all()
+        ]
 
-    def _case_candidates(
-        self,
-        db: Session,
-        query: str,
-        company_id: int | None,
-        entity_types: set[str] | None,
-        collection_id: int | None,
-    ) -> list[SearchCandidate]:
-        if not self._allowed("investment_case", entity_types):
-            return []
-        statement = select(InvestmentCaseStudy, KnowledgeCollection).outerjoin(
-            KnowledgeCollection,
-            InvestmentCaseStudy.collection_id == KnowledgeCollection.id,
+    def _cases(self, db: Session, corpus: Corpus, ids: list[int]) -> list[SearchCandidate]:
+        statement = (
+            select(InvestmentCaseStudy, KnowledgeCollection)
+            .outerjoin(
+                KnowledgeCollection,
+                InvestmentCaseStudy.collection_id == KnowledgeCollection.id,
+            )
+            .where(InvestmentCaseStudy.id.in_(ids))
         )
-        if collection_id is not None:
-            statement = statement.where(InvestmentCaseStudy.collection_id == collection_id)
-        if company_id is not None:
-            statement = statement.where(InvestmentCaseStudy.company_id == company_id)
-        statement = self._fts(statement, InvestmentCaseStudy.summary, query, db).limit(300)
-        result = []
-        for row, collection in db.execute(statement).all():
-            result.append(
-                SearchCandidate(
-                    key=f"investment_case:{row.id}",
-                    entity_type="investment_case",
-                    entity_id=row.id,
-                    title=row.title,
-                    text=" ".join((row.summary, row.outcome, *row.lessons)),
-                    company_id=row.company_id,
-                    source_type="historical_case",
-                    collection_id=row.collection_id,
-                    collection=collection.name if collection else None,
-                    status=row.status,
-                    as_of=row.updated_at,
-                    metadata={"period": row.period, "sector": row.sector},
-                )
+        return [
+            SearchCandidate(
+                key=f"investment_case:{row.id}",
+                entity_type="investment_case",
+                entity_id=row.id,
+                title=row.title,
+                text=" ".join((row.summary, row.outcome, *row.lessons)),
+                company_id=row.company_id,
+                source_type="historical_case",
+                collection_id=row.collection_id,
+                collection=collection.name if collection else None,
+                status=row.status,
+                as_of=row.updated_at,
+                metadata={"period": row.period, "sector": row.sector},
             )
-        return result
+            for row, collection in db.execute(statement).all()
+        ]
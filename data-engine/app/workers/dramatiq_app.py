@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import re
+import threading
 from datetime import UTC, datetime
 from typing import Any
 
@@ -9,6 +10,7 @@ import dramatiq
 from dramatiq.brokers.redis import RedisBroker
 
 from app.core.config import get_settings
+from app.core.http_clients import install_http_clients
 
 settings = get_settings()
 broker = RedisBroker(url=settings.redis_url)
@@ -35,8 +37,38 @@ def _batch_status(processed: int, errors: list[dict]) -> str:
     return "ok"
 
 
+_worker_loop = threading.local()
+
+
 def _run(coroutine):
-    return asyncio.run(coroutine)
+    # Each worker thread keeps one event loop and its pooled HTTP clients, so
+    # connections to SEC, FMP and LLM hosts survive from one message to the next.
+    loop = getattr(_worker_loop, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _worker_loop.loop = loop
+        _worker_loop.http_clients = install_http_clients(loop)
+    return loop.run_until_complete(coroutine)
+
+
+def _close_worker_loop() -> None:
+    loop = getattr(_worker_loop, "loop", None)
+    if loop is None or loop.is_closed():
+        return
+    loop.run_until_complete(_worker_loop.http_clients.aclose())
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+    _worker_loop.loop = None
+
+
+class WorkerEventLoop(dramatiq.Middleware):
+    """Close each worker thread's event loop and HTTP pools on shutdown."""
+
+    def before_worker_thread_shutdown(self, broker, thread) -> None:
+        _close_worker_loop()
+
+
+broker.add_middleware(WorkerEventLoop())
 
 
 def _session(tenant_id: int | None, user_id: str | None):
@@ -215,11 +247,18 @@ def refresh_market_pipeline(
     tenant_id: int | None = None,
     user_id: str | None = None,
 ) -> dict[str, Any]:
-    from app.services.market_refresh_service import MarketRefreshService
+    from app.services.market_refresh_service import (
+        ECBFXProvider,
+        MarketRefreshService,
+        PublicPriceProvider,
+    )
+    from app.services.public_data_cache import default_public_data_cache
 
     db = _session(tenant_id, user_id)
     try:
-        result = _run(MarketRefreshService().refresh(db))
+        public_data = default_public_data_cache()
+        service = MarketRefreshService(PublicPriceProvider(public_data), ECBFXProvider(public_data))
+        result = _run(service.refresh(db))
         return {"actor": "refresh_market_pipeline", **result}
     except Exception as exc:
         _rollback(db)
@@ -228,77 +267,186 @@ def refresh_market_pipeline(
         db.close()
 
 
+# Connector calls one feed refresh keeps in flight. Provider semaphores and
+# the SEC request throttle still apply underneath, so this only needs to be
+# high enough to keep the slowest provider's rate limit saturated.
+FEED_POLL_CONCURRENCY = 16
+
+
+class _FeedBatch:
+    """Counters and the single database writer for one feed refresh."""
+
+    def __init__(
+        self,
+        db,
+        service,
+        *,
+        source: str,
+        key: str = "ticker",
+        document_source: str | None = None,
+        tenant_id: int | None = None,
+        user_id: str | None = None,
+    ) -> None:
+        self.db = db
+        self.service = service
+        self.source = source
+        self.key = key
+        self.document_source = document_source
+        self.tenant_id = tenant_id
+        self.user_id = user_id
+        self.processed = self.ingested = self.documents_queued = 0
+        self.errors: list[dict] = []
+
+    def write(self, target: tuple[str, str | None, str], outcome) -> None:
+        """Ingest one polled result; a failure only affects its own target."""
+        label, ticker, _ = target
+        try:
+            if isinstance(outcome, Exception):
+                raise outcome
+            if outcome.errors:
+                self.errors.extend(
+                    {self.key: label, "source": self.source, "message": error}
+                    for error in outcome.errors
+                )
+            ingestion = self.service.ingest_news_result(self.db, outcome, ticker=ticker)
+            if outcome.status != "error":
+                self.processed += 1
+            self.ingested += int(ingestion.get("created", 0))
+            if self.document_source is None:
+                return
+            # Document-producing sweeps are keyed by ticker.
+            for item in outcome.items:
+                if not item.url:
+                    continue
+                process_document.send(
+                    label,
+                    item.title,
+                    item.url,
+                    self.document_source,
+                    item.published_at.isoformat() if item.published_at else None,
+                    self.tenant_id,
+                    self.user_id,
+                )
+                self.documents_queued += 1
+        except Exception as exc:
+            _rollback(self.db)
+            self.errors.append(
+                {
+                    self.key: label,
+                    "source": self.source,
+                    "type": type(exc).__name__,
+                    "message": str(exc),
+                }
+            )
+
+    def summary(self, actor_name: str, processed_key: str = "companies_processed") -> dict[str, Any]:
+        summary = {
+            "status": _batch_status(self.processed, self.errors),
+            "actor": actor_name,
+            processed_key: self.processed,
+            "news_ingested": self.ingested,
+        }
+        if self.document_source is not None:
+            summary["documents_queued"] = self.documents_queued
+        summary["errors"] = self.errors
+        return summary
+
+
+async def _sweep(targets, poll, write) -> None:
+    """Poll every target concurrently and write each outcome in turn.
+
+    Polls share the worker loop's pooled clients and run up to
+    ``FEED_POLL_CONCURRENCY`` at a time. Outcomes are written one by one
+    on the loop thread as they complete, so the session is never used by
+    two coroutines at once. A poll that raises is written as its exception.
+    """
+    slots = asyncio.Semaphore(FEED_POLL_CONCURRENCY)
+    outcomes: asyncio.Queue = asyncio.Queue()
+
+    async def fetch(target) -> None:
+        async with slots:
+            try:
+                outcome = await poll(target)
+            except Exception as exc:
+                outcome = exc
+        outcomes.put_nowait((target, outcome))
+
+    tasks = [asyncio.create_task(fetch(target)) for target in targets]
+    try:
+        for _ in tasks:
+            write(*await outcomes.get())
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Poll sizes shared by the tenant actors and the global public-data refresh;
+# they are part of the cache key, so both sides must use the same values.
+SEC_FILINGS_LIMIT = 20
+NEWS_MAX_RECORDS = 25
+
+
+def _feed_targets(db, source: str, ticker: str | None = None) -> list[tuple[str, str | None, str]]:
+    """(label, ticker, argument) for each company a feed source polls."""
+    companies = _companies(db, ticker)
+    if source == "sec":
+        return [(company.ticker, company.ticker, company.cik) for company in companies if company.cik]
+    if source == "ir":
+        return [(company.ticker, company.ticker, company.ir_url) for company in companies if company.ir_url]
+    if source == "gdelt":
+        return [
+            (company.ticker, company.ticker, f'"{company.name}" OR {company.ticker}')
+            for company in companies
+        ]
+    raise ValueError(f"Unknown company feed source {source!r}")
+
+
+def _feed_poller(
+    service,
+    source: str,
+    *,
+    limit: int = SEC_FILINGS_LIMIT,
+    max_records: int = NEWS_MAX_RECORDS,
+):
+    async def poll(target):
+        _, ticker, argument = target
+        if source == "sec":
+            return await service.poll_sec(argument, ticker=ticker, limit=limit)
+        if source == "ir":
+            return await service.poll_ir(argument, ticker=ticker)
+        if source == "rss":
+            return await service.poll_rss(argument, ticker=ticker)
+        return await service.poll_gdelt(argument, ticker=ticker, max_records=max_records)
+
+    return poll
+
+
 @dramatiq.actor(max_retries=2, min_backoff=15_000)
 def refresh_sec_filings(
     tenant_id: int | None = None,
     user_id: str | None = None,
     ticker: str | None = None,
-    limit: int = 20,
+    limit: int = SEC_FILINGS_LIMIT,
 ) -> dict[str, Any]:
     actor_name = "refresh_sec_filings"
     try:
+        from app.services.connectors.sec import SECClient, default_sec_cache
         from app.services.feed_ingestion_service import FeedIngestionService
+        from app.services.public_data_cache import default_public_data_cache
 
         db = _session(tenant_id, user_id)
         try:
-            service = FeedIngestionService()
-            processed = ingested = queued_documents = 0
-            errors: list[dict] = []
-            for company in _companies(db, ticker):
-                if not company.cik:
-                    continue
-                try:
-                    result = _run(
-                        service.poll_sec(
-                            company.cik,
-                            ticker=company.ticker,
-                            limit=limit,
-                        )
-                    )
-                    if result.errors:
-                        errors.extend(
-                            {"ticker": company.ticker, "source": "sec", "message": error}
-                            for error in result.errors
-                        )
-                    ingestion = service.ingest_news_result(
-                        db,
-                        result,
-                        ticker=company.ticker,
-                    )
-                    if result.status != "error":
-                        processed += 1
-                    ingested += int(ingestion.get("created", 0))
-                    for item in result.items:
-                        if not item.url:
-                            continue
-                        process_document.send(
-                            company.ticker,
-                            item.title,
-                            item.url,
-                            "SEC",
-                            item.published_at.isoformat() if item.published_at else None,
-                            tenant_id,
-                            user_id,
-                        )
-                        queued_documents += 1
-                except Exception as exc:
-                    _rollback(db)
-                    errors.append(
-                        {
-                            "ticker": company.ticker,
-                            "source": "sec",
-                            "type": type(exc).__name__,
-                            "message": str(exc),
-                        }
-                    )
-            return {
-                "status": _batch_status(processed, errors),
-                "actor": actor_name,
-                "companies_processed": processed,
-                "news_ingested": ingested,
-                "documents_queued": queued_documents,
-                "errors": errors,
-            }
+            # One client for the whole sweep, so its throttle spaces every request.
+            service = FeedIngestionService(
+                sec_client=SECClient(cache=default_sec_cache()), public_data=default_public_data_cache()
+            )
+            batch = _FeedBatch(
+                db, service, source="sec", document_source="SEC", tenant_id=tenant_id, user_id=user_id
+            )
+            targets = _feed_targets(db, "sec", ticker)
+            _run(_sweep(targets, _feed_poller(service, "sec", limit=limit), batch.write))
+            return batch.summary(actor_name)
         finally:
             db.close()
     except Exception as exc:
@@ -314,63 +462,17 @@ def refresh_ir_pages(
     actor_name = "refresh_ir_pages"
     try:
         from app.services.feed_ingestion_service import FeedIngestionService
+        from app.services.public_data_cache import default_public_data_cache
 
         db = _session(tenant_id, user_id)
         try:
-            service = FeedIngestionService()
-            processed = ingested = queued_documents = 0
-            errors: list[dict] = []
-            for company in _companies(db, ticker):
-                if not company.ir_url:
-                    continue
-                try:
-                    result = _run(
-                        service.poll_ir(company.ir_url, ticker=company.ticker)
-                    )
-                    if result.errors:
-                        errors.extend(
-                            {"ticker": company.ticker, "source": "ir", "message": error}
-                            for error in result.errors
-                        )
-                    ingestion = service.ingest_news_result(
-                        db,
-                        result,
-                        ticker=company.ticker,
-                    )
-                    if result.status != "error":
-                        processed += 1
-                    ingested += int(ingestion.get("created", 0))
-                    for item in result.items:
-                        if not item.url:
-                            continue
-                        process_document.send(
-                            company.ticker,
-                            item.title,
-                            item.url,
-                            "IR",
-                            item.published_at.isoformat() if item.published_at else None,
-                            tenant_id,
-                            user_id,
-                        )
-                        queued_documents += 1
-                except Exception as exc:
-                    _rollback(db)
-                    errors.append(
-                        {
-                            "ticker": company.ticker,
-                            "source": "ir",
-                            "type": type(exc).__name__,
-                            "message": str(exc),
-                        }
-                    )
-            return {
-                "status": _batch_status(processed, errors),
-                "actor": actor_name,
-                "companies_processed": processed,
-                "news_ingested": ingested,
-                "documents_queued": queued_documents,
-                "errors": errors,
-            }
+            service = FeedIngestionService(public_data=default_public_data_cache())
+            batch = _FeedBatch(
+                db, service, source="ir", document_source="IR", tenant_id=tenant_id, user_id=user_id
+            )
+            targets = _feed_targets(db, "ir", ticker)
+            _run(_sweep(targets, _feed_poller(service, "ir"), batch.write))
+            return batch.summary(actor_name)
         finally:
             db.close()
     except Exception as exc:
@@ -391,6 +493,7 @@ def refresh_rss_feeds(
             RSSFeed,
             configured_rss_feeds,
         )
+        from app.services.public_data_cache import default_public_data_cache
 
         feeds = [RSSFeed(feed_url, ticker.upper() if ticker else None)] if feed_url else configured_rss_feeds()
         if not feeds:
@@ -403,44 +506,11 @@ def refresh_rss_feeds(
 
         db = _session(tenant_id, user_id)
         try:
-            service = FeedIngestionService()
-            processed = ingested = 0
-            errors: list[dict] = []
-            for feed in feeds:
-                try:
-                    result = _run(
-                        service.poll_rss(feed.url, ticker=feed.ticker)
-                    )
-                    if result.errors:
-                        errors.extend(
-                            {"url": feed.url, "source": "rss", "message": error}
-                            for error in result.errors
-                        )
-                    ingestion = service.ingest_news_result(
-                        db,
-                        result,
-                        ticker=feed.ticker,
-                    )
-                    if result.status != "error":
-                        processed += 1
-                    ingested += int(ingestion.get("created", 0))
-                except Exception as exc:
-                    _rollback(db)
-                    errors.append(
-                        {
-                            "url": feed.url,
-                            "source": "rss",
-                            "type": type(exc).__name__,
-                            "message": str(exc),
-                        }
-                    )
-            return {
-                "status": _batch_status(processed, errors),
-                "actor": actor_name,
-                "feeds_processed": processed,
-                "news_ingested": ingested,
-                "errors": errors,
-            }
+            service = FeedIngestionService(public_data=default_public_data_cache())
+            batch = _FeedBatch(db, service, source="rss", key="url")
+            targets = [(feed.url, feed.ticker, feed.url) for feed in feeds]
+            _run(_sweep(targets, _feed_poller(service, "rss"), batch.write))
+            return batch.summary(actor_name, "feeds_processed")
         finally:
             db.close()
     except Exception as exc:
@@ -459,57 +529,20 @@ def refresh_news(
     tenant_id: int | None = None,
     user_id: str | None = None,
     ticker: str | None = None,
-    max_records: int = 25,
+    max_records: int = NEWS_MAX_RECORDS,
 ) -> dict[str, Any]:
     actor_name = "refresh_news"
     try:
         from app.services.feed_ingestion_service import FeedIngestionService
+        from app.services.public_data_cache import default_public_data_cache
 
         db = _session(tenant_id, user_id)
         try:
-            service = FeedIngestionService()
-            processed = ingested = 0
-            errors: list[dict] = []
-            for company in _companies(db, ticker):
-                try:
-                    query = f'"{company.name}" OR {company.ticker}'
-                    result = _run(
-                        service.poll_gdelt(
-                            query,
-                            ticker=company.ticker,
-                            max_records=max_records,
-                        )
-                    )
-                    if result.errors:
-                        errors.extend(
-                            {"ticker": company.ticker, "source": "gdelt", "message": error}
-                            for error in result.errors
-                        )
-                    ingestion = service.ingest_news_result(
-                        db,
-                        result,
-                        ticker=company.ticker,
-                    )
-                    if result.status != "error":
-                        processed += 1
-                    ingested += int(ingestion.get("created", 0))
-                except Exception as exc:
-                    _rollback(db)
-                    errors.append(
-                        {
-                            "ticker": company.ticker,
-                            "source": "gdelt",
-                            "type": type(exc).__name__,
-                            "message": str(exc),
-                        }
-                    )
-            return {
-                "status": _batch_status(processed, errors),
-                "actor": actor_name,
-                "companies_processed": processed,
-                "news_ingested": ingested,
-                "errors": errors,
-            }
+            service = FeedIngestionService(public_data=default_public_data_cache())
+            batch = _FeedBatch(db, service, source="gdelt")
+            targets = _feed_targets(db, "gdelt", ticker)
+            _run(_sweep(targets, _feed_poller(service, "gdelt", max_records=max_records), batch.write))
+            return batch.summary(actor_name)
         finally:
             db.close()
     except Exception as exc:
@@ -523,6 +556,81 @@ def refresh_news(
         )
 
 
+# Tenant actor fanned out after each global public-data refresh.
+PUBLIC_DATA_FANOUT = {
+    "market": refresh_market_pipeline,
+    "sec": refresh_sec_filings,
+    "ir": refresh_ir_pages,
+    "rss": refresh_rss_feeds,
+    "gdelt": refresh_news,
+}
+
+
+async def _warm_public_data(db, source: str, public_data) -> dict[str, Any]:
+    from datetime import date
+
+    from app.services.connectors.sec import SECClient, default_sec_cache
+    from app.services.feed_ingestion_service import FeedIngestionService, configured_rss_feeds
+    from app.services.market_refresh_service import ECBFXProvider, PublicPriceProvider
+
+    if source == "market":
+        companies = _companies(db)
+        _, errors = await PublicPriceProvider(public_data).fetch(companies, as_of=date.today())
+        await ECBFXProvider(public_data).fetch(base_currency="EUR", quote_currencies=set())
+        return {"resources": len(companies) + 1, "errors": errors}
+
+    service = FeedIngestionService(sec_client=SECClient(cache=default_sec_cache()), public_data=public_data)
+    if source == "rss":
+        targets = [(feed.url, feed.ticker, feed.url) for feed in configured_rss_feeds()]
+    else:
+        targets = _feed_targets(db, source)
+    errors: list[dict] = []
+
+    def record(target, outcome) -> None:
+        if isinstance(outcome, Exception):
+            errors.append({"target": target[0], "type": type(outcome).__name__, "message": str(outcome)})
+        elif outcome.status == "error":
+            errors.extend({"target": target[0], "message": error} for error in outcome.errors)
+
+    await _sweep(targets, _feed_poller(service, source), record)
+    return {"resources": len(targets), "errors": errors}
+
+
+@dramatiq.actor(max_retries=1, min_backoff=15_000)
+def refresh_public_data(source: str) -> dict[str, Any]:
+    """Fetch one source's public resources once, then fan out tenant ingestion.
+
+    Companies, prices, FX rates, filings and feeds are the same for every
+    tenant. This refreshes the shared public-data cache for ``source`` and
+    only then enqueues the tenant actors, which read that cache, so provider
+    request counts do not grow with the number of tenants.
+    """
+    actor_name = "refresh_public_data"
+    try:
+        from app.core.database import SessionLocal
+        from app.services.public_data_cache import default_public_data_cache
+        from app.workers.scheduler import enqueue_for_all_tenants
+
+        fanout = PUBLIC_DATA_FANOUT[source]
+        public_data = default_public_data_cache().refreshing()
+        with SessionLocal() as db:
+            warmed = _run(_warm_public_data(db, source, public_data))
+        queued = enqueue_for_all_tenants(fanout)["queued"]
+        pruned = public_data.prune()
+        return {
+            "status": "partial" if warmed["errors"] else "ok",
+            "actor": actor_name,
+            "source": source,
+            "resources": warmed["resources"],
+            "provider_fetches": sum(public_data.fetches.values()),
+            "tenants_queued": len(queued),
+            "pruned": pruned,
+            "errors": warmed["errors"],
+        }
+    except Exception as exc:
+        return _failure(actor_name, exc, source=source)
+
+
 @dramatiq.actor(max_retries=3, min_backoff=30_000)
 def process_document(
     ticker: str,
@@ -837,6 +945,65 @@ def run_daily_research() -> dict[str, Any]:
     }
 
 
+@dramatiq.actor(max_retries=1, time_limit=2 * 60 * 60 * 1000)
+def ingest_sec_companyfacts(
+    tenant_id: int | None = None,
+    user_id: str | None = None,
+    archive_path: str | None = None,
+) -> dict[str, Any]:
+    """Load SEC facts for the tenant's universe from a downloaded companyfacts.zip."""
+    from app.services.financial_ingestion_service import FinancialIngestionService
+
+    db = _session(tenant_id, user_id)
+    try:
+        if not archive_path:
+            raise ValueError("archive_path is required")
+        result = FinancialIngestionService().ingest_companyfacts_archive(db, archive_path)
+        return {"actor": "ingest_sec_companyfacts", **result}
+    except Exception as exc:
+        _rollback(db)
+        return _failure("ingest_sec_companyfacts", exc, archive_path=archive_path)
+    finally:
+        db.close()
+
+
+@dramatiq.actor(max_retries=1, time_limit=6 * 60 * 60 * 1000)
+def backfill_search_vectors(batch_size: int = 5000) -> dict[str, Any]:
+    """Fill stored search vectors for rows written before migration 0019.
+
+    Maintenance job across all tenants; it only touches derived columns.
+    """
+    from app.core.database import SessionLocal
+    from app.services.search_vector_service import SearchVectorService
+
+    with SessionLocal() as db:
+        try:
+            result = SearchVectorService().backfill(db, batch_size=batch_size)
+            return {"actor": "backfill_search_vectors", **result}
+        except Exception as exc:
+            _rollback(db)
+            return _failure("backfill_search_vectors", exc, batch_size=batch_size)
+
+
+@dramatiq.actor(max_retries=1, time_limit=60 * 60 * 1000)
+def export_analytics_warehouse(full: bool = False) -> dict[str, Any]:
+    """Copy changed facts, metrics and prices into the Parquet warehouse.
+
+    Maintenance job across all tenants; each tenant's rows land in its own
+    directory.
+    """
+    from app.core.database import SessionLocal
+    from app.services.analytics_warehouse import default_warehouse
+
+    with SessionLocal() as db:
+        try:
+            result = default_warehouse().export(db, full=full)
+            return {"actor": "export_analytics_warehouse", **result}
+        except Exception as exc:
+            _rollback(db)
+            return _failure("export_analytics_warehouse", exc, full=full)
+
+
 # Short aliases keep operational imports stable while actor names remain descriptive.
 refresh_sec = refresh_sec_filings
 refresh_ir = refresh_ir_pages
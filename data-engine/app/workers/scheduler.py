@@ -1,16 +1,15 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from functools import partial
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 
 from app.workers.dramatiq_app import (
+    backfill_search_vectors,
     consolidate_memory,
-    refresh_market_pipeline,
-    refresh_ir_pages,
-    refresh_news,
-    refresh_rss_feeds,
-    refresh_sec_filings,
+    export_analytics_warehouse,
+    refresh_public_data,
     review_theses,
     run_daily_research,
     scan_contradictions,
@@ -52,37 +51,39 @@ def enqueue_for_all_tenants(actor) -> dict:
 
 def build_scheduler() -> BlockingScheduler:
     scheduler = BlockingScheduler(timezone="UTC")
+    # Public-data jobs fetch each shared resource once, then fan out the
+    # tenant actors themselves (see refresh_public_data).
     _register(
         scheduler,
-        partial(enqueue_for_all_tenants, refresh_market_pipeline),
+        partial(refresh_public_data.send, "market"),
         "interval",
         job_id="market_refresh",
         hours=1,
     )
     _register(
         scheduler,
-        partial(enqueue_for_all_tenants, refresh_rss_feeds),
+        partial(refresh_public_data.send, "rss"),
         "interval",
         job_id="rss_refresh",
         minutes=15,
     )
     _register(
         scheduler,
-        partial(enqueue_for_all_tenants, refresh_news),
+        partial(refresh_public_data.send, "gdelt"),
         "interval",
         job_id="news_refresh",
         minutes=30,
     )
     _register(
         scheduler,
-        partial(enqueue_for_all_tenants, refresh_ir_pages),
+        partial(refresh_public_data.send, "ir"),
         "interval",
         job_id="ir_refresh",
         hours=1,
     )
     _register(
         scheduler,
-        partial(enqueue_for_all_tenants, refresh_sec_filings),
+        partial(refresh_public_data.send, "sec"),
         "cron",
         job_id="sec_refresh",
         hour="*/4",
@@ -112,6 +113,24 @@ def build_scheduler() -> BlockingScheduler:
         hour=7,
         minute=0,
     )
+    _register(
+        scheduler,
+        export_analytics_warehouse.send,
+        "interval",
+        job_id="analytics_warehouse_export",
+        minutes=15,
+    )
+    # Also runs at startup so a deployment fills rows written before
+    # migration 0019; once nothing is pending each pass is a no-op.
+    _register(
+        scheduler,
+        backfill_search_vectors.send,
+        "cron",
+        job_id="search_vector_backfill",
+        hour=2,
+        minute=45,
+        next_run_time=datetime.now(UTC),
+    )
     _register(
         scheduler,
         run_daily_research.send,
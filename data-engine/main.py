@@ -8,7 +8,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router as research_api_router
 from app.core.config import get_settings
 from app.core.auth import get_research_principal
+from app.core.compute import current_compute_executor, open_compute_executor
 from app.core.database import SessionLocal, init_db
+from app.core.http_clients import open_http_clients
 from app.core.rate_limit import RateLimitMiddleware
 from app.llm.factory import validate_llm_configuration
 from app.llm.model_aliases import configure_model_aliases
@@ -19,7 +21,7 @@ from routers.market import router as market_router
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(app: FastAPI):
     settings = get_settings()
     if settings.app_env.lower() == "test":
         # Tests use an isolated disposable schema. Runtime environments migrate
@@ -30,7 +32,10 @@ async def lifespan(_: FastAPI):
     validate_llm_configuration(settings)
     if settings.app_env.lower() != "production":
         ensure_company_master()
-    yield
+    async with open_http_clients() as http_clients, open_compute_executor() as compute:
+        app.state.http_clients = http_clients
+        app.state.compute = compute
+        yield
 
 
 app = FastAPI(title="CavaAI Research Engine", version="1.0.0", lifespan=lifespan)
@@ -125,7 +130,9 @@ async def health_ready():
     if not settings.database_url.startswith("sqlite"):
         ready = all(value == "ok" for value in checks.values())
 
+    compute = current_compute_executor()
     return {
         "status": "ready" if ready else "degraded",
         "checks": checks,
+        "compute": compute.metrics() if compute is not None else None,
     }
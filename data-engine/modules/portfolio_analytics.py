@@ -9,36 +9,46 @@ from typing import Optional
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
 import quantstats as qs
 from quantstats.montecarlo import run_models
 
+from modules.price_store import default_store, period_start
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _returns_from_closes(closes: pd.Series, symbol: str) -> Optional[pd.Series]:
+    prices = closes.dropna()
+    if len(prices) < 30:
+        return None
+    returns = prices.pct_change().dropna()
+    returns.name = symbol
+    return returns
+
+
 def _fetch_returns(symbol: str, period: str = "2y") -> Optional[pd.Series]:
-    """Download adjusted close prices and return daily log returns."""
+    """Adjusted closes from the local price store as daily returns."""
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=period, auto_adjust=True)
-        if hist.empty or len(hist) < 30:
-            return None
-        prices = hist["Close"].dropna()
-        returns = prices.pct_change().dropna()
-        returns.name = symbol
-        return returns
+        closes = default_store().closes([symbol], period_start(period))
     except Exception:
         return None
+    if symbol not in closes:
+        return None
+    return _returns_from_closes(closes[symbol], symbol)
 
 
 def _fetch_multi_returns(symbols: list[str], period: str = "2y") -> pd.DataFrame:
     """Fetch aligned daily returns for multiple symbols (inner join on dates)."""
+    try:
+        closes = default_store().closes(symbols, period_start(period))
+    except Exception:
+        return pd.DataFrame()
     series_map: dict[str, pd.Series] = {}
     for sym in symbols:
-        r = _fetch_returns(sym, period)
+        r = _returns_from_closes(closes[sym], sym) if sym in closes else None
         if r is not None and not r.empty:
             series_map[sym] = r
 
@@ -240,6 +250,9 @@ def run_portfolio_montecarlo(
             bust=bust,
             goal=goal,
             models=model_names,
+            # Only terminal values are reported: keep per-path outcomes, not paths.
+            keep_paths=False,
+            fan_paths=0,
         )
     except Exception as exc:
         return {"error": f"Monte Carlo failed: {exc}", "symbols": symbols}
@@ -0,0 +1,302 @@
+"""Local store of adjusted daily bars, fetched incrementally.
+
+Each symbol is one Parquet file under ``PRICE_STORE_DIR`` (default
+``storage/prices``) next to a small JSON sidecar recording how far back its
+history was fetched and when the tail was last checked. Files are replaced
+atomically and read through an in-memory DuckDB connection, so API and
+worker processes can share the directory without a database lock.
+
+Only bars after the last stored date are downloaded on refresh. Adjusted
+prices are restated after dividends and splits, so the last stored bar is
+fetched again as an overlap; if it moved, the whole series is reloaded.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import quote
+
+import duckdb
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from app.core.files import replacing, sql_literal
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+REFRESH_AFTER_SECONDS = 6 * 3600
+RESTATEMENT_TOLERANCE = 1e-6
+EARLIEST_DATE = date(1970, 1, 1)
+
+Downloader = Callable[[Sequence[str], date, date], Mapping[str, pd.DataFrame]]
+
+_default_store: Optional["PriceStore"] = None
+
+
+def yahoo_downloader(symbols: Sequence[str], start: date, end: date) -> dict[str, pd.DataFrame]:
+    """Adjusted daily bars from Yahoo Finance for ``[start, end)``, one batch call."""
+    data = yf.download(
+        tickers=" ".join(symbols),
+        start=start.isoformat(),
+        end=end.isoformat(),
+        auto_adjust=True,
+        progress=False,
+        group_by="ticker",
+        threads=True,
+    )
+    if data is None or data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {symbols[0]: data} if len(symbols) == 1 else {}
+    available = set(data.columns.get_level_values(0))
+    return {symbol: data[symbol] for symbol in symbols if symbol in available}
+
+
+def period_start(period: str, today: Optional[date] = None) -> date:
+    """First date covered by a yfinance-style period such as ``2y`` or ``6mo``."""
+    today = today or date.today()
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period.strip().lower())
+    if period == "max":
+        return EARLIEST_DATE
+    if period == "ytd":
+        return date(today.year, 1, 1)
+    if match is None:
+        return (pd.Timestamp(today) - pd.DateOffset(years=2)).date()
+    count, unit = int(match.group(1)), match.group(2)
+    offset = {
+        "d": pd.DateOffset(days=count),
+        "wk": pd.DateOffset(weeks=count),
+        "mo": pd.DateOffset(months=count),
+        "y": pd.DateOffset(years=count),
+    }[unit]
+    return (pd.Timestamp(today) - offset).date()
+
+
+def default_store() -> "PriceStore":
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore(os.getenv("PRICE_STORE_DIR", "storage/prices"))
+    return _default_store
+
+
+class PriceStore:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        downloader: Downloader = yahoo_downloader,
+        refresh_after: float = REFRESH_AFTER_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.downloader = downloader
+        self.refresh_after = refresh_after
+        self.clock = clock
+
+    # -- reads -------------------------------------------------------------
+
+    def closes(
+        self, symbols: Iterable[str], start: date, end: Optional[date] = None
+    ) -> pd.DataFrame:
+        """Adjusted closes for ``[start, end)``, one column per symbol with data."""
+        symbols = list(dict.fromkeys(symbols))
+        self.refresh(symbols, start)
+        return self.read(symbols, start=start, end=end)
+
+    def read(
+        self,
+        symbols: Iterable[str],
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        column: str = "close",
+    ) -> pd.DataFrame:
+        """Stored values without refreshing: a date index and one column per symbol."""
+        if column not in BAR_COLUMNS:
+            raise ValueError(f"Unknown bar column {column!r}")
+        symbols = list(dict.fromkeys(symbols))
+        files = [str(self._path(symbol)) for symbol in symbols if self._path(symbol).exists()]
+        if not files:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+        query = f"SELECT symbol, date, {column} AS value FROM read_parquet(?) WHERE date >= ?"
+        parameters: list[Any] = [files, start or EARLIEST_DATE]
+        if end is not None:
+            query += " AND date < ?"
+            parameters.append(end)
+        with duckdb.connect() as connection:
+            arrays = connection.execute(query, parameters).fetchnumpy()
+        frame = pd.DataFrame(
+            {
+                "symbol": np.asarray(arrays["symbol"], dtype=object),
+                "date": pd.to_datetime(arrays["date"]),
+                "value": np.asarray(arrays["value"], dtype=np.float64),
+            }
+        )
+        wide = frame.pivot(index="date", columns="symbol", values="value").sort_index()
+        wide.columns.name = None
+        return wide[[symbol for symbol in symbols if symbol in wide.columns]]
+
+    def bars(self, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+        """Stored OHLCV bars for one symbol, indexed by date."""
+        path = self._path(symbol)
+        if not path.exists():
+            return pd.DataFrame(columns=list(BAR_COLUMNS), index=pd.DatetimeIndex([], name="date"))
+        with duckdb.connect() as connection:
+            frame = connection.execute(
+                f"SELECT date, {', '.join(BAR_COLUMNS)} FROM read_parquet(?) "
+                "WHERE date >= ? AND date < ? ORDER BY date",
+                [str(path), start or EARLIEST_DATE, end or date.max],
+            ).df()
+        frame["date"] = pd.to_datetime(frame["date"])
+        return frame.set_index("date")
+
+    # -- incremental fetch -------------------------------------------------
+
+    def refresh(self, symbols: Iterable[str], start: date) -> None:
+        """Make stored history cover ``start`` onward and be recently checked.
+
+        Symbols without history back to ``start`` are fetched in full; the
+        rest only fetch bars from their last stored date once
+        ``refresh_after`` seconds have passed. Download failures are logged
+        and leave the stored data as it was.
+        """
+        now = self.clock()
+        full: dict[date, list[str]] = defaultdict(list)
+        tails: dict[date, list[str]] = defaultdict(list)
+        metadata: dict[str, dict[str, Any]] = {}
+        for symbol in dict.fromkeys(symbols):
+            meta = self._metadata(symbol)
+            if meta is None or start < date.fromisoformat(meta["covered_from"]):
+                full[start].append(symbol)
+            elif now - meta["checked_at"] >= self.refresh_after:
+                metadata[symbol] = meta
+                if meta.get("last_date") is None:
+                    full[date.fromisoformat(meta["covered_from"])].append(symbol)
+                else:
+                    tails[date.fromisoformat(meta["last_date"])].append(symbol)
+
+        for since, group in tails.items():
+            fetched = self._download(group, since)
+            if fetched is None:
+                continue
+            for symbol in group:
+                meta = metadata[symbol]
+                bars = fetched.get(symbol)
+                if bars is None or bars.empty:
+                    self._write_metadata(symbol, {**meta, "checked_at": now})
+                    continue
+                overlap = bars[bars["date"] == np.datetime64(since, "D")]
+                if len(overlap) and not np.isclose(
+                    float(overlap["close"].iloc[0]),
+                    meta["last_close"],
+                    rtol=RESTATEMENT_TOLERANCE,
+                    atol=0.0,
+                ):
+                    # Adjusted history was restated: fetch it all again.
+                    full[date.fromisoformat(meta["covered_from"])].append(symbol)
+                    continue
+                self._append(symbol, bars[bars["date"] > np.datetime64(since, "D")], meta, now)
+
+        for since, group in full.items():
+            fetched = self._download(group, since)
+            if fetched is None:
+                continue
+            for symbol in group:
+                self._replace(symbol, fetched.get(symbol), since, now)
+
+    def _download(self, symbols: list[str], start: date) -> Optional[dict[str, pd.DataFrame]]:
+        try:
+            frames = self.downloader(symbols, start, date.today() + timedelta(days=1))
+        except Exception:
+            logger.warning("Price download failed for %s", ",".join(symbols), exc_info=True)
+            return None
+        return {symbol: _normalize(frame) for symbol, frame in frames.items()}
+
+    def _replace(self, symbol: str, bars: Optional[pd.DataFrame], covered_from: date, now: float) -> None:
+        if bars is None or bars.empty:
+            # Remember the miss so unknown symbols are not re-requested every call.
+            self._path(symbol).unlink(missing_ok=True)
+            self._write_metadata(
+                symbol,
+                {"covered_from": covered_from.isoformat(), "last_date": None, "last_close": None, "checked_at": now},
+            )
+            return
+        self._write_bars(symbol, bars, append=False)
+        self._write_metadata(symbol, _metadata_for(bars, covered_from.isoformat(), now))
+
+    def _append(self, symbol: str, bars: pd.DataFrame, meta: dict[str, Any], now: float) -> None:
+        if bars.empty:
+            self._write_metadata(symbol, {**meta, "checked_at": now})
+            return
+        self._write_bars(symbol, bars, append=True)
+        self._write_metadata(symbol, _metadata_for(bars, meta["covered_from"], now))
+
+    # -- files -------------------------------------------------------------
+
+    def _path(self, symbol: str) -> Path:
+        return self.root / f"{quote(symbol, safe='')}.parquet"
+
+    def _metadata_path(self, symbol: str) -> Path:
+        return self.root / f"{quote(symbol, safe='')}.json"
+
+    def _metadata(self, symbol: str) -> Optional[dict[str, Any]]:
+        try:
+            return json.loads(self._metadata_path(symbol).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_metadata(self, symbol: str, meta: dict[str, Any]) -> None:
+        with replacing(self._metadata_path(symbol)) as temporary:
+            temporary.write_text(json.dumps(meta))
+
+    def _write_bars(self, symbol: str, bars: pd.DataFrame, *, append: bool) -> None:
+        path = self._path(symbol)
+        columns = ", ".join(BAR_COLUMNS)
+        select = f"SELECT ? AS symbol, CAST(date AS DATE) AS date, {columns} FROM bars"
+        parameters: list[Any] = [symbol]
+        if append and path.exists():
+            select = f"SELECT symbol, date, {columns} FROM read_parquet(?) UNION ALL {select}"
+            parameters.insert(0, str(path))
+        with replacing(path) as temporary, duckdb.connect() as connection:
+            connection.register("bars", bars)
+            # COPY takes no bound parameters, so the merge is staged in a table.
+            connection.execute(f"CREATE TABLE merged AS {select}", parameters)
+            connection.execute(
+                f"COPY (SELECT * FROM merged ORDER BY date) TO '{sql_literal(temporary)}' (FORMAT parquet)"
+            )
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case OHLCV columns plus a ``date`` column of calendar days."""
+    renamed = frame.rename(columns=lambda column: str(column).lower())
+    bars = pd.DataFrame(
+        {column: pd.to_numeric(renamed.get(column, np.nan), errors="coerce") for column in BAR_COLUMNS},
+        index=renamed.index,
+    )
+    index = pd.DatetimeIndex(pd.to_datetime(renamed.index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    bars.insert(0, "date", index.normalize().values.astype("datetime64[D]"))
+    bars = bars[bars["close"].notna()]
+    return bars.drop_duplicates("date", keep="last").sort_values("date").reset_index(drop=True)
+
+
+def _metadata_for(bars: pd.DataFrame, covered_from: str, now: float) -> dict[str, Any]:
+    last = bars.iloc[-1]
+    return {
+        "covered_from": covered_from,
+        "last_date": pd.Timestamp(last["date"]).date().isoformat(),
+        "last_close": float(last["close"]),
+        "checked_at": now,
+    }
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Optional
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from modules.price_store import default_store
 
 
 def _period_start(period: str) -> pd.Timestamp:
@@ -24,35 +24,76 @@ def _period_start(period: str) -> pd.Timestamp:
     return today - mapping.get(period, pd.DateOffset(years=2))
 
 
-def _parse_date(value) -> pd.Timestamp:
-    if isinstance(value, datetime):
-        return pd.Timestamp(value).tz_localize(None)
-    return pd.Timestamp(value).tz_localize(None)
-
-
 def _fetch_prices(symbols: list[str], start: pd.Timestamp, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
     if not symbols:
         return pd.DataFrame()
-    end = end or pd.Timestamp.utcnow().normalize().tz_localize(None) + pd.Timedelta(days=1)
-    data = yf.download(
-        tickers=" ".join(symbols),
-        start=start.strftime("%Y-%m-%d"),
-        end=end.strftime("%Y-%m-%d"),
-        auto_adjust=True,
-        progress=False,
-        group_by="ticker",
-        threads=False,
-    )
-    if data.empty:
+    close = default_store().closes(symbols, start.date(), end.date() if end is not None else None)
+    if close.empty:
         return pd.DataFrame()
-    if len(symbols) == 1:
-        close = data["Close"].to_frame(symbols[0]) if "Close" in data else pd.DataFrame()
-    else:
-        close = pd.DataFrame({sym: data[sym]["Close"] for sym in symbols if sym in data and "Close" in data[sym]})
-    close.index = pd.to_datetime(close.index).tz_localize(None)
     return close.dropna(how="all").ffill()
 
 
+def _running_values(days: int, tx_days: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+    """Running total of ``amounts`` at the end of each price day.
+
+    ``tx_days`` must be in replay order; the cumulative sum adds one
+    transaction at a time, like the original ledger loop.
+    """
+    if not len(amounts):
+        return np.zeros(days)
+    totals = np.cumsum(amounts)
+    last = np.searchsorted(tx_days, np.arange(days), side="right") - 1
+    return np.where(last >= 0, totals[np.maximum(last, 0)], 0.0)
+
+
+def _replay_ledger(tx_frame: pd.DataFrame, prices: pd.DataFrame, symbols: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Daily NAV and buy flows on ``prices.index`` from the transaction ledger.
+
+    Transactions apply on the price date with the same calendar day and are
+    ignored otherwise. Holdings per symbol and cash are cumulative sums over
+    the ledger sorted by day (ties keep input order), evaluated on the price
+    dates, so values match replaying one transaction at a time exactly.
+    """
+    days = len(prices.index)
+    if tx_frame.empty:
+        return np.zeros(days), np.zeros(days)
+    price_days = prices.index.normalize().to_numpy("datetime64[ns]")
+    sorter = np.argsort(price_days, kind="stable")
+    tx_dates = tx_frame["date"].dt.normalize().to_numpy("datetime64[ns]")
+    slot = np.minimum(np.searchsorted(price_days, tx_dates, sorter=sorter), days - 1)
+    day = sorter[slot]
+    kind = tx_frame["type"].to_numpy(object) if "type" in tx_frame else np.full(len(tx_frame), None)
+    buys = (price_days[day] == tx_dates) & (kind == "buy")
+    sells = (price_days[day] == tx_dates) & (kind == "sell")
+    quantity = tx_frame["quantity"].to_numpy(float)
+    amount = quantity * tx_frame["price"].to_numpy(float)
+
+    flows = np.zeros(days)
+    # ufunc.at accumulates unbuffered in input order, like the daily loop.
+    np.add.at(flows, day[buys], amount[buys])
+    order = np.argsort(day, kind="stable")
+    sold = order[sells[order]]
+    cash = _running_values(days, day[sold], amount[sold])
+
+    # Group traded rows by symbol; a stable sort keeps each group in day order.
+    traded = order[(buys | sells)[order]]
+    codes = pd.Index(symbols).get_indexer(tx_frame["symbol"].to_numpy(object)[traded])
+    grouped = traded[np.argsort(codes, kind="stable")]
+    bounds = np.searchsorted(np.sort(codes), np.arange(len(symbols) + 1))
+    signed = np.where(buys, quantity, -quantity)
+    columns = prices.columns.get_indexer(symbols)
+    values = prices.to_numpy(float)
+    market_value = np.zeros(days)
+    for index, column in enumerate(columns):
+        if column < 0:
+            continue
+        rows = grouped[bounds[index] : bounds[index + 1]]
+        held = _running_values(days, day[rows], signed[rows])
+        price = values[:, column]
+        market_value += np.where(np.isfinite(price), held * price, 0.0)
+    return np.maximum(0.0, market_value + cash), flows
+
+
 def compute_portfolio_returns(
     transactions: Optional[list[dict]] = None,
     symbols: Optional[list[str]] = None,
@@ -61,14 +102,21 @@ def compute_portfolio_returns(
     transactions = transactions or []
     symbols = [s.upper().strip() for s in (symbols or []) if s.strip()]
     if transactions:
-        tx_symbols = [str(t.get("symbol", "")).upper().strip() for t in transactions]
+        tx_symbols = {str(t.get("symbol", "")).upper().strip() for t in transactions}
         symbols = sorted({*symbols, *[s for s in tx_symbols if s]})
     if not symbols:
         return {"error": "No symbols or transactions supplied"}
 
+    tx_frame = pd.DataFrame(transactions)
+    if not tx_frame.empty:
+        tx_frame["symbol"] = tx_frame["symbol"].str.upper().str.strip()
+        tx_frame["date"] = pd.to_datetime(tx_frame["date"]).dt.tz_localize(None)
+        tx_frame["quantity"] = pd.to_numeric(tx_frame["quantity"], errors="coerce").fillna(0.0)
+        tx_frame["price"] = pd.to_numeric(tx_frame["price"], errors="coerce").fillna(0.0)
+
     requested_start = _period_start(period)
-    tx_dates = [_parse_date(t["date"]) for t in transactions if t.get("date")]
-    price_start = min([requested_start, *tx_dates]) if tx_dates else requested_start
+    first_trade = tx_frame["date"].min() if not tx_frame.empty else pd.NaT
+    price_start = requested_start if pd.isna(first_trade) else min(requested_start, first_trade)
     prices = _fetch_prices(symbols, price_start)
     if prices.empty:
         return {"error": "Insufficient price history for portfolio returns"}
@@ -77,41 +125,8 @@ def compute_portfolio_returns(
     if len(dates) < 2:
         return {"error": "Insufficient price history for portfolio returns"}
 
-    tx_frame = pd.DataFrame(transactions)
-    if not tx_frame.empty:
-        tx_frame["symbol"] = tx_frame["symbol"].str.upper().str.strip()
-        tx_frame["date"] = pd.to_datetime(tx_frame["date"]).dt.tz_localize(None)
-        tx_frame["quantity"] = pd.to_numeric(tx_frame["quantity"], errors="coerce").fillna(0.0)
-        tx_frame["price"] = pd.to_numeric(tx_frame["price"], errors="coerce").fillna(0.0)
-
-    cash = 0.0
-    shares = {symbol: 0.0 for symbol in symbols}
-    nav_values: list[float] = []
-    flow_values: list[float] = []
-
     all_dates = prices.index
-    for date in all_dates:
-        day_flow = 0.0
-        if not tx_frame.empty:
-            day_txs = tx_frame[tx_frame["date"].dt.normalize() == date.normalize()]
-            for _, tx in day_txs.iterrows():
-                symbol = tx["symbol"]
-                qty = float(tx["quantity"])
-                price = float(tx["price"])
-                amount = qty * price
-                if tx["type"] == "buy":
-                    shares[symbol] = shares.get(symbol, 0.0) + qty
-                    day_flow += amount
-                elif tx["type"] == "sell":
-                    shares[symbol] = shares.get(symbol, 0.0) - qty
-                    cash += amount
-
-        market_value = 0.0
-        for symbol, qty in shares.items():
-            if symbol in prices.columns and np.isfinite(prices.loc[date, symbol]):
-                market_value += qty * float(prices.loc[date, symbol])
-        nav_values.append(max(0.0, market_value + cash))
-        flow_values.append(day_flow)
+    nav_values, flow_values = _replay_ledger(tx_frame, prices, symbols)
 
     nav = pd.Series(nav_values, index=all_dates, dtype=float).loc[dates]
     flows = pd.Series(flow_values, index=all_dates, dtype=float).loc[dates]
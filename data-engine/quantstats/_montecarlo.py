@@ -25,25 +25,84 @@ analysis. It allows users to generate multiple simulated return paths
 by shuffling historical returns, enabling probability-based risk assessment.
 """
 
-from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
 
-@dataclass
+def permutation_paths(
+    returns: np.ndarray, sims: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Independent random permutations of ``returns``, one per column.
+
+    The returns are tiled into a ``(periods, sims)`` matrix and shuffled
+    in place along the time axis in one ``Generator.permuted`` call,
+    instead of one ``rng.permutation`` per simulation.
+
+    Parameters
+    ----------
+    returns : np.ndarray
+        1-D array of periodic returns
+    sims : int
+        Number of permuted paths
+    rng : np.random.Generator
+        Source of randomness
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(len(returns), sims)``
+    """
+    paths = np.tile(np.asarray(returns, dtype=float)[:, np.newaxis], (1, sims))
+    return rng.permuted(paths, axis=0, out=paths)
+
+
+def _max_drawdowns(paths: np.ndarray) -> np.ndarray:
+    """Max drawdown of each cumulative-return column, one period at a time."""
+    if paths.shape[0] == 0:
+        return np.full(paths.shape[1], np.nan)
+    peak = paths[0] + 1
+    worst = np.zeros(paths.shape[1])
+    for row in paths[1:]:
+        growth = row + 1
+        np.maximum(peak, growth, out=peak)
+        np.minimum(worst, (growth - peak) / peak, out=worst)
+    return worst
+
+
+def _distribution(values: np.ndarray, quantiles: dict[str, float]) -> dict[str, float]:
+    """min/max/mean/median/std (sample) plus the requested quantiles."""
+    if values.size == 0:
+        return dict.fromkeys(["min", "max", "mean", "median", "std", *quantiles], np.nan)
+    summary = {
+        "min": np.min(values),
+        "max": np.max(values),
+        "mean": np.mean(values),
+        "median": np.median(values),
+        "std": np.std(values, ddof=1),
+    }
+    summary.update({key: np.quantile(values, q) for key, q in quantiles.items()})
+    return summary
+
+
 class MonteCarloResult:
     """
     Container for Montecarlo simulation results.
 
     This class holds the results of a Montecarlo simulation and provides
     convenient methods for analyzing and visualizing the simulated paths.
+    Statistics are computed column-wise on the NumPy path matrix; the
+    pandas views (``data``, ``original``) are built only when accessed.
 
     Attributes
     ----------
+    paths : np.ndarray
+        Simulated cumulative returns, shape ``(periods, sims)``; column 0
+        is the original path
     data : pd.DataFrame
-        Raw simulation paths (sims x periods) as cumulative returns
+        Raw simulation paths (periods x sims) as cumulative returns
     original : pd.Series
         Original cumulative returns path
     bust_threshold : float, optional
@@ -60,11 +119,69 @@ class MonteCarloResult:
     >>> mc.plot()
     """
 
-    data: pd.DataFrame
-    original: pd.Series
-    bust_threshold: float | None = None
-    goal_threshold: float | None = None
-    _maxdd_cache: pd.Series | None = field(default=None, repr=False)
+    def __init__(
+        self,
+        paths: np.ndarray | pd.DataFrame | None = None,
+        bust_threshold: float | None = None,
+        goal_threshold: float | None = None,
+        *,
+        data: pd.DataFrame | None = None,
+        original: pd.Series | None = None,
+    ) -> None:
+        # Earlier versions took ``data=`` (a periods x sims DataFrame) and
+        # ``original=``; both are still accepted and returned as given.
+        if isinstance(paths, pd.DataFrame):
+            if data is not None:
+                raise TypeError("pass the simulation paths either as paths or as data")
+            paths, data = None, paths
+        if paths is None:
+            if data is None:
+                raise TypeError("MonteCarloResult needs paths or data")
+            paths = data.to_numpy(dtype=float)
+        self.paths = paths
+        self.bust_threshold = bust_threshold
+        self.goal_threshold = goal_threshold
+        self._maxdd_cache: np.ndarray | None = None
+        self._data: pd.DataFrame | None = data
+        self._original = original
+
+    def __repr__(self) -> str:
+        periods, sims = self.paths.shape
+        return (
+            f"MonteCarloResult(periods={periods}, sims={sims}, "
+            f"bust_threshold={self.bust_threshold}, goal_threshold={self.goal_threshold})"
+        )
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """Simulation paths as a DataFrame with ``sim_<i>`` columns."""
+        if self._data is None:
+            periods, sims = self.paths.shape
+            self._data = pd.DataFrame(
+                self.paths,
+                index=range(periods),
+                columns=[f"sim_{i}" for i in range(sims)],
+            )
+        return self._data
+
+    @property
+    def original(self) -> pd.Series:
+        """Original cumulative returns path."""
+        if self._original is not None:
+            return self._original
+        return pd.Series(self.paths[:, 0], index=range(len(self.paths)), name="original")
+
+    @property
+    def terminal(self) -> np.ndarray:
+        """Terminal cumulative return of each simulation."""
+        return self.paths[-1]
+
+    @property
+    def max_drawdowns(self) -> np.ndarray:
+        """Maximum drawdown of each simulation."""
+        if self._maxdd_cache is None:
+            self._maxdd_cache = _max_drawdowns(self.paths)
+        return self._maxdd_cache
 
     @property
     def stats(self) -> dict[str, float]:
@@ -76,18 +193,15 @@ class MonteCarloResult:
         dict
             Dictionary containing min, max, mean, median, std of terminal values
         """
-        terminal = self.data.iloc[-1]
-        return {
-            "min": terminal.min(),
-            "max": terminal.max(),
-            "mean": terminal.mean(),
-            "median": terminal.median(),
-            "std": terminal.std(),
-            "percentile_5": terminal.quantile(0.05),
-            "percentile_25": terminal.quantile(0.25),
-            "percentile_75": terminal.quantile(0.75),
-            "percentile_95": terminal.quantile(0.95),
-        }
+        return _distribution(
+            self.terminal,
+            {
+                "percentile_5": 0.05,
+                "percentile_25": 0.25,
+                "percentile_75": 0.75,
+                "percentile_95": 0.95,
+            },
+        )
 
     @property
     def maxdd(self) -> dict[str, float]:
@@ -99,28 +213,10 @@ class MonteCarloResult:
         dict
             Dictionary containing min, max, mean, median of max drawdowns
         """
-        if self._maxdd_cache is None:
-            # Calculate max drawdown for each simulation path
-            maxdd_values = []
-            for col in self.data.columns:
-                path = self.data[col]
-                # Calculate drawdown from cumulative returns
-                cumulative = path + 1  # Convert to growth factor
-                running_max = cumulative.cummax()
-                drawdown = (cumulative - running_max) / running_max
-                maxdd_values.append(drawdown.min())
-            object.__setattr__(self, "_maxdd_cache", pd.Series(maxdd_values))
-
-        dd = self._maxdd_cache
-        return {
-            "min": dd.min(),  # Worst (most negative) drawdown
-            "max": dd.max(),  # Best (least negative) drawdown
-            "mean": dd.mean(),
-            "median": dd.median(),
-            "std": dd.std(),
-            "percentile_5": dd.quantile(0.05),
-            "percentile_95": dd.quantile(0.95),
-        }
+        # min is the worst (most negative) drawdown, max the best.
+        return _distribution(
+            self.max_drawdowns, {"percentile_5": 0.05, "percentile_95": 0.95}
+        )
 
     @property
     def bust_probability(self) -> float | None:
@@ -134,14 +230,7 @@ class MonteCarloResult:
         """
         if self.bust_threshold is None:
             return None
-
-        if self._maxdd_cache is None:
-            # Trigger maxdd calculation
-            _ = self.maxdd
-
-        # Count simulations where max drawdown exceeds bust threshold
-        bust_count = (self._maxdd_cache <= self.bust_threshold).sum()
-        return bust_count / len(self._maxdd_cache)
+        return np.count_nonzero(self.max_drawdowns <= self.bust_threshold) / self.paths.shape[1]
 
     @property
     def goal_probability(self) -> float | None:
@@ -155,10 +244,7 @@ class MonteCarloResult:
         """
         if self.goal_threshold is None:
             return None
-
-        terminal = self.data.iloc[-1]
-        goal_count = (terminal >= self.goal_threshold).sum()
-        return goal_count / len(terminal)
+        return np.count_nonzero(self.terminal >= self.goal_threshold) / self.paths.shape[1]
 
     def percentile(self, p: float) -> pd.Series:
         """
@@ -174,7 +260,7 @@ class MonteCarloResult:
         pd.Series
             The p-th percentile path
         """
-        return self.data.quantile(p / 100, axis=1)
+        return self._quantile_path(p / 100)
 
     def confidence_band(
         self, level: float = 0.95
@@ -193,9 +279,12 @@ class MonteCarloResult:
             (lower_bound, upper_bound) as pd.Series
         """
         alpha = (1 - level) / 2
-        lower = self.data.quantile(alpha, axis=1)
-        upper = self.data.quantile(1 - alpha, axis=1)
-        return lower, upper
+        return self._quantile_path(alpha), self._quantile_path(1 - alpha)
+
+    def _quantile_path(self, q: float) -> pd.Series:
+        return pd.Series(
+            np.quantile(self.paths, q, axis=1), index=range(len(self.paths)), name=q
+        )
 
     def plot(self, **kwargs) -> Any:
         """
@@ -257,40 +346,17 @@ def run_montecarlo(
     >>> print(mc.stats)
     >>> print(f"Bust probability: {mc.bust_probability:.1%}")
     """
-    # Initialize random number generator
     rng = np.random.default_rng(seed)
+    returns_array = np.asarray(returns.dropna(), dtype=float)
 
-    # Get returns as numpy array for efficiency
-    returns_array = returns.dropna().values
-    n_periods = len(returns_array)
-
-    # Pre-allocate simulation array
-    sim_returns = np.empty((n_periods, sims))
-
-    # First column is original (unshuffled) returns
+    # First column is the original (unshuffled) path, the rest are permutations.
+    sim_returns = np.empty((len(returns_array), sims))
     sim_returns[:, 0] = returns_array
+    sim_returns[:, 1:] = permutation_paths(returns_array, sims - 1, rng)
+
+    # Cumulative returns of every path, (1 + r).cumprod() - 1, in place.
+    np.add(sim_returns, 1, out=sim_returns)
+    np.cumprod(sim_returns, axis=0, out=sim_returns)
+    np.subtract(sim_returns, 1, out=sim_returns)
 
-    # Generate shuffled paths
-    for i in range(1, sims):
-        sim_returns[:, i] = rng.permutation(returns_array)
-
-    # Calculate cumulative returns for all paths
-    # Using (1 + r).cumprod() - 1 formula
-    cumulative = np.cumprod(1 + sim_returns, axis=0) - 1
-
-    # Create DataFrame with simulation results
-    sim_df = pd.DataFrame(
-        cumulative,
-        index=range(n_periods),
-        columns=[f"sim_{i}" for i in range(sims)],
-    )
-
-    # Original cumulative returns
-    original = pd.Series(cumulative[:, 0], index=range(n_periods), name="original")
-
-    return MonteCarloResult(
-        data=sim_df,
-        original=original,
-        bust_threshold=bust,
-        goal_threshold=goal,
-    )
+    return MonteCarloResult(sim_returns, bust_threshold=bust, goal_threshold=goal)
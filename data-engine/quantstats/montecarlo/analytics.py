@@ -4,19 +4,103 @@ Analytics over simulated return paths.
 All functions take ``sim_returns``: a 2-D array of shape ``(horizon, sims)`` of
 simple periodic returns, and derive distributions of outcomes used by the
 montecarlo tearsheet and the cross-model comparison table.
+
+:class:`PathAccumulator` derives the same per-path outcomes a chunk of paths
+at a time, so summaries of large simulations need O(sims) memory instead of
+the full matrix.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 
 if TYPE_CHECKING:
     from .core import ModelResult
 
 
+@dataclass
+class PathStatistics:
+    """Per-path outcomes of a simulation, kept without the paths themselves.
+
+    ``sample_paths`` holds the cumulative returns of the first simulated
+    paths, shape ``(horizon, k)``, for fan charts. Paths are independent and
+    identically distributed, so the first ``k`` are already a uniform sample.
+    """
+
+    horizon: int
+    terminal: np.ndarray
+    max_drawdown: np.ndarray
+    sample_paths: np.ndarray | None = None
+
+    @classmethod
+    def from_returns(cls, sim_returns: np.ndarray) -> PathStatistics:
+        terminal, max_drawdown = _path_outcomes(sim_returns)
+        return cls(int(sim_returns.shape[0]), terminal, max_drawdown)
+
+
+class PathAccumulator:
+    """Builds :class:`PathStatistics` from chunks of simulated paths.
+
+    Only terminal value and max drawdown per path are kept, plus up to
+    ``fan_paths`` cumulative paths for fan charts, stored as ``dtype``.
+    """
+
+    def __init__(
+        self,
+        horizon: int,
+        sims: int,
+        fan_paths: int = 0,
+        dtype: DTypeLike = np.float64,
+    ) -> None:
+        self.horizon = horizon
+        self._terminal = np.empty(sims, dtype=dtype)
+        self._max_drawdown = np.empty(sims, dtype=dtype)
+        self._sample = np.empty((horizon, min(fan_paths, sims)), dtype=dtype)
+        self._filled = 0
+
+    def add(self, sim_returns: np.ndarray) -> None:
+        """Record a ``(horizon, n)`` block of the next ``n`` paths."""
+        start, count = self._filled, int(sim_returns.shape[1])
+        if sim_returns.shape[0] != self.horizon or start + count > self._terminal.size:
+            raise ValueError("Chunk does not fit the accumulator's horizon and sims.")
+        terminal, max_drawdown = _path_outcomes(sim_returns)
+        self._terminal[start : start + count] = terminal
+        self._max_drawdown[start : start + count] = max_drawdown
+        sampled = min(count, self._sample.shape[1] - start)
+        if sampled > 0:
+            self._sample[:, start : start + sampled] = cumulative_paths(sim_returns[:, :sampled])
+        self._filled += count
+
+    def result(self) -> PathStatistics:
+        if self._filled != self._terminal.size:
+            raise ValueError(f"Only {self._filled} of {self._terminal.size} paths were added.")
+        return PathStatistics(self.horizon, self._terminal, self._max_drawdown, self._sample)
+
+
+def _path_outcomes(sim_returns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Terminal cumulative return and max drawdown per path in one pass.
+
+    Walks the paths period by period with O(sims) state instead of
+    materialising growth, running-max and drawdown matrices.
+    """
+    if sim_returns.shape[0] == 0:
+        zeros = np.zeros(sim_returns.shape[1])
+        return zeros, zeros.copy()
+    growth = 1.0 + sim_returns[0]
+    peak = growth.copy()
+    max_drawdown = np.zeros_like(growth)
+    for period in sim_returns[1:]:
+        growth = growth * (1.0 + period)
+        np.maximum(peak, growth, out=peak)
+        np.minimum(max_drawdown, growth / peak - 1.0, out=max_drawdown)
+    return growth - 1.0, max_drawdown
+
+
 def cumulative_paths(sim_returns: np.ndarray) -> np.ndarray:
     """Cumulative simple return per path: ``prod(1+r) - 1`` along time.
 
@@ -33,17 +117,16 @@ def terminal_values(sim_returns: np.ndarray) -> np.ndarray:
 
 def max_drawdowns(sim_returns: np.ndarray) -> np.ndarray:
     """Maximum drawdown (negative) of each path (1-D, length ``sims``)."""
-    growth = np.cumprod(1.0 + sim_returns, axis=0)
-    running_max = np.maximum.accumulate(growth, axis=0)
-    drawdowns = growth / running_max - 1.0
-    return drawdowns.min(axis=0)
+    return _path_outcomes(sim_returns)[1]
 
 
 def cagr_values(sim_returns: np.ndarray, periods: float = 252.0) -> np.ndarray:
     """Annualised compound growth rate for each path (1-D, length ``sims``)."""
-    horizon = sim_returns.shape[0]
+    return _cagr(terminal_values(sim_returns), sim_returns.shape[0], periods)
+
+
+def _cagr(terminal: np.ndarray, horizon: int, periods: float) -> np.ndarray:
     years = horizon / periods
-    terminal = terminal_values(sim_returns)
     # Guard against terminal <= -1 (total wipeout) which would be invalid.
     safe = np.clip(terminal, -0.999999, None)
     return (1.0 + safe) ** (1.0 / years) - 1.0
@@ -75,7 +158,13 @@ def fan_chart(
 
     Returns ``(median, lower, upper)``, each of length ``horizon``.
     """
-    paths = cumulative_paths(sim_returns)
+    return fan_chart_paths(cumulative_paths(sim_returns), level=level)
+
+
+def fan_chart_paths(
+    paths: np.ndarray, level: float = 0.95
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """:func:`fan_chart` from cumulative paths, e.g. ``PathStatistics.sample_paths``."""
     alpha = (1.0 - level) / 2.0
     median = np.median(paths, axis=1)
     lower = np.quantile(paths, alpha, axis=1)
@@ -151,9 +240,21 @@ def summarize(
     goal: float | None = None,
 ) -> dict[str, float]:
     """Cross-model comparison row for a set of simulated paths."""
-    terminal = terminal_values(sim_returns)
-    mdd = max_drawdowns(sim_returns)
-    cagr = cagr_values(sim_returns, periods)
+    return summarize_statistics(
+        PathStatistics.from_returns(sim_returns), periods=periods, bust=bust, goal=goal
+    )
+
+
+def summarize_statistics(
+    statistics: PathStatistics,
+    periods: float = 252.0,
+    bust: float | None = None,
+    goal: float | None = None,
+) -> dict[str, float]:
+    """:func:`summarize` from per-path outcomes instead of the paths."""
+    terminal = statistics.terminal
+    mdd = statistics.max_drawdown
+    cagr = _cagr(terminal, statistics.horizon, periods)
 
     summary: dict[str, float] = {
         "cagr_p5": float(np.quantile(cagr, 0.05)),
@@ -168,9 +269,9 @@ def summarize(
         "cvar_5": cvar(terminal, 0.05),
     }
     if bust is not None:
-        summary["bust_prob"] = bust_probability(sim_returns, bust)
+        summary["bust_prob"] = float(np.mean(mdd <= bust))
     if goal is not None:
-        summary["goal_prob"] = goal_probability(sim_returns, goal)
+        summary["goal_prob"] = float(np.mean(terminal >= goal))
     return summary
 
 
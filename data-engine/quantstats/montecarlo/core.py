@@ -1,13 +1,22 @@
 """
 Orchestration: calibrate and simulate multiple models, collect results.
+
+Calibrations are cached per process, keyed by model name, a hash of the
+drift-adjusted returns and the drift settings, so repeated runs on an
+unchanged series skip the GARCH fit and the block-length estimate.
 """
 
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 
 from . import analytics
 from .base import SimulationModel
@@ -15,6 +24,78 @@ from .registry import available_models, get_model
 
 _DRIFT_MODES = ("historical", "zero", "rf")
 
+#: Fitted models kept in the calibration cache (least recently used evicted).
+CALIBRATION_CACHE_SIZE = 128
+#: Default chunk size of streamed runs, in simulated returns (32 MB as float64).
+STREAM_CHUNK_ELEMENTS = 4_000_000
+
+_calibrations: OrderedDict[tuple, SimulationModel] = OrderedDict()
+_calibrations_lock = threading.Lock()
+
+
+def clear_calibration_cache() -> None:
+    """Drop every cached calibration."""
+    with _calibrations_lock:
+        _calibrations.clear()
+
+
+def _calibration_key(
+    name: str, returns: pd.Series, drift: str, rf: float, periods: float
+) -> tuple:
+    # Models calibrate on the values only, so the index is not hashed.
+    values = np.ascontiguousarray(returns.to_numpy(dtype=float))
+    digest = hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+    return (name, digest, drift, float(rf), float(periods))
+
+
+def _cached_calibration(key: tuple) -> SimulationModel | None:
+    with _calibrations_lock:
+        model = _calibrations.get(key)
+        if model is not None:
+            _calibrations.move_to_end(key)
+        return model
+
+
+def _store_calibration(key: tuple, model: SimulationModel) -> None:
+    with _calibrations_lock:
+        _calibrations[key] = model
+        _calibrations.move_to_end(key)
+        while len(_calibrations) > CALIBRATION_CACHE_SIZE:
+            _calibrations.popitem(last=False)
+
+
+def _simulate_model(
+    name: str,
+    returns: pd.Series,
+    horizon: int,
+    sims: int,
+    seed: np.random.SeedSequence,
+    fitted: SimulationModel | None = None,
+    *,
+    keep_paths: bool = True,
+    chunk_sims: int = 10_000,
+    fan_paths: int = 0,
+    dtype: DTypeLike = np.float64,
+) -> tuple[SimulationModel, np.ndarray | analytics.PathStatistics]:
+    """Calibrate (unless ``fitted``) and simulate one model.
+
+    Module-level so process pools can pickle it; the model's child seed
+    travels with the task, so where it runs does not change the draws.
+    Without ``keep_paths`` the model simulates ``chunk_sims`` paths at a
+    time and only per-path outcomes are kept.
+    """
+    model = fitted
+    if model is None:
+        model = get_model(name)
+        model.calibrate(returns)
+    rng = np.random.default_rng(seed)
+    if keep_paths:
+        return model, np.asarray(model.simulate(horizon, sims, rng), dtype=dtype)
+    accumulator = analytics.PathAccumulator(horizon, sims, fan_paths=fan_paths, dtype=dtype)
+    for start in range(0, sims, chunk_sims):
+        accumulator.add(model.simulate(horizon, min(chunk_sims, sims - start), rng))
+    return model, accumulator.result()
+
 
 def infer_periods_per_year(returns: pd.Series) -> float:
     """Infer trading days per year from the return index.
@@ -56,36 +137,59 @@ def _apply_drift(
 
 @dataclass
 class ModelResult:
-    """Container for one model's simulated paths and derived analytics."""
+    """Container for one model's simulated paths and derived analytics.
+
+    Runs with ``keep_paths=False`` carry only ``path_statistics``; their
+    ``sim_returns`` is ``None`` and fan charts come from the sampled paths.
+    """
 
     name: str
     label: str
-    sim_returns: np.ndarray  # shape (horizon, sims), simple periodic returns
+    sim_returns: np.ndarray | None  # shape (horizon, sims), simple periodic returns
     category: str = "montecarlo"
     periods: float = 252.0
     bust: float | None = None
     goal: float | None = None
     fitted_model: SimulationModel | None = field(default=None, repr=False)
+    path_statistics: analytics.PathStatistics | None = field(default=None, repr=False)
+
+    @property
+    def statistics(self) -> analytics.PathStatistics:
+        """Per-path terminal value and max drawdown, computed once."""
+        if self.path_statistics is None:
+            if self.sim_returns is None:
+                raise ValueError(f"Model '{self.name}' has neither paths nor statistics.")
+            self.path_statistics = analytics.PathStatistics.from_returns(self.sim_returns)
+        return self.path_statistics
 
     @property
     def horizon(self) -> int:
+        if self.sim_returns is None:
+            return self.statistics.horizon
         return int(self.sim_returns.shape[0])
 
     @property
     def sims(self) -> int:
+        if self.sim_returns is None:
+            return int(self.statistics.terminal.size)
         return int(self.sim_returns.shape[1])
 
     @property
     def summary(self) -> dict[str, float]:
-        return analytics.summarize(
-            self.sim_returns, periods=self.periods, bust=self.bust, goal=self.goal
+        return analytics.summarize_statistics(
+            self.statistics, periods=self.periods, bust=self.bust, goal=self.goal
         )
 
     def terminal_values(self) -> np.ndarray:
-        return analytics.terminal_values(self.sim_returns)
+        return self.statistics.terminal
 
     def fan_chart(self, level: float = 0.95):
-        return analytics.fan_chart(self.sim_returns, level=level)
+        if self.sim_returns is not None:
+            return analytics.fan_chart(self.sim_returns, level=level)
+        sample = self.statistics.sample_paths
+        if sample is None or sample.shape[1] == 0:
+            raise ValueError(f"Model '{self.name}' was run without fan-chart paths.")
+        return analytics.fan_chart_paths(sample, level=level)
 
     def calibration_summary(self) -> dict[str, str]:
         if self.fitted_model is None:
@@ -104,6 +208,12 @@ def run_models(
     periods: float | None = None,
     drift: str = "historical",
     rf: float = 0.0,
+    executor: Executor | None = None,
+    cache: bool = True,
+    keep_paths: bool = True,
+    chunk_sims: int | None = None,
+    fan_paths: int = 1_000,
+    dtype: DTypeLike = np.float64,
 ) -> dict[str, ModelResult]:
     """
     Calibrate and simulate one or more models on a single asset's returns.
@@ -135,6 +245,30 @@ def run_models(
         sets the per-period mean to the risk-free rate.
     rf : float, default 0.0
         Annual risk-free rate, used only when ``drift="rf"``.
+    executor : concurrent.futures.Executor, optional
+        Runs the models concurrently, e.g. a ``ProcessPoolExecutor``.
+        Each model keeps its own child seed, so results are bit-identical
+        to serial execution.
+    cache : bool, default True
+        Reuse calibrations of the same returns and drift settings from
+        earlier runs in this process.
+    keep_paths : bool, default True
+        Keep every model's ``(horizon, sims)`` return matrix. ``False``
+        simulates ``chunk_sims`` paths at a time and keeps only per-path
+        terminal value and max drawdown plus ``fan_paths`` sampled
+        cumulative paths: enough for ``summary``, ``terminal_values`` and
+        ``fan_chart``, not for the tearsheet plots. Draws then differ from
+        a ``keep_paths=True`` run with the same seed unless ``chunk_sims``
+        covers all ``sims``.
+    chunk_sims : int, optional
+        Paths simulated per chunk when ``keep_paths`` is ``False``; by
+        default about ``STREAM_CHUNK_ELEMENTS`` returns per chunk.
+    fan_paths : int, default 1000
+        Cumulative paths sampled for fan charts when ``keep_paths`` is
+        ``False``.
+    dtype : numpy dtype, default float64
+        Storage type of the kept matrices or statistics; ``np.float32``
+        halves their memory.
 
     Returns
     -------
@@ -149,6 +283,10 @@ def run_models(
         horizon = int(round(periods))
     if horizon <= 0:
         raise ValueError("horizon must be a positive integer")
+    if chunk_sims is None:
+        chunk_sims = max(1, STREAM_CHUNK_ELEMENTS // horizon)
+    if chunk_sims <= 0:
+        raise ValueError("chunk_sims must be a positive integer")
 
     returns = _apply_drift(returns, drift, rf=rf, periods=periods)
 
@@ -156,20 +294,33 @@ def run_models(
     seed_seq = np.random.SeedSequence(seed)
     children = seed_seq.spawn(len(names))
 
+    keys = [_calibration_key(name, returns, drift, rf, periods) for name in names]
+    fitted = [_cached_calibration(key) if cache else None for key in keys]
+    tasks = [
+        (name, returns, horizon, sims, child, model)
+        for name, child, model in zip(names, children, fitted, strict=True)
+    ]
+    options = {"keep_paths": keep_paths, "chunk_sims": chunk_sims, "fan_paths": fan_paths, "dtype": dtype}
+    if executor is None:
+        outputs = [_simulate_model(*task, **options) for task in tasks]
+    else:
+        futures = [executor.submit(_simulate_model, *task, **options) for task in tasks]
+        outputs = [future.result() for future in futures]
+
     results: dict[str, ModelResult] = {}
-    for name, child in zip(names, children, strict=True):
-        model = get_model(name)
-        model.calibrate(returns)
-        rng = np.random.default_rng(child)
-        sim_returns = model.simulate(horizon, sims, rng)
+    for name, key, (model, simulated) in zip(names, keys, outputs, strict=True):
+        if cache:
+            _store_calibration(key, model)
+        streamed = isinstance(simulated, analytics.PathStatistics)
         results[name] = ModelResult(
             name=name,
             label=getattr(model, "label", name),
             category=getattr(model, "category", "montecarlo"),
-            sim_returns=np.asarray(sim_returns, dtype=float),
+            sim_returns=None if streamed else simulated,
             periods=periods,
             bust=bust,
             goal=goal,
             fitted_model=model,
+            path_statistics=simulated if streamed else None,
         )
     return results
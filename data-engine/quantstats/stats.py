@@ -3208,7 +3208,7 @@ def montecarlo_sharpe(returns, sims=1000, rf=0, periods=252, seed=None):
         >>> print(f"Sharpe range: {sharpe_dist['percentile_5']:.2f} to "
         ...       f"{sharpe_dist['percentile_95']:.2f}")
     """
-    from ._montecarlo import run_montecarlo
+    from ._montecarlo import _distribution, run_montecarlo
 
     validate_input(returns)
     returns = _utils._prepare_returns(returns)
@@ -3218,27 +3218,20 @@ def montecarlo_sharpe(returns, sims=1000, rf=0, periods=252, seed=None):
 
     mc = run_montecarlo(returns, sims=sims, seed=seed)
 
-    # Calculate Sharpe for each simulation path
-    sharpe_values = []
-    for col in mc.data.columns:
-        # Convert cumulative returns back to simple returns
-        cumret = mc.data[col] + 1
-        sim_returns = cumret.pct_change().dropna()
-        if len(sim_returns) > 0 and sim_returns.std() > 0:
-            excess = sim_returns.mean() - rf / periods
-            sharpe_val = excess / sim_returns.std() * _np.sqrt(periods)
-            sharpe_values.append(sharpe_val)
-
-    sharpe_series = _pd.Series(sharpe_values)
-    return {
-        "min": sharpe_series.min(),
-        "max": sharpe_series.max(),
-        "mean": sharpe_series.mean(),
-        "median": sharpe_series.median(),
-        "std": sharpe_series.std(),
-        "percentile_5": sharpe_series.quantile(0.05),
-        "percentile_95": sharpe_series.quantile(0.95),
-    }
+    # Simple returns of every path, recovered from the cumulative matrix
+    # column-wise instead of one pct_change per DataFrame column.
+    growth = mc.paths + 1
+    sim_returns = growth[1:] / growth[:-1] - 1
+    sharpe_values = _np.array([])
+    if len(sim_returns) > 1:
+        std = sim_returns.std(axis=0, ddof=1)
+        valid = std > 0
+        excess = sim_returns[:, valid].mean(axis=0) - rf / periods
+        sharpe_values = excess / std[valid] * _np.sqrt(periods)
+
+    return _distribution(
+        sharpe_values, {"percentile_5": 0.05, "percentile_95": 0.95}
+    )
 
 
 def montecarlo_drawdown(returns, sims=1000, seed=None):
@@ -3287,7 +3280,7 @@ def montecarlo_cagr(returns, sims=1000, periods=252, seed=None):
         >>> cagr_dist = qs.stats.montecarlo_cagr(returns, sims=1000)
         >>> print(f"Expected CAGR: {cagr_dist['mean']:.1%}")
     """
-    from ._montecarlo import run_montecarlo
+    from ._montecarlo import _distribution, run_montecarlo
 
     validate_input(returns)
     returns = _utils._prepare_returns(returns)
@@ -3298,24 +3291,11 @@ def montecarlo_cagr(returns, sims=1000, periods=252, seed=None):
     mc = run_montecarlo(returns, sims=sims, seed=seed)
 
     # Calculate CAGR for each simulation path
-    n_periods = len(mc.data)
-    years = n_periods / periods
-
-    cagr_values = []
-    for col in mc.data.columns:
-        terminal = mc.data[col].iloc[-1]
-        # CAGR = (1 + total_return)^(1/years) - 1
-        if terminal > -1:  # Avoid invalid values
-            cagr_val = (1 + terminal) ** (1 / years) - 1
-            cagr_values.append(cagr_val)
-
-    cagr_series = _pd.Series(cagr_values)
-    return {
-        "min": cagr_series.min(),
-        "max": cagr_series.max(),
-        "mean": cagr_series.mean(),
-        "median": cagr_series.median(),
-        "std": cagr_series.std(),
-        "percentile_5": cagr_series.quantile(0.05),
-        "percentile_95": cagr_series.quantile(0.95),
-    }
+    years = len(mc.paths) / periods
+    terminal = mc.terminal
+    # CAGR = (1 + total_return)^(1/years) - 1, skipping wiped-out paths
+    cagr_values = (1 + terminal[terminal > -1]) ** (1 / years) - 1
+
+    return _distribution(
+        cagr_values, {"percentile_5": 0.05, "percentile_95": 0.95}
+    )
@@ -1,17 +1,27 @@
-"""Analytics API routes."""
+"""Analytics API routes.
+
+Handlers are async but the analytics are blocking, so every call goes
+through the compute executor: quantstats and Monte Carlo on the process
+pool, price- and ledger-bound work on the thread pool.
+"""
 
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+from typing import Any, Callable, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 
+from app.core.auth import ResearchPrincipal, get_research_principal
+from app.core.compute import Kind, run_blocking
 from modules import analytics_service
 from modules.cache import cached_call
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+DISCONNECT_POLL_SECONDS = 0.5
+
 
 class PortfolioAnalyticsRequest(BaseModel):
     symbols: List[str]
@@ -52,15 +62,53 @@ class PortfolioReturnsRequest(BaseModel):
     period: str = "2y"
 
 
+async def _compute(
+    request: Request,
+    principal: ResearchPrincipal | None,
+    kind: Kind,
+    fn: Callable[..., dict],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> dict:
+    """Run ``fn`` off the event loop, dropping it if the client goes away."""
+    tenant = principal.tenant_external_id if principal else "anonymous"
+    work = asyncio.ensure_future(run_blocking(kind, tenant, fn, *args, **kwargs))
+    try:
+        while not work.done():
+            await asyncio.wait({work}, timeout=DISCONNECT_POLL_SECONDS)
+            if not work.done() and await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+        return work.result()
+    finally:
+        work.cancel()
+
+
+def _holding_metrics(symbol: str, period: str) -> dict:
+    return cached_call(
+        f"analytics:holding:{symbol}:{period}",
+        lambda: analytics_service.get_holding_metrics(symbol, period=period),
+        ttl_seconds=300,
+    )
+
+
 @router.post("/portfolio")
-async def portfolio_analytics(req: PortfolioAnalyticsRequest):
+async def portfolio_analytics(
+    req: PortfolioAnalyticsRequest,
+    request: Request,
+    principal: ResearchPrincipal | None = Depends(get_research_principal),
+):
     if not req.symbols:
         raise HTTPException(status_code=400, detail="symbols list cannot be empty")
     if len(req.symbols) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 symbols per request")
 
     symbols = [s.upper().strip() for s in req.symbols]
-    result = analytics_service.get_portfolio_performance(
+    result = await _compute(
+        request,
+        principal,
+        "cpu",
+        analytics_service.get_portfolio_performance,
         symbols=symbols,
         weights=req.weights,
         period=req.period,
@@ -73,10 +121,18 @@ async def portfolio_analytics(req: PortfolioAnalyticsRequest):
 
 
 @router.post("/portfolio/returns")
-async def portfolio_returns(req: PortfolioReturnsRequest):
+async def portfolio_returns(
+    req: PortfolioReturnsRequest,
+    request: Request,
+    principal: ResearchPrincipal | None = Depends(get_research_principal),
+):
     transactions = [t.model_dump() for t in req.transactions or []]
     symbols = [s.upper().strip() for s in req.symbols or []]
-    result = analytics_service.get_portfolio_returns(
+    result = await _compute(
+        request,
+        principal,
+        "io",
+        analytics_service.get_portfolio_returns,
         transactions=transactions,
         symbols=symbols,
         period=req.period,
@@ -87,25 +143,33 @@ async def portfolio_returns(req: PortfolioReturnsRequest):
 
 
 @router.get("/holding/{symbol}")
-async def holding_analytics(symbol: str, period: str = Query("2y", description="yfinance period string")):
-    cache_key = f"analytics:holding:{symbol.upper()}:{period}"
-    result = cached_call(
-        cache_key,
-        lambda: analytics_service.get_holding_metrics(symbol.upper(), period=period),
-        ttl_seconds=300,
-    )
+async def holding_analytics(
+    symbol: str,
+    request: Request,
+    period: str = Query("2y", description="yfinance period string"),
+    principal: ResearchPrincipal | None = Depends(get_research_principal),
+):
+    result = await _compute(request, principal, "cpu", _holding_metrics, symbol.upper(), period)
     if "error" in result:
         raise HTTPException(status_code=422, detail=result["error"])
     return result
 
 
 @router.post("/montecarlo")
-async def portfolio_montecarlo(req: MonteCarloRequest):
+async def portfolio_montecarlo(
+    req: MonteCarloRequest,
+    request: Request,
+    principal: ResearchPrincipal | None = Depends(get_research_principal),
+):
     if not req.symbols:
         raise HTTPException(status_code=400, detail="symbols list cannot be empty")
 
     symbols = [s.upper().strip() for s in req.symbols]
-    result = analytics_service.run_portfolio_montecarlo(
+    result = await _compute(
+        request,
+        principal,
+        "cpu",
+        analytics_service.run_portfolio_montecarlo,
         symbols=symbols,
         weights=req.weights,
         period=req.period,
@@ -121,12 +185,20 @@ async def portfolio_montecarlo(req: MonteCarloRequest):
 
 
 @router.post("/correlation")
-async def correlation_matrix(req: CorrelationRequest):
+async def correlation_matrix(
+    req: CorrelationRequest,
+    request: Request,
+    principal: ResearchPrincipal | None = Depends(get_research_principal),
+):
     if len(req.symbols) < 2:
         raise HTTPException(status_code=400, detail="Need at least 2 symbols for correlation")
 
     symbols = [s.upper().strip() for s in req.symbols]
-    result = analytics_service.get_correlation_matrix(
+    result = await _compute(
+        request,
+        principal,
+        "io",
+        analytics_service.get_correlation_matrix,
         symbols=symbols,
         period=req.period,
         method=req.method,
@@ -137,8 +209,15 @@ async def correlation_matrix(req: CorrelationRequest):
 
 
 @router.get("/regime/{symbol}")
-async def regime_drift(symbol: str, period: str = Query("2y", description="yfinance period string")):
-    result = analytics_service.get_regime_drift(symbol.upper(), period=period)
+async def regime_drift(
+    symbol: str,
+    request: Request,
+    period: str = Query("2y", description="yfinance period string"),
+    principal: ResearchPrincipal | None = Depends(get_research_principal),
+):
+    result = await _compute(
+        request, principal, "cpu", analytics_service.get_regime_drift, symbol.upper(), period=period
+    )
     if "error" in result:
         raise HTTPException(status_code=422, detail=result["error"])
     return result
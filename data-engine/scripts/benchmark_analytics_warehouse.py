@@ -0,0 +1,182 @@
+"""Compare ORM and DuckDB warehouse reads for peer and historical-multiple endpoints.
+
+Seeds a universe of companies with twenty years of annual facts and daily
+prices, exports it to a Parquet warehouse, then times peer selection (per
+candidate ORM lookups as before, one ORM window query, DuckDB) and the
+historical valuation series (ORM vs DuckDB).
+
+    python scripts/benchmark_analytics_warehouse.py --companies 2000 --priced 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+from collections.abc import Callable
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import create_engine, desc, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Company, FinancialFact, MarketPrice, Tenant  # noqa: E402
+from app.services.analytics_warehouse import AnalyticsWarehouse  # noqa: E402
+from app.services.historical_valuation_service import HistoricalValuationService  # noqa: E402
+from app.services.peer_comparison_service import PeerComparisonService  # noqa: E402
+
+METRICS = ("eps", "free_cash_flow", "revenue", "shares_diluted", "total_debt", "cash_and_equivalents", "market_cap")
+SECTORS = ("Technology", "Industrials", "Health Care", "Financials", "Energy")
+
+
+def seed(db: Session, companies: int, priced: int, years: int) -> tuple[int, list[int]]:
+    tenant = Tenant(external_id="warehouse-benchmark", name="Warehouse benchmark")
+    db.add(tenant)
+    db.flush()
+    rng = np.random.default_rng(11)
+    db.execute(
+        insert(Company),
+        [
+            {
+                "ticker": f"B{index:05d}",
+                "name": f"Benchmark {index}",
+                "exchange": "TEST",
+                "currency": "USD",
+                "sector": SECTORS[index % len(SECTORS)],
+                "industry": f"Industry {index % 40}",
+                "company_type": "standard",
+                "valuation_model": "standard_dcf",
+                "special_sources": [],
+                "special_risks": [],
+                "factor_tags": [f"tag{index % 7}", f"tag{index % 11}"],
+            }
+            for index in range(companies)
+        ],
+    )
+    ids = list(db.scalars(select(Company.id).order_by(Company.id)))
+    this_year = date.today().year
+    db.execute(
+        insert(FinancialFact),
+        [
+            {
+                "tenant_id": tenant.id,
+                "company_id": company_id,
+                "metric": metric,
+                "value": Decimal(str(round(float(rng.uniform(1, 5_000)), 2))),
+                "period": f"FY{year}",
+                "fiscal_year": year,
+                "fiscal_quarter": "FY",
+                "source_type": "benchmark",
+            }
+            for company_id in ids
+            for year in range(this_year - years, this_year)
+            for metric in METRICS
+        ],
+    )
+    start = date(this_year - years, 1, 1)
+    days = [start + timedelta(days=offset) for offset in range(365 * years)]
+    for company_id in ids[:priced]:
+        closes = 50 * np.cumprod(1 + rng.normal(0.0003, 0.015, len(days)))
+        db.execute(
+            insert(MarketPrice),
+            [
+                {
+                    "company_id": company_id,
+                    "date": day,
+                    "close": Decimal(str(round(float(close), 4))),
+                    "adj_close": Decimal(str(round(float(close), 4))),
+                }
+                for day, close in zip(days, closes)
+            ],
+        )
+    db.commit()
+    return tenant.id, ids
+
+
+def legacy_market_caps(db: Session, company_ids: list[int]) -> dict[int, Decimal | None]:
+    """The previous peer selection: one ORM lookup per candidate."""
+    caps: dict[int, Decimal | None] = {}
+    for company_id in company_ids:
+        fact = db.scalar(
+            select(FinancialFact)
+            .where(FinancialFact.company_id == company_id, FinancialFact.metric == "market_cap")
+            .order_by(FinancialFact.fiscal_year.desc().nullslast(), desc(FinancialFact.created_at))
+            .limit(1)
+        )
+        caps[company_id] = fact.value if fact else None
+    return caps
+
+
+def timed(label: str, runs: int, function: Callable[[], Any]) -> Any:
+    timings = []
+    result = None
+    for _ in range(runs):
+        started = perf_counter()
+        result = function()
+        timings.append(perf_counter() - started)
+    print(f"{label:<42} median {statistics.median(timings) * 1000:8.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=2_000)
+    parser.add_argument("--priced", type=int, default=100)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite+pysqlite:///:memory:")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with tempfile.TemporaryDirectory() as directory, Session(engine) as db:
+        tenant_id, ids = seed(db, args.companies, args.priced, args.years)
+        warehouse = AnalyticsWarehouse(Path(directory) / "warehouse")
+        database_only = AnalyticsWarehouse(Path(directory) / "empty")
+        started = perf_counter()
+        warehouse.export(db)
+        print(f"full export: {perf_counter() - started:.1f} s")
+        db.info["tenant_id"] = tenant_id
+        target = db.get(Company, ids[0])
+        assert target is not None
+
+        print(f"peer benchmark, {args.companies} companies:")
+        legacy = timed("  ORM, one query per candidate", args.runs, lambda: legacy_market_caps(db, ids))
+        batched = timed(
+            "  ORM, one window query",
+            args.runs,
+            lambda: PeerComparisonService(database_only)._latest_market_caps(db),
+        )
+        columnar = timed(
+            "  DuckDB warehouse",
+            args.runs,
+            lambda: PeerComparisonService(warehouse)._latest_market_caps(db),
+        )
+        assert {key: value for key, value in legacy.items() if value is not None} == batched == columnar
+
+        print(f"historical multiples, {args.years} years of daily prices:")
+        expected = timed(
+            "  ORM",
+            args.runs,
+            lambda: HistoricalValuationService(database_only).build(db, target, years=args.years),
+        )
+        actual = timed(
+            "  DuckDB warehouse",
+            args.runs,
+            lambda: HistoricalValuationService(warehouse).build(db, target, years=args.years),
+        )
+        assert actual == expected
+
+
+if __name__ == "__main__":
+    main()
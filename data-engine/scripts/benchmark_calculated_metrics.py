@@ -0,0 +1,172 @@
+"""Compare batched universe metric calculation with the per-metric path.
+
+Seeds an in-memory SQLite universe and evaluates every calculated metric for
+every company twice: once through ``MetricCalculationService.calculate``
+per (company, metric) and once through ``calculate_universe``. Results are
+compared for parity before wall time and statement counts are printed.
+Nothing is persisted, so both paths do the same work.
+
+    python scripts/benchmark_calculated_metrics.py --companies 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, event, insert, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Company, FinancialFact, Tenant  # noqa: E402
+from app.services.metric_calculation_service import (  # noqa: E402
+    METRIC_DEFINITIONS,
+    MetricCalculationService,
+)
+
+
+ANNUAL_FACTS = {
+    "revenue": 1000,
+    "free_cash_flow": 250,
+    "net_income": 180,
+    "operating_income": 250,
+    "gross_profit": 650,
+    "total_equity": 800,
+    "total_assets": 1500,
+    "total_debt": 200,
+    "cash_and_equivalents": 100,
+    "ebitda": 300,
+    "net_debt": 100,
+    "income_tax_expense": 50,
+    "income_before_tax": 200,
+    "interest_expense": -10,
+    "gross_investment": 900,
+    "shares_diluted": 100,
+}
+MARKET_FACTS = {
+    "risk_free_rate": 0.04,
+    "beta": 1.1,
+    "equity_risk_premium": 0.05,
+    "market_cap": 5000,
+}
+
+
+def seed(db: Session, companies: int, years: int) -> list[Company]:
+    tenant = Tenant(external_id="metrics-benchmark", name="Metrics benchmark")
+    db.add(tenant)
+    db.flush()
+    db.info["tenant_id"] = tenant.id
+    rows = [
+        Company(
+            ticker=f"M{index:05d}",
+            name=f"Benchmark {index}",
+            exchange="TEST",
+            currency="USD",
+            sector="Test",
+            industry="Test",
+            company_type="standard",
+            valuation_model="standard_dcf",
+            special_sources=[],
+            special_risks=[],
+            factor_tags=[],
+        )
+        for index in range(companies)
+    ]
+    db.add_all(rows)
+    db.flush()
+    facts = []
+    for index, company in enumerate(rows):
+        scale = 1 + (index % 20) / 10
+        for year in range(2026 - years, 2026):
+            growth = 1 + 0.05 * (year - 2026 + years)
+            facts.extend(
+                {
+                    "tenant_id": tenant.id,
+                    "company_id": company.id,
+                    "metric": metric,
+                    "value": round(value * scale * growth, 4),
+                    "unit": "shares" if metric == "shares_diluted" else "USD",
+                    "period": f"FY{year}",
+                    "fiscal_year": year,
+                    "fiscal_quarter": "FY",
+                    "source_type": "benchmark",
+                    "is_reported": True,
+                    "confidence": 0.9,
+                }
+                for metric, value in ANNUAL_FACTS.items()
+            )
+        facts.extend(
+            {
+                "tenant_id": tenant.id,
+                "company_id": company.id,
+                "metric": metric,
+                "value": value,
+                "unit": "USD",
+                "period": "2025-12-31",
+                "fiscal_year": 2025,
+                "fiscal_quarter": None,
+                "source_type": "benchmark",
+                "is_reported": True,
+                "confidence": 0.9,
+            }
+            for metric, value in MARKET_FACTS.items()
+        )
+    db.execute(insert(FinancialFact), facts)
+    db.commit()
+    # Without statistics SQLite serves the per-company lookups from the metric
+    # index and scans every company; PostgreSQL keeps statistics up to date.
+    db.execute(text("ANALYZE"))
+    return list(db.scalars(select(Company).order_by(Company.id)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    statements = [0]
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.__setitem__(0, statements[0] + 1))
+    with Session(engine) as db:
+        started = perf_counter()
+        companies = seed(db, args.companies, args.years)
+        print(f"seeded {args.companies} companies x {args.years} years in {perf_counter() - started:.2f}s")
+
+        service = MetricCalculationService()
+        timings = {}
+        counts = {}
+        results = {}
+        runs = {
+            "per_metric": lambda: {
+                company.id: [service.calculate(db, company, metric, persist=False) for metric in METRIC_DEFINITIONS]
+                for company in companies
+            },
+            "batched": lambda: service.calculate_universe(db, companies, persist=False),
+        }
+        for label, run in runs.items():
+            statements[0] = 0
+            started = perf_counter()
+            results[label] = run()
+            timings[label] = perf_counter() - started
+            counts[label] = statements[0]
+        for company in companies:
+            expected = [asdict(result) for result in results["per_metric"][company.id]]
+            if [asdict(result) for result in results["batched"][company.id]] != expected:
+                raise SystemExit(f"Batched and per-metric results differ for {company.ticker}")
+        print(f"metrics: {len(METRIC_DEFINITIONS)} per company, {len(METRIC_DEFINITIONS) * len(companies)} total")
+        for label, seconds in timings.items():
+            print(f"{label}: {seconds:.3f}s, {counts[label]} statements")
+        print(f"speedup: {timings['per_metric'] / timings['batched']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
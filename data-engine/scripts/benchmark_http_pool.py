@@ -0,0 +1,87 @@
+"""Compare per-request HTTP clients with the pooled client registry.
+
+Starts a local keep-alive HTTP server that counts accepted TCP connections,
+then issues the same fan-out of requests through ``http_client`` without
+and with an installed registry. Pooling should open at most the provider's
+concurrency limit worth of connections instead of one per request.
+
+    python scripts/benchmark_http_pool.py --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.http_clients import http_client, open_http_clients  # noqa: E402
+
+BODY = b'[{"price": 1}]'
+
+
+class CountingServer:
+    def __init__(self) -> None:
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                await asyncio.sleep(0.002)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(BODY)}\r\n\r\n".encode()
+                    + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def fan_out(url: str, requests: int) -> None:
+    async def one(index: int) -> None:
+        async with http_client(url, provider="fmp") as client:
+            response = await client.get(url, params={"ticker": f"T{index}"})
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(index) for index in range(requests)))
+
+
+async def main(requests: int) -> None:
+    counter = CountingServer()
+    server = await asyncio.start_server(counter.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/profile"
+    async with server:
+        for label, pooled in (("per-request clients", False), ("pooled registry", True)):
+            counter.connections = 0
+            started = perf_counter()
+            if pooled:
+                async with open_http_clients() as registry:
+                    await fan_out(url, requests)
+                    peak = registry.metrics()["peak_in_flight"].get("fmp")
+            else:
+                await fan_out(url, requests)
+                peak = None
+            elapsed = perf_counter() - started
+            print(
+                f"{label}: {requests} requests, {counter.connections} TCP connections, "
+                f"{elapsed * 1000:.0f} ms" + (f", peak in flight {peak}" if peak else "")
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,123 @@
+"""Measure PortfolioIntelligenceService.build on a large synthetic portfolio.
+
+Seeds N positions with Y years of daily prices (plus the SPY benchmark)
+and times the full analytics payload: one price query, returns, portfolio
+series, drawdown, correlation matrix, beta and attribution. Repeat runs hit
+the price-matrix cache, so the cold matrix load is also timed on its own,
+from the database and from an analytics warehouse export.
+
+    python scripts/benchmark_portfolio_intelligence.py --positions 300 --years 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Company, MarketPrice, Position, Tenant  # noqa: E402
+from app.services import price_matrix  # noqa: E402
+from app.services.analytics_warehouse import AnalyticsWarehouse  # noqa: E402
+from app.services.portfolio_intelligence_service import PortfolioIntelligenceService  # noqa: E402
+from app.services.price_matrix import PriceMatrix  # noqa: E402
+
+
+def seed(db: Session, positions: int, years: int) -> None:
+    tenant = Tenant(external_id="portfolio-benchmark", name="Portfolio benchmark")
+    db.add(tenant)
+    db.flush()
+    db.info["tenant_id"] = tenant.id
+    companies = [
+        Company(
+            ticker="SPY" if index == 0 else f"B{index:04d}",
+            name=f"Benchmark company {index}",
+            exchange="NYSE",
+            currency="USD",
+            sector=f"Sector {index % 11}",
+            industry="Benchmark",
+            company_type="standard",
+            valuation_model="standard_dcf",
+            special_sources=[],
+            special_risks=[],
+            factor_tags=[],
+        )
+        for index in range(positions + 1)
+    ]
+    db.add_all(companies)
+    db.flush()
+    rng = np.random.default_rng(11)
+    start = date.today() - timedelta(days=365 * years)
+    days = [start + timedelta(days=offset) for offset in range(365 * years) if (start + timedelta(days=offset)).weekday() < 5]
+    for company in companies:
+        prices = 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, len(days)))
+        db.execute(
+            insert(MarketPrice),
+            [
+                {"company_id": company.id, "date": day, "adj_close": round(float(price), 6), "close": round(float(price), 6)}
+                for day, price in zip(days, prices)
+            ],
+        )
+    db.add_all(
+        Position(
+            company_id=company.id,
+            quantity=Decimal("10"),
+            currency="USD",
+            market_value_base=Decimal(int(rng.integers(1_000, 100_000))),
+            cost_basis_native=Decimal("1000"),
+        )
+        for company in companies[1:]
+    )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=300)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite+pysqlite:///:memory:")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        started = perf_counter()
+        seed(db, args.positions, args.years)
+        print(f"seeded {args.positions} positions x {args.years} years in {perf_counter() - started:.1f}s")
+        service = PortfolioIntelligenceService()
+        timings = []
+        for _ in range(args.runs):
+            started = perf_counter()
+            service.build(db, years=args.years)
+            timings.append(perf_counter() - started)
+        print(f"median: {statistics.median(timings) * 1000:.0f} ms")
+        print(f"max: {max(timings) * 1000:.0f} ms")
+
+        company_ids = db.scalars(select(Company.id)).all()
+        with tempfile.TemporaryDirectory() as directory:
+            empty, exported = AnalyticsWarehouse(Path(directory) / "empty"), AnalyticsWarehouse(directory)
+            exported.export(db, full=True)
+            for source, warehouse in (("database", empty), ("warehouse", exported)):
+                price_matrix._cache.clear()
+                started = perf_counter()
+                matrix = PriceMatrix.load(db, company_ids, warehouse=warehouse)
+                elapsed = perf_counter() - started
+                print(f"cold matrix from {source}: {elapsed * 1000:.0f} ms {matrix.prices.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure return_engine.compute_portfolio_returns on a large synthetic ledger.
+
+Prices come from a seeded random walk instead of Yahoo Finance so the
+timing covers only the ledger replay, NAV and TWR.
+
+    python scripts/benchmark_return_engine.py --years 10 --symbols 200 --trades 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules import return_engine  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--trades", type=int, default=20_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * args.years)
+    symbols = [f"S{index:03d}" for index in range(args.symbols)]
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + rng.normal(0.0003, 0.02, (len(dates), len(symbols))), axis=0),
+        index=dates,
+        columns=symbols,
+    )
+    trade_days = np.sort(rng.integers(0, len(dates), args.trades))
+    transactions = [
+        {
+            "symbol": symbols[int(rng.integers(0, len(symbols)))],
+            "type": kind,
+            # Small sells against larger buys keep the book long.
+            "quantity": float(rng.integers(1, 20)) if kind == "buy" else 1.0,
+            "price": round(float(rng.uniform(20, 300)), 2),
+            "date": dates[int(day)].strftime("%Y-%m-%d"),
+        }
+        for day, kind in zip(trade_days, np.where(rng.random(args.trades) < 0.7, "buy", "sell"))
+    ]
+    return_engine._fetch_prices = lambda symbols, start, end=None: prices
+    return_engine._period_start = lambda period: dates[0]
+
+    timings = []
+    for _ in range(args.runs):
+        started = perf_counter()
+        result = return_engine.compute_portfolio_returns(transactions=transactions, period="5y")
+        timings.append(perf_counter() - started)
+    print(
+        f"{args.years}y x {args.symbols} symbols x {args.trades} trades: "
+        f"median {statistics.median(timings) * 1000:.0f} ms, twr={result['twr']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
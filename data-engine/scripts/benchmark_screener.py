@@ -0,0 +1,144 @@
+"""Compare the columnar screener engine with the row-by-row reference path.
+
+Seeds an in-memory SQLite universe and reports wall time for both paths. The
+results of both engines are compared for parity before timings are printed.
+
+    python scripts/benchmark_screener.py --companies 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import CalculatedMetric, Company, FinancialFact, Tenant  # noqa: E402
+from app.services.screener_service import CustomMetricService, ScreenerService  # noqa: E402
+
+
+CRITERIA = [
+    {"left": "roic_spread", "operator": ">", "right": "0.02"},
+    {"left": "fcf_per_share_cagr", "operator": ">", "right": "0.03"},
+    {"left": "shares_cagr", "operator": "<", "right": "0.02"},
+    {"left": "net_debt_to_ebitda", "operator": "<", "right": "3"},
+]
+RANKING = "roic_spread + fcf_per_share_cagr"
+
+
+def seed(db: Session, companies: int) -> None:
+    tenant = Tenant(external_id="screener-benchmark", name="Screener benchmark")
+    db.add(tenant)
+    db.flush()
+    db.info["tenant_id"] = tenant.id
+    rows = [
+        Company(
+            ticker=f"B{index:05d}",
+            name=f"Benchmark {index}",
+            exchange="TEST",
+            currency="USD",
+            sector="Test",
+            industry="Test",
+            company_type="standard",
+            valuation_model="standard_dcf",
+            special_sources=[],
+            special_risks=[],
+            factor_tags=[],
+        )
+        for index in range(companies)
+    ]
+    db.add_all(rows)
+    db.flush()
+    for index, company in enumerate(rows):
+        for metric, value in (
+            ("roic", Decimal("0.04") + Decimal(index % 30) / 100),
+            ("wacc", Decimal("0.08")),
+            ("net_debt_to_ebitda", Decimal(index % 5)),
+            ("gross_margin", Decimal("0.40")),
+            ("operating_margin", Decimal("0.20")),
+        ):
+            db.add(
+                CalculatedMetric(
+                    company_id=company.id,
+                    metric=metric,
+                    value=value,
+                    unit="decimal",
+                    period="FY2025",
+                    fiscal_year=2025,
+                    status="ok",
+                    definition_version="benchmark-v1",
+                    formula=metric,
+                    source_fact_ids=[],
+                    calculation_trace={},
+                    confidence=Decimal("0.9"),
+                )
+            )
+        for year in range(2018, 2026):
+            for metric, value in (
+                ("free_cash_flow", Decimal(100 + index % 50 + 5 * (year - 2018))),
+                ("shares_diluted", Decimal(1000 + (year - 2018) * (index % 3))),
+                ("revenue", Decimal(1000 + 40 * (year - 2018))),
+            ):
+                db.add(
+                    FinancialFact(
+                        company_id=company.id,
+                        metric=metric,
+                        value=value,
+                        unit="USD",
+                        period=f"FY{year}",
+                        fiscal_year=year,
+                        fiscal_quarter="FY",
+                        source_type="benchmark",
+                        confidence=Decimal("0.95"),
+                    )
+                )
+    db.commit()
+    CustomMetricService().create(
+        db,
+        metric_key="roic_spread",
+        name="ROIC spread",
+        formula="roic - wacc",
+        unit="decimal",
+        description="ROIC less WACC",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        started = perf_counter()
+        seed(db, args.companies)
+        print(f"seeded {args.companies} companies in {perf_counter() - started:.2f}s")
+
+        service = ScreenerService()
+        timings = {}
+        responses = {}
+        for label, run in (("columnar", service.run), ("row_by_row", service.run_rowwise)):
+            db.expire_all()
+            started = perf_counter()
+            responses[label] = run(db, criteria=CRITERIA, ranking_formula=RANKING, ranking_direction="desc")
+            timings[label] = perf_counter() - started
+        if responses["columnar"] != responses["row_by_row"]:
+            raise SystemExit("Columnar and row-by-row screen results differ")
+        print(f"matches: {responses['columnar']['match_count']}")
+        for label, seconds in timings.items():
+            print(f"{label}: {seconds:.3f}s")
+        print(f"speedup: {timings['row_by_row'] / timings['columnar']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measure universal search latency on a seeded tenant.
+
+Seeds one tenant with N document chunks plus a few claims and knowledge
+chunks, then runs a fixed query mix and prints p50/p95 latency. Point
+``--database-url`` at a scratch PostgreSQL database to measure the
+``ts_rank_cd`` path; the default in-memory SQLite exercises the portable
+fallback. On PostgreSQL migrate the scratch database to head first so the
+stored ``search_vector`` columns exist; the script backfills them and
+reports latency with and without them.
+
+    python scripts/benchmark_universal_search.py --chunks 100000
+    DATABASE_URL=postgresql+psycopg://.../scratch alembic upgrade head
+    python scripts/benchmark_universal_search.py --chunks 1000000 \
+        --database-url postgresql+psycopg://.../scratch
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Claim, Document, DocumentChunk, Tenant  # noqa: E402
+from app.services.search_vector_service import SearchVectorService  # noqa: E402
+from app.services.universal_search_service import UniversalSearchService  # noqa: E402
+
+
+WORDS = (
+    "pricing power margin capital allocation buyback reinvestment moat churn backlog "
+    "guidance inventory supply demand operating leverage dilution working capital "
+    "free cash flow return invested capital competition regulation subscription"
+).split()
+QUERIES = (
+    "pricing power",
+    "capital allocation discipline",
+    "free cash flow conversion",
+    "operating leverage margin",
+    "subscription churn",
+)
+
+
+def seed(db: Session, chunks: int, chunks_per_document: int = 50) -> None:
+    tenant = Tenant(external_id="search-benchmark", name="Search benchmark")
+    db.add(tenant)
+    db.flush()
+    db.info["tenant_id"] = tenant.id
+    rng = random.Random(7)
+    documents = [
+        Document(title=f"Filing {index}", source_type="sec_filing", tenant_id=tenant.id)
+        for index in range(max(1, chunks // chunks_per_document))
+    ]
+    db.add_all(documents)
+    db.flush()
+    rows = [
+        {
+            "tenant_id": tenant.id,
+            "document_id": documents[index // chunks_per_document % len(documents)].id,
+            "chunk_index": index % chunks_per_document,
+            "text": " ".join(rng.choices(WORDS, k=60)),
+            "token_count": 60,
+            "metadata": {},
+        }
+        for index in range(chunks)
+    ]
+    for offset in range(0, len(rows), 5000):
+        db.execute(insert(DocumentChunk), rows[offset : offset + 5000])
+    db.add_all(
+        Claim(statement=" ".join(rng.choices(WORDS, k=20)), status="verified") for _ in range(500)
+    )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--database-url", default="sqlite+pysqlite:///:memory:")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        started = perf_counter()
+        seed(db, args.chunks)
+        print(f"seeded {args.chunks} chunks in {perf_counter() - started:.1f}s")
+
+        modes = [True]
+        if engine.dialect.name == "postgresql":
+            backfill = SearchVectorService().backfill(db)
+            print(f"backfilled search vectors in {backfill['elapsed_seconds']:.1f}s")
+            modes.append(False)
+        for use_search_vectors in modes:
+            measure(UniversalSearchService(use_search_vectors=use_search_vectors), db, args.runs)
+
+
+def measure(service: UniversalSearchService, db: Session, runs: int) -> None:
+    timings = []
+    for run in range(runs):
+        query = QUERIES[run % len(QUERIES)]
+        started = perf_counter()
+        response = service.search(db, query, include_vector=False)
+        timings.append(perf_counter() - started)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+    print(f"backend: {response['retrieval']['lexical_backend']}", end=" ")
+    print(f"(search vectors {'on' if service.use_search_vectors else 'off'})")
+    print(f"  p50: {statistics.median(timings) * 1000:.1f} ms")
+    print(f"  p95: {p95 * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
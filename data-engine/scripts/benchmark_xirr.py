@@ -0,0 +1,142 @@
+"""Measure portfolio XIRR on a large multi-currency transaction ledger.
+
+Seeds N transactions in USD/GBP/EUR with daily EUR FX quotes and compares
+the previous path (two FX queries per transaction, then bisection over a
+Python NPV sum) with the preloaded FX curve and the Newton/Brent solver.
+
+    python scripts/benchmark_xirr.py --transactions 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import FXRate, Tenant, Transaction  # noqa: E402
+from app.services.portfolio_fx_service import PortfolioFXService  # noqa: E402
+from app.services.portfolio_intelligence_service import PortfolioIntelligenceService  # noqa: E402
+
+CURRENCIES = ("USD", "GBP", "EUR")
+
+
+def seed(db: Session, transactions: int, years: int) -> None:
+    tenant = Tenant(external_id="xirr-benchmark", name="XIRR benchmark")
+    db.add(tenant)
+    db.flush()
+    db.info["tenant_id"] = tenant.id
+    PortfolioFXService().set_base_currency(db, "EUR")
+    rng = np.random.default_rng(3)
+    start = date.today() - timedelta(days=365 * years)
+    days = [start + timedelta(days=offset) for offset in range(365 * years)]
+    db.execute(
+        insert(FXRate),
+        [
+            {
+                "tenant_id": tenant.id,
+                "base_currency": "EUR",
+                "quote_currency": currency,
+                "rate_date": day,
+                "rate": Decimal(str(round(float(rate), 6))),
+                "source": "benchmark",
+            }
+            for currency, level in (("USD", 0.9), ("GBP", 1.15))
+            for day, rate in zip(days, level * np.cumprod(1 + rng.normal(0, 0.003, len(days))))
+        ],
+    )
+    offsets = np.sort(rng.integers(0, len(days), transactions))
+    db.execute(
+        insert(Transaction),
+        [
+            {
+                "tenant_id": tenant.id,
+                "trade_date": days[int(offset)],
+                "action": "buy" if rng.random() < 0.7 else "sell",
+                "quantity": Decimal(int(rng.integers(1, 50))),
+                "price": Decimal(str(round(float(rng.uniform(5, 500)), 2))),
+                "fees": Decimal("1.00"),
+                "currency": CURRENCIES[int(rng.integers(0, 3))],
+                "raw_payload": {},
+            }
+            for offset in offsets
+        ],
+    )
+    db.commit()
+
+
+def legacy_xirr(db: Session, ending_value: float) -> float | None:
+    fx = PortfolioFXService()
+    cashflows = []
+    for transaction in db.scalars(select(Transaction).order_by(Transaction.trade_date)):
+        rate = fx.rate(
+            db,
+            quote_currency=transaction.currency,
+            base_currency="EUR",
+            as_of=transaction.trade_date,
+        )
+        if rate is None:
+            continue
+        amount = float((transaction.quantity * transaction.price + transaction.fees) * rate)
+        cashflows.append((transaction.trade_date, -amount if transaction.action == "buy" else amount))
+    cashflows.append((date.today(), ending_value))
+    origin = min(day for day, _ in cashflows)
+
+    def npv(rate: float) -> float:
+        return sum(value / ((1 + rate) ** ((day - origin).days / 365.0)) for day, value in cashflows)
+
+    low, high = -0.9999, 10.0
+    for _ in range(200):
+        middle = (low + high) / 2
+        if abs(npv(middle)) < 1e-8:
+            break
+        if npv(low) * npv(middle) <= 0:
+            high = middle
+        else:
+            low = middle
+    return middle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--database-url", default="sqlite+pysqlite:///:memory:")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db, args.transactions, args.years)
+        service = PortfolioIntelligenceService()
+        started = perf_counter()
+        flows, _ = service._cashflows(db, [], "EUR")
+        loaded = perf_counter()
+        ending_value = float(-flows.amounts.sum() * 1.4)
+        rate, trace = service._xirr(flows, ending_value)
+        solved = perf_counter()
+        print(
+            f"curve + arrays: {(loaded - started) * 1000:.0f} ms load, "
+            f"{(solved - loaded) * 1000:.1f} ms solve, xirr={rate:.10f} ({trace['method']})"
+        )
+        if not args.skip_legacy:
+            started = perf_counter()
+            legacy = legacy_xirr(db, ending_value)
+            elapsed = perf_counter() - started
+            print(f"per-transaction FX + bisection: {elapsed * 1000:.0f} ms, xirr={legacy:.10f}")
+
+
+if __name__ == "__main__":
+    main()
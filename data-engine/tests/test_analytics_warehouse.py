@@ -0,0 +1,225 @@
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import Company, FinancialFact, MarketPrice, Tenant
+from app.services import analytics_warehouse, price_matrix
+from app.services.analytics_warehouse import AnalyticsWarehouse
+from app.services.historical_valuation_service import HistoricalValuationService
+from app.services.peer_comparison_service import PeerComparisonService
+from app.services.price_matrix import PriceMatrix
+
+
+def _company(ticker: str) -> Company:
+    return Company(
+        ticker=ticker,
+        name=f"{ticker} Co",
+        exchange="TEST",
+        currency="USD",
+        sector="Test",
+        industry="Test",
+        company_type="standard",
+        valuation_model="standard_dcf",
+        special_sources=[],
+        special_risks=[],
+        factor_tags=[],
+    )
+
+
+def _fact(tenant: Tenant, company: Company, metric: str, value: str, year: int) -> FinancialFact:
+    return FinancialFact(
+        tenant_id=tenant.id,
+        company_id=company.id,
+        metric=metric,
+        value=Decimal(value),
+        period=f"FY{year}",
+        fiscal_year=year,
+        fiscal_quarter="FY",
+        source_type="FMP",
+    )
+
+
+def _seed(db: Session) -> tuple[list[Tenant], list[Company]]:
+    tenants = [Tenant(external_id=f"warehouse-{index}", name="Warehouse") for index in range(2)]
+    companies = [_company(f"WH{index}") for index in range(3)]
+    db.add_all([*tenants, *companies])
+    db.flush()
+    this_year = date.today().year
+    rng = np.random.default_rng(4)
+    day = date(this_year - 4, 1, 1)
+    db.add_all(
+        MarketPrice(
+            company_id=company.id,
+            date=day + timedelta(days=offset),
+            close=Decimal(str(round(float(price), 2))),
+            adj_close=Decimal(str(round(float(price), 4))),
+        )
+        for company in companies
+        for offset, price in enumerate(50 * np.cumprod(1 + rng.normal(0, 0.01, 1500)))
+    )
+    for tenant_index, tenant in enumerate(tenants):
+        for company_index, company in enumerate(companies):
+            for year in range(this_year - 4, this_year):
+                growth = 1 + 0.1 * (year - this_year + 5)
+                db.add_all(
+                    _fact(tenant, company, metric, str(round(base * growth, 2)), year)
+                    for metric, base in (
+                        ("eps", 2 + tenant_index),
+                        ("free_cash_flow", 120.0),
+                        ("revenue", 900.0),
+                        ("shares_diluted", 60.0),
+                        ("total_debt", 40.0),
+                        ("cash_and_equivalents", 15.0),
+                        ("market_cap", 1_000.0 * (company_index + 1) * (tenant_index + 1)),
+                    )
+                )
+    db.flush()
+    # Age the seed past the export's overlap window, as a settled history.
+    settled = datetime.now(UTC) - timedelta(hours=1)
+    for model in (FinancialFact, MarketPrice):
+        db.execute(update(model).values(updated_at=settled))
+    db.commit()
+    return tenants, companies
+
+
+def test_export_is_incremental_tenant_scoped_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_warehouse, "COMPACT_AFTER_PARTS", 2)
+    # The seed shares one timestamp; without the overlap only new writes are re-read.
+    monkeypatch.setattr(analytics_warehouse, "CHANGE_WATERMARK_OVERLAP", timedelta(0))
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    warehouse = AnalyticsWarehouse(tmp_path)
+    with Session(engine) as db:
+        (first, second), companies = _seed(db)
+        assert not warehouse.is_current(db, FinancialFact)
+
+        summary = warehouse.export(db)
+        assert summary["tables"]["financial_facts"]["mode"] == "full"
+        assert summary["tables"]["market_prices"]["rows"] == 4500
+        assert warehouse.is_current(db, FinancialFact, MarketPrice)
+        assert sorted(path.name for path in (tmp_path / "financial_facts").iterdir()) == [
+            f"tenant={first.id}",
+            f"tenant={second.id}",
+        ]
+        with warehouse.connect(first.id) as connection:
+            assert connection.execute(
+                "SELECT DISTINCT tenant_id FROM financial_facts"
+            ).fetchall() == [(first.id,)]
+            assert connection.execute("SELECT count(*) FROM financial_facts").fetchone() == (84,)
+
+        # Ingestion replaces one company's facts by delete and re-insert.
+        db.execute(
+            delete(FinancialFact).where(
+                FinancialFact.tenant_id == first.id, FinancialFact.company_id == companies[0].id
+            )
+        )
+        db.add(_fact(first, companies[0], "eps", "9.5", date.today().year - 1))
+        db.commit()
+        assert not warehouse.is_current(db, FinancialFact)
+        summary = warehouse.export(db)
+        assert summary["tables"]["financial_facts"] == {
+            "mode": "incremental",
+            "companies": 1,
+            "rows": 1,
+            "compacted_directories": 0,
+        }
+        assert summary["tables"]["market_prices"]["mode"] == "unchanged"
+        with warehouse.connect(first.id) as connection:
+            assert connection.execute(
+                "SELECT metric, value FROM financial_facts WHERE company_id = ?", [companies[0].id]
+            ).fetchall() == [("eps", Decimal("9.500000"))]
+            assert connection.execute("SELECT count(*) FROM financial_facts").fetchone() == (57,)
+        with warehouse.connect(second.id) as connection:
+            assert connection.execute("SELECT count(*) FROM financial_facts").fetchone() == (84,)
+
+        db.add(_fact(first, companies[1], "eps", "7", date.today().year))
+        db.commit()
+        summary = warehouse.export(db)
+        assert summary["tables"]["financial_facts"]["compacted_directories"] == 1
+        assert len(list((tmp_path / "financial_facts" / f"tenant={first.id}").glob("*.parquet"))) == 1
+        with warehouse.connect(first.id) as connection:
+            assert connection.execute("SELECT count(*) FROM financial_facts").fetchone() == (58,)
+
+
+def test_services_read_the_warehouse_with_database_identical_results(tmp_path, monkeypatch):
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    warehouse = AnalyticsWarehouse(tmp_path / "warehouse")
+    database_only = AnalyticsWarehouse(tmp_path / "empty")
+    connections = []
+    connect = AnalyticsWarehouse.connect
+    monkeypatch.setattr(
+        AnalyticsWarehouse,
+        "connect",
+        lambda self, tenant_id: connections.append(tenant_id) or connect(self, tenant_id),
+    )
+    with Session(engine) as db:
+        (first, second), companies = _seed(db)
+        warehouse.export(db)
+        db.info["tenant_id"] = second.id
+
+        expected = HistoricalValuationService(database_only).build(db, companies[1], years=5)
+        assert connections == []
+        actual = HistoricalValuationService(warehouse).build(db, companies[1], years=5)
+        assert connections == [second.id]
+        assert actual == expected
+        assert actual["coverage"]["complete_valuation_points"] == 4
+
+        caps = PeerComparisonService(database_only)._latest_market_caps(db)
+        assert PeerComparisonService(warehouse)._latest_market_caps(db) == caps
+        assert caps == {
+            company.id: Decimal(2_800 * (index + 1)) for index, company in enumerate(companies)
+        }
+        # The other tenant's newer rows stay invisible on both paths.
+        db.info["tenant_id"] = first.id
+        caps = PeerComparisonService(database_only)._latest_market_caps(db)
+        assert PeerComparisonService(warehouse)._latest_market_caps(db) == caps
+        assert caps[companies[0].id] == Decimal("1400")
+
+        ids = [company.id for company in companies]
+        start = date(date.today().year - 3, 1, 1)
+        price_matrix._cache.clear()
+        from_database = PriceMatrix.load(db, ids, start=start, warehouse=database_only)
+        price_matrix._cache.clear()
+        from_parquet = PriceMatrix.load(db, ids, start=start, warehouse=warehouse)
+        assert connections[-1] is None
+        np.testing.assert_array_equal(from_parquet.dates, from_database.dates)
+        np.testing.assert_array_equal(from_parquet.prices, from_database.prices)
+
+
+def test_deleting_a_tenants_last_facts_for_a_company_forces_a_full_export(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_warehouse, "CHANGE_WATERMARK_OVERLAP", timedelta(0))
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    warehouse = AnalyticsWarehouse(tmp_path)
+    with Session(engine) as db:
+        (first, second), companies = _seed(db)
+        warehouse.export(db)
+
+        # No surviving fact of this tenant and company is left to carry a newer timestamp.
+        db.execute(
+            delete(FinancialFact).where(
+                FinancialFact.tenant_id == first.id, FinancialFact.company_id == companies[2].id
+            )
+        )
+        db.commit()
+        assert not warehouse.is_current(db, FinancialFact)
+
+        summary = warehouse.export(db)
+        assert summary["tables"]["financial_facts"]["mode"] == "full"
+        assert warehouse.is_current(db, FinancialFact)
+        with warehouse.connect(first.id) as connection:
+            assert connection.execute(
+                "SELECT count(*) FROM financial_facts WHERE company_id = ?", [companies[2].id]
+            ).fetchone() == (0,)
+            assert connection.execute("SELECT count(*) FROM financial_facts").fetchone() == (56,)
+        with warehouse.connect(second.id) as connection:
+            assert connection.execute("SELECT count(*) FROM financial_facts").fetchone() == (84,)
+
+        db.add(_fact(second, companies[0], "eps", "3", date.today().year))
+        db.commit()
+        assert warehouse.export(db)["tables"]["financial_facts"]["mode"] == "incremental"
@@ -1,12 +1,14 @@
+from contextlib import contextmanager
+from dataclasses import asdict
 from decimal import Decimal
 
 from fastapi.testclient import TestClient
-from sqlalchemy import delete, select
+from sqlalchemy import delete, event, select
 
 import main
-from app.core.database import SessionLocal, init_db
+from app.core.database import SessionLocal, engine, init_db
 from app.models import CalculatedMetric, Company, FinancialFact
-from app.services.metric_calculation_service import MetricCalculationService
+from app.services.metric_calculation_service import METRIC_DEFINITIONS, MetricCalculationService
 
 
 TEST_TICKER = "TCALC"
@@ -72,6 +74,160 @@ def add_fact(
     return fact
 
 
+@contextmanager
+def count_statements():
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def seed_parity_universe(db) -> list[Company]:
+    target = create_test_company(db)
+    peer_1 = create_test_company(db, "TPEER1", "Traceable Peer One")
+    peer_2 = create_test_company(db, "TPEER2", "Traceable Peer Two")
+
+    for metric, value in [
+        ("revenue", "1000"),
+        ("free_cash_flow", "250"),
+        ("net_income", "180"),
+        ("operating_income", "250"),
+        ("gross_profit", "650"),
+        ("total_equity", "800"),
+        ("total_assets", "1500"),
+        ("total_debt", "200"),
+        ("cash_and_equivalents", "100"),
+        ("ebitda", "300"),
+        ("net_debt", "100"),
+        ("income_tax_expense", "50"),
+        ("income_before_tax", "200"),
+    ]:
+        add_fact(db, target, metric, value)
+    for metric, value in [
+        ("revenue", "900"),
+        ("operating_income", "210"),
+        ("total_debt", "150"),
+        ("total_equity", "700"),
+        ("cash_and_equivalents", "90"),
+    ]:
+        add_fact(db, target, metric, value, "FY2024", 2024)
+    add_fact(db, target, "revenue", "260", "Q3-2025", 2025, "Q3")
+    add_fact(db, target, "free_cash_flow", "70", "Q3-2025", 2025, "Q3")
+    for metric, value in [
+        ("risk_free_rate", "4"),
+        ("beta", "1.1"),
+        ("equity_risk_premium", "0.05"),
+        ("market_cap", "5000"),
+    ]:
+        add_fact(db, target, metric, value, "2025-12-31", 2025, None)
+    add_fact(db, target, "interest_expense", "-10")
+
+    for metric, value in [
+        ("operating_income", "120"),
+        ("total_debt", "300"),
+        ("total_equity", "500"),
+        ("cash_and_equivalents", "50"),
+        ("goodwill", "40"),
+        ("intangible_assets", "10"),
+        ("operating_lease_liabilities", "30"),
+        ("effective_tax_rate", "24"),
+        ("revenue", "0"),
+        ("net_income", "20"),
+    ]:
+        add_fact(db, peer_1, metric, value)
+    add_fact(db, peer_1, "gross_investment", "900", "FY2023", 2023)
+
+    add_fact(db, peer_2, "revenue", "400", "FY2025", 2025, "FY", is_reported=False)
+    add_fact(db, peer_2, "free_cash_flow", "30", "FY2023", 2023)
+    add_fact(db, peer_2, "risk_free_rate", "0.03", "2025-06-30", 2025, None)
+    db.commit()
+    return [target, peer_1, peer_2]
+
+
+def test_batched_calculation_matches_per_metric_path():
+    cleanup_metric_test_artifacts()
+    db = SessionLocal()
+    try:
+        companies = seed_parity_universe(db)
+        service = MetricCalculationService()
+
+        with count_statements() as per_metric_statements:
+            expected = {
+                company.id: [
+                    service.calculate(db, company, metric, persist=False)
+                    for metric in METRIC_DEFINITIONS
+                ]
+                for company in companies
+            }
+
+        with count_statements() as batched_statements:
+            batched = service.calculate_universe(db, companies, persist=False)
+
+        for company in companies:
+            assert [asdict(result) for result in batched[company.id]] == [
+                asdict(result) for result in expected[company.id]
+            ]
+        assert {result.status for result in batched[companies[0].id]} == {"ok", "unavailable"}
+        assert len(batched_statements) == 1
+        assert len(per_metric_statements) > 50 * len(batched_statements)
+    finally:
+        db.close()
+        cleanup_metric_test_artifacts()
+
+
+def test_batched_calculation_persists_with_one_bulk_upsert():
+    cleanup_metric_test_artifacts()
+    db = SessionLocal()
+    try:
+        companies = seed_parity_universe(db)
+        service = MetricCalculationService()
+        first = service.calculate_universe(db, companies, persist=True)
+        stored_ids = {
+            (company_id, result.metric): result.id
+            for company_id, results in first.items()
+            for result in results
+        }
+        assert all(stored_ids.values())
+
+        with count_statements() as statements:
+            second = service.calculate_universe(db, companies, persist=True)
+        writes = [
+            statement
+            for statement in statements
+            if statement.lstrip().upper().startswith(("INSERT", "UPDATE"))
+        ]
+        assert len(writes) <= 1
+        assert {
+            (company_id, result.metric): result.id
+            for company_id, results in second.items()
+            for result in results
+        } == stored_ids
+
+        rows = db.scalars(
+            select(CalculatedMetric).where(
+                CalculatedMetric.company_id.in_([company.id for company in companies])
+            )
+        ).all()
+        assert len(rows) == len(companies) * len(METRIC_DEFINITIONS)
+        roic = next(
+            row
+            for row in rows
+            if row.company_id == companies[0].id and row.metric == "roic"
+        )
+        assert roic.calculation_trace["invested_capital_basis"] == (
+            "average_current_and_prior_period"
+        )
+    finally:
+        db.close()
+        cleanup_metric_test_artifacts()
+
+
 def test_calculated_metrics_are_persisted_with_trace():
     cleanup_metric_test_artifacts()
     db = SessionLocal()
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.services.cashflow_analytics import (
+    CashFlows,
+    money_weighted_return,
+    money_weighted_returns_by_key,
+    xirr,
+)
+
+
+def _bisection_xirr(flows: list[tuple[date, float]]) -> float | None:
+    origin = min(day for day, _ in flows)
+
+    def npv(rate: float) -> float:
+        return sum(value / ((1 + rate) ** ((day - origin).days / 365.0)) for day, value in flows)
+
+    low, high = -0.9999, 10.0
+    if npv(low) * npv(high) > 0:
+        return None
+    for _ in range(200):
+        middle = (low + high) / 2
+        if abs(npv(middle)) < 1e-8:
+            break
+        if npv(low) * npv(middle) <= 0:
+            high = middle
+        else:
+            low = middle
+    return middle
+
+
+def test_xirr_matches_bisection_on_random_ledgers():
+    rng = np.random.default_rng(12)
+    start = date(2016, 1, 4)
+    for _ in range(25):
+        count = int(rng.integers(2, 300))
+        offsets = np.sort(rng.integers(0, 3650, count))
+        amounts = -rng.uniform(100, 5_000, count)
+        amounts[rng.random(count) < 0.3] *= -0.5
+        days = [start + timedelta(days=int(offset)) for offset in offsets]
+        ending = float(-amounts.sum() * rng.uniform(0.6, 2.5))
+        flows = list(zip(days, amounts.tolist())) + [(date(2026, 1, 5), ending)]
+
+        expected = _bisection_xirr(flows)
+        actual = xirr(
+            np.array([day for day, _ in flows], dtype="datetime64[D]"),
+            np.array([value for _, value in flows]),
+        )
+
+        assert expected is not None and actual is not None
+        assert abs(actual - expected) < 1e-8
+
+
+def test_xirr_edge_cases_and_money_weighted_breakdowns():
+    days = np.array(["2025-01-01", "2026-01-01"], dtype="datetime64[D]")
+    assert abs(xirr(days, np.array([-100.0, 110.0])) - 0.1) < 1e-12
+    assert xirr(days, np.array([100.0, 110.0])) is None
+    assert xirr(days[:1], np.array([-100.0])) is None
+    # Same-day flows net out before solving.
+    assert abs(xirr(days[[0, 0, 1]], np.array([-60.0, -40.0, 121.0])) - 0.21) < 1e-12
+
+    flows = CashFlows.from_arrays(
+        np.array(["2025-01-01", "2025-01-01", "2025-07-01"], dtype="datetime64[D]"),
+        np.array([-100.0, -200.0, 50.0]),
+        np.array([1, 2, 1]),
+    )
+    by_key = money_weighted_returns_by_key(flows, {1: 60.0, 2: 180.0}, as_of=date(2026, 1, 1))
+    assert by_key[1] is not None and by_key[1] > 0
+    assert abs(by_key[2] - (-0.1)) < 1e-9
+
+    period = money_weighted_return(
+        np.array(["2025-01-01", "2025-06-01", "2026-01-01"], dtype="datetime64[D]"),
+        np.array([-999.0, -50.0, 0.0]),
+        start=date(2025, 1, 1),
+        end=date(2026, 1, 1),
+        start_value=1_000.0,
+        end_value=1_150.0,
+    )
+    # The opening flow belongs to the previous period; the June contribution counts.
+    assert period is not None and 0.09 < period < 0.1
+
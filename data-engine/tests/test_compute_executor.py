@@ -0,0 +1,120 @@
+import asyncio
+import operator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.compute import ComputeExecutor, open_compute_executor, run_blocking
+from routers import analytics
+
+
+def _slow_montecarlo(**kwargs):
+    """Pure-Python busy loop: holds the GIL of whichever process runs it."""
+    deadline = time.perf_counter() + 1.5
+    iterations = 0
+    while time.perf_counter() < deadline:
+        iterations += 1
+    return {"symbols": kwargs["symbols"], "iterations": iterations}
+
+
+class _DisconnectedRequest:
+    async def is_disconnected(self):
+        return True
+
+
+def test_long_montecarlo_does_not_stall_other_requests(monkeypatch):
+    import main
+    import modules.analytics_service as analytics_service
+
+    monkeypatch.setattr(analytics_service, "run_portfolio_montecarlo", _slow_montecarlo)
+    monkeypatch.setattr(analytics_service, "get_correlation_matrix", lambda **kw: {"pairs": []})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with open_compute_executor(ComputeExecutor(process_workers=1, thread_workers=2)) as compute:
+            app.state.compute = compute
+            yield
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(analytics.router)
+    app.add_api_route("/health/live", main.health_live)
+
+    with TestClient(app) as client, ThreadPoolExecutor(1) as background:
+        simulation = background.submit(client.post, "/analytics/montecarlo", json={"symbols": ["AAA"]})
+        deadline = time.perf_counter() + 30
+        while app.state.compute.metrics()["cpu"]["running"] == 0:
+            assert time.perf_counter() < deadline and not simulation.done()
+            time.sleep(0.01)
+
+        latencies = []
+        for index in range(100):
+            started = time.perf_counter()
+            if index % 10 == 0:
+                response = client.post("/analytics/correlation", json={"symbols": ["AAA", "BBB"]})
+            else:
+                response = client.get("/health/live")
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+        assert app.state.compute.metrics()["cpu"]["running"] == 1
+        assert np.percentile(latencies, 99) < 0.25
+
+        response = simulation.result(timeout=60)
+        assert response.status_code == 200
+        assert response.json()["iterations"] > 0
+        metrics = app.state.compute.metrics()
+        assert metrics["cpu"]["completed"] == 1
+        assert metrics["io"]["completed"] == 10
+        assert metrics["cpu"]["run_ms"]["p50"] >= 1500
+
+
+def test_tenant_limits_queue_per_tenant_and_cancellation_drops_queued_work(monkeypatch):
+    monkeypatch.setattr(analytics, "DISCONNECT_POLL_SECONDS", 0.01)
+    gate = threading.Event()
+    executor = ComputeExecutor(process_workers=0, thread_workers=4, tenant_concurrency=1)
+
+    async def scenario():
+        async with open_compute_executor(executor):
+            running = asyncio.create_task(run_blocking("cpu", "tenant-a", gate.wait, 10))
+            queued = asyncio.create_task(run_blocking("cpu", "tenant-a", operator.add, 1, 1))
+            await asyncio.sleep(0.05)
+            # Another tenant is not held up by tenant-a's queue.
+            assert await asyncio.wait_for(run_blocking("cpu", "tenant-b", operator.add, 2, 3), 1) == 5
+            assert executor.metrics()["cpu"]["queued"] == 1
+
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            assert executor.metrics()["cpu"]["queued"] == 0
+
+            # A client that disconnects abandons its call; the slot stays held
+            # until the running work ends.
+            with pytest.raises(HTTPException) as disconnected:
+                await analytics._compute(_DisconnectedRequest(), None, "io", gate.wait, 10)
+            assert disconnected.value.status_code == 499
+            assert executor.metrics()["io"]["running"] == 1
+
+            gate.set()
+            assert await running is True
+            await asyncio.sleep(0.05)
+            return executor.metrics()
+
+    metrics = asyncio.run(scenario())
+
+    assert metrics["cpu"] | {"wait_ms": None, "run_ms": None} == {
+        "workers": 4,
+        "queued": 0,
+        "running": 0,
+        "completed": 2,
+        "cancelled": 1,
+        "wait_ms": None,
+        "run_ms": None,
+    }
+    assert metrics["io"]["cancelled"] == 1
+    assert metrics["io"]["running"] == 0
+    assert executor.closed
@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.services.embedding_service import EmbeddingService
+
+
+class FakeModel:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.release = threading.Event()
+
+    def encode(self, texts, normalize_embeddings=False):
+        assert normalize_embeddings is True
+        self.release.wait(timeout=5)
+        self.calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def test_model_loads_once_and_concurrent_queries_share_encode_calls():
+    model = FakeModel()
+    loads: list[str] = []
+
+    def factory(name: str) -> FakeModel:
+        loads.append(name)
+        return model
+
+    service = EmbeddingService(model_factory=factory, max_batch_size=8, max_wait_seconds=0.05)
+    queries = [f"query {index}" for index in range(12)]
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        futures = [pool.submit(service.encode_query, query) for query in queries]
+        model.release.set()
+        vectors = [future.result() for future in futures]
+
+    assert loads == ["all-MiniLM-L6-v2"]
+    assert vectors == [[float(len(query)), 1.0] for query in queries]
+    assert sum(len(call) for call in model.calls) == len(queries)
+    assert len(model.calls) < len(queries)
+    assert max(len(call) for call in model.calls) <= 8
+    metrics = service.metrics()
+    assert metrics["model_loads"] == 1
+    assert metrics["batched_queries"] == len(queries)
+    assert metrics["mean_query_batch_size"] > 1
+
+
+def test_query_embeddings_are_cached_by_normalized_text():
+    model = FakeModel()
+    model.release.set()
+    service = EmbeddingService(model_factory=lambda _: model, query_cache_size=2, max_wait_seconds=0)
+
+    first = service.encode_query("gross  margin\ttrend")
+    second = service.encode_query(" gross margin trend ")
+    service.encode_query("capex")
+    service.encode_query("roic")
+    service.encode_query("gross margin trend")
+
+    assert first == second
+    assert model.calls == [["gross margin trend"], ["capex"], ["roic"], ["gross margin trend"]]
+    metrics = service.metrics()
+    assert metrics["query_cache_hits"] == 1
+    assert metrics["query_cache_misses"] == 4
+    assert metrics["query_cache_entries"] == 2
+    assert service.encode_documents(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert service.metrics()["max_batch_size"] == 2
@@ -204,6 +204,7 @@ def test_scheduler_jobs_are_single_instance_and_coalesced():
         "memory_consolidation",
         "thesis_review",
         "daily_research",
+        "search_vector_backfill",
     } <= jobs.keys()
     assert all(job.max_instances == 1 and job.coalesce for job in jobs.values())
 
@@ -220,3 +221,162 @@ def test_actor_dependency_failure_returns_structured_error(monkeypatch):
     assert result["status"] == "error"
     assert result["actor"] == "refresh_news"
     assert result["error"]["type"] == "ImportError"
+
+
+def test_sec_refresh_polls_companies_concurrently_at_the_throttle_rate(monkeypatch, tmp_path):
+    import time
+    from types import SimpleNamespace
+
+    from app.core.http_clients import HTTPClientRegistry, install_http_clients
+    from app.services import public_data_cache
+    from app.services.connectors import sec as sec_connector
+    from app.services.connectors.sec import SECResponseCache
+    from app.services.feed_ingestion_service import FeedIngestionService
+    from app.workers import dramatiq_app
+
+    in_flight = peak = 0
+    started: list[float] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        started.append(time.monotonic())
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.3)
+        in_flight -= 1
+        cik = request.url.path.rsplit("CIK", 1)[1].removesuffix(".json")
+        if cik.endswith("3"):
+            return httpx.Response(500)
+        return httpx.Response(
+            200,
+            json={
+                "name": f"Company {cik}",
+                "filings": {
+                    "recent": {
+                        "accessionNumber": [f"0000000000-26-{cik[-6:]}"],
+                        "form": ["10-K"],
+                        "primaryDocument": ["report.htm"],
+                        "filingDate": ["2026-02-01"],
+                    }
+                },
+            },
+        )
+
+    companies = [SimpleNamespace(ticker=f"C{index}", cik=str(index)) for index in range(12)]
+    written: list[str] = []
+    sent: list[tuple] = []
+
+    def ingest(self, db, result, *, ticker=None):
+        written.append(ticker)
+        if ticker == "C5":
+            raise RuntimeError("constraint violated")
+        return {"created": len(result.items)}
+
+    db = SimpleNamespace(close=lambda: None, rollback=lambda: None)
+    monkeypatch.setattr(dramatiq_app, "_session", lambda *_args: db)
+    monkeypatch.setattr(dramatiq_app, "_companies", lambda *_args: companies)
+    monkeypatch.setattr(FeedIngestionService, "ingest_news_result", ingest)
+    monkeypatch.setattr(
+        public_data_cache,
+        "default_public_data_cache",
+        lambda: public_data_cache.PublicDataCache(tmp_path / "public"),
+    )
+    monkeypatch.setattr(sec_connector, "default_sec_cache", lambda: SECResponseCache(tmp_path / "sec"))
+    monkeypatch.setattr(dramatiq_app.process_document, "send", lambda *args: sent.append(args))
+    monkeypatch.setattr(
+        dramatiq_app,
+        "install_http_clients",
+        lambda loop: install_http_clients(
+            loop, HTTPClientRegistry(transport=httpx.MockTransport(handler))
+        ),
+    )
+
+    dramatiq_app._close_worker_loop()
+    try:
+        began = time.monotonic()
+        result = dramatiq_app.refresh_sec_filings.fn(1, "worker")
+        elapsed = time.monotonic() - began
+    finally:
+        dramatiq_app._close_worker_loop()
+
+    # Sequential polling would take 12 x 0.3 s; the shared throttle spaces
+    # request starts at 1/8 s while responses overlap.
+    assert elapsed < 2.5
+    assert peak > 1
+    assert min(b - a for a, b in zip(started, started[1:])) >= 0.12
+    assert sorted(written) == sorted(company.ticker for company in companies)
+    assert result["status"] == "partial"
+    assert result["companies_processed"] == 10
+    assert result["news_ingested"] == 10
+    assert result["documents_queued"] == 10
+    assert {error["ticker"] for error in result["errors"]} == {"C3", "C5"}
+    assert all(args[3] == "SEC" and args[5:] == (1, "worker") for args in sent)
+
+
+def test_sec_cache_revalidates_with_etags_and_indexes_tickers_in_memory(monkeypatch, tmp_path):
+    import gzip
+    import json
+    from datetime import timedelta
+
+    from app.services.connectors import sec as sec_connector
+    from app.services.connectors.sec import SECResponseCache
+
+    tickers = {
+        "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+        "1": {"cik_str": 789019, "ticker": "MSFT", "title": "Microsoft Corp"},
+    }
+    facts = {"cik": 320193, "facts": {"us-gaap": {"Revenues": {"units": {"USD": [{"val": 1}] * 5000}}}}}
+    compressed_facts = gzip.compress(json.dumps(facts).encode())
+    seen: list[tuple[str, int]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        etag = f'"{request.url.path}-v1"'
+        if request.headers.get("if-none-match") == etag:
+            seen.append((request.url.path, 304))
+            return httpx.Response(304, headers={"etag": etag})
+        seen.append((request.url.path, 200))
+        if request.url.path.endswith("company_tickers.json"):
+            return httpx.Response(200, json=tickers, headers={"etag": etag})
+        assert request.headers["accept-encoding"] == "gzip"
+
+        async def body():
+            # Streamed in chunks, as from the network.
+            for start in range(0, len(compressed_facts), 4096):
+                yield compressed_facts[start : start + 4096]
+
+        return httpx.Response(
+            200,
+            content=body(),
+            headers={"etag": etag, "content-encoding": "gzip", "last-modified": "Fri, 16 Oct 2026 00:00:00 GMT"},
+        )
+
+    monkeypatch.setattr(sec_connector, "_ticker_indexes", {})
+    cache = SECResponseCache(tmp_path)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            sec = sec_connector.SECClient(http, cache=cache, requests_per_second=10)
+            ciks = [await sec.cik_for_ticker(ticker) for ticker in ("aapl", "MSFT", "NOPE", "AAPL")]
+            first = await sec.company_facts("320193")
+            cached = await sec.company_facts("320193")
+            # Past the TTL each payload is revalidated rather than downloaded.
+            monkeypatch.setitem(sec_connector.CACHE_TTL, "companyfacts", timedelta(0))
+            revalidated = await sec.company_facts("320193")
+            # A new client in the same process reuses the built index.
+            again = await sec_connector.SECClient(http, cache=cache).cik_for_ticker("MSFT")
+            return ciks, first, cached, revalidated, again, sec.cache_stats
+
+    ciks, first, cached, revalidated, again, stats = asyncio.run(scenario())
+
+    assert ciks == ["0000320193", "0000789019", None, "0000320193"]
+    assert again == "0000789019"
+    assert first == cached == revalidated == facts
+    assert seen == [
+        ("/files/company_tickers.json", 200),
+        ("/api/xbrl/companyfacts/CIK0000320193.json", 200),
+        ("/api/xbrl/companyfacts/CIK0000320193.json", 304),
+    ]
+    assert stats == {"downloaded": 2, "hit": 1, "not_modified": 1}
+    # The gzip body went to disk as received.
+    url = f"{sec_connector.SECClient.companyfacts_url}/CIK0000320193.json"
+    assert cache.body_path(url).read_bytes() == compressed_facts
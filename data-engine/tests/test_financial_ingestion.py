@@ -0,0 +1,169 @@
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import Company, FinancialFact, FinancialStatement, Tenant
+from app.services.analytics_warehouse import AnalyticsWarehouse
+from app.services.connectors.fmp import FMPClient
+from app.services.financial_ingestion_service import FinancialIngestionService
+
+
+class FakeFMP(FMPClient):
+    def __init__(self, revenue: dict[int, float], capex: float | None = -20.0) -> None:
+        super().__init__()
+        self.revenue = revenue
+        self.capex = capex
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _respond(self, payload):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return payload
+
+    def _periods(self, fields):
+        return [
+            {"date": f"{year}-12-31", "calendarYear": str(year), "period": "FY", **fields(year)}
+            for year in sorted(self.revenue, reverse=True)
+        ]
+
+    async def income_statement(self, ticker, limit=10):
+        return await self._respond(self._periods(lambda year: {"revenue": self.revenue[year]}))
+
+    async def balance_sheet(self, ticker, limit=10):
+        return await self._respond(
+            self._periods(lambda year: {"totalDebt": 50, "cashAndCashEquivalents": 10})
+        )
+
+    async def cash_flow(self, ticker, limit=10):
+        def fields(year):
+            row: dict[str, float] = {"operatingCashFlow": 40}
+            if self.capex is not None:
+                row["capitalExpenditure"] = self.capex
+            return row
+
+        return await self._respond(self._periods(fields))
+
+    async def ratios(self, ticker, limit=10):
+        return await self._respond([])
+
+    async def company_profile(self, ticker):
+        return await self._respond([{"beta": 1.1, "mktCap": 1000, "price": 0}])
+
+
+def _company() -> Company:
+    return Company(
+        ticker="DIFF",
+        name="Diff Co",
+        exchange="NASDAQ",
+        company_type="standard",
+        valuation_model="standard_dcf",
+        special_sources=[],
+        special_risks=[],
+        factor_tags=[],
+    )
+
+
+def _facts(db) -> dict[tuple[str, str, str], tuple[int, Decimal]]:
+    return {
+        (fact.source_type, fact.metric, fact.period): (fact.id, fact.value)
+        for fact in db.scalars(select(FinancialFact))
+    }
+
+
+def test_fmp_refresh_only_writes_changed_facts():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        tenant = Tenant(external_id="fmp-diff", name="FMP diff")
+        company = _company()
+        db.add_all([tenant, company])
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        service = FinancialIngestionService()
+
+        client = FakeFMP({2023: 100, 2024: 120})
+        first = asyncio.run(service.refresh_from_fmp(db, company, client=client))
+        assert client.peak == 5
+        assert first["facts_imported"] == 16
+        assert first["statements_imported"] == 6
+        assert len(first["changes"]["inserted"]) == 16
+        stored = _facts(db)
+        assert stored[("FMP", "free_cash_flow", "2024-12-31:FY")][1] == Decimal("20")
+        assert stored[("FMP", "revenue_growth", "2024-12-31:FY")][1] == Decimal("0.2")
+        assert {fact.tenant_id for fact in db.scalars(select(FinancialFact))} == {tenant.id}
+
+        again = asyncio.run(service.refresh_from_fmp(db, company, client=FakeFMP({2023: 100, 2024: 120})))
+        assert again["changes"] == {
+            "inserted": [],
+            "updated": [],
+            "deleted": [],
+            "unchanged": 16,
+            "metrics": [],
+        }
+        assert _facts(db) == stored
+
+        changed = asyncio.run(
+            service.refresh_from_fmp(db, company, client=FakeFMP({2023: 100, 2024: 150}, capex=None))
+        )
+        changes = changed["changes"]
+        after = _facts(db)
+        revenue_key = ("FMP", "revenue", "2024-12-31:FY")
+        growth_key = ("FMP", "revenue_growth", "2024-12-31:FY")
+        assert after[revenue_key] == (stored[revenue_key][0], Decimal("150"))
+        assert after[growth_key] == (stored[growth_key][0], Decimal("0.5"))
+        assert set(changes["updated"]) == {stored[revenue_key][0], stored[growth_key][0]}
+        assert set(changes["deleted"]) == {
+            stored[key][0]
+            for key in (
+                ("FMP", "capital_expenditure", "2023-12-31:FY"),
+                ("FMP", "capital_expenditure", "2024-12-31:FY"),
+                ("FMP", "free_cash_flow", "2024-12-31:FY"),
+                ("FMP", "fcf_margin", "2024-12-31:FY"),
+            )
+        }
+        assert changes["inserted"] == []
+        assert changes["metrics"] == [
+            "capital_expenditure",
+            "fcf_margin",
+            "free_cash_flow",
+            "revenue",
+            "revenue_growth",
+        ]
+        assert all(after[key][0] == stored[key][0] for key in after)
+        assert len(db.scalars(select(FinancialStatement)).all()) == 6
+
+
+def test_fmp_refresh_that_only_deletes_reaches_the_warehouse(tmp_path):
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    warehouse = AnalyticsWarehouse(tmp_path)
+    with Session(engine) as db:
+        tenant = Tenant(external_id="fmp-deletes", name="FMP deletes")
+        company = _company()
+        db.add_all([tenant, company])
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        service = FinancialIngestionService()
+        asyncio.run(service.refresh_from_fmp(db, company, client=FakeFMP({2023: 100, 2024: 120})))
+        warehouse.export(db)
+        assert warehouse.is_current(db, FinancialFact)
+
+        result = asyncio.run(
+            service.refresh_from_fmp(db, company, client=FakeFMP({2023: 100, 2024: 120}, capex=None))
+        )
+        changes = result["changes"]
+        assert changes["deleted"] and not changes["inserted"] and not changes["updated"]
+        assert not warehouse.is_current(db, FinancialFact)
+
+        summary = warehouse.export(db)
+        assert summary["tables"]["financial_facts"]["mode"] == "incremental"
+        with warehouse.connect(tenant.id) as connection:
+            exported = connection.execute("SELECT id FROM financial_facts ORDER BY id").fetchall()
+        assert [row[0] for row in exported] == sorted(_facts(db)[key][0] for key in _facts(db))
+        assert not set(changes["deleted"]) & {row[0] for row in exported}
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+
+from app.core.config import Settings
+from app.core.http_clients import HTTPClientRegistry, current_http_clients, open_http_clients
+from app.services.connectors.fmp import FMPClient
+from app.services.connectors.sec import SECClient
+from app.workers import dramatiq_app
+
+
+def test_connectors_share_one_pooled_client_per_host_and_respect_concurrency():
+    in_flight = 0
+    peak = 0
+    hosts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        hosts.append(request.url.host)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        if request.url.host == "financialmodelingprep.com":
+            return httpx.Response(200, json=[{"symbol": request.url.path.rsplit("/", 1)[-1]}])
+        return httpx.Response(200, json={"name": "Example", "filings": {"recent": {}}})
+
+    registry = HTTPClientRegistry(
+        transport=httpx.MockTransport(handler), concurrency={"fmp": 3}
+    )
+
+    async def scenario():
+        fmp = FMPClient()
+        fmp.settings = Settings(_env_file=None, fmp_api_key="test-key")
+        sec = SECClient(requests_per_second=10)
+        async with open_http_clients(registry):
+            assert current_http_clients() is registry
+            profiles = await asyncio.gather(
+                *(fmp.company_profile(f"T{index}") for index in range(40))
+            )
+            await sec.submissions("320193")
+            await sec.submissions("789019")
+            return profiles, registry.metrics()
+
+    profiles, metrics = asyncio.run(scenario())
+
+    assert [profile[0]["symbol"] for profile in profiles] == [f"T{index}" for index in range(40)]
+    assert metrics["hosts"] == ["https://data.sec.gov", "https://financialmodelingprep.com"]
+    assert metrics["requests"] == {"fmp": 40, "sec": 2}
+    assert metrics["peak_in_flight"]["fmp"] == 3
+    assert peak <= 3
+    assert hosts.count("data.sec.gov") == 2
+    assert registry.closed
+
+
+def test_worker_threads_reuse_one_loop_and_registry_across_messages():
+    async def registry():
+        return current_http_clients()
+
+    try:
+        first = dramatiq_app._run(registry())
+        assert first is not None
+        assert dramatiq_app._run(registry()) is first
+    finally:
+        dramatiq_app._close_worker_loop()
+    assert first.closed
+    # Outside a managed loop connectors fall back to short-lived clients.
+    assert asyncio.run(registry()) is None
+
+
+def test_tenant_hosts_share_one_external_client_without_cookies():
+    seen_cookies = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=tenant-a; Path=/"}, text="ok")
+
+    registry = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+
+    async def scenario():
+        async with open_http_clients(registry):
+            for index in range(50):
+                client = registry.client(f"https://ir{index}.example.com/feed")
+                await client.get(f"https://ir{index}.example.com/feed")
+            await registry.client("https://ir0.example.com").get("https://ir0.example.com/feed")
+            await registry.client("https://data.sec.gov").get("https://data.sec.gov/submissions")
+            return registry.metrics()
+
+    metrics = asyncio.run(scenario())
+
+    assert metrics["hosts"] == ["external", "https://data.sec.gov"]
+    assert seen_cookies == [None] * 52
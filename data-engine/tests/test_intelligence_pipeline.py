@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from app.core.database import Base
 from app.api.routes.sources import source_audits
 from app.llm.base import LLMProvider
-from app.llm.contracts import LLMRequest, LLMResponse, Message, Usage
+from app.llm.contracts import LLMRequest, LLMResponse, Message, StreamEvent, Usage
 from app.llm.routing import TaskModelRouter
 from app.models import (
     Company,
@@ -26,6 +26,7 @@ from app.models import (
 )
 from app.schemas import ChatResponse
 from app.services.alert_rule_service import AlertRuleService
+from app.services.chat_service import ChatService
 from app.services.chat_synthesis_service import ChatSynthesisService
 from app.services.kpi_extraction_service import KPIExtractionService
 from app.services.metric_semantics import MetricSemanticsRegistry
@@ -53,6 +54,24 @@ class StaticProvider(LLMProvider):
         )
 
 
+class StreamingProvider(StaticProvider):
+    """Local stand-in for a token-streaming provider with observable timing."""
+
+    def __init__(self, payload, log):
+        super().__init__(payload)
+        self.log = log
+
+    async def stream(self, request: LLMRequest):
+        self.log.append("provider_called")
+        response = await self.complete(request)
+        text = response.text
+        step = max(1, len(text) // 3)
+        for offset in range(0, len(text), step):
+            await asyncio.sleep(0.01)
+            yield StreamEvent(delta=text[offset : offset + step])
+        yield StreamEvent(response=response)
+
+
 def _company(ticker: str, company_type: str = "standard", tags=None) -> Company:
     return Company(
         ticker=ticker,
@@ -339,3 +358,41 @@ def test_chat_llm_synthesis_verifies_citations_and_falls_back_on_hallucination()
     assert invalid.model == "test-model" or invalid.model == "deterministic"
     assert invalid.llm_trace["fallback"] is True
     assert invalid.answer == "safe deterministic answer"
+
+
+def test_chat_stream_sends_baseline_before_tokens_and_ends_with_verified_response():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    log = []
+
+    async def collect(db, provider):
+        events = []
+        async for event in ChatService(provider).answer_stream(
+            db, "What changed in the portfolio?", "portfolio", None
+        ):
+            log.append(event["event"])
+            events.append(event)
+        return events
+
+    with Session(engine) as db:
+        def payload(request):
+            sources = json.loads(request.messages[1].content)["allowed_source_ids"]
+            return _chat_payload(sources[0] if sources else "none")
+
+        events = asyncio.run(collect(db, StreamingProvider(payload, log)))
+
+    # Baseline goes out before the provider is even asked for tokens.
+    assert log[:2] == ["baseline", "provider_called"]
+    assert [event["event"] for event in events][-1] == "final"
+    tokens = [event["data"]["delta"] for event in events if event["event"] == "token"]
+    assert len(tokens) >= 3
+    assert len(json.loads("".join(tokens))["sections"]) == 7
+    baseline = events[0]["data"]
+    assert baseline["model"] == "deterministic"
+    assert "sources" in baseline
+    final = events[-1]["data"]
+    assert ChatResponse.model_validate(final)
+    assert final["llm_trace"]["streaming"] is True
+    # No financial facts in an empty database: verification rejects the model
+    # citations or caps confidence, but the stream always closes with a response.
+    assert final["confidence"] <= 0.75
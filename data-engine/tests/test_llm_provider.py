@@ -253,6 +253,52 @@ def test_openai_compatible_completion_and_structured_output_use_mock_http():
     assert len(requests) == 1
 
 
+def test_openai_compatible_stream_yields_deltas_then_full_response():
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        assert payload["stream"] is True
+        assert payload["stream_options"] == {"include_usage": True}
+        events = [
+            ": OPENROUTER PROCESSING",
+            json.dumps({"id": "req-2", "model": "m", "choices": [{"delta": {"role": "assistant"}}]}),
+            json.dumps({"id": "req-2", "choices": [{"delta": {"content": "Margins "}}]}),
+            json.dumps({"id": "req-2", "choices": [{"delta": {"content": "expanded."}, "finish_reason": "stop"}]}),
+            json.dumps({"id": "req-2", "choices": [], "usage": {"prompt_tokens": 9, "completion_tokens": 3}}),
+            "[DONE]",
+        ]
+        body = "".join(
+            f"{event}\n\n" if event.startswith(":") else f"data: {event}\n\n" for event in events
+        )
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = OpenAICompatibleProvider(
+                api_key="test-secret",
+                base_url="https://llm.example/v1",
+                default_model="default",
+                client=client,
+                max_retries=0,
+            )
+            return [
+                event
+                async for event in provider.stream(
+                    LLMRequest(messages=[Message("user", "Summarize the quarter")])
+                )
+            ]
+
+    events = run(scenario())
+
+    assert [event.delta for event in events[:-1]] == ["Margins ", "expanded."]
+    final = events[-1].response
+    assert final is not None
+    assert final.text == "Margins expanded."
+    assert final.model == "m"
+    assert final.finish_reason == "stop"
+    assert final.request_id == "req-2"
+    assert (final.usage.input_tokens, final.usage.output_tokens, final.usage.total_tokens) == (9, 3, 12)
+
+
 def test_anthropic_messages_adapter_uses_mock_http():
     def handler(request: httpx.Request) -> httpx.Response:
         payload = json.loads(request.content)
@@ -0,0 +1,161 @@
+import multiprocessing
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from quantstats.montecarlo import clear_calibration_cache, run_models
+from quantstats.montecarlo.models.block_bootstrap import BlockBootstrap
+from quantstats.montecarlo.models.garch import GARCH
+
+MODELS = ["gbm", "bootstrap", "block_bootstrap", "garch", "heston"]
+
+
+def _returns() -> pd.Series:
+    rng = np.random.default_rng(21)
+    index = pd.bdate_range("2021-01-01", periods=750)
+    return pd.Series(rng.standard_t(5, len(index)) * 0.01 + 0.0004, index=index, name="PORT")
+
+
+def _assert_identical(left, right):
+    assert list(left) == list(right)
+    for name in left:
+        np.testing.assert_array_equal(left[name].sim_returns, right[name].sim_returns)
+
+
+def test_process_pool_and_cached_runs_match_serial_bit_for_bit():
+    clear_calibration_cache()
+    returns = _returns()
+    serial = run_models(returns, models=MODELS, horizon=126, sims=300, seed=7, cache=False)
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        parallel = run_models(returns, models=MODELS, horizon=126, sims=300, seed=7, executor=executor)
+    cached = run_models(returns, models=MODELS, horizon=126, sims=300, seed=7)
+
+    _assert_identical(serial, parallel)
+    _assert_identical(serial, cached)
+    assert cached["garch"].fitted_model is parallel["garch"].fitted_model
+    assert cached["garch"].calibration_summary() == serial["garch"].calibration_summary()
+
+
+def test_calibration_cache_skips_fits_until_returns_or_drift_change(monkeypatch):
+    clear_calibration_cache()
+    fits = []
+    for model in (GARCH, BlockBootstrap):
+        calibrate = model.calibrate
+        monkeypatch.setattr(
+            model,
+            "calibrate",
+            lambda self, returns, calibrate=calibrate: fits.append(self.name) or calibrate(self, returns),
+        )
+    returns = _returns()
+    options = {"models": ["garch", "block_bootstrap"], "horizon": 20, "sims": 50}
+
+    run_models(returns, seed=1, **options)
+    run_models(returns, seed=2, **options)
+    assert fits == ["garch", "block_bootstrap"]
+
+    run_models(returns, seed=1, drift="zero", **options)
+    assert len(fits) == 4
+    run_models(returns.iloc[1:], seed=1, **options)
+    assert len(fits) == 6
+    run_models(returns, seed=1, cache=False, **options)
+    assert len(fits) == 8
+
+
+def test_streamed_statistics_match_full_paths_in_o_sims_memory():
+    returns = _returns()
+    models = ["gbm", "bootstrap", "garch"]
+    options = {"models": models, "horizon": 252, "sims": 2_000, "seed": 3, "bust": -0.2, "goal": 0.1}
+    full = run_models(returns, **options)
+    # One chunk covering every path consumes the generator exactly as the full run.
+    streamed = run_models(returns, keep_paths=False, chunk_sims=2_000, fan_paths=2_000, **options)
+    for name in models:
+        assert streamed[name].sim_returns is None
+        np.testing.assert_array_equal(streamed[name].terminal_values(), full[name].terminal_values())
+        assert streamed[name].summary == full[name].summary
+        for ours, theirs in zip(streamed[name].fan_chart(), full[name].fan_chart(), strict=True):
+            np.testing.assert_allclose(ours, theirs, rtol=1e-12)
+
+    chunked = run_models(returns, keep_paths=False, chunk_sims=300, fan_paths=500, dtype=np.float32, **options)
+    again = run_models(returns, keep_paths=False, chunk_sims=300, fan_paths=500, dtype=np.float32, **options)
+    np.testing.assert_array_equal(chunked["garch"].terminal_values(), again["garch"].terminal_values())
+    assert chunked["garch"].terminal_values().dtype == np.float32
+    assert chunked["garch"].statistics.sample_paths.shape == (252, 500)
+    assert abs(chunked["gbm"].summary["cagr_median"] - full["gbm"].summary["cagr_median"]) < 0.02
+
+    horizon, sims = 504, 20_000
+    tracemalloc.start()
+    try:
+        run_models(returns, models=["gbm"], horizon=horizon, sims=sims, seed=1, keep_paths=False, chunk_sims=500, fan_paths=0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < horizon * sims * 8 / 10
+
+
+def test_legacy_montecarlo_permutes_in_one_batch_and_matches_pandas_statistics():
+    import quantstats as qs
+    from quantstats._montecarlo import run_montecarlo
+
+    returns = _returns()
+    mc = run_montecarlo(returns, sims=200, bust=-0.1, goal=0.3, seed=3)
+    assert mc._data is None
+    assert mc.paths.shape == (750, 200)
+    np.testing.assert_array_equal(mc.paths[:, 0], (1 + returns.to_numpy()).cumprod() - 1)
+    growth = mc.paths + 1
+    shuffled = np.vstack([growth[0], growth[1:] / growth[:-1]]) - 1
+    np.testing.assert_allclose(
+        np.sort(shuffled, axis=0),
+        np.sort(np.tile(returns.to_numpy()[:, None], 200), axis=0),
+        atol=1e-12,
+    )
+    assert not np.allclose(shuffled[:, 1], shuffled[:, 2])
+
+    np.testing.assert_array_equal(
+        run_montecarlo(returns, sims=200, seed=3).paths, mc.paths
+    )
+    assert mc._data is None
+
+    # The previous DataFrame implementation, on the same paths.
+    data = mc.data
+    terminal = data.iloc[-1]
+    maxdd = pd.Series(
+        {col: ((data[col] + 1) / (data[col] + 1).cummax() - 1).min() for col in data.columns}
+    )
+    assert mc.stats["median"] == terminal.median()
+    assert mc.stats["percentile_25"] == terminal.quantile(0.25)
+    np.testing.assert_allclose(mc.stats["std"], terminal.std())
+    np.testing.assert_allclose(mc.max_drawdowns, maxdd.to_numpy(), rtol=1e-12)
+    assert mc.bust_probability == (maxdd <= -0.1).sum() / 200
+    assert mc.goal_probability == (terminal >= 0.3).sum() / 200
+    pd.testing.assert_series_equal(mc.percentile(50), data.quantile(0.5, axis=1))
+    lower, upper = mc.confidence_band(0.9)
+    pd.testing.assert_series_equal(upper, data.quantile(0.95, axis=1))
+    pd.testing.assert_series_equal(mc.original, data["sim_0"].rename("original"))
+
+    sharpe = qs.stats.montecarlo_sharpe(returns, sims=200, seed=3)
+    sim_returns = (data + 1).pct_change().dropna()
+    expected = sim_returns.mean() / sim_returns.std() * np.sqrt(252)
+    np.testing.assert_allclose(sharpe["mean"], expected.mean(), rtol=1e-9)
+    np.testing.assert_allclose(sharpe["percentile_5"], expected.quantile(0.05), rtol=1e-9)
+    cagr = qs.stats.montecarlo_cagr(returns, sims=200, seed=3)
+    np.testing.assert_allclose(cagr["median"], ((1 + terminal) ** (252 / 750) - 1).median())
+
+
+def test_montecarlo_result_still_accepts_the_dataframe_keywords():
+    from quantstats._montecarlo import MonteCarloResult, run_montecarlo
+
+    mc = run_montecarlo(_returns(), sims=50, bust=-0.1, goal=0.3, seed=3)
+    original = mc.original
+    legacy = MonteCarloResult(data=mc.data, original=original, bust_threshold=-0.1, goal_threshold=0.3)
+
+    assert legacy.data is mc.data
+    assert legacy.original is original
+    np.testing.assert_array_equal(legacy.paths, mc.paths)
+    assert legacy.stats == mc.stats
+    assert legacy.maxdd == mc.maxdd
+    assert legacy.bust_probability == mc.bust_probability
+    assert legacy.goal_probability == mc.goal_probability
+    np.testing.assert_array_equal(MonteCarloResult(mc.data).paths, mc.paths)
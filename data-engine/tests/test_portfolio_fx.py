@@ -1,13 +1,31 @@
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
-from sqlalchemy import create_engine, select
+import numpy as np
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import Session
 
 from app.core.database import Base
 from app.models import Company, Position
-from app.services.portfolio_fx_service import PortfolioFXService
+from app.services.portfolio_fx_service import FXCurve, PortfolioFXService
 from app.services.portfolio_ledger_service import PortfolioLedgerService
+from app.services.portfolio_snapshot_service import PortfolioSnapshotService
+
+
+def _company(ticker: str, currency: str = "USD") -> Company:
+    return Company(
+        ticker=ticker,
+        name=f"{ticker} Company",
+        exchange="NYSE",
+        currency=currency,
+        sector="Test",
+        industry="Test",
+        company_type="generic",
+        valuation_model="dcf",
+        special_sources=[],
+        special_risks=[],
+        factor_tags=[],
+    )
 
 
 def test_portfolio_uses_historical_cost_fx_and_current_market_fx():
@@ -119,3 +137,95 @@ def test_portfolio_does_not_silently_convert_without_an_fx_rate():
         assert position.market_value_native == Decimal("2000")
         assert position.market_value_base is None
         assert position.cost_basis_base is None
+
+
+def test_fx_curve_resolves_direct_inverse_and_cross_rates_as_of():
+    curve = FXCurve(
+        [
+            ("EUR", "USD", date(2026, 1, 2), Decimal("0.90")),
+            ("EUR", "USD", date(2026, 2, 2), Decimal("0.80")),
+            ("GBP", "EUR", date(2026, 1, 10), Decimal("0.8")),
+            ("USD", "JPY", date(2026, 1, 5), Decimal("0.0065")),
+        ]
+    )
+
+    assert curve.rate(quote_currency="usd", base_currency="EUR", as_of=date(2026, 1, 1)) is None
+    assert curve.rate(quote_currency="USD", base_currency="EUR", as_of=date(2026, 2, 1)) == Decimal("0.90")
+    assert curve.rate(quote_currency="USD", base_currency="EUR", as_of=date(2026, 3, 1)) == Decimal("0.80")
+    assert curve.rate(quote_currency="GBP", base_currency="EUR", as_of=date(2026, 1, 10)) == Decimal("1.25")
+    # USD -> EUR -> GBP when no USD/GBP quote exists.
+    assert curve.rate(quote_currency="USD", base_currency="GBP", as_of=date(2026, 2, 2)) == Decimal("0.80") * Decimal("0.8")
+    # JPY has no EUR leg, so it cannot be crossed into EUR.
+    assert curve.rate(quote_currency="JPY", base_currency="EUR", as_of=date(2026, 2, 2)) is None
+
+    probes = [date(2026, 1, 1) + timedelta(days=offset) for offset in range(0, 60, 3)]
+    for quote, base in (("USD", "EUR"), ("EUR", "USD"), ("GBP", "USD"), ("JPY", "USD"), ("JPY", "EUR")):
+        expected = [curve.rate(quote_currency=quote, base_currency=base, as_of=day) for day in probes]
+        np.testing.assert_allclose(
+            curve.rates(quote_currency=quote, base_currency=base, days=np.array(probes, dtype="datetime64[D]")),
+            [np.nan if value is None else float(value) for value in expected],
+            equal_nan=True,
+        )
+
+
+def test_fx_curve_loads_once_per_session_and_refreshes_after_upserts():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    fx_queries = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "fx_rates" in statement:
+            fx_queries.append(statement)
+
+    with Session(engine) as db:
+        fx = PortfolioFXService()
+        fx.set_base_currency(db, "EUR")
+        fx.upsert_rate(
+            db,
+            base_currency="EUR",
+            quote_currency="USD",
+            rate=Decimal("0.90"),
+            rate_date=date(2026, 1, 2),
+            source="test",
+        )
+        ledger = PortfolioLedgerService()
+        for index in range(6):
+            db.add(_company(f"FXS{index}"))
+            db.flush()
+            ledger.create_transaction(
+                db,
+                ticker=f"FXS{index}",
+                action="buy",
+                quantity=Decimal("1"),
+                price=Decimal("100"),
+                trade_date=date(2026, 1, 2) + timedelta(days=index),
+                currency="USD",
+            )
+        db.commit()
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as db:
+            today = date.today()
+            snapshot = PortfolioSnapshotService().capture(db, as_of=today)
+            captured = len(fx_queries)
+            positions_value = snapshot.positions_value_base
+            fx.upsert_rate(
+                db,
+                base_currency="EUR",
+                quote_currency="USD",
+                rate=Decimal("0.50"),
+                rate_date=today,
+                source="test",
+            )
+            refreshed = fx.rate(db, quote_currency="USD", base_currency="EUR", as_of=today)
+            db.rollback()
+            rolled_back = fx.rate(db, quote_currency="USD", base_currency="EUR", as_of=today)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Six positions, one quote table read.
+    assert captured == 1
+    assert positions_value == Decimal("540")
+    assert refreshed == Decimal("0.50")
+    assert rolled_back == Decimal("0.90")
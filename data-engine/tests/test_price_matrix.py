@@ -0,0 +1,128 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import Company, MarketPrice
+from app.services.price_matrix import (
+    PriceMatrix,
+    drawdowns,
+    pairwise_correlations,
+    weighted_returns,
+)
+
+
+def _company(ticker: str) -> Company:
+    return Company(
+        ticker=ticker,
+        name=f"{ticker} Co",
+        exchange="TEST",
+        currency="USD",
+        sector="Test",
+        industry="Test",
+        company_type="standard",
+        valuation_model="standard_dcf",
+        special_sources=[],
+        special_risks=[],
+        factor_tags=[],
+    )
+
+
+def test_returns_follow_each_series_across_gaps_and_skip_non_positive_bases():
+    day = date(2026, 1, 1)
+    rows = [
+        (1, day, 100.0),
+        (1, day + timedelta(days=1), 110.0),
+        (1, day + timedelta(days=3), 99.0),
+        (2, day + timedelta(days=1), 0.0),
+        (2, day + timedelta(days=2), 5.0),
+        (2, day + timedelta(days=3), 6.0),
+    ]
+    matrix = PriceMatrix.from_rows(list(reversed(rows)), [1, 2])
+
+    returns = matrix.returns()
+
+    assert matrix.dates.tolist() == [day + timedelta(days=offset) for offset in range(4)]
+    np.testing.assert_allclose(returns[:, 0], [np.nan, 0.1, np.nan, -0.1], equal_nan=True)
+    np.testing.assert_allclose(returns[:, 1], [np.nan, np.nan, np.nan, 0.2], equal_nan=True)
+    # A zero first price leaves the total return undefined, as before.
+    np.testing.assert_allclose(matrix.total_returns(), [-0.01, np.nan], equal_nan=True)
+
+    values, present = weighted_returns(returns, np.array([0.75, 0.25]))
+    assert present.tolist() == [False, True, False, True]
+    np.testing.assert_allclose(values[present], [0.1, 0.75 * -0.1 + 0.25 * 0.2])
+    np.testing.assert_allclose(drawdowns(np.array([0.1, -0.2, 0.05])), [0, -0.2, -0.16])
+
+
+def test_pairwise_correlations_match_numpy_on_shared_dates():
+    rng = np.random.default_rng(5)
+    returns = rng.normal(0, 0.02, (250, 4))
+    returns[::3, 1] = np.nan
+    returns[:248, 2] = np.nan
+    returns[:, 3] = 0.01
+
+    correlations = pairwise_correlations(returns)
+
+    shared = ~np.isnan(returns[:, 0]) & ~np.isnan(returns[:, 1])
+    expected = np.corrcoef(returns[shared, 0], returns[shared, 1])[0, 1]
+    assert abs(correlations[0, 1] - expected) < 1e-12
+    assert correlations[1, 0] == correlations[0, 1]
+    # Two shared observations and a constant series are both undefined.
+    assert np.isnan(correlations[0, 2]) and np.isnan(correlations[0, 3])
+    assert np.diag(correlations).tolist() == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_load_uses_one_query_and_refreshes_after_new_prices():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "market_prices" in statement:
+            statements.append(statement)
+
+    with Session(engine) as db:
+        companies = [_company(f"PM{index}") for index in range(3)]
+        db.add_all(companies)
+        db.flush()
+        start = date(2026, 1, 1)
+        db.add_all(
+            MarketPrice(
+                company_id=company.id,
+                date=start + timedelta(days=offset),
+                adj_close=Decimal(100 + offset + index),
+            )
+            for index, company in enumerate(companies)
+            for offset in range(5)
+        )
+        db.commit()
+        ids = [company.id for company in companies]
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            first = PriceMatrix.load(db, ids, start=start)
+            loads = len(statements)
+            assert PriceMatrix.load(db, ids, start=start) is first
+            cached = len(statements) - loads
+            db.add(
+                MarketPrice(
+                    company_id=companies[0].id,
+                    date=start + timedelta(days=5),
+                    adj_close=Decimal("120"),
+                )
+            )
+            db.commit()
+            refreshed = PriceMatrix.load(db, ids, start=start)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    # One watermark lookup plus one price query; a cache hit only checks the watermark.
+    assert loads == 2
+    assert cached == 1
+    assert first.prices.shape == (5, 3)
+    assert refreshed.prices.shape == (6, 3)
+    assert refreshed.prices[-1].tolist()[0] == 120.0
+    assert np.isnan(refreshed.prices[-1, 1:]).all()
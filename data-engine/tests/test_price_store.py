@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from modules.price_store import PriceStore, _normalize, period_start
+
+
+class FakeDownloader:
+    """Serves bars from an in-memory history and records every request."""
+
+    def __init__(self, history: dict[str, pd.DataFrame]):
+        self.history = history
+        self.calls: list[tuple[tuple[str, ...], date]] = []
+
+    def __call__(self, symbols, start, end):
+        self.calls.append((tuple(symbols), start))
+        window = {}
+        for symbol in symbols:
+            frame = self.history.get(symbol)
+            if frame is not None:
+                selected = frame[(frame.index >= pd.Timestamp(start)) & (frame.index < pd.Timestamp(end))]
+                if not selected.empty:
+                    window[symbol] = selected
+        return window
+
+
+def _bars(closes: np.ndarray, dates: pd.DatetimeIndex) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Open": closes, "High": closes * 1.01, "Low": closes * 0.99, "Close": closes, "Volume": 1_000.0},
+        index=dates,
+    )
+
+
+def test_store_fetches_only_new_bars_and_reloads_restated_history(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=300)
+    rng = np.random.default_rng(5)
+    full = {
+        symbol: _bars(100 * np.cumprod(1 + rng.normal(0, 0.01, len(dates))), dates)
+        for symbol in ("AAA", "BBB")
+    }
+    downloader = FakeDownloader({symbol: frame.iloc[:250] for symbol, frame in full.items()})
+    now = [0.0]
+    store = PriceStore(tmp_path, downloader=downloader, refresh_after=3600, clock=lambda: now[0])
+
+    closes = store.closes(["AAA", "BBB", "MISSING"], date(2024, 1, 1))
+    assert downloader.calls == [(("AAA", "BBB", "MISSING"), date(2024, 1, 1))]
+    assert list(closes.columns) == ["AAA", "BBB"]
+    assert len(closes) == 250
+    np.testing.assert_array_equal(closes["AAA"].to_numpy(), full["AAA"]["Close"].iloc[:250].to_numpy())
+
+    # Within refresh_after nothing is downloaded, and unknown symbols stay cached as misses.
+    store.closes(["AAA", "BBB", "MISSING"], date(2024, 3, 1))
+    assert len(downloader.calls) == 1
+
+    # Once stale, only bars from the last stored day onward are requested.
+    now[0] = 7200.0
+    downloader.history = full
+    last_stored = dates[249].date()
+    closes = store.closes(["AAA", "BBB"], date(2024, 1, 1))
+    assert downloader.calls[1] == (("AAA", "BBB"), last_stored)
+    assert len(downloader.calls) == 2
+    assert len(closes) == 300
+    np.testing.assert_array_equal(closes["BBB"].to_numpy(), full["BBB"]["Close"].to_numpy())
+
+    # A dividend adjustment moves the overlap bar, so the whole series is reloaded.
+    now[0] = 14_400.0
+    restated = full["AAA"].copy()
+    restated[["Open", "High", "Low", "Close"]] *= 0.98
+    downloader.history = {**full, "AAA": restated}
+    closes = store.closes(["AAA", "BBB"], date(2024, 1, 1))
+    assert downloader.calls[2] == (("AAA", "BBB"), dates[-1].date())
+    assert downloader.calls[3] == (("AAA",), date(2024, 1, 1))
+    np.testing.assert_allclose(closes["AAA"].to_numpy(), restated["Close"].to_numpy())
+
+    # Earlier history than stored triggers a full fetch from the new start.
+    store.closes(["BBB"], date(2023, 6, 1))
+    assert downloader.calls[4] == (("BBB",), date(2023, 6, 1))
+
+
+def test_range_reads_are_end_exclusive_and_aligned(tmp_path):
+    dates = pd.bdate_range("2025-01-01", periods=40)
+    downloader = FakeDownloader(
+        {
+            "AAA": _bars(np.arange(40, dtype=float) + 1, dates),
+            "BBB": _bars(np.arange(20, dtype=float) + 100, dates[20:]),
+        }
+    )
+    store = PriceStore(tmp_path, downloader=downloader)
+    store.refresh(["AAA", "BBB"], date(2025, 1, 1))
+
+    window = store.read(["BBB", "AAA"], start=dates[15].date(), end=dates[25].date())
+    assert list(window.columns) == ["BBB", "AAA"]
+    assert window.index[0] == dates[15] and window.index[-1] == dates[24]
+    assert window["BBB"].isna().sum() == 5
+    assert window["AAA"].iloc[0] == 16.0
+
+    bars = store.bars("BBB", start=dates[30].date())
+    assert list(bars.columns) == ["open", "high", "low", "close", "volume"]
+    assert len(bars) == 10 and bars["volume"].eq(1_000.0).all()
+    assert period_start("6mo", date(2025, 8, 31)) == date(2025, 2, 28)
+
+
+def test_concurrent_writes_of_one_symbol_never_publish_a_torn_file(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=500)
+    store = PriceStore(tmp_path, downloader=FakeDownloader({}))
+    frames = [
+        _normalize(_bars(np.full(len(dates), float(100 + index)), dates)) for index in range(8)
+    ]
+
+    def write(frame):
+        store._write_bars("AAA", frame, append=False)
+        store._write_metadata("AAA", {"close": float(frame["close"].iloc[0])})
+        return store.bars("AAA")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for bars in pool.map(write, frames * 4):
+            assert len(bars) == len(dates)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["AAA.json", "AAA.parquet"]
+
+
+def test_first_refresh_without_bars_creates_the_store_directory(tmp_path):
+    root = tmp_path / "prices"
+    store = PriceStore(root, downloader=FakeDownloader({}))
+
+    assert store.closes(["NOPE"], date(2024, 1, 1)).empty
+    assert (root / "NOPE.json").exists()
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+from collections import Counter
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+
+from app.core.http_clients import HTTPClientRegistry, install_http_clients, open_http_clients
+from app.services import public_data_cache
+from app.services.connectors import sec as sec_connector
+from app.services.connectors.sec import SECResponseCache
+from app.services.feed_ingestion_service import FeedIngestionService
+from app.services.market_refresh_service import ECBFXProvider, PublicPriceProvider
+from app.services.public_data_cache import RETENTION, PublicDataCache
+from app.workers import dramatiq_app
+
+ECB_DOCUMENT = """<?xml version="1.0"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01"
+    xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+  <Cube><Cube time="2026-10-16">
+    <Cube currency="USD" rate="1.10"/>
+    <Cube currency="GBP" rate="0.85"/>
+  </Cube></Cube>
+</gesmes:Envelope>"""
+
+
+def _provider(requests: Counter):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests[request.url.host] += 1
+        if request.url.host == "www.ecb.europa.eu":
+            return httpx.Response(200, text=ECB_DOCUMENT)
+        if request.url.host == "financialmodelingprep.com":
+            return httpx.Response(200, json=[{"price": 101.5}])
+        cik = request.url.path.rsplit("CIK", 1)[1].removesuffix(".json")
+        return httpx.Response(
+            200,
+            json={
+                "name": f"Company {cik}",
+                "filings": {
+                    "recent": {
+                        "accessionNumber": [f"0000000000-26-{cik[-6:]}"],
+                        "form": ["8-K"],
+                        "primaryDocument": ["release.htm"],
+                        "filingDate": ["2026-10-15"],
+                    }
+                },
+            },
+        )
+
+    return handler
+
+
+def test_cache_is_content_addressed_and_skips_failed_payloads(tmp_path):
+    cache = PublicDataCache(tmp_path)
+    calls = Counter()
+
+    async def fetcher(name, payload):
+        calls[name] += 1
+        return payload
+
+    async def scenario():
+        first = await cache.fetch("rss", "a", lambda: fetcher("a", {"items": [1, 2]}))
+        again = await cache.fetch("rss", "a", lambda: fetcher("a", {"items": [3]}))
+        await cache.fetch("rss", "b", lambda: fetcher("b", {"items": [1, 2]}))
+        await cache.fetch(
+            "rss", "c", lambda: fetcher("c", {"status": "error"}), cacheable=lambda p: p["status"] != "error"
+        )
+        await cache.fetch(
+            "rss", "c", lambda: fetcher("c", {"status": "error"}), cacheable=lambda p: p["status"] != "error"
+        )
+        expired = await cache.fetch(
+            "rss", "a", lambda: fetcher("a", {"items": [4]}), max_age=timedelta(0)
+        )
+        refreshed = await cache.refreshing().fetch("rss", "b", lambda: fetcher("b", {"items": [5]}))
+        return first, again, expired, refreshed
+
+    first, again, expired, refreshed = asyncio.run(scenario())
+
+    assert first == again == {"items": [1, 2]}
+    assert expired == {"items": [4]}
+    assert refreshed == {"items": [5]}
+    assert calls == {"a": 2, "b": 2, "c": 2}
+    # "a" and "b" once shared {"items": [1, 2]}; now both point elsewhere.
+    assert len(list((tmp_path / "objects").rglob("*.json"))) == 3
+    assert len(list((tmp_path / "refs" / "rss").glob("*.json"))) == 2
+    assert cache.hits["rss"] == 1
+
+
+def test_prune_removes_replaced_and_expired_objects(tmp_path):
+    cache = PublicDataCache(tmp_path)
+    cache.put("rss", "a", {"items": [1]})
+    cache.put("rss", "a", {"items": [2]})
+    cache.put("rss", "b", {"items": [2]})
+    cache.put("prices", "old", {"price": 1})
+    old_ref = cache._ref_path("prices", "old")
+    ref = json.loads(old_ref.read_text())
+    ref["fetched_at"] = (datetime.now(UTC) - RETENTION - timedelta(minutes=1)).isoformat()
+    old_ref.write_text(json.dumps(ref))
+    # A writer that died before its replace.
+    leftover = old_ref.with_name(f".{old_ref.name}.dead.tmp")
+    leftover.write_text("{")
+    expired = (datetime.now(UTC) - RETENTION - timedelta(minutes=1)).timestamp()
+    os.utime(leftover, (expired, expired))
+
+    assert len(list((tmp_path / "objects").rglob("*.json"))) == 3
+    assert cache.prune() == {"refs": 1, "objects": 2}
+
+    objects = list((tmp_path / "objects").rglob("*.json"))
+    assert [json.loads(path.read_bytes()) for path in objects] == [{"items": [2]}]
+    assert cache.get("rss", "a", max_age=RETENTION) == {"items": [2]}
+    assert cache.get("rss", "b", max_age=RETENTION) == {"items": [2]}
+    assert cache.prune() == {"refs": 0, "objects": 0}
+    assert not leftover.exists()
+
+
+def test_concurrent_readers_share_one_fetch(tmp_path):
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"value": calls}
+
+    async def scenario():
+        # Separate instances stand in for separate workers sharing the directory.
+        return await asyncio.gather(
+            *(PublicDataCache(tmp_path).fetch("sec", "CIK1", slow) for _ in range(5))
+        )
+
+    assert asyncio.run(scenario()) == [{"value": 1}] * 5
+    assert calls == 1
+
+
+def test_provider_requests_stay_constant_as_tenants_grow(monkeypatch, tmp_path):
+    monkeypatch.setenv("FMP_API_KEY", "test-key")
+    requests: Counter = Counter()
+    companies = [
+        SimpleNamespace(ticker=f"T{index}", cik=str(100 + index), ir_url=None, name=f"T{index} Inc")
+        for index in range(6)
+    ]
+    cache = PublicDataCache(tmp_path / "public")
+
+    async def market_refresh(public_data):
+        async with open_http_clients(HTTPClientRegistry(transport=httpx.MockTransport(_provider(requests)))):
+            observations, errors = await PublicPriceProvider(public_data).fetch(
+                companies, as_of=date(2026, 10, 16)
+            )
+            rates = await ECBFXProvider(public_data).fetch(base_currency="EUR", quote_currencies={"USD"})
+            return observations, errors, rates
+
+    asyncio.run(market_refresh(cache.refreshing()))
+    assert requests == {"financialmodelingprep.com": 6, "www.ecb.europa.eu": 1}
+    for _ in range(4):
+        observations, errors, rates = asyncio.run(market_refresh(cache))
+        assert errors == []
+        assert {observation.price for observation in observations.values()} == {101.5}
+        assert str(rates.rates["USD"]) == "0.9090909090909090909090909091"
+    assert requests == {"financialmodelingprep.com": 6, "www.ecb.europa.eu": 1}
+
+    # Feeds: the global refresh fetches, tenant actors only ingest.
+    ingested: list[tuple[str, int]] = []
+
+    def ingest(self, db, result, *, ticker=None):
+        ingested.append((ticker, len(result.items)))
+        return {"created": len(result.items)}
+
+    db = SimpleNamespace(close=lambda: None, rollback=lambda: None)
+    monkeypatch.setattr(dramatiq_app, "_session", lambda *_args: db)
+    monkeypatch.setattr(dramatiq_app, "_companies", lambda *_args: companies)
+    monkeypatch.setattr(FeedIngestionService, "ingest_news_result", ingest)
+    monkeypatch.setattr(dramatiq_app.process_document, "send", lambda *args: None)
+    monkeypatch.setattr(public_data_cache, "default_public_data_cache", lambda: cache)
+    monkeypatch.setattr(sec_connector, "default_sec_cache", lambda: SECResponseCache(tmp_path / "sec"))
+    monkeypatch.setattr(
+        dramatiq_app,
+        "install_http_clients",
+        lambda loop: install_http_clients(
+            loop, HTTPClientRegistry(transport=httpx.MockTransport(_provider(requests)))
+        ),
+    )
+
+    dramatiq_app._close_worker_loop()
+    try:
+        warmed = dramatiq_app._run(dramatiq_app._warm_public_data(db, "sec", cache.refreshing()))
+        assert warmed == {"resources": 6, "errors": []}
+        assert requests["data.sec.gov"] == 6
+        for tenant_id in range(1, 9):
+            result = dramatiq_app.refresh_sec_filings.fn(tenant_id, f"user-{tenant_id}")
+            assert result["status"] == "ok"
+            assert result["documents_queued"] == 6
+    finally:
+        dramatiq_app._close_worker_loop()
+
+    assert requests["data.sec.gov"] == 6
+    assert len(ingested) == 8 * 6
@@ -0,0 +1,221 @@
+import hashlib
+import threading
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import (
+    Company,
+    Document,
+    DocumentChunk,
+    KnowledgeChunk,
+    KnowledgeDocument,
+    ChunkEmbedding,
+    Tenant,
+)
+from app.services.embedding_service import EmbeddingService
+from app.services.embedding_store import ChunkEmbeddingStore
+from app.services.rag import RAGIndex
+
+
+class FakeModel:
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+
+    def encode(self, texts, normalize_embeddings=False):
+        self.encoded.extend(texts)
+        vectors = np.zeros((len(texts), RAGIndex.vector_size))
+        for row, text in enumerate(texts):
+            slot = int(hashlib.sha256(text.encode()).hexdigest(), 16) % RAGIndex.vector_size
+            vectors[row, slot] = 1.0
+        return vectors
+
+
+class RecordingQdrant:
+    """In-memory Qdrant that serialises calls and records upsert concurrency."""
+
+    def __init__(self) -> None:
+        self.client = QdrantClient(location=":memory:")
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls: dict[str, int] = {}
+
+    def __getattr__(self, name):
+        target = getattr(self.client, name)
+        if not callable(target):
+            return target
+
+        def call(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if name != "upsert":
+                with self.lock:
+                    return target(*args, **kwargs)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                time.sleep(0.01)
+                with self.lock:
+                    return target(*args, **kwargs)
+            finally:
+                self.active -= 1
+
+        return call
+
+
+def _company(ticker: str) -> Company:
+    return Company(
+        ticker=ticker,
+        name=f"{ticker} Co",
+        exchange="TEST",
+        currency="USD",
+        sector="Test",
+        industry="Test",
+        company_type="standard",
+        valuation_model="standard_dcf",
+        special_sources=[],
+        special_risks=[],
+        factor_tags=[],
+    )
+
+
+def test_rebuild_tenant_streams_batches_into_in_memory_qdrant():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    qdrant = RecordingQdrant()
+    index = RAGIndex(client=qdrant)  # type: ignore[arg-type]
+    index.embeddings = EmbeddingService(model_factory=lambda _: FakeModel(), max_wait_seconds=0)
+    index.rebuild_batch_size = 3
+    index.rebuild_upsert_workers = 2
+
+    with Session(engine) as db:
+        tenant = Tenant(external_id="rag-rebuild", name="RAG rebuild")
+        db.add(tenant)
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        company = _company("RAGX")
+        db.add(company)
+        db.flush()
+        kept_point_id = str(uuid.uuid4())
+        for number in range(4):
+            document = Document(
+                company_id=company.id if number % 2 == 0 else None,
+                title=f"Filing {number}",
+                source_type="sec_filing",
+            )
+            db.add(document)
+            db.flush()
+            for chunk_index in range(3):
+                db.add(
+                    DocumentChunk(
+                        document_id=document.id,
+                        chunk_index=chunk_index,
+                        text=f"filing {number} section {chunk_index} on pricing power",
+                        qdrant_point_id=kept_point_id if number == chunk_index == 0 else None,
+                    )
+                )
+        knowledge = KnowledgeDocument(title="Letters", document_type="book")
+        db.add(knowledge)
+        db.flush()
+        for chunk_index in range(2):
+            db.add(
+                KnowledgeChunk(
+                    knowledge_document_id=knowledge.id,
+                    chunk_index=chunk_index,
+                    content=f"principle {chunk_index}: margin of safety",
+                    page_number=chunk_index + 1,
+                )
+            )
+        db.commit()
+
+        index._ensure_collection(qdrant)  # type: ignore[arg-type]
+        qdrant.upsert(
+            collection_name=index.collection_name,
+            points=[
+                PointStruct(id=str(uuid.uuid4()), vector=[1.0] * 384, payload={"tenant_id": 999}),
+                PointStruct(id=str(uuid.uuid4()), vector=[1.0] * 384, payload={"tenant_id": tenant.id}),
+            ],
+        )
+        qdrant.max_active = 0
+
+        result = index.rebuild_tenant(db)
+
+        assert result["errors"] == []
+        assert result["chunks_indexed"] == 14
+        assert result["documents"] == 4
+        assert result["knowledge_documents"] == 1
+        assert result["chunks_per_second"] > 0
+        assert qdrant.calls["upsert"] == 1 + 4 + 1
+        assert 1 < qdrant.max_active <= 2
+        assert qdrant.calls["collection_exists"] == 1
+        assert result["embeddings_computed"] == 14
+        assert qdrant.client.count(index.collection_name).count == 15
+
+        point_ids = db.scalars(select(DocumentChunk.qdrant_point_id)).all()
+        point_ids += db.scalars(select(KnowledgeChunk.qdrant_point_id)).all()
+        assert None not in point_ids
+        assert kept_point_id in point_ids
+        stored = qdrant.client.retrieve(index.collection_name, ids=point_ids, with_payload=True)
+        assert len(stored) == 14
+        assert {point.payload["ticker"] for point in stored if point.payload.get("document_id")} == {
+            "RAGX",
+            None,
+        }
+
+        hits = index.search("filing 1 section 2 on pricing power", tenant_id=tenant.id, limit=1)
+        assert hits[0]["entity_type"] == "document_chunk"
+        assert hits[0]["title"] == "Filing 1"
+        assert qdrant.calls["collection_exists"] == 1
+
+
+def test_rebuild_after_qdrant_wipe_reuses_stored_embeddings_across_tenants():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    qdrant = RecordingQdrant()
+    model = FakeModel()
+    index = RAGIndex(client=qdrant)  # type: ignore[arg-type]
+    index.embeddings = EmbeddingService(model_factory=lambda _: model, max_wait_seconds=0)
+
+    with Session(engine) as db:
+        first = Tenant(external_id="rag-store-a", name="Store A")
+        second = Tenant(external_id="rag-store-b", name="Store B")
+        db.add_all([first, second])
+        db.flush()
+        documents = {}
+        for tenant in (first, second):
+            db.info["tenant_id"] = tenant.id
+            document = Document(title="10-K", source_type="sec_filing")
+            db.add(document)
+            db.flush()
+            for chunk_index, text in enumerate(["Same filing text.", f"Notes for {tenant.external_id}."]):
+                db.add(DocumentChunk(document_id=document.id, chunk_index=chunk_index, text=text))
+            db.commit()
+            documents[tenant.id] = document
+
+        for tenant in (first, second):
+            db.info["tenant_id"] = tenant.id
+            assert index.ingest_document(db, documents[tenant.id])["chunks_indexed"] == 2
+        assert model.encoded == ["Same filing text.", "Notes for rag-store-a.", "Notes for rag-store-b."]
+
+        qdrant.client.delete_collection(index.collection_name)
+        index._forget_collection()
+        db.info["tenant_id"] = first.id
+        result = index.rebuild_tenant(db)
+
+        assert result["chunks_indexed"] == 2
+        assert result["embeddings_computed"] == 0
+        assert result["embeddings_reused"] == 2
+        assert len(model.encoded) == 3
+        stored = db.scalars(select(ChunkEmbedding)).all()
+        assert len(stored) == 3
+        assert {row.model for row in stored} == {"all-MiniLM-L6-v2"}
+        assert all(len(row.vector) == 4 * RAGIndex.vector_size for row in stored)
+        assert ChunkEmbeddingStore.unpack(stored[0].vector) == FakeModel().encode(
+            ["Same filing text."]
+        )[0].tolist()
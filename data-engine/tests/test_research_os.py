@@ -1,3 +1,4 @@
+import json
 from decimal import Decimal
 from uuid import uuid4
 
@@ -6,9 +7,12 @@ from fastapi.testclient import TestClient
 from sqlalchemy import delete, or_, select
 
 import main
+from app.api.routes import chat as chat_route
 from app.core.database import SessionLocal, init_db
+from app.llm import DisabledProvider
 from app.models import Company, ExternalClaim, FinancialFact, MemoryItem, NewsEvent, ThesisChange
 from app.seed import seed
+from app.services.chat_service import ChatService
 from app.services.manual_transcript_import_service import ManualTranscriptImportService
 from app.services.source_auditor import SourceAuditor
 from app.valuation import DCFInputs, ReverseDCFInputs, run_dcf, solve_required_growth
@@ -176,6 +180,31 @@ def test_research_api_core_flow():
     assert "ASTS" in chat.json()["answer"]
 
 
+def test_chat_stream_endpoint_emits_sse_and_ndjson_phases(monkeypatch):
+    seed()
+    monkeypatch.setattr(chat_route, "ChatService", lambda: ChatService(DisabledProvider("test")))
+    client = TestClient(main.app)
+    payload = {"question": "Que pasa con MSFT?", "ticker": "MSFT", "scope": "company"}
+
+    with client.stream("POST", "/api/chat/stream", json=payload) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in response.read().decode().split("\n\n") if frame]
+    names = [frame.splitlines()[0].removeprefix("event: ") for frame in frames]
+    assert names[0] == "baseline"
+    assert names[-1] == "final"
+    final = json.loads(frames[-1].splitlines()[1].removeprefix("data: "))
+    assert final["llm_trace"]["fallback"] is True
+    assert "MSFT" in final["answer"]
+
+    ndjson = client.post("/api/chat/stream?format=ndjson", json=payload)
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in ndjson.text.splitlines()]
+    # A disabled provider fails before its first token, so no token events.
+    assert [event["event"] for event in events] == ["baseline", "final"]
+    assert events[0]["data"]["sources"] == events[-1]["data"]["sources"]
+
+
 def test_memory_api_tracks_claims_evidence_sections_and_sessions():
     seed()
     client = TestClient(main.app)
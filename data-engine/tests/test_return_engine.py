@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -49,3 +50,64 @@ def test_symbol_only_returns_equal_weight_history(monkeypatch, prices):
     assert "error" not in result
     assert result["nav"][0] > 100
     assert result["twr"] > 0
+
+
+def _loop_replay(tx_frame, prices, symbols):
+    # The per-day ledger loop the vectorized replay replaced.
+    cash = 0.0
+    shares = {symbol: 0.0 for symbol in symbols}
+    nav_values, flow_values = [], []
+    for date in prices.index:
+        day_flow = 0.0
+        day_txs = tx_frame[tx_frame["date"].dt.normalize() == date.normalize()]
+        for _, tx in day_txs.iterrows():
+            amount = float(tx["quantity"]) * float(tx["price"])
+            if tx["type"] == "buy":
+                shares[tx["symbol"]] = shares.get(tx["symbol"], 0.0) + float(tx["quantity"])
+                day_flow += amount
+            elif tx["type"] == "sell":
+                shares[tx["symbol"]] = shares.get(tx["symbol"], 0.0) - float(tx["quantity"])
+                cash += amount
+        market_value = 0.0
+        for symbol, qty in shares.items():
+            if symbol in prices.columns and np.isfinite(prices.loc[date, symbol]):
+                market_value += qty * float(prices.loc[date, symbol])
+        nav_values.append(max(0.0, market_value + cash))
+        flow_values.append(day_flow)
+    return nav_values, flow_values
+
+
+def test_vectorized_replay_is_bit_identical_to_the_ledger_loop(monkeypatch):
+    rng = np.random.default_rng(21)
+    dates = pd.date_range("2023-01-02", periods=90, freq="B")
+    symbols = ["AAA", "BBB", "CCC", "DDD"]
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + rng.normal(0, 0.02, (len(dates), 3)), axis=0),
+        index=dates,
+        columns=symbols[:3],
+    )
+    prices.iloc[:10, 2] = np.nan  # CCC lists late; DDD never has prices.
+    transactions = [
+        {
+            "symbol": symbols[int(rng.integers(0, 4))].lower(),
+            "type": ["buy", "buy", "sell", "dividend"][int(rng.integers(0, 4))],
+            "quantity": round(float(rng.uniform(0.1, 7)), 3),
+            "price": round(float(rng.uniform(50, 150)), 2),
+            # Calendar days, so some trades land on weekends and are skipped.
+            "date": str((dates[0] + pd.Timedelta(days=int(rng.integers(0, 130)))).date()),
+        }
+        for _ in range(400)
+    ]
+    monkeypatch.setattr(return_engine, "_fetch_prices", lambda symbols, start, end=None: prices)
+    monkeypatch.setattr(return_engine, "_period_start", lambda period: dates[5])
+
+    result = return_engine.compute_portfolio_returns(transactions=transactions, period="1y")
+
+    tx_frame = pd.DataFrame(transactions)
+    tx_frame["symbol"] = tx_frame["symbol"].str.upper().str.strip()
+    tx_frame["date"] = pd.to_datetime(tx_frame["date"])
+    nav, flows = return_engine._replay_ledger(tx_frame, prices, symbols)
+    expected_nav, expected_flows = _loop_replay(tx_frame, prices, symbols)
+    assert nav.tolist() == expected_nav
+    assert flows.tolist() == expected_flows
+    assert result["nav"] == [round(value, 6) for value in expected_nav[5:]]
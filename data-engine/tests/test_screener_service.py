@@ -1,7 +1,8 @@
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 
 import pytest
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, delete, select, update
 from sqlalchemy.orm import Session
 
 from app.core.database import Base
@@ -9,9 +10,12 @@ from app.models import (
     CalculatedMetric,
     Company,
     FinancialFact,
+    MarketPrice,
     ResearchAlert,
+    SavedScreenMatch,
     Tenant,
 )
+from app.services.company_change_service import CompanyChangeService
 from app.services.screener_service import (
     CustomMetricService,
     SafeFormula,
@@ -182,3 +186,218 @@ def test_ranking_dependencies_are_included_in_result_quality():
         assert missing_result["coverage_percent"] == 50
         assert missing_result["missing_fields"] == ["quality_score"]
         assert response["results"][0]["ticker"] == "COMP"
+
+
+def _fact_quarter(db: Session, company: Company, metric: str, value: str, year: int, quarter: str) -> None:
+    db.add(
+        FinancialFact(
+            company_id=company.id,
+            metric=metric,
+            value=Decimal(value),
+            unit="USD",
+            period=f"{quarter}-{year}",
+            fiscal_year=year,
+            fiscal_quarter=quarter,
+            source_type="sec_filing",
+            confidence=Decimal("0.80"),
+        )
+    )
+
+
+def test_columnar_engine_matches_row_by_row_screen():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        other = Tenant(external_id="screen-other", name="Other tenant")
+        tenant = Tenant(external_id="screen-parity", name="Screen parity")
+        db.add_all([other, tenant])
+        db.flush()
+        companies = [_company(f"P{index:03d}") for index in range(24)]
+        db.add_all(companies)
+        db.flush()
+
+        db.info["tenant_id"] = other.id
+        _metric(db, companies[0], "roic", "0.99")
+        _metric(db, companies[0], "wacc", "0.01")
+        db.flush()
+
+        db.info["tenant_id"] = tenant.id
+        for index, company in enumerate(companies):
+            if index % 5 != 4:
+                _metric(db, company, "roic", str(Decimal("0.05") + Decimal(index) / 100))
+            if index % 3:
+                _metric(db, company, "wacc", "0.08")
+            if index % 4 == 0:
+                _metric(db, company, "net_debt_to_ebitda", str(index % 3))
+            if index % 7:
+                _fact(db, company, "free_cash_flow", str(10 + index), 2020)
+                _fact(db, company, "free_cash_flow", str(12 + 2 * index), 2025)
+                _fact_quarter(db, company, "free_cash_flow", "9", 2025, "Q2")
+            if index % 6:
+                _fact(db, company, "shares_diluted", "100", 2020)
+                _fact(db, company, "shares_diluted", str(100 + index % 4), 2025)
+            if index % 9 == 0:
+                _fact(db, company, "gross_margin", "0.5", 2025)
+        db.commit()
+
+        custom = CustomMetricService()
+        custom.create(
+            db,
+            metric_key="roic_spread",
+            name="ROIC spread",
+            formula="roic - wacc",
+            unit="decimal",
+            description="ROIC less WACC",
+        )
+        custom.create(
+            db,
+            metric_key="quality_score",
+            name="Quality score",
+            formula="max(roic_spread, 0) * 10 + abs(min(fcf_per_share_cagr, 0.5)) - -1",
+            unit="score",
+            description="Chained custom metric",
+        )
+        criteria = [
+            {"left": "roic_spread", "operator": ">", "right": "0.02"},
+            {"left": "fcf_per_share_cagr", "operator": ">=", "right": "wacc / 2"},
+            {"left": "shares_cagr", "operator": "<", "right": "0.01"},
+            {"left": "free_cash_flow_cagr", "operator": "!=", "right": "0"},
+        ]
+
+        service = ScreenerService()
+        for ranking_formula, direction in (
+            ("quality_score", "desc"),
+            ("roic ** 2 + gross_margin", "asc"),
+            (None, "desc"),
+        ):
+            columnar = service.run(
+                db,
+                criteria=criteria,
+                ranking_formula=ranking_formula,
+                ranking_direction=direction,
+            )
+            rowwise = service.run_rowwise(
+                db,
+                criteria=criteria,
+                ranking_formula=ranking_formula,
+                ranking_direction=direction,
+            )
+            assert columnar == rowwise
+
+        assert columnar["company_count"] == len(companies)
+        assert 0 < columnar["match_count"] < len(companies)
+        other_tenant_company = next(row for row in columnar["results"] if row["ticker"] == "P000")
+        assert "wacc" in other_tenant_company["missing_fields"]
+        assert any(row["missing_fields"] for row in columnar["results"])
+
+
+def test_incremental_saved_screen_only_reevaluates_changed_companies():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        tenant = Tenant(external_id="screen-incremental", name="Screen incremental")
+        db.add(tenant)
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        companies = [_company(f"I{index:02d}") for index in range(6)]
+        db.add_all(companies)
+        db.flush()
+        for index, company in enumerate(companies):
+            _metric(db, company, "roic", "0.20" if index % 2 == 0 else "0.05")
+        db.commit()
+        service = ScreenerService()
+        screen = service.create_screen(
+            db,
+            name="High ROIC",
+            description="",
+            criteria=[{"left": "roic", "operator": ">", "right": "0.10"}],
+            ranking_formula="roic",
+            ranking_direction="desc",
+            alerts_enabled=True,
+        )
+
+        first = service.run_saved(db, screen, incremental=True)
+        assert first["evaluation_mode"] == "full"
+        assert first["match_count"] == 3
+
+        stale = datetime.now(UTC) - timedelta(days=1)
+        for model in (CalculatedMetric, FinancialFact, MarketPrice, Company):
+            db.execute(update(model).values(updated_at=stale))
+        db.commit()
+        assert service.run_saved(db, screen, incremental=True)["evaluated_company_count"] == 0
+
+        gained, lost = companies[1], companies[2]
+        for company, value in ((gained, "0.30"), (lost, "0.01")):
+            metric = db.scalar(select(CalculatedMetric).where(CalculatedMetric.company_id == company.id))
+            assert metric is not None
+            metric.value = Decimal(value)
+        db.commit()
+
+        incremental = service.run_saved(db, screen, incremental=True)
+        assert incremental["evaluation_mode"] == "incremental"
+        assert incremental["evaluated_company_count"] == 2
+        assert incremental["new_match_company_ids"] == [gained.id]
+        active = set(
+            db.scalars(
+                select(SavedScreenMatch.company_id).where(SavedScreenMatch.active.is_(True))
+            ).all()
+        )
+        full = service.run(db, criteria=screen.criteria, ranking_formula="roic")
+        assert active == {row["company_id"] for row in full["results"] if row["matched"]}
+        assert incremental["match_count"] == len(active) == 3
+        assert len(db.scalars(select(ResearchAlert)).all()) == 4
+
+        screen.criteria = [{"left": "roic", "operator": ">", "right": "0.25"}]
+        db.commit()
+        rerun = service.run_saved(db, screen, incremental=True)
+        assert rerun["evaluation_mode"] == "full"
+        assert rerun["match_count"] == 1
+
+
+def test_deleted_facts_mark_companies_changed():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        tenant = Tenant(external_id="screen-deletions", name="Screen deletions")
+        db.add(tenant)
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        companies = [_company(f"D{index:02d}") for index in range(6)]
+        db.add_all(companies)
+        db.flush()
+        for company in companies:
+            _metric(db, company, "roic", "0.20")
+            _fact(db, company, "free_cash_flow", "10", 2024)
+        _fact(db, companies[0], "free_cash_flow", "8", 2023)
+        db.commit()
+        service = ScreenerService()
+        screen = service.create_screen(
+            db,
+            name="Deletions",
+            description="",
+            criteria=[{"left": "roic", "operator": ">", "right": "0.10"}],
+            ranking_formula="roic",
+            ranking_direction="desc",
+            alerts_enabled=False,
+        )
+        service.run_saved(db, screen, incremental=True)
+
+        stale = datetime.now(UTC) - timedelta(days=1)
+        for model in (CalculatedMetric, FinancialFact, MarketPrice, Company):
+            db.execute(update(model).values(updated_at=stale))
+        db.commit()
+
+        partial, emptied = companies[0], companies[1]
+        deleted = db.scalars(
+            delete(FinancialFact)
+            .where(FinancialFact.company_id.in_([partial.id, emptied.id]), FinancialFact.fiscal_year == 2024)
+            .returning(FinancialFact.company_id)
+        ).all()
+        CompanyChangeService().record_deletions(db, deleted)
+        db.commit()
+
+        since = datetime.now(UTC) - timedelta(hours=1)
+        assert CompanyChangeService().changed_company_ids(db, since) == {partial.id, emptied.id}
+        rerun = service.run_saved(db, screen, incremental=True)
+        assert rerun["evaluation_mode"] == "incremental"
+        assert rerun["evaluated_company_count"] == 2
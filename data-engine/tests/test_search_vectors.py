@@ -0,0 +1,80 @@
+"""PostgreSQL-only checks for the stored search_vector columns.
+
+Runs against a database migrated to head, e.g. the CI migration job:
+
+    CAVAAI_TEST_POSTGRES_URL=postgresql+psycopg://... python -m pytest tests/test_search_vectors.py
+"""
+
+import os
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, delete, text
+from sqlalchemy.orm import Session
+
+from app.models import Document, DocumentChunk, Tenant
+from app.services.search_vector_service import SearchVectorService
+from app.services.universal_search_service import UniversalSearchService
+
+
+POSTGRES_URL = os.getenv("CAVAAI_TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="CAVAAI_TEST_POSTGRES_URL is not set")
+
+
+def test_backfilled_search_vector_is_served_by_gin_index():
+    engine = create_engine(str(POSTGRES_URL))
+    with Session(engine) as db:
+        tenant = Tenant(external_id=f"search-vector-{uuid4().hex}", name="Search vectors")
+        db.add(tenant)
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        document = Document(title="Vector filing", source_type="sec_filing")
+        db.add(document)
+        db.flush()
+        try:
+            db.add_all(
+                DocumentChunk(
+                    document_id=document.id,
+                    chunk_index=index,
+                    text=f"Segment {index} shows pricing power and margin resilience.",
+                )
+                for index in range(200)
+            )
+            db.commit()
+            # Emulate rows written before the migration added the trigger.
+            db.execute(
+                text("UPDATE document_chunks SET search_vector = NULL WHERE document_id = :id"),
+                {"id": document.id},
+            )
+            db.commit()
+            SearchVectorService.invalidate()
+            assert "document_chunks" not in SearchVectorService().ready_tables(db)
+
+            result = SearchVectorService().backfill(db, batch_size=64)
+
+            assert result["tables"]["document_chunks"] >= 200
+            assert "document_chunks" in SearchVectorService().ready_tables(db)
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = "\n".join(
+                db.scalars(
+                    text(
+                        "EXPLAIN SELECT id FROM document_chunks "
+                        "WHERE search_vector @@ websearch_to_tsquery('simple', 'pricing power')"
+                    )
+                ).all()
+            )
+            assert "ix_document_chunks_search_vector" in plan
+            db.rollback()
+
+            response = UniversalSearchService().search(
+                db, "pricing power", entity_types={"document_chunk"}, include_vector=False
+            )
+            assert response["retrieval"]["lexical_ranker"] == "ts_rank_cd"
+            assert response["results"]
+            assert all(row["title"] == "Vector filing" for row in response["results"])
+        finally:
+            db.rollback()
+            db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document.id))
+            db.execute(delete(Document).where(Document.id == document.id))
+            db.execute(delete(Tenant).where(Tenant.id == tenant.id))
+            db.commit()
@@ -0,0 +1,117 @@
+import json
+import zipfile
+from decimal import Decimal
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import Company, Document, FinancialFact, Tenant
+from app.services.financial_ingestion_service import FinancialIngestionService
+
+
+def _company(ticker: str, cik: str | None) -> Company:
+    return Company(
+        ticker=ticker,
+        name=f"{ticker} Inc",
+        exchange="NASDAQ",
+        cik=cik,
+        company_type="standard",
+        valuation_model="standard_dcf",
+        special_sources=[],
+        special_risks=[],
+        factor_tags=[],
+    )
+
+
+def _annual(values: dict[int, float]) -> list[dict]:
+    return [
+        {"end": f"{year}-12-31", "fy": year, "fp": "FY", "form": "10-K", "val": value}
+        for year, value in values.items()
+    ] + [{"end": "2024-06-30", "fy": 2024, "fp": "Q2", "form": "10-Q", "val": 1}]
+
+
+def _companyfacts(revenue: dict[int, float], capex: dict[int, float]) -> dict:
+    return {
+        "facts": {
+            "us-gaap": {
+                "Revenues": {"units": {"USD": _annual(revenue)}},
+                "PaymentsToAcquirePropertyPlantAndEquipment": {"units": {"USD": _annual(capex)}},
+                "EarningsPerShareDiluted": {"units": {"USD/shares": _annual({2024: 2.5})}},
+            }
+        }
+    }
+
+
+def test_archive_ingestion_writes_known_companies_in_batches(tmp_path):
+    archive_path = tmp_path / "companyfacts.zip"
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("CIK0000000001.json", json.dumps(_companyfacts({2023: 100, 2024: 120}, {2024: 30})))
+        archive.writestr("CIK0000000002.json", json.dumps(_companyfacts({2024: 50}, {})))
+        archive.writestr("CIK0000000003.json", json.dumps(_companyfacts({2024: 900}, {})))
+        archive.writestr("README.txt", "not a filer")
+
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        tenant, other = Tenant(external_id="sec-bulk", name="SEC bulk"), Tenant(external_id="other", name="O")
+        alpha, beta, unlisted = _company("ALFA", "0000000001"), _company("BETA", "2"), _company("NOCK", None)
+        db.add_all([tenant, other, alpha, beta, unlisted])
+        db.flush()
+        db.add_all(
+            [
+                FinancialFact(
+                    tenant_id=tenant.id, company_id=alpha.id, metric="revenue", value=Decimal("100"),
+                    period="2024-12-31:FY", source_type="FMP",
+                ),
+                FinancialFact(
+                    tenant_id=tenant.id, company_id=alpha.id, metric="revenue", value=Decimal("1"),
+                    period="2022-12-31:FY", source_type="SEC",
+                ),
+                FinancialFact(
+                    tenant_id=other.id, company_id=alpha.id, metric="revenue", value=Decimal("7"),
+                    period="2022-12-31:FY", source_type="SEC",
+                ),
+            ]
+        )
+        db.commit()
+        db.info["tenant_id"] = tenant.id
+
+        service = FinancialIngestionService()
+        result = service.ingest_companyfacts_archive(db, archive_path, batch_size=1)
+        again = service.ingest_companyfacts_archive(db, archive_path)
+
+        for summary in (result, again):
+            assert summary["members"] == 3
+            assert summary["companies"] == 2
+            assert summary["facts_imported"] == 6
+            assert summary["conflicts"] == {"ALFA": ["revenue:2024-12-31:FY FMP=100 SEC=120 diff=20.0%"]}
+
+        facts = db.scalars(
+            select(FinancialFact)
+            .where(FinancialFact.source_type == "SEC")
+            .order_by(FinancialFact.company_id, FinancialFact.metric, FinancialFact.period)
+        ).all()
+        assert [(fact.company_id, fact.metric, fact.period, fact.value) for fact in facts] == [
+            (alpha.id, "capital_expenditure", "2024-12-31:FY", Decimal("-30")),
+            (alpha.id, "eps_diluted", "2024-12-31:FY", Decimal("2.5")),
+            (alpha.id, "revenue", "2023-12-31:FY", Decimal("100")),
+            (alpha.id, "revenue", "2024-12-31:FY", Decimal("120")),
+            (beta.id, "eps_diluted", "2024-12-31:FY", Decimal("2.5")),
+            (beta.id, "revenue", "2024-12-31:FY", Decimal("50")),
+        ]
+        assert {fact.tenant_id for fact in facts} == {tenant.id}
+        assert all(fact.confidence == Decimal("0.95") and fact.created_at is not None for fact in facts)
+
+        other_facts = db.scalars(
+            select(FinancialFact)
+            .where(FinancialFact.tenant_id == other.id)
+            .execution_options(include_all_tenants=True)
+        ).all()
+        assert [fact.value for fact in other_facts] == [Decimal("7")]
+
+        documents = db.scalars(select(Document).order_by(Document.title)).all()
+        assert [document.title for document in documents] == ["SEC XBRL facts - ALFA", "SEC XBRL facts - BETA"]
+        assert documents[0].metadata_["cik"] == "0000000001"
+        assert documents[0].metadata_["conflicts"] == result["conflicts"]["ALFA"]
+        assert {fact.source_id for fact in facts} == {document.id for document in documents}
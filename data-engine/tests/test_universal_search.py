@@ -1,6 +1,9 @@
+from datetime import UTC, date, datetime
 from decimal import Decimal
+from types import SimpleNamespace
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
 from app.core.database import Base
@@ -17,6 +20,7 @@ from app.models import (
     KnowledgeDocument,
     Tenant,
 )
+from app.services.search_vector_service import SearchVectorService
 from app.services.universal_search_service import UniversalSearchService
 
 
@@ -223,3 +227,101 @@ def test_vector_only_hit_is_hydrated_when_fts_returns_no_candidate(monkeypatch):
         assert response["results"][0]["entity_id"] == chunk.id
         assert response["results"][0]["scores"]["lexical"] == 0
         assert response["results"][0]["scores"]["vector"] == 0.91
+
+
+def test_filters_are_pushed_into_one_candidate_query():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        tenant = Tenant(external_id="search-filters", name="Search filters")
+        other = Tenant(external_id="search-filters-other", name="Other")
+        db.add_all([tenant, other])
+        db.flush()
+        db.info["tenant_id"] = other.id
+        db.add(Claim(statement="Pricing power claim from another tenant.", status="verified"))
+        db.flush()
+        db.info["tenant_id"] = tenant.id
+        filing = Document(title="Pricing filing", source_type="sec_filing")
+        note = Document(
+            title="Pricing note",
+            source_type="news",
+            published_at=datetime(2020, 1, 15, tzinfo=UTC),
+        )
+        db.add_all([filing, note])
+        db.flush()
+        db.add_all(
+            [
+                DocumentChunk(document_id=filing.id, chunk_index=0, text="Pricing power in filings."),
+                DocumentChunk(document_id=note.id, chunk_index=0, text="Pricing power in the news."),
+                Claim(statement="Pricing power is verified.", status="verified"),
+                Claim(statement="Pricing power is unverified.", status="unverified"),
+            ]
+        )
+        db.commit()
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            verified = UniversalSearchService().search(
+                db, "pricing power", statuses={"verified"}, include_vector=False
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert [row["entity_type"] for row in verified["results"]] == ["claim"]
+        assert verified["results"][0]["text"] == "Pricing power is verified."
+        assert sum("UNION ALL" in statement for statement in statements) == 1
+        assert len(statements) == 2
+
+        filings = UniversalSearchService().search(
+            db, "pricing power", source_types={"sec_filing"}, include_vector=False
+        )
+        assert [row["title"] for row in filings["results"]] == ["Pricing filing"]
+
+        dated = UniversalSearchService().search(
+            db,
+            "pricing power",
+            entity_types={"document_chunk"},
+            date_from=date(2020, 1, 15),
+            date_to=date(2020, 1, 15),
+            include_vector=False,
+        )
+        assert [row["title"] for row in dated["results"]] == ["Pricing note"]
+
+
+def test_postgres_candidates_rank_with_ts_rank_cd_and_limit_per_corpus(monkeypatch):
+    captured = []
+
+    class FakeSession:
+        bind = SimpleNamespace(dialect=postgresql.dialect())
+        info = {"tenant_id": 1}
+
+        def execute(self, statement):
+            captured.append(statement)
+            return SimpleNamespace(all=lambda: [])
+
+    ready = {"document_chunks"}
+    monkeypatch.setattr(SearchVectorService, "ready_tables", lambda self, db: frozenset(ready))
+
+    for service in (UniversalSearchService(), UniversalSearchService(use_search_vectors=False)):
+        service._candidates(
+            FakeSession(),  # type: ignore[arg-type]
+            "pricing power",
+            company=None,
+            entity_types={"document_chunk", "claim"},
+            collection_id=None,
+            top_k=40,
+        )
+
+    stored, expression = (statement.compile(dialect=postgresql.dialect()) for statement in captured)
+    sql = str(stored)
+    assert sql.count("ts_rank_cd") == 4
+    assert sql.count("LIMIT") == 2
+    assert list(stored.params.values()).count(40) == 2
+    assert "UNION ALL" in sql
+    assert '"document_chunks".search_vector @@ websearch_to_tsquery' in sql
+    assert "to_tsvector(%(to_tsvector_1)s, coalesce(claims.statement" in sql
+    assert "search_vector" not in str(expression)